@@ -0,0 +1,547 @@
+"""Esquema inicial (anterior às migrações)
+
+Até aqui as tabelas eram criadas pelo `create_all` na inicialização da aplicação. Esta revisão
+registra esse esquema para que um banco vazio possa ser criado só com as migrações; tabelas e
+índices que já existem são mantidos, então ela também roda sobre um banco criado pelo `create_all`.
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import create_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "achievements",
+    "organizations",
+    "clients",
+    "demousage",
+    "goals",
+    "implements",
+    "parts",
+    "users",
+    "vehicles",
+    "alerts",
+    "documents",
+    "fines",
+    "freight_orders",
+    "fuel_logs",
+    "inventory_items",
+    "location_history",
+    "maintenance_requests",
+    "notifications",
+    "user_achievements",
+    "inventory_transactions",
+    "journeys",
+    "maintenance_comments",
+    "stop_points",
+    "vehicle_costs",
+    "vehicle_components",
+    "vehicle_tires",
+)
+
+ENUMS = (
+    "partcategory",
+    "userrole",
+    "vehiclestatus",
+    "alertlevel",
+    "documenttype",
+    "finestatus",
+    "freightstatus",
+    "verificationstatus",
+    "fuellogsource",
+    "inventoryitemstatus",
+    "maintenancestatus",
+    "maintenancecategory",
+    "notificationtype",
+    "transactiontype",
+    "stoppointtype",
+    "stoppointstatus",
+    "costtype",
+)
+
+
+def upgrade() -> None:
+    create_table(
+        "achievements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("code", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column("icon", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_achievements_code", "achievements", ["code"], unique=True, if_not_exists=True)
+    op.create_index("ix_achievements_id", "achievements", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "organizations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("sector", sa.String(length=50), nullable=False),
+        sa.Column("fuel_provider_name", sa.String(length=100), nullable=True),
+        sa.Column("encrypted_fuel_provider_api_key", sa.LargeBinary(), nullable=True),
+        sa.Column("encrypted_fuel_provider_api_secret", sa.LargeBinary(), nullable=True),
+        sa.Column("vehicle_limit", sa.Integer(), nullable=False),
+        sa.Column("driver_limit", sa.Integer(), nullable=False),
+        sa.Column("freight_order_limit", sa.Integer(), nullable=False),
+        sa.Column("maintenance_limit", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_organizations_id", "organizations", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_organizations_name", "organizations", ["name"], unique=True, if_not_exists=True)
+    create_table(
+        "clients",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("contact_person", sa.String(length=100), nullable=True),
+        sa.Column("phone", sa.String(length=20), nullable=True),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_clients_id", "clients", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_clients_name", "clients", ["name"], unique=False, if_not_exists=True)
+    create_table(
+        "demousage",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("resource_type", sa.String(), nullable=False),
+        sa.Column("usage_count", sa.Integer(), nullable=True),
+        sa.Column("period", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_demousage_id", "demousage", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_demousage_organization_id", "demousage", ["organization_id"], unique=False, if_not_exists=True)
+    op.create_index("ix_demousage_resource_type", "demousage", ["resource_type"], unique=False, if_not_exists=True)
+    create_table(
+        "goals",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("target_value", sa.Float(), nullable=False),
+        sa.Column("unit", sa.String(), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("period_end", sa.Date(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_goals_id", "goals", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "implements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("brand", sa.String(length=50), nullable=False),
+        sa.Column("model", sa.String(length=50), nullable=False),
+        sa.Column("type", sa.String(length=50), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("identifier", sa.String(length=50), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_implements_id", "implements", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "parts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("category", sa.Enum("PECA", "FLUIDO", "CONSUMIVEL", "PNEU", "OUTRO", name="partcategory"), nullable=False),
+        sa.Column("value", sa.Float(), nullable=True),
+        sa.Column("invoice_url", sa.String(length=512), nullable=True),
+        sa.Column("serial_number", sa.String(length=100), nullable=True),
+        sa.Column("minimum_stock", sa.Integer(), nullable=True),
+        sa.Column("part_number", sa.String(length=100), nullable=True),
+        sa.Column("brand", sa.String(length=100), nullable=True),
+        sa.Column("location", sa.String(length=100), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("photo_url", sa.String(length=512), nullable=True),
+        sa.Column("lifespan_km", sa.Integer(), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_parts_id", "parts", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_parts_name", "parts", ["name"], unique=False, if_not_exists=True)
+    op.create_index("ix_parts_part_number", "parts", ["part_number"], unique=False, if_not_exists=True)
+    op.create_index("ix_parts_serial_number", "parts", ["serial_number"], unique=True, if_not_exists=True)
+    create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("employee_id", sa.String(length=50), nullable=False),
+        sa.Column("role", sa.Enum("CLIENTE_ATIVO", "CLIENTE_DEMO", "DRIVER", name="userrole"), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("avatar_url", sa.String(length=512), nullable=True),
+        sa.Column("notify_in_app", sa.Boolean(), nullable=False),
+        sa.Column("notify_by_email", sa.Boolean(), nullable=False),
+        sa.Column("notification_email", sa.String(length=100), nullable=True),
+        sa.Column("reset_password_token", sa.String(length=255), nullable=True),
+        sa.Column("reset_password_token_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True, if_not_exists=True)
+    op.create_index("ix_users_employee_id", "users", ["employee_id"], unique=True, if_not_exists=True)
+    op.create_index("ix_users_full_name", "users", ["full_name"], unique=False, if_not_exists=True)
+    op.create_index("ix_users_id", "users", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_users_reset_password_token", "users", ["reset_password_token"], unique=False, if_not_exists=True)
+    create_table(
+        "vehicles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("brand", sa.String(length=50), nullable=False),
+        sa.Column("model", sa.String(length=50), nullable=False),
+        sa.Column("license_plate", sa.String(length=20), nullable=True),
+        sa.Column("identifier", sa.String(length=50), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("photo_url", sa.String(length=512), nullable=True),
+        sa.Column("status", sa.Enum("AVAILABLE", "IN_USE", "MAINTENANCE", name="vehiclestatus"), nullable=False),
+        sa.Column("current_km", sa.Integer(), nullable=False),
+        sa.Column("current_engine_hours", sa.Float(), nullable=True),
+        sa.Column("axle_configuration", sa.String(length=30), nullable=True),
+        sa.Column("telemetry_device_id", sa.String(length=100), nullable=True),
+        sa.Column("last_latitude", sa.Float(), nullable=True),
+        sa.Column("last_longitude", sa.Float(), nullable=True),
+        sa.Column("next_maintenance_date", sa.Date(), nullable=True),
+        sa.Column("next_maintenance_km", sa.Integer(), nullable=True),
+        sa.Column("maintenance_notes", sa.Text(), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("license_plate")
+    )
+    op.create_index("ix_vehicles_id", "vehicles", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_vehicles_telemetry_device_id", "vehicles", ["telemetry_device_id"], unique=True, if_not_exists=True)
+    create_table(
+        "alerts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("message", sa.String(length=255), nullable=False),
+        sa.Column("level", sa.Enum("INFO", "WARNING", "CRITICAL", name="alertlevel"), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=True),
+        sa.Column("driver_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["driver_id"], ["users.id"], ),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_alerts_id", "alerts", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "documents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("document_type", sa.Enum("CNH", "CRLV", "ANTT", "ASO", "SEGURO", "OUTRO", name="documenttype"), nullable=False),
+        sa.Column("expiry_date", sa.Date(), nullable=False),
+        sa.Column("file_url", sa.String(length=512), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=True),
+        sa.Column("driver_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["driver_id"], ["users.id"], ),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_documents_expiry_date", "documents", ["expiry_date"], unique=False, if_not_exists=True)
+    op.create_index("ix_documents_id", "documents", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "fines",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=False),
+        sa.Column("infraction_code", sa.String(length=50), nullable=True),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("status", sa.Enum("PENDING", "PAID", "APPEALED", "CANCELED", name="finestatus"), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=False),
+        sa.Column("driver_id", sa.Integer(), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["driver_id"], ["users.id"], ),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_fines_id", "fines", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "freight_orders",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(length=500), nullable=True),
+        sa.Column("status", sa.Enum("OPEN", "CLAIMED", "PENDING", "IN_TRANSIT", "DELIVERED", "CANCELED", name="freightstatus"), nullable=False),
+        sa.Column("scheduled_start_time", sa.DateTime(), nullable=True),
+        sa.Column("scheduled_end_time", sa.DateTime(), nullable=True),
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=True),
+        sa.Column("driver_id", sa.Integer(), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ),
+        sa.ForeignKeyConstraint(["driver_id"], ["users.id"], ),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_freight_orders_id", "freight_orders", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "fuel_logs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("odometer", sa.Integer(), nullable=False),
+        sa.Column("liters", sa.Float(), nullable=False),
+        sa.Column("total_cost", sa.Float(), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("receipt_photo_url", sa.String(length=512), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("verification_status", sa.Enum("VERIFIED", "SUSPICIOUS", "UNVERIFIED", "PENDING", name="verificationstatus"), nullable=False),
+        sa.Column("provider_transaction_id", sa.String(length=255), nullable=True),
+        sa.Column("provider_name", sa.String(length=100), nullable=True),
+        sa.Column("gas_station_name", sa.String(length=255), nullable=True),
+        sa.Column("gas_station_latitude", sa.Float(), nullable=True),
+        sa.Column("gas_station_longitude", sa.Float(), nullable=True),
+        sa.Column("source", sa.Enum("MANUAL", "INTEGRATION", name="fuellogsource"), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_fuel_logs_id", "fuel_logs", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_fuel_logs_provider_transaction_id", "fuel_logs", ["provider_transaction_id"], unique=True, if_not_exists=True)
+    create_table(
+        "inventory_items",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("item_identifier", sa.Integer(), nullable=False),
+        sa.Column("status", sa.Enum("DISPONIVEL", "EM_USO", "FIM_DE_VIDA", name="inventoryitemstatus"), nullable=False),
+        sa.Column("part_id", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("installed_on_vehicle_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("installed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["installed_on_vehicle_id"], ["vehicles.id"], ),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["part_id"], ["parts.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("part_id", "item_identifier", name="_part_item_identifier_uc")
+    )
+    op.create_index("ix_inventory_items_id", "inventory_items", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_inventory_items_item_identifier", "inventory_items", ["item_identifier"], unique=False, if_not_exists=True)
+    op.create_index("ix_inventory_items_status", "inventory_items", ["status"], unique=False, if_not_exists=True)
+    create_table(
+        "location_history",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_location_history_id", "location_history", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "maintenance_requests",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("problem_description", sa.Text(), nullable=False),
+        sa.Column("status", sa.Enum("PENDENTE", "APROVADA", "REJEITADA", "EM_ANDAMENTO", "CONCLUIDA", name="maintenancestatus"), nullable=False),
+        sa.Column("category", sa.Enum("MECHANICAL", "ELECTRICAL", "BODYWORK", "OTHER", name="maintenancecategory"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("manager_notes", sa.Text(), nullable=True),
+        sa.Column("reported_by_id", sa.Integer(), nullable=True),
+        sa.Column("approved_by_id", sa.Integer(), nullable=True),
+        sa.Column("vehicle_id", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["approved_by_id"], ["users.id"], ),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["reported_by_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_maintenance_requests_id", "maintenance_requests", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "notifications",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("is_read", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("notification_type", sa.Enum("MAINTENANCE_DUE_DATE", "MAINTENANCE_DUE_KM", "DOCUMENT_EXPIRING", "LOW_STOCK", "TIRE_STATUS_BAD", "ABNORMAL_FUEL_CONSUMPTION", "COST_EXCEEDED", "NEW_FINE_REGISTERED", "FINE_PAYMENT_DUE", "FREIGHT_ASSIGNED", "FREIGHT_UPDATED", "MAINTENANCE_REQUEST_NEW", "MAINTENANCE_REQUEST_STATUS_UPDATE", "MAINTENANCE_REQUEST_NEW_COMMENT", "JOURNEY_STARTED", "JOURNEY_ENDED", "ACHIEVEMENT_UNLOCKED", "LEADERBOARD_TOP3", name="notificationtype"), nullable=False),
+        sa.Column("related_entity_type", sa.String(), nullable=True),
+        sa.Column("related_entity_id", sa.Integer(), nullable=True),
+        sa.Column("related_vehicle_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["related_vehicle_id"], ["vehicles.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_notifications_id", "notifications", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "user_achievements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("achievement_id", sa.Integer(), nullable=False),
+        sa.Column("unlocked_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["achievement_id"], ["achievements.id"], ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "achievement_id", name="_user_achievement_uc")
+    )
+    op.create_index("ix_user_achievements_id", "user_achievements", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "inventory_transactions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("part_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("transaction_type", sa.Enum("ENTRADA", "SAIDA_USO", "FIM_DE_VIDA", "AJUSTE_INICIAL", "INSTALACAO", "DESCARTE", name="transactiontype"), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("related_vehicle_id", sa.Integer(), nullable=True),
+        sa.Column("related_user_id", sa.Integer(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["item_id"], ["inventory_items.id"], ),
+        sa.ForeignKeyConstraint(["part_id"], ["parts.id"], ),
+        sa.ForeignKeyConstraint(["related_user_id"], ["users.id"], ),
+        sa.ForeignKeyConstraint(["related_vehicle_id"], ["vehicles.id"], ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_inventory_transactions_id", "inventory_transactions", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "journeys",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=True),
+        sa.Column("start_mileage", sa.Integer(), nullable=False),
+        sa.Column("end_mileage", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("trip_type", sa.String(length=50), nullable=False),
+        sa.Column("implement_id", sa.Integer(), nullable=True),
+        sa.Column("freight_order_id", sa.Integer(), nullable=True),
+        sa.Column("trip_description", sa.String(), nullable=True),
+        sa.Column("start_engine_hours", sa.Float(), nullable=True),
+        sa.Column("end_engine_hours", sa.Float(), nullable=True),
+        sa.Column("destination_address", sa.String(), nullable=True),
+        sa.Column("destination_street", sa.String(length=255), nullable=True),
+        sa.Column("destination_neighborhood", sa.String(length=100), nullable=True),
+        sa.Column("destination_city", sa.String(length=100), nullable=True),
+        sa.Column("destination_state", sa.String(length=2), nullable=True),
+        sa.Column("destination_cep", sa.String(length=9), nullable=True),
+        sa.Column("vehicle_id", sa.Integer(), nullable=False),
+        sa.Column("driver_id", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["driver_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["freight_order_id"], ["freight_orders.id"], ),
+        sa.ForeignKeyConstraint(["implement_id"], ["implements.id"], ),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_journeys_id", "journeys", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "maintenance_comments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("comment_text", sa.Text(), nullable=False),
+        sa.Column("file_url", sa.String(length=512), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("request_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["request_id"], ["maintenance_requests.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_maintenance_comments_id", "maintenance_comments", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "stop_points",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("freight_order_id", sa.Integer(), nullable=False),
+        sa.Column("sequence_order", sa.Integer(), nullable=False),
+        sa.Column("type", sa.Enum("PICKUP", "DELIVERY", name="stoppointtype"), nullable=False),
+        sa.Column("status", sa.Enum("PENDING", "COMPLETED", name="stoppointstatus"), nullable=False),
+        sa.Column("address", sa.String(length=500), nullable=False),
+        sa.Column("cargo_description", sa.String(length=500), nullable=True),
+        sa.Column("scheduled_time", sa.DateTime(), nullable=False),
+        sa.Column("actual_arrival_time", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["freight_order_id"], ["freight_orders.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_stop_points_id", "stop_points", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "vehicle_costs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("cost_type", sa.Enum("MANUTENCAO", "COMBUSTIVEL", "PEDAGIO", "SEGURO", "PNEU", "PECAS_COMPONENTES", "MULTA", "OUTROS", name="costtype"), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("fine_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["fine_id"], ["fines.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("fine_id")
+    )
+    op.create_index("ix_vehicle_costs_id", "vehicle_costs", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "vehicle_components",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=False),
+        sa.Column("part_id", sa.Integer(), nullable=False),
+        sa.Column("inventory_transaction_id", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("installation_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("uninstallation_date", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["inventory_transaction_id"], ["inventory_transactions.id"], ),
+        sa.ForeignKeyConstraint(["part_id"], ["parts.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("inventory_transaction_id")
+    )
+    op.create_index("ix_vehicle_components_id", "vehicle_components", ["id"], unique=False, if_not_exists=True)
+    create_table(
+        "vehicle_tires",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), nullable=False),
+        sa.Column("part_id", sa.Integer(), nullable=False),
+        sa.Column("position_code", sa.String(length=20), nullable=False),
+        sa.Column("install_km", sa.Integer(), nullable=False),
+        sa.Column("removal_km", sa.Integer(), nullable=True),
+        sa.Column("install_engine_hours", sa.Float(), nullable=True),
+        sa.Column("removal_engine_hours", sa.Float(), nullable=True),
+        sa.Column("km_run", sa.Float(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("installation_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("removal_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("inventory_transaction_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["inventory_transaction_id"], ["inventory_transactions.id"], ),
+        sa.ForeignKeyConstraint(["part_id"], ["parts.id"], ),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_vehicle_tires_id", "vehicle_tires", ["id"], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_table(table)
+    for name in ENUMS:
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
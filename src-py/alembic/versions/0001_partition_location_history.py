@@ -0,0 +1,156 @@
+"""Particiona location_history por mês em timestamp
+
+Converte a tabela location_history (heap única com PK global) numa tabela
+particionada por RANGE (timestamp), com uma partição por mês e o índice
+(vehicle_id, timestamp) em cada partição. As linhas existentes são copiadas
+mês a mês para as novas partições (backfill) e a tabela antiga é removida.
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-18
+
+"""
+from datetime import date, datetime, timezone
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = "0000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "location_history"
+LEGACY_TABLE = "location_history_legacy"
+SEQUENCE = "location_history_id_seq"
+COLUMNS = "id, latitude, longitude, timestamp, vehicle_id, organization_id"
+# Partições criadas além do mês atual; as seguintes ficam a cargo da tarefa diária.
+PARTITIONS_AHEAD = 2
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _month_range(first: date, last: date) -> List[date]:
+    months = []
+    current = date(first.year, first.month, 1)
+    while current <= last:
+        months.append(current)
+        current = _add_months(current, 1)
+    return months
+
+
+def _utc_bound(month: date) -> str:
+    return f"{month.isoformat()}T00:00:00+00"
+
+
+def _partition_name(month: date) -> str:
+    return f"{TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def _table_exists(conn, name: str) -> bool:
+    return conn.execute(sa.text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None
+
+
+def _is_partitioned(conn) -> bool:
+    return conn.execute(
+        sa.text("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :name"),
+        {"name": TABLE},
+    ).scalar() is not None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql" or _is_partitioned(conn):
+        return
+
+    has_legacy = _table_exists(conn, TABLE)
+    if has_legacy:
+        # Renomeia a tabela antiga e libera os nomes de constraint/índice/sequence para a nova.
+        op.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+        op.execute(f"ALTER TABLE {LEGACY_TABLE} RENAME CONSTRAINT {TABLE}_pkey TO {LEGACY_TABLE}_pkey")
+        # Todos os índices da tabela antiga (inclusive os criados pelo `create_all` a partir dos
+        # modelos atuais), para que as revisões seguintes possam criá-los na tabela nova
+        legacy_indexes = conn.execute(
+            sa.text("SELECT indexname FROM pg_indexes WHERE tablename = :name AND indexname LIKE :prefix"),
+            {"name": LEGACY_TABLE, "prefix": f"ix\\_{TABLE}\\_%"},
+        ).scalars().all()
+        for index in legacy_indexes:
+            op.execute(f'ALTER INDEX "{index}" RENAME TO "ix_{LEGACY_TABLE}{index[len(TABLE) + 3:]}"')
+        op.execute(f"ALTER SEQUENCE IF EXISTS {SEQUENCE} OWNED BY NONE")
+
+    op.execute(f"CREATE SEQUENCE IF NOT EXISTS {SEQUENCE}")
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} AS BIGINT")
+    op.execute(f"""
+        CREATE TABLE {TABLE} (
+            id BIGINT NOT NULL DEFAULT nextval('{SEQUENCE}'),
+            latitude DOUBLE PRECISION NOT NULL,
+            longitude DOUBLE PRECISION NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            vehicle_id INTEGER NOT NULL REFERENCES vehicles (id) ON DELETE CASCADE,
+            organization_id INTEGER NOT NULL REFERENCES organizations (id),
+            CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+    # Índice na tabela-mãe: o PostgreSQL cria o índice correspondente em cada partição.
+    op.execute(f"CREATE INDEX ix_{TABLE}_vehicle_id_timestamp ON {TABLE} (vehicle_id, timestamp)")
+
+    today = datetime.utcnow().date()
+    first_month, last_month = today, _add_months(today, PARTITIONS_AHEAD)
+    if has_legacy:
+        oldest, newest = conn.execute(sa.text(f"SELECT min(timestamp), max(timestamp) FROM {LEGACY_TABLE}")).one()
+        if oldest is not None:
+            first_month = min(first_month, oldest.astimezone(timezone.utc).date())
+            last_month = max(last_month, newest.astimezone(timezone.utc).date())
+
+    months = _month_range(first_month, last_month)
+    for month in months:
+        op.execute(
+            f"CREATE TABLE {_partition_name(month)} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{_utc_bound(month)}') TO ('{_utc_bound(_add_months(month, 1))}')"
+        )
+
+    if not has_legacy:
+        return
+
+    # Backfill mês a mês, para não montar uma única transação gigante de ordenação/índice.
+    for month in months:
+        op.execute(
+            f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {LEGACY_TABLE} "
+            f"WHERE timestamp >= '{_utc_bound(month)}' AND timestamp < '{_utc_bound(_add_months(month, 1))}'"
+        )
+    op.execute(f"SELECT setval('{SEQUENCE}', COALESCE((SELECT max(id) FROM {TABLE}), 0) + 1, false)")
+    op.execute(f"DROP TABLE {LEGACY_TABLE}")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql" or not _is_partitioned(conn):
+        return
+
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+    op.execute(f"ALTER TABLE {LEGACY_TABLE} RENAME CONSTRAINT {TABLE}_pkey TO {LEGACY_TABLE}_pkey")
+    op.execute(f"ALTER INDEX ix_{TABLE}_vehicle_id_timestamp RENAME TO ix_{LEGACY_TABLE}_vehicle_id_timestamp")
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY NONE")
+
+    op.execute(f"""
+        CREATE TABLE {TABLE} (
+            id BIGINT NOT NULL DEFAULT nextval('{SEQUENCE}') PRIMARY KEY,
+            latitude DOUBLE PRECISION NOT NULL,
+            longitude DOUBLE PRECISION NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            vehicle_id INTEGER NOT NULL REFERENCES vehicles (id) ON DELETE CASCADE,
+            organization_id INTEGER NOT NULL REFERENCES organizations (id)
+        )
+    """)
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+    op.execute(f"CREATE INDEX ix_{TABLE}_vehicle_id_timestamp ON {TABLE} (vehicle_id, timestamp)")
+    op.execute(f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {LEGACY_TABLE}")
+    # Remove a tabela particionada junto com todas as suas partições.
+    op.execute(f"DROP TABLE {LEGACY_TABLE} CASCADE")
@@ -0,0 +1,41 @@
+"""Cria a tabela track_chunks (trajetos compactados por janela de tempo)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import create_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_table(
+        "track_chunks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("window_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("window_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("point_count", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("sealed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), sa.ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.UniqueConstraint("vehicle_id", "window_start", name="uq_track_chunks_vehicle_window"),
+    )
+    op.create_index("ix_track_chunks_id", "track_chunks", ["id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_track_chunks_id", table_name="track_chunks")
+    op.drop_table("track_chunks")
@@ -0,0 +1,53 @@
+"""Cria a tabela geofences e os tipos de notificação de cerca eletrônica
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import create_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_table(
+        "geofences",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("type", sa.Enum("POLYGON", "CIRCLE", name="geofencetype"), nullable=False),
+        sa.Column("coordinates", sa.JSON(), nullable=True),
+        sa.Column("center_latitude", sa.Float(), nullable=True),
+        sa.Column("center_longitude", sa.Float(), nullable=True),
+        sa.Column("radius_meters", sa.Float(), nullable=True),
+        sa.Column("alert_on_enter", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("alert_on_exit", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+    )
+    op.create_index("ix_geofences_id", "geofences", ["id"], if_not_exists=True)
+    op.create_index("ix_geofences_organization_id", "geofences", ["organization_id"], if_not_exists=True)
+
+    # ALTER TYPE ... ADD VALUE não pode rodar dentro de uma transação em versões antigas do PostgreSQL
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE notificationtype ADD VALUE IF NOT EXISTS 'GEOFENCE_ENTERED'")
+        op.execute("ALTER TYPE notificationtype ADD VALUE IF NOT EXISTS 'GEOFENCE_EXITED'")
+
+
+def downgrade() -> None:
+    # Valores de enum não podem ser removidos no PostgreSQL; ficam sem uso após o downgrade.
+    op.drop_index("ix_geofences_organization_id", table_name="geofences")
+    op.drop_index("ix_geofences_id", table_name="geofences")
+    op.drop_table("geofences")
+    sa.Enum(name="geofencetype").drop(op.get_bind(), checkfirst=True)
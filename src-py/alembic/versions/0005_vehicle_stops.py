@@ -0,0 +1,64 @@
+"""Cria as tabelas de paradas detectadas e de checkpoint do detector, e as coordenadas dos pontos de parada
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import create_table, add_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column("stop_points", sa.Column("latitude", sa.Float(), nullable=True))
+    add_column("stop_points", sa.Column("longitude", sa.Float(), nullable=True))
+
+    create_table(
+        "vehicle_stops",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("ended_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=True),
+        sa.Column("vehicle_id", sa.Integer(), sa.ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("stop_point_id", sa.Integer(), sa.ForeignKey("stop_points.id", ondelete="SET NULL"), nullable=True),
+        sa.UniqueConstraint("vehicle_id", "started_at", name="uq_vehicle_stops_vehicle_started"),
+    )
+    op.create_index("ix_vehicle_stops_id", "vehicle_stops", ["id"], if_not_exists=True)
+    op.create_index("ix_vehicle_stops_organization_started", "vehicle_stops", ["organization_id", "started_at"], if_not_exists=True)
+
+    create_table(
+        "stop_detector_checkpoints",
+        sa.Column("vehicle_id", sa.Integer(), sa.ForeignKey("vehicles.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("last_latitude", sa.Float(), nullable=False),
+        sa.Column("last_longitude", sa.Float(), nullable=False),
+        sa.Column("last_timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("anchor_latitude", sa.Float(), nullable=False),
+        sa.Column("anchor_longitude", sa.Float(), nullable=False),
+        sa.Column("anchor_timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("stopped", sa.Boolean(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stop_detector_checkpoints")
+    op.drop_index("ix_vehicle_stops_organization_started", table_name="vehicle_stops")
+    op.drop_index("ix_vehicle_stops_id", table_name="vehicle_stops")
+    op.drop_table("vehicle_stops")
+    op.drop_column("stop_points", "longitude")
+    op.drop_column("stop_points", "latitude")
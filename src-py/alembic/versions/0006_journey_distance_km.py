@@ -0,0 +1,28 @@
+"""Adiciona journeys.distance_km (distância da viagem calculada pelo GPS)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import add_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column("journeys", sa.Column("distance_km", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("journeys", "distance_km")
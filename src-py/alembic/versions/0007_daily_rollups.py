@@ -0,0 +1,114 @@
+"""Cria a tabela de consolidação diária (custos, abastecimentos e viagens por veículo/motorista/dia)
+
+A tabela é preenchida com o histórico na própria migração, com o mesmo agrupamento de
+`crud_rollup.reconcile`, para que os relatórios que passam a lê-la não fiquem sem dados.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import create_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+METRICS = (
+    "km", "engine_hours", "gps_km", "liters", "fuel_cost", "total_cost",
+    "cost_maintenance", "cost_fuel", "cost_toll", "cost_insurance", "cost_tire", "cost_parts", "cost_fine", "cost_other",
+)
+
+# Coluna de custo de cada valor do enum `costtype` (como `COST_COLUMNS` do modelo)
+COST_COLUMNS = {
+    "MANUTENCAO": "cost_maintenance",
+    "COMBUSTIVEL": "cost_fuel",
+    "PEDAGIO": "cost_toll",
+    "SEGURO": "cost_insurance",
+    "PNEU": "cost_tire",
+    "PECAS_COMPONENTES": "cost_parts",
+    "MULTA": "cost_fine",
+    "OUTROS": "cost_other",
+}
+
+
+def _contribution(key: str, values: dict, source: str) -> str:
+    """SELECT de uma origem com todas as colunas da consolidação (zero nas que ela não tem)."""
+    metrics = ", ".join(f"{values.get(metric, '0')} AS {metric}" for metric in (*METRICS, "journey_count"))
+    return f"SELECT {key}, {metrics} FROM {source}"
+
+
+def _backfill() -> None:
+    """
+    Soma custos, abastecimentos e viagens encerradas por organização, veículo, motorista e dia,
+    como `crud_rollup.reconcile`: os custos ficam sem motorista, os abastecimentos contam no dia
+    UTC e as viagens no dia em que começaram. Só roda com a tabela vazia.
+    """
+    if op.get_bind().execute(sa.text("SELECT 1 FROM daily_rollups LIMIT 1")).first() is not None:
+        return
+    costs = _contribution(
+        "organization_id, vehicle_id, NULL::integer AS driver_id, date AS day",
+        {
+            "total_cost": "amount",
+            **{column: f"CASE WHEN cost_type = '{cost_type}' THEN amount ELSE 0 END" for cost_type, column in COST_COLUMNS.items()},
+        },
+        "vehicle_costs",
+    )
+    fuel_logs = _contribution(
+        "organization_id, vehicle_id, user_id AS driver_id, (timestamp AT TIME ZONE 'UTC')::date AS day",
+        {"liters": "COALESCE(liters, 0)", "fuel_cost": "COALESCE(total_cost, 0)"},
+        "fuel_logs",
+    )
+    journeys = _contribution(
+        "organization_id, vehicle_id, driver_id, start_time::date AS day",
+        {
+            "km": "COALESCE(end_mileage - start_mileage, 0)",
+            "engine_hours": "COALESCE(end_engine_hours - start_engine_hours, 0)",
+            "gps_km": "COALESCE(distance_km, 0)",
+            "journey_count": "1",
+        },
+        "journeys WHERE is_active IS NOT TRUE",
+    )
+    columns = (*METRICS, "journey_count")
+    op.execute(
+        f"INSERT INTO daily_rollups (organization_id, vehicle_id, driver_id, day, {', '.join(columns)}) "
+        f"SELECT organization_id, vehicle_id, driver_id, day, {', '.join(f'SUM({c})' for c in columns)} "
+        f"FROM ({costs} UNION ALL {fuel_logs} UNION ALL {journeys}) AS contributions "
+        "GROUP BY organization_id, vehicle_id, driver_id, day "
+        f"HAVING {' OR '.join(f'SUM({c}) <> 0' for c in columns)}"
+    )
+
+
+def upgrade() -> None:
+    create_table(
+        "daily_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        *(sa.Column(metric, sa.Float(), nullable=False, server_default="0") for metric in METRICS),
+        sa.Column("journey_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("vehicle_id", sa.Integer(), sa.ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("driver_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=True),
+    )
+    op.create_index("ix_daily_rollups_id", "daily_rollups", ["id"], if_not_exists=True)
+    op.create_index(
+        "uq_daily_rollups_key", "daily_rollups",
+        ["organization_id", "vehicle_id", sa.text("COALESCE(driver_id, 0)"), "day"], unique=True, if_not_exists=True,
+    )
+    op.create_index("ix_daily_rollups_organization_day", "daily_rollups", ["organization_id", "day"], if_not_exists=True)
+    _backfill()
+
+
+def downgrade() -> None:
+    op.drop_index("ix_daily_rollups_organization_day", table_name="daily_rollups")
+    op.drop_index("uq_daily_rollups_key", table_name="daily_rollups")
+    op.drop_index("ix_daily_rollups_id", table_name="daily_rollups")
+    op.drop_table("daily_rollups")
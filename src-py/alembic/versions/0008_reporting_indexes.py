@@ -0,0 +1,62 @@
+"""Adiciona os índices compostos usados pelos relatórios e dashboards
+
+As consultas de período filtram por (organização/veículo/motorista, data) com intervalos
+semiabertos sobre a própria coluna (ver `app.core.periods.within_days`), o que permite
+usar estes índices. As viagens em andamento ganham índices parciais.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_journeys_organization_start_time", "journeys", ["organization_id", "start_time"]),
+    ("ix_journeys_vehicle_start_time", "journeys", ["vehicle_id", "start_time"]),
+    ("ix_journeys_driver_start_time", "journeys", ["driver_id", "start_time"]),
+    ("ix_fuel_logs_organization_timestamp", "fuel_logs", ["organization_id", "timestamp"]),
+    ("ix_fuel_logs_vehicle_timestamp", "fuel_logs", ["vehicle_id", "timestamp"]),
+    ("ix_fuel_logs_user_timestamp", "fuel_logs", ["user_id", "timestamp"]),
+    ("ix_maintenance_requests_organization_created_at", "maintenance_requests", ["organization_id", "created_at"]),
+    ("ix_maintenance_requests_vehicle_created_at", "maintenance_requests", ["vehicle_id", "created_at"]),
+    ("ix_maintenance_requests_reported_by_created_at", "maintenance_requests", ["reported_by_id", "created_at"]),
+    ("ix_maintenance_comments_request_id", "maintenance_comments", ["request_id"]),
+    ("ix_vehicle_costs_organization_date", "vehicle_costs", ["organization_id", "date"]),
+    ("ix_vehicle_costs_vehicle_date", "vehicle_costs", ["vehicle_id", "date"]),
+    ("ix_alerts_organization_timestamp", "alerts", ["organization_id", "timestamp"]),
+    ("ix_alerts_driver_timestamp", "alerts", ["driver_id", "timestamp"]),
+    ("ix_vehicles_organization_status", "vehicles", ["organization_id", "status"]),
+    ("ix_users_organization_role", "users", ["organization_id", "role"]),
+    ("ix_goals_organization_period_end", "goals", ["organization_id", "period_end"]),
+    ("ix_fines_vehicle_date", "fines", ["vehicle_id", "date"]),
+    ("ix_documents_vehicle_id", "documents", ["vehicle_id"]),
+    ("ix_vehicle_tires_vehicle_id", "vehicle_tires", ["vehicle_id"]),
+)
+
+PARTIAL_INDEXES = (
+    ("ix_journeys_active_organization", "journeys", ["organization_id"]),
+    ("ix_journeys_active_driver", "journeys", ["driver_id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+    for name, table, columns in PARTIAL_INDEXES:
+        op.create_index(name, table, columns, postgresql_where=sa.text("is_active"), if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES + PARTIAL_INDEXES):
+        op.drop_index(name, table_name=table)
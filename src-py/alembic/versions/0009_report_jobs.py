@@ -0,0 +1,61 @@
+"""Cria a tabela de jobs de relatórios em segundo plano (com o resultado comprimido)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import create_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = "status IN ('PENDING', 'RUNNING')"
+
+
+def upgrade() -> None:
+    create_table(
+        "report_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "report_type",
+            sa.Enum("FLEET_MANAGEMENT", "DRIVER_PERFORMANCE", "VEHICLE_CONSOLIDATED", name="reportjobtype"),
+            nullable=False,
+        ),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("dedupe_key", sa.String(64), nullable=False),
+        sa.Column(
+            "status", sa.Enum("PENDING", "RUNNING", "DONE", "FAILED", name="reportjobstatus"), nullable=False
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("result", sa.LargeBinary(), nullable=True),
+        sa.Column("result_size", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("requested_by_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+    )
+    op.create_index("ix_report_jobs_id", "report_jobs", ["id"], if_not_exists=True)
+    op.create_index("ix_report_jobs_dedupe_key", "report_jobs", ["dedupe_key"], if_not_exists=True)
+    op.create_index("uq_report_jobs_active_key", "report_jobs", ["dedupe_key"], unique=True,
+                    postgresql_where=sa.text(ACTIVE), if_not_exists=True)
+    op.create_index("ix_report_jobs_status_created_at", "report_jobs", ["status", "created_at"], if_not_exists=True)
+    op.create_index("ix_report_jobs_expires_at", "report_jobs", ["expires_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_table("report_jobs")
+    sa.Enum(name="reportjobstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="reportjobtype").drop(op.get_bind(), checkfirst=True)
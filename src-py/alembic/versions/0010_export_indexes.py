@@ -0,0 +1,36 @@
+"""Adiciona os índices usados pelas exportações por período
+
+As exportações de multas filtram por (organização, data); as de transações de estoque
+chegam às transações pelos itens da organização e filtram por (item, data).
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_fines_organization_date", "fines", ["organization_id", "date"]),
+    ("ix_inventory_items_organization_id", "inventory_items", ["organization_id"]),
+    ("ix_inventory_transactions_item_timestamp", "inventory_transactions", ["item_id", "timestamp"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,28 @@
+"""Adiciona o índice (organização, timestamp) ao histórico de localização
+
+Usado pela exportação do histórico por organização e período. Criado na tabela-mãe,
+o PostgreSQL cria o índice correspondente em cada partição mensal.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_location_history_organization_timestamp", "location_history", ["organization_id", "timestamp"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_location_history_organization_timestamp", table_name="location_history")
@@ -0,0 +1,37 @@
+"""Exportações Parquet como jobs em segundo plano
+
+Adiciona o tipo `PARQUET_EXPORT`, o horário mínimo de execução (`run_after`) e os dados do
+resultado devolvidos em cabeçalhos (`result_metadata`).
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import add_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TYPE reportjobtype ADD VALUE IF NOT EXISTS 'PARQUET_EXPORT'")
+    add_column("report_jobs", sa.Column("run_after", sa.DateTime(timezone=True), nullable=True))
+    add_column("report_jobs", sa.Column("result_metadata", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    # O PostgreSQL não remove valores de um ENUM: 'PARQUET_EXPORT' continua no tipo, sem uso
+    op.execute("DELETE FROM report_jobs WHERE report_type = 'PARQUET_EXPORT'")
+    op.drop_column("report_jobs", "result_metadata")
+    op.drop_column("report_jobs", "run_after")
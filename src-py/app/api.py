@@ -7,6 +7,7 @@ from app.v1.endpoints import (
     dashboard,
     freight_orders,
     fuel_logs,
+    geofences,
     gps,
     implements,
     journeys,
@@ -28,7 +29,8 @@ from app.v1.endpoints import (
     vehicle_components,
     tires,
     costs,
-    fines 
+    fines,
+    exports
 )
 
 api_router = APIRouter()
@@ -46,6 +48,7 @@ api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
 api_router.include_router(maintenance.router, prefix="/maintenance", tags=["Maintenance"])
 api_router.include_router(gps.router, prefix="/gps", tags=["GPS"])
+api_router.include_router(geofences.router, prefix="/geofences", tags=["Geofences"])
 api_router.include_router(fuel_logs.router, prefix="/fuel-logs", tags=["Fuel Logs"])
 api_router.include_router(performance.router, prefix="/performance", tags=["Performance"])
 api_router.include_router(report_generator.router, prefix="/report-generator", tags=["Report Generator"])
@@ -61,3 +64,4 @@ api_router.include_router(vehicle_components.router, tags=["Vehicle Components"]
 api_router.include_router(tires.router, prefix="/tires", tags=["Tire Management"])
 api_router.include_router(costs.router, prefix="/costs", tags=["Costs"])
 api_router.include_router(fines.router, prefix="/fines", tags=["Fines"]) # <-- ADICIONE ESTA LINHA
+api_router.include_router(exports.router, prefix="/exports", tags=["Exports"])
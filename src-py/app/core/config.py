@@ -40,4 +40,98 @@ class Settings(BaseSettings):
     FERNET_KEY: str
     # --- FIM DA ADIÇÃO ---
 
+    # --- INGESTÃO DE TELEMETRIA ---
+    # Intervalo entre as gravações em lote da posição atual dos veículos
+    POSITION_BUFFER_FLUSH_INTERVAL_MS: int = 500
+    # Número máximo de pings aguardando gravação antes de aplicar backpressure
+    POSITION_BUFFER_MAX_QUEUE_SIZE: int = 10000
+    # Cache de telemetry_device_id -> veículo (entradas válidas e de dispositivos desconhecidos)
+    DEVICE_REGISTRY_TTL_SECONDS: int = 300
+    DEVICE_REGISTRY_NEGATIVE_TTL_SECONDS: int = 60
+    DEVICE_REGISTRY_MAX_ENTRIES: int = 100000
+    # Deduplicação de pacotes reenviados: timestamps recentes guardados por dispositivo
+    # e número máximo de dispositivos acompanhados em memória
+    TELEMETRY_DEDUP_WINDOW: int = 32
+    TELEMETRY_DEDUP_MAX_DEVICES: int = 100000
+    # Pacotes com timestamp além desta tolerância no futuro são descartados na ingestão
+    TELEMETRY_MAX_FUTURE_SECONDS: int = 600
+    # Histórico de localização particionado por mês. Os pontos brutos só ficam nele até serem
+    # compactados em track_chunks, que guardam o trajeto de longo prazo; partições anteriores
+    # à retenção são removidas quando já estiverem vazias.
+    LOCATION_HISTORY_RETENTION_MONTHS: int = 3
+    LOCATION_HISTORY_PARTITIONS_AHEAD: int = 2
+    # Compactação dos trajetos em blocos binários por janela de tempo. Os pontos ficam no
+    # buffer bruto (location_history) até a janela ter fechado há TRACK_HOT_BUFFER_HOURS
+    TRACK_CHUNK_WINDOW_MINUTES: int = 60
+    TRACK_HOT_BUFFER_HOURS: int = 48
+    # Canal WebSocket de telemetria: validade do token do dispositivo, janela de confirmação
+    # (frames por ack) e limite de frames pendentes por conexão antes de parar de ler o socket
+    DEVICE_TOKEN_EXPIRE_DAYS: int = 365
+    TELEMETRY_WS_AUTH_TIMEOUT_SECONDS: float = 10.0
+    TELEMETRY_WS_ACK_WINDOW: int = 50
+    TELEMETRY_WS_MAX_PENDING_FRAMES: int = 500
+    # Índice em grade das últimas posições (consultas de proximidade)
+    VEHICLE_INDEX_CELL_DEGREES: float = 0.1
+    VEHICLE_INDEX_REFRESH_SECONDS: int = 300
+    # Agrupamento do mapa: raio do grupo em pixels e limite de veículos individuais por resposta
+    MAP_CLUSTER_RADIUS_PX: int = 60
+    MAP_CLUSTER_MAX_VEHICLES: int = 500
+    # Cercas eletrônicas: grade das cercas (graus por célula), recarga periódica das cercas de
+    # cada organização e limite de células por cerca (acima dele a cerca é testada em toda posição)
+    GEOFENCE_INDEX_CELL_DEGREES: float = 0.05
+    GEOFENCE_REFRESH_SECONDS: int = 300
+    GEOFENCE_INDEX_MAX_CELLS_PER_FENCE: int = 1024
+    # Mapa em tempo real por SSE: intervalo de agrupamento das posições por assinante
+    # (padrão e mínimo aceito) e intervalo do heartbeat quando não há mudanças
+    POSITION_STREAM_DEFAULT_INTERVAL_MS: int = 1000
+    POSITION_STREAM_MIN_INTERVAL_MS: int = 250
+    POSITION_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    # Período máximo aceito por GET /vehicles/{id}/track
+    TRACK_PLAYBACK_MAX_DAYS: int = 31
+    # Detecção de paradas no fluxo de posições: raio em torno do primeiro ponto do trecho e
+    # permanência mínima dentro dele para registrar a parada, raio de chegada a um ponto de
+    # parada de frete, intervalo entre checkpoints do estado de cada veículo e limite de
+    # pontos do histórico reprocessados ao retomar um veículo a partir do checkpoint
+    STOP_RADIUS_METERS: float = 50.0
+    STOP_MIN_DWELL_SECONDS: int = 180
+    STOP_ARRIVAL_RADIUS_METERS: float = 200.0
+    STOP_CHECKPOINT_INTERVAL_SECONDS: int = 60
+    STOP_REPLAY_MAX_POINTS: int = 5000
+    # Distância das viagens pelo GPS: velocidade acima da qual um trecho é considerado erro
+    # (pico ou salto de posição), velocidade média mínima na janela em torno de um ponto para o
+    # veículo não ser considerado parado (ruído do GPS parado não soma distância) e número de
+    # viagens por lote do backfill
+    JOURNEY_DISTANCE_MAX_SPEED_KMH: float = 250.0
+    JOURNEY_DISTANCE_MIN_SPEED_KMH: float = 3.0
+    JOURNEY_DISTANCE_SPEED_WINDOW_SECONDS: float = 60.0
+    JOURNEY_DISTANCE_BACKFILL_BATCH_SIZE: int = 500
+    # Seções do dashboard do gestor executadas em paralelo por requisição (uma conexão cada)
+    DASHBOARD_MAX_PARALLEL_SECTIONS: int = 4
+    # Cache dos dashboards montados por (organização, período, perfil): validade e número
+    # máximo de snapshots em memória. Escritas nos dados do dashboard invalidam antes do TTL.
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 10000
+    # Consolidação diária (custos, abastecimentos e viagens por veículo/motorista/dia):
+    # dias recentes conferidos pela reconciliação noturna e dias recalculados por transação
+    ROLLUP_RECONCILE_DAYS: int = 7
+    ROLLUP_RECONCILE_BATCH_DAYS: int = 31
+    # Relatórios em segundo plano: workers por processo, intervalo de busca de jobs na fila
+    # (pedidos feitos em outros processos), tempo máximo de cálculo e de tentativas por job,
+    # e validade do resultado guardado
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_POLL_INTERVAL_SECONDS: float = 5.0
+    REPORT_JOB_TIMEOUT_SECONDS: int = 600
+    REPORT_JOB_MAX_ATTEMPTS: int = 3
+    REPORT_JOB_RESULT_TTL_SECONDS: int = 86400
+    # Intervalo dos comentários de keepalive no stream de eventos de um job
+    REPORT_JOB_EVENTS_HEARTBEAT_SECONDS: int = 15
+    # Exportações (CSV/NDJSON): linhas lidas do cursor no servidor e enviadas por vez
+    EXPORT_BATCH_SIZE: int = 2000
+    # Exportações em Parquet (um arquivo por mês): linhas por row group e compressão
+    EXPORT_PARQUET_ROW_GROUP_SIZE: int = 100000
+    EXPORT_PARQUET_COMPRESSION: str = "zstd"
+    # Espera entre o pedido de uma exportação Parquet e a leitura: só entram as linhas com id até
+    # o maior existente no pedido, e transações que já tinham reservado um id terminam nesse prazo
+    EXPORT_CURSOR_SAFETY_LAG_SECONDS: int = 60
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,101 @@
+# backend/app/core/dashboard_cache.py
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from app.core.config import settings
+
+# (organization_id, ...): o primeiro elemento é sempre a organização, usada na invalidação
+SnapshotKey = Tuple[int, Hashable, Hashable]
+
+
+@dataclass
+class CachedSnapshot:
+    value: Any
+    expires_at: float
+    generation: int
+
+
+class DashboardCache:
+    """
+    Cache em memória dos dashboards já montados, por (organização, período, perfil), com TTL.
+
+    Cada organização tem uma geração, incrementada por `invalidate` quando um dado que
+    alimenta o dashboard muda; snapshots de gerações anteriores são descartados na leitura,
+    então invalidar custa O(1). Num miss, apenas uma requisição recalcula a chave e as demais
+    aguardam o mesmo resultado (single-flight); um resultado cuja organização foi invalidada
+    durante o cálculo é entregue a quem esperava, mas não é guardado.
+    """
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[SnapshotKey, CachedSnapshot]" = OrderedDict()
+        self._inflight: Dict[SnapshotKey, asyncio.Task] = {}
+        self._generations: Dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get_or_compute(self, key: SnapshotKey, compute: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic() and entry.generation == self._generations.get(key[0], 0):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # O cálculo roda numa tarefa própria: se quem o iniciou desconectar, os demais
+            # que aguardam a mesma chave ainda recebem o resultado.
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            generation = self._generations.get(key[0], 0)
+            task.add_done_callback(lambda done: self._store(key, generation, done))
+        return await asyncio.shield(task)
+
+    def _store(self, key: SnapshotKey, generation: int, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if generation != self._generations.get(key[0], 0):
+            return
+        self._entries[key] = CachedSnapshot(task.result(), time.monotonic() + self.ttl_seconds, generation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, organization_id: int) -> None:
+        """Descarta os snapshots da organização (inclusive os que estão sendo calculados)."""
+        self._generations[organization_id] = self._generations.get(organization_id, 0) + 1
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generations.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+dashboard_cache = DashboardCache(
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    max_entries=settings.DASHBOARD_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,125 @@
+# backend/app/core/device_registry.py
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.track_codec import as_utc
+from app.models.vehicle_model import Vehicle
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeviceEntry:
+    """Dados do veículo necessários para processar a telemetria de um dispositivo."""
+    vehicle_id: int
+    organization_id: int
+    current_engine_hours: float
+    # Horário da posição mais recente aplicada ao veículo (ver `Vehicle.last_position_at`)
+    last_timestamp: Optional[datetime] = None
+
+
+class DeviceRegistry:
+    """
+    Cache em memória de telemetry_device_id -> veículo, carregado sob demanda com TTL.
+
+    Dispositivos desconhecidos ficam guardados como entradas negativas (com TTL próprio),
+    para que um rastreador mal configurado não gere uma consulta ao banco a cada ping.
+    O cache é invalidado pelas operações de criação, atualização e remoção de veículos
+    deste processo; nos demais processos, o TTL limita o tempo de dados desatualizados.
+    """
+
+    def __init__(self, *, ttl_seconds: float, negative_ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Optional[DeviceEntry], float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get_cached(self, device_id: str) -> Tuple[bool, Optional[DeviceEntry]]:
+        cached = self._entries.get(device_id)
+        if cached is None:
+            return False, None
+        entry, expires_at = cached
+        if expires_at <= time.monotonic():
+            del self._entries[device_id]
+            return False, None
+        return True, entry
+
+    def _store(self, device_id: str, entry: Optional[DeviceEntry]) -> None:
+        ttl = self.ttl_seconds if entry is not None else self.negative_ttl_seconds
+        self._entries.pop(device_id, None)
+        while len(self._entries) >= self.max_entries:
+            # Dicionários preservam a ordem de inserção: removemos a entrada mais antiga.
+            del self._entries[next(iter(self._entries))]
+        self._entries[device_id] = (entry, time.monotonic() + ttl)
+
+    async def resolve(self, db: AsyncSession, device_id: str) -> Optional[DeviceEntry]:
+        """Retorna o veículo associado ao dispositivo, ou None se ele não estiver registrado."""
+        resolved = await self.resolve_many(db, [device_id])
+        return resolved.get(device_id)
+
+    async def resolve_many(self, db: AsyncSession, device_ids: Iterable[str]) -> Dict[str, DeviceEntry]:
+        """Resolve vários dispositivos de uma vez, consultando o banco apenas para os que não estão em cache."""
+        resolved: Dict[str, DeviceEntry] = {}
+        missing = set()
+        for device_id in set(device_ids):
+            found, entry = self._get_cached(device_id)
+            if not found:
+                missing.add(device_id)
+                continue
+            self.hits += 1
+            if entry is not None:
+                resolved[device_id] = entry
+
+        if not missing:
+            return resolved
+
+        self.misses += len(missing)
+        stmt = select(
+            Vehicle.telemetry_device_id, Vehicle.id, Vehicle.organization_id, Vehicle.current_engine_hours,
+            Vehicle.last_position_at,
+        ).where(Vehicle.telemetry_device_id.in_(missing))
+        result = await db.execute(stmt)
+        for device_id, vehicle_id, organization_id, engine_hours, last_position_at in result.all():
+            entry = DeviceEntry(
+                vehicle_id=vehicle_id,
+                organization_id=organization_id,
+                current_engine_hours=engine_hours or 0,
+                last_timestamp=as_utc(last_position_at) if last_position_at is not None else None,
+            )
+            self._store(device_id, entry)
+            resolved[device_id] = entry
+            missing.discard(device_id)
+
+        for device_id in missing:
+            logger.warning("Telemetria recebida de um dispositivo não registrado: %s", device_id)
+            self._store(device_id, None)
+
+        return resolved
+
+    def invalidate(self, *device_ids: Optional[str]) -> None:
+        for device_id in device_ids:
+            if device_id:
+                self._entries.pop(device_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+device_registry = DeviceRegistry(
+    ttl_seconds=settings.DEVICE_REGISTRY_TTL_SECONDS,
+    negative_ttl_seconds=settings.DEVICE_REGISTRY_NEGATIVE_TTL_SECONDS,
+    max_entries=settings.DEVICE_REGISTRY_MAX_ENTRIES,
+)
@@ -0,0 +1,278 @@
+# backend/app/core/geofence_engine.py
+
+import math
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.vehicle_index import EARTH_RADIUS_KM, haversine_km
+from app.models.geofence_model import Geofence, GeofenceType
+from app.models.vehicle_model import Vehicle
+
+
+@dataclass
+class IndexedFence:
+    """Cerca pronta para avaliação: retângulo envolvente e geometria em graus."""
+    fence_id: int
+    organization_id: int
+    name: str
+    type: GeofenceType
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+    vertices: Optional[Sequence[Tuple[float, float]]] = None
+    center: Optional[Tuple[float, float]] = None
+    radius_km: float = 0.0
+    alert_on_enter: bool = True
+    alert_on_exit: bool = True
+
+    @classmethod
+    def polygon(cls, fence_id: int, organization_id: int, name: str, vertices: Sequence[Sequence[float]], **flags) -> "IndexedFence":
+        """Polígono com vértices (lat, lon). Polígonos que cruzam o antimeridiano não são suportados."""
+        vertices = [(float(lat), float(lon)) for lat, lon in vertices]
+        lats = [lat for lat, _ in vertices]
+        lons = [lon for _, lon in vertices]
+        return cls(
+            fence_id, organization_id, name, GeofenceType.POLYGON,
+            min(lats), min(lons), max(lats), max(lons), vertices=vertices, **flags,
+        )
+
+    @classmethod
+    def circle(cls, fence_id: int, organization_id: int, name: str, latitude: float, longitude: float, radius_meters: float, **flags) -> "IndexedFence":
+        radius_km = radius_meters / 1000
+        angular = radius_km / EARTH_RADIUS_KM
+        d_lat = math.degrees(angular)
+        cos_lat = math.cos(math.radians(latitude))
+        if abs(latitude) + d_lat >= 90 or math.sin(angular) >= cos_lat:
+            d_lon = 180.0
+        else:
+            d_lon = math.degrees(math.asin(math.sin(angular) / cos_lat))
+        return cls(
+            fence_id, organization_id, name, GeofenceType.CIRCLE,
+            max(latitude - d_lat, -90), longitude - d_lon, min(latitude + d_lat, 90), longitude + d_lon,
+            center=(latitude, longitude), radius_km=radius_km, **flags,
+        )
+
+    @classmethod
+    def from_model(cls, geofence: Geofence) -> "IndexedFence":
+        flags = {"alert_on_enter": geofence.alert_on_enter, "alert_on_exit": geofence.alert_on_exit}
+        if geofence.type == GeofenceType.POLYGON:
+            return cls.polygon(geofence.id, geofence.organization_id, geofence.name, geofence.coordinates, **flags)
+        return cls.circle(
+            geofence.id, geofence.organization_id, geofence.name,
+            geofence.center_latitude, geofence.center_longitude, geofence.radius_meters, **flags,
+        )
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        if self.center is not None:
+            return haversine_km(latitude, longitude, *self.center) <= self.radius_km
+        if not (self.min_lat <= latitude <= self.max_lat and self.min_lon <= longitude <= self.max_lon):
+            return False
+        # Ray casting: conta quantas arestas um raio para leste a partir do ponto atravessa
+        inside = False
+        vertices = self.vertices
+        lat_j, lon_j = vertices[-1]
+        for lat_i, lon_i in vertices:
+            if (lat_i > latitude) != (lat_j > latitude):
+                crossing = lon_i + (latitude - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+                if longitude < crossing:
+                    inside = not inside
+            lat_j, lon_j = lat_i, lon_i
+        return inside
+
+
+class GeofenceTransition(NamedTuple):
+    fence: IndexedFence
+    vehicle_id: int
+    entered: bool
+
+
+@dataclass
+class TrackedVehicle:
+    organization_id: int
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    inside: FrozenSet[int] = frozenset()
+
+
+@dataclass
+class OrganizationFences:
+    fences: Dict[int, IndexedFence] = field(default_factory=dict)
+    cells: Dict[Tuple[int, int], List[int]] = field(default_factory=dict)
+    # Cercas grandes demais para a grade, testadas em toda posição (após o retângulo envolvente)
+    large: List[int] = field(default_factory=list)
+    loaded_at: Optional[float] = None
+
+
+class GeofenceEngine:
+    """
+    Avalia as cercas eletrônicas de cada organização a cada posição recebida.
+
+    As cercas ficam numa grade (células de `cell_degrees` graus) que guarda, por célula, as
+    cercas cujo retângulo envolvente a toca; uma posição só testa as cercas da sua célula.
+    Para cada veículo é mantido o conjunto de cercas em que ele está, e apenas as mudanças
+    desse conjunto (entrada/saída) são devolvidas. Ao carregar uma organização, o estado
+    inicial vem da última posição conhecida, então reinícios e alterações de cercas não
+    geram transições retroativas.
+    """
+
+    def __init__(self, *, cell_degrees: float, refresh_seconds: float, max_cells_per_fence: int):
+        self.cell_degrees = cell_degrees
+        self.refresh_seconds = refresh_seconds
+        self.max_cells_per_fence = max_cells_per_fence
+        self._columns = math.ceil(360 / cell_degrees)
+        self._orgs: Dict[int, OrganizationFences] = {}
+        self._vehicles: Dict[int, TrackedVehicle] = {}
+        self.evaluations = 0
+        self.fence_tests = 0
+
+    # --- Carga ---
+
+    def _cell_for(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        column = math.floor((longitude + 180) / self.cell_degrees) % self._columns
+        row = math.floor((latitude + 90) / self.cell_degrees)
+        return column, row
+
+    def _index(self, org: OrganizationFences, fence: IndexedFence) -> None:
+        first_column, first_row = self._cell_for(fence.min_lat, fence.min_lon)
+        last_column, last_row = self._cell_for(fence.max_lat, fence.max_lon)
+        span = (last_column - first_column) % self._columns
+        if fence.max_lon - fence.min_lon >= 360:
+            span = self._columns - 1
+        if (span + 1) * (last_row - first_row + 1) > self.max_cells_per_fence:
+            org.large.append(fence.fence_id)
+            return
+        for offset in range(span + 1):
+            column = (first_column + offset) % self._columns
+            for row in range(first_row, last_row + 1):
+                org.cells.setdefault((column, row), []).append(fence.fence_id)
+
+    def _inside(self, org: OrganizationFences, latitude: float, longitude: float) -> FrozenSet[int]:
+        candidates = org.cells.get(self._cell_for(latitude, longitude), ())
+        inside = set()
+        for fence_id in (*candidates, *org.large):
+            self.fence_tests += 1
+            if org.fences[fence_id].contains(latitude, longitude):
+                inside.add(fence_id)
+        return frozenset(inside)
+
+    def load_organization(
+        self, organization_id: int, fences: Iterable[IndexedFence],
+        positions: Iterable[Tuple[int, Optional[float], Optional[float]]] = (),
+    ) -> None:
+        """
+        Substitui as cercas da organização e recalcula o estado dos veículos a partir da
+        última posição conhecida (a deste processo tem prioridade sobre `positions`).
+        """
+        org = OrganizationFences(loaded_at=time.monotonic())
+        for fence in fences:
+            org.fences[fence.fence_id] = fence
+            self._index(org, fence)
+        self._orgs[organization_id] = org
+
+        for vehicle_id, latitude, longitude in positions:
+            vehicle = self._vehicles.get(vehicle_id)
+            if vehicle is None or vehicle.latitude is None:
+                self._vehicles[vehicle_id] = TrackedVehicle(organization_id, latitude, longitude)
+        for vehicle in self._vehicles.values():
+            if vehicle.organization_id != organization_id:
+                continue
+            if vehicle.latitude is None or vehicle.longitude is None:
+                vehicle.inside = frozenset()
+            else:
+                vehicle.inside = self._inside(org, vehicle.latitude, vehicle.longitude)
+
+    async def ensure_loaded(self, db: AsyncSession, organization_id: int) -> None:
+        org = self._orgs.get(organization_id)
+        if org is not None and org.loaded_at is not None and time.monotonic() - org.loaded_at < self.refresh_seconds:
+            return
+
+        fences_stmt = select(Geofence).where(Geofence.organization_id == organization_id, Geofence.is_active == True)
+        fences = [IndexedFence.from_model(fence) for fence in (await db.execute(fences_stmt)).scalars().all()]
+        positions_stmt = select(Vehicle.id, Vehicle.last_latitude, Vehicle.last_longitude).where(
+            Vehicle.organization_id == organization_id
+        )
+        positions = (await db.execute(positions_stmt)).all()
+        self.load_organization(organization_id, fences, positions)
+
+    async def organization_of(self, db: AsyncSession, vehicle_id: int) -> Optional[int]:
+        vehicle = self._vehicles.get(vehicle_id)
+        if vehicle is not None:
+            return vehicle.organization_id
+        stmt = select(Vehicle.organization_id).where(Vehicle.id == vehicle_id)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    def invalidate(self, organization_id: Optional[int] = None) -> None:
+        """Força a recarga das cercas de uma organização (ou de todas) na próxima posição."""
+        if organization_id is None:
+            for org in self._orgs.values():
+                org.loaded_at = None
+        elif organization_id in self._orgs:
+            self._orgs[organization_id].loaded_at = None
+
+    def forget(self, vehicle_id: int) -> None:
+        self._vehicles.pop(vehicle_id, None)
+
+    def snapshot(self, vehicle_ids: Iterable[int]) -> Dict[int, Optional[TrackedVehicle]]:
+        """Cópia do estado dos veículos, para `rollback` se a transação da ingestão falhar."""
+        return {
+            vehicle_id: replace(vehicle) if (vehicle := self._vehicles.get(vehicle_id)) is not None else None
+            for vehicle_id in vehicle_ids
+        }
+
+    def rollback(self, snapshot: Dict[int, Optional[TrackedVehicle]]) -> None:
+        for vehicle_id, vehicle in snapshot.items():
+            if vehicle is None:
+                self._vehicles.pop(vehicle_id, None)
+            else:
+                self._vehicles[vehicle_id] = vehicle
+
+    # --- Avaliação ---
+
+    def evaluate(self, organization_id: int, vehicle_id: int, latitude: float, longitude: float) -> List[GeofenceTransition]:
+        """Atualiza o estado do veículo com a nova posição e devolve as entradas e saídas."""
+        org = self._orgs.get(organization_id)
+        if org is None:
+            return []
+        self.evaluations += 1
+
+        vehicle = self._vehicles.get(vehicle_id)
+        if vehicle is None:
+            vehicle = self._vehicles[vehicle_id] = TrackedVehicle(organization_id)
+            first_position = True
+        else:
+            first_position = vehicle.latitude is None
+        previous = vehicle.inside
+        current = self._inside(org, latitude, longitude) if org.fences else frozenset()
+        vehicle.latitude, vehicle.longitude, vehicle.inside = latitude, longitude, current
+
+        # A primeira posição conhecida do veículo só inicializa o estado
+        if first_position or current == previous:
+            return []
+        transitions = [GeofenceTransition(org.fences[fence_id], vehicle_id, True) for fence_id in current - previous]
+        transitions.extend(
+            GeofenceTransition(org.fences[fence_id], vehicle_id, False)
+            for fence_id in previous - current if fence_id in org.fences
+        )
+        return transitions
+
+    def stats(self) -> dict:
+        return {
+            "organizations": len(self._orgs),
+            "fences": sum(len(org.fences) for org in self._orgs.values()),
+            "vehicles": len(self._vehicles),
+            "evaluations": self.evaluations,
+            "fence_tests": self.fence_tests,
+        }
+
+
+geofence_engine = GeofenceEngine(
+    cell_degrees=settings.GEOFENCE_INDEX_CELL_DEGREES,
+    refresh_seconds=settings.GEOFENCE_REFRESH_SECONDS,
+    max_cells_per_fence=settings.GEOFENCE_INDEX_MAX_CELLS_PER_FENCE,
+)
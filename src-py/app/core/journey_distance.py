@@ -0,0 +1,122 @@
+# backend/app/core/journey_distance.py
+
+from datetime import datetime
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from app.core.track_codec import TrackArrays, as_utc
+from app.core.vehicle_index import EARTH_RADIUS_KM
+
+
+class FilteredTrack(NamedTuple):
+    """
+    Trajeto após a filtragem: horário de cada ponto mantido (segundos desde a época) e a
+    distância acumulada até ele, em km, contando apenas os trechos válidos.
+    """
+    timestamps: np.ndarray
+    cumulative_km: np.ndarray
+    dropped_points: int
+    dropped_segments: int
+    parked_segments: int = 0
+
+
+def _segment_km(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Haversine entre pontos consecutivos (coordenadas em radianos)."""
+    sin_dlat = np.sin(np.diff(lat) * 0.5)
+    sin_dlon = np.sin(np.diff(lon) * 0.5)
+    a = sin_dlat * sin_dlat + np.cos(lat[:-1]) * np.cos(lat[1:]) * sin_dlon * sin_dlon
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _speeds_kmh(segments: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    elapsed = np.diff(timestamps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speeds = segments / elapsed * 3600
+    # Pontos repetidos no mesmo instante não andam; saltos sem tempo decorrido são inválidos
+    speeds[elapsed <= 0] = np.where(segments[elapsed <= 0] > 0, np.inf, 0.0)
+    return speeds
+
+
+def _parked(timestamps: np.ndarray, lat: np.ndarray, lon: np.ndarray, *, min_speed_kmh: float, window_s: float) -> np.ndarray:
+    """
+    Pontos em que o veículo está parado: o deslocamento em linha reta na janela de `window_s`
+    centrada no ponto (ao menos até os vizinhos) fica abaixo de `min_speed_kmh`. O ruído do GPS
+    de um veículo parado vai e volta, então quase não desloca a janela.
+    """
+    count = timestamps.size
+    index = np.arange(count)
+    first = np.minimum(np.searchsorted(timestamps, timestamps - window_s / 2, side="left"), np.maximum(index - 1, 0))
+    last = np.maximum(np.searchsorted(timestamps, timestamps + window_s / 2, side="right") - 1, np.minimum(index + 1, count - 1))
+    sin_dlat = np.sin((lat[last] - lat[first]) * 0.5)
+    sin_dlon = np.sin((lon[last] - lon[first]) * 0.5)
+    a = sin_dlat * sin_dlat + np.cos(lat[first]) * np.cos(lat[last]) * sin_dlon * sin_dlon
+    displacement_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    elapsed = timestamps[last] - timestamps[first]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speeds = np.where(elapsed > 0, displacement_km / elapsed * 3600, 0.0)
+    return speeds < min_speed_kmh
+
+
+def filter_track(
+    timestamps: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray, *, max_speed_kmh: float,
+    min_speed_kmh: float = 0.0, speed_window_s: float = 60.0,
+) -> FilteredTrack:
+    """
+    Calcula a distância percorrida ao longo de um trajeto ordenado, descartando erros de GPS:
+
+    * picos: pontos isolados cujo trecho de chegada e de saída exigiriam velocidade acima de
+      `max_speed_kmh` são removidos, e o trecho entre os vizinhos passa a contar;
+    * saltos: trechos que continuam acima de `max_speed_kmh` (ex: o rastreador voltou a
+      reportar depois de um reposicionamento) não somam distância;
+    * ruído parado: trechos entre dois pontos em que o veículo está parado (velocidade média
+      abaixo de `min_speed_kmh` numa janela de `speed_window_s`) não somam distância.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    if timestamps.size < 2:
+        return FilteredTrack(timestamps, np.zeros(timestamps.size), 0, 0)
+
+    segments = _segment_km(lat, lon)
+    fast = _speeds_kmh(segments, timestamps) > max_speed_kmh
+    spikes = np.zeros(timestamps.size, dtype=bool)
+    spikes[1:-1] = fast[:-1] & fast[1:]
+    dropped_points = int(spikes.sum())
+    if dropped_points:
+        keep = ~spikes
+        timestamps, lat, lon = timestamps[keep], lat[keep], lon[keep]
+        segments = _segment_km(lat, lon)
+        fast = _speeds_kmh(segments, timestamps) > max_speed_kmh
+
+    parked = np.zeros(segments.size, dtype=bool)
+    if min_speed_kmh > 0:
+        parked_points = _parked(timestamps, lat, lon, min_speed_kmh=min_speed_kmh, window_s=speed_window_s)
+        parked = parked_points[:-1] & parked_points[1:] & ~fast
+
+    cumulative = np.empty(timestamps.size)
+    cumulative[0] = 0.0
+    np.cumsum(np.where(fast | parked, 0.0, segments), out=cumulative[1:])
+    return FilteredTrack(timestamps, cumulative, dropped_points, int(fast.sum()), int(parked.sum()))
+
+
+def track_arrays(track: TrackArrays) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Converte o trajeto nos vetores (segundos desde a época, latitude, longitude)."""
+    return track.timestamps / 1_000_000, track.latitudes, track.longitudes
+
+
+def distances_between(track: FilteredTrack, starts: Sequence[datetime], ends: Sequence[datetime]) -> np.ndarray:
+    """
+    Distância percorrida em cada intervalo [start, end] do trajeto, de uma só vez
+    (ex: todas as viagens de um veículo). Intervalos sem dois pontos valem zero.
+    """
+    starts = np.array([as_utc(value).timestamp() for value in starts], dtype=np.float64)
+    ends = np.array([as_utc(value).timestamp() for value in ends], dtype=np.float64)
+    if track.timestamps.size == 0:
+        return np.zeros(starts.size)
+    first = np.searchsorted(track.timestamps, starts, side="left")
+    last = np.searchsorted(track.timestamps, ends, side="right") - 1
+    valid = last > first
+    first = np.minimum(first, track.timestamps.size - 1)
+    last = np.clip(last, 0, None)
+    return np.where(valid, track.cumulative_km[last] - track.cumulative_km[first], 0.0)
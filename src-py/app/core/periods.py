@@ -0,0 +1,26 @@
+# backend/app/core/periods.py
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Tuple
+
+from sqlalchemy import ColumnElement, and_
+
+
+def day_bounds(start: date, end: date) -> Tuple[datetime, datetime]:
+    """Intervalo semiaberto [início de `start`, início do dia seguinte a `end`) em UTC."""
+    return (
+        datetime.combine(start, time.min, timezone.utc),
+        datetime.combine(end + timedelta(days=1), time.min, timezone.utc),
+    )
+
+
+def within_days(column, start: date, end: date) -> ColumnElement[bool]:
+    """
+    Filtra uma coluna de data/hora pelos dias [start, end] comparando a própria coluna com os
+    limites do intervalo, em vez de `func.date(coluna)`, que impede o uso de índices.
+    Colunas sem fuso (gravadas em UTC) recebem limites sem fuso.
+    """
+    lower, upper = day_bounds(start, end)
+    if not getattr(column.type, "timezone", False):
+        lower, upper = lower.replace(tzinfo=None), upper.replace(tzinfo=None)
+    return and_(column >= lower, column < upper)
@@ -0,0 +1,232 @@
+# backend/app/core/position_buffer.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import DateTime, Float, Integer, case, column, func, or_, update, values
+
+from app.core.config import settings
+from app.models.vehicle_model import Vehicle
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PositionUpdate:
+    """Última posição conhecida de um veículo, pronta para ser gravada."""
+    vehicle_id: int
+    latitude: float
+    longitude: float
+    engine_hours: Optional[float] = None
+    # Horário do pacote (UTC); posições mais antigas que a gravada não a substituem
+    timestamp: Optional[datetime] = None
+
+
+PositionWriter = Callable[[List[PositionUpdate]], Awaitable[None]]
+
+
+async def write_positions(updates: List[PositionUpdate]) -> None:
+    """
+    Grava um lote de posições com um único UPDATE ... FROM (VALUES ...).
+    O horímetro só avança: valores menores que o atual (ou nulos) são ignorados, e a posição
+    não é substituída por uma mais antiga que `last_position_at` (ex: gravada por outro processo).
+    """
+    # Import local para não acoplar o carregamento dos modelos ao engine do banco.
+    from app.db.session import SessionLocal
+
+    rows = values(
+        column("vehicle_id", Integer),
+        column("latitude", Float),
+        column("longitude", Float),
+        column("engine_hours", Float),
+        column("timestamp", DateTime(timezone=True)),
+        name="positions",
+    ).data([(u.vehicle_id, u.latitude, u.longitude, u.engine_hours, u.timestamp) for u in updates])
+
+    stmt = (
+        update(Vehicle)
+        .where(
+            Vehicle.id == rows.c.vehicle_id,
+            or_(Vehicle.last_position_at.is_(None), Vehicle.last_position_at <= rows.c.timestamp),
+        )
+        .values(
+            last_latitude=rows.c.latitude,
+            last_longitude=rows.c.longitude,
+            last_position_at=rows.c.timestamp,
+            current_engine_hours=case(
+                (rows.c.engine_hours > func.coalesce(Vehicle.current_engine_hours, 0), rows.c.engine_hours),
+                else_=Vehicle.current_engine_hours,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    async with SessionLocal() as session:
+        await session.execute(stmt)
+        await session.commit()
+
+
+class PositionBuffer:
+    """
+    Buffer de escrita (write-behind) para a posição atual dos veículos.
+
+    Os pings de telemetria/GPS são enfileirados numa fila limitada e, a cada
+    `flush_interval_ms`, a fila é drenada mantendo apenas a última posição (e o maior
+    horímetro) de cada veículo, que é gravada de uma só vez. Com a fila cheia,
+    `submit` aguarda (backpressure) em vez de descartar pontos. Um lote que falha ao ser
+    gravado volta para o próximo flush (só a posição mais recente de cada veículo).
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval_ms: int,
+        max_queue_size: int,
+        writer: PositionWriter = write_positions,
+    ):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._writer = writer
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping: Optional[asyncio.Event] = None
+        # Posições de lotes que falharam, regravadas no próximo flush
+        self._retry: Dict[int, PositionUpdate] = {}
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.received = 0
+        self.written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._flush_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Interrompe o loop e drena o que ainda estiver na fila. O loop não é cancelado:
+        ele termina o flush em andamento, para que nenhum lote já retirado da fila se perca.
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+        await self.flush()
+        if self._retry:
+            logger.error("Buffer de posições parado com %d posições não gravadas", len(self._retry))
+
+    async def submit(self, update: PositionUpdate) -> bool:
+        """
+        Enfileira uma atualização de posição. Retorna False se o buffer não estiver
+        ativo (ex: scripts e testes), para que o chamador grave de forma síncrona.
+        """
+        if not self.is_running:
+            return False
+        await self._queue.put(update)
+        self.received += 1
+        return True
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    @staticmethod
+    def _merge(latest: Dict[int, PositionUpdate], update: PositionUpdate) -> None:
+        previous = latest.get(update.vehicle_id)
+        if previous is not None and previous.engine_hours is not None:
+            if update.engine_hours is None or update.engine_hours < previous.engine_hours:
+                update.engine_hours = previous.engine_hours
+        if previous is not None and update.timestamp is not None and previous.timestamp is not None \
+                and update.timestamp < previous.timestamp:
+            # Pacote atrasado: mantém a posição mais recente (com o maior horímetro)
+            previous.engine_hours = update.engine_hours
+            return
+        latest[update.vehicle_id] = update
+
+    def _drain(self) -> List[PositionUpdate]:
+        latest: Dict[int, PositionUpdate] = {}
+        retry, self._retry = self._retry, {}
+        for update in retry.values():
+            self._merge(latest, update)
+        while True:
+            try:
+                update = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self._merge(latest, update)
+        return list(latest.values())
+
+    async def flush(self) -> int:
+        """Grava as posições pendentes. Retorna o número de veículos atualizados."""
+        if self._queue is None:
+            return 0
+        async with self._flush_lock:
+            updates = self._drain()
+            if not updates:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                await self._writer(updates)
+            except BaseException as exc:
+                # O lote volta para o próximo flush: um veículo que parou de reportar não
+                # teria outro ping para substituir a posição perdida.
+                for update in updates:
+                    self._merge(self._retry, update)
+                if not isinstance(exc, Exception):
+                    raise
+                self.failed_flushes += 1
+                logger.exception("Falha ao gravar %d posições de veículos", len(updates))
+                return 0
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flushes += 1
+            self.written += len(updates)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+            return len(updates)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.is_running,
+            "queue_size": self._queue.qsize() if self._queue is not None else 0,
+            "retry_pending": len(self._retry),
+            "max_queue_size": self.max_queue_size,
+            "received": self.received,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+        }
+
+
+position_buffer = PositionBuffer(
+    flush_interval_ms=settings.POSITION_BUFFER_FLUSH_INTERVAL_MS,
+    max_queue_size=settings.POSITION_BUFFER_MAX_QUEUE_SIZE,
+)
@@ -0,0 +1,95 @@
+# backend/app/core/position_hub.py
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+
+
+class PositionSubscription:
+    """
+    Assinatura de um cliente (ex: uma aba do mapa) às posições de uma organização.
+
+    Cada publicação só sobrescreve a última posição pendente do veículo, então o que fica
+    pendente é limitado ao tamanho da frota; `next_batch` entrega no máximo um lote por
+    `interval` segundos com a posição mais recente de cada veículo que mudou.
+    """
+
+    def __init__(self, organization_id: int, interval: float):
+        self.organization_id = organization_id
+        self.interval = interval
+        self.pending: Dict[int, dict] = {}
+        self._changed = asyncio.Event()
+        self._last_sent = 0.0
+
+    def push(self, vehicle_id: int, delta: dict) -> None:
+        self.pending[vehicle_id] = delta
+        self._changed.set()
+
+    async def next_batch(self, *, timeout: float) -> List[dict]:
+        """Aguarda mudanças (até `timeout` segundos) e devolve as posições acumuladas."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        wait = self._last_sent + self.interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        batch, self.pending = list(self.pending.values()), {}
+        self._changed.clear()
+        self._last_sent = time.monotonic()
+        return batch
+
+
+class PositionHub:
+    """
+    Distribuição em memória, por organização, das posições recebidas pela telemetria.
+
+    Publicar custa uma atribuição em dicionário por assinante da organização (nenhuma,
+    se ninguém estiver assistindo), em vez de uma consulta por cliente a cada atualização
+    do mapa. Os assinantes são os clientes conectados a este processo.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[PositionSubscription]] = {}
+        self.published = 0
+
+    def subscribe(self, organization_id: int, *, interval: float) -> PositionSubscription:
+        subscription = PositionSubscription(organization_id, interval)
+        self._subscribers.setdefault(organization_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: PositionSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.organization_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.organization_id]
+
+    def publish(
+        self, organization_id: int, vehicle_id: int, latitude: float, longitude: float,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        subscribers = self._subscribers.get(organization_id)
+        if not subscribers:
+            return
+        self.published += 1
+        delta = {
+            "id": vehicle_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timestamp": (timestamp or datetime.now(timezone.utc)).isoformat(),
+        }
+        for subscription in subscribers:
+            subscription.push(vehicle_id, delta)
+
+    def stats(self) -> dict:
+        return {
+            "organizations": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "published": self.published,
+        }
+
+
+position_hub = PositionHub()
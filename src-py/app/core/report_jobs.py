@@ -0,0 +1,174 @@
+# backend/app/core/report_jobs.py
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud import crud_report_job
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+def _default_session_factory() -> AsyncSession:
+    # Import local para não acoplar o carregamento do módulo ao engine do banco.
+    from app.db.session import SessionLocal
+
+    return SessionLocal()
+
+
+class ReportJobRunner:
+    """
+    Pool de workers que calcula os relatórios pedidos em `/reports/jobs`.
+
+    Os jobs ficam na tabela `report_jobs`, então qualquer processo pode executá-los: um
+    pedido feito neste processo acorda um worker na hora, e a cada `poll_interval` os
+    workers ociosos buscam jobs pendentes de outros processos (ou de um processo que caiu).
+    Cada job roda numa sessão própria, então no máximo `workers` conexões ficam presas em
+    relatórios longos, em vez de uma por requisição aguardando.
+
+    Quem acompanha um job (`subscribe`) é avisado quando ele começa e quando termina neste
+    processo; jobs concluídos em outro processo aparecem na próxima consulta ao banco.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        poll_interval: float,
+        timeout: float,
+        session_factory: SessionFactory = _default_session_factory,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._subscribers: Dict[int, Set[asyncio.Event]] = {}
+        self._last_purge = 0.0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Interrompe os workers; jobs interrompidos voltam para a fila após `timeout`."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def enqueue(self, job_id: int, *, delay: float = 0) -> None:
+        """Acorda um worker deste processo para o job recém-criado (após `delay` segundos)."""
+        if self._queue is None:
+            return
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, job_id)
+        else:
+            self._queue.put_nowait(job_id)
+
+    def subscribe(self, job_id: int) -> asyncio.Event:
+        event = asyncio.Event()
+        self._subscribers.setdefault(job_id, set()).add(event)
+        return event
+
+    def unsubscribe(self, job_id: int, event: asyncio.Event) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is None:
+            return
+        subscribers.discard(event)
+        if not subscribers:
+            del self._subscribers[job_id]
+
+    def _publish(self, job_id: int) -> None:
+        for event in self._subscribers.get(job_id, ()):
+            event.set()
+
+    async def _next_job_id(self) -> Optional[int]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), self.poll_interval)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._next_job_id()
+            try:
+                if job_id is None:
+                    await self._purge()
+                # Sem job indicado, esvazia o que estiver pendente no banco
+                while await self.run_once(job_id) and job_id is None:
+                    pass
+            except Exception:
+                logger.exception("Falha no worker de relatórios")
+
+    async def run_once(self, job_id: Optional[int] = None) -> bool:
+        """Pega um job (o indicado ou o mais antigo pendente) e o executa. Retorna False se não havia job."""
+        async with self.session_factory() as db:
+            job = await crud_report_job.claim(db, job_id=job_id)
+            if job is None:
+                return False
+            # O commit expira o objeto: guarda o que é usado depois dele
+            job_id, report_type = job.id, job.report_type.value
+            self._publish(job_id)
+            try:
+                if job.attempts > settings.REPORT_JOB_MAX_ATTEMPTS:
+                    raise RuntimeError("Número máximo de tentativas excedido.")
+                started = time.perf_counter()
+                report = await asyncio.wait_for(crud_report_job.compute(db, job=job), self.timeout)
+                await crud_report_job.complete(db, job=job, report=report)
+                self.completed += 1
+                logger.info("Relatório %s (job %d) gerado em %.0f ms", report_type, job_id,
+                            (time.perf_counter() - started) * 1000)
+            except Exception as exc:
+                await db.rollback()
+                self.failed += 1
+                logger.exception("Falha ao gerar o relatório do job %d", job_id)
+                message = "Tempo limite excedido." if isinstance(exc, asyncio.TimeoutError) else str(exc) or type(exc).__name__
+                await crud_report_job.fail(db, job=job, error=message)
+            finally:
+                self._publish(job_id)
+            return True
+
+    async def _purge(self) -> None:
+        """Remove os resultados expirados, no máximo uma vez por `poll_interval` neste processo."""
+        if time.monotonic() - self._last_purge < self.poll_interval:
+            return
+        self._last_purge = time.monotonic()
+        async with self.session_factory() as db:
+            await crud_report_job.purge_expired(db)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.is_running,
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+report_job_runner = ReportJobRunner(
+    workers=settings.REPORT_JOB_WORKERS,
+    poll_interval=settings.REPORT_JOB_POLL_INTERVAL_SECONDS,
+    timeout=settings.REPORT_JOB_TIMEOUT_SECONDS,
+)
@@ -12,6 +12,11 @@ PASSWORD_RESET_SECRET_KEY = settings.REFRESH_TOKEN_SECRET_KEY
 PASSWORD_RESET_TOKEN_EXPIRE_MINUTES = 10
 # --- FIM DA MODIFICAÇÃO ---
 
+# Audiências dos tokens que não autenticam utilizadores: como são assinados com a mesma
+# SECRET_KEY, o `aud` impede que sejam aceitos como token de acesso (e vice-versa)
+DEVICE_TOKEN_AUDIENCE = "telemetry-device"
+EXPORT_CURSOR_AUDIENCE = "export-cursor"
+
 def create_access_token(subject: str | Any) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
@@ -39,6 +44,51 @@ def verify_password_reset_token(token: str) -> Optional[str]:
     except JWTError:
         return None
 
+def create_device_token(device_id: str) -> str:
+    """Cria o token de longa duração usado por um dispositivo de telemetria para se autenticar."""
+    expire = datetime.now(timezone.utc) + timedelta(days=settings.DEVICE_TOKEN_EXPIRE_DAYS)
+    to_encode = {"exp": expire, "sub": device_id, "aud": DEVICE_TOKEN_AUDIENCE, "type": "device"}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def verify_device_token(token: str) -> Optional[str]:
+    """Verifica o token de um dispositivo e retorna o telemetry_device_id se for válido."""
+    try:
+        decoded_token = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], audience=DEVICE_TOKEN_AUDIENCE
+        )
+        if decoded_token.get("type") != "device":
+            return None
+        return decoded_token.get("sub")
+    except JWTError:
+        return None
+
+def create_export_cursor(organization_id: int, dataset: str, last_id: int) -> str:
+    """Cria o cursor da exportação incremental: a próxima exportação começa após `last_id`."""
+    to_encode = {
+        "org": organization_id,
+        "dataset": dataset,
+        "last_id": last_id,
+        "aud": EXPORT_CURSOR_AUDIENCE,
+        "type": "export_cursor",
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def verify_export_cursor(token: str, *, organization_id: int, dataset: str) -> Optional[int]:
+    """Verifica o cursor e retorna o último id exportado se ele for da organização e do conjunto."""
+    try:
+        decoded_token = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], audience=EXPORT_CURSOR_AUDIENCE
+        )
+    except JWTError:
+        return None
+    if (
+        decoded_token.get("type") != "export_cursor"
+        or decoded_token.get("org") != organization_id
+        or decoded_token.get("dataset") != dataset
+    ):
+        return None
+    return decoded_token.get("last_id")
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -0,0 +1,154 @@
+# backend/app/core/stop_detector.py
+
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.vehicle_index import haversine_km
+
+
+@dataclass
+class VehicleMotion:
+    """Estado de um veículo: último ponto e início (âncora) do trecho atual perto de um mesmo lugar."""
+    organization_id: int
+    last_latitude: float
+    last_longitude: float
+    last_timestamp: datetime
+    anchor_latitude: float
+    anchor_longitude: float
+    anchor_timestamp: datetime
+    stopped: bool = False
+    # Mudou desde o último checkpoint / instante (monotônico) do último checkpoint
+    dirty: bool = True
+    checkpointed_at: Optional[float] = None
+
+
+class StopEvent(NamedTuple):
+    """Início (`ended_at` vazio) ou fim de uma parada."""
+    vehicle_id: int
+    organization_id: int
+    latitude: float
+    longitude: float
+    started_at: datetime
+    ended_at: Optional[datetime] = None
+
+
+class StopDetector:
+    """
+    Segmenta o trajeto de cada veículo em trechos parados e em movimento, um ponto por vez.
+
+    Um trecho parado começa no primeiro ponto (âncora) a partir do qual o veículo não se afasta
+    mais que `radius_meters` da âncora; a parada só é reconhecida depois de `min_dwell_seconds`
+    nesse estado e termina no último ponto antes do veículo sair do raio. A decisão usa só a
+    distância até a âncora, e não a velocidade entre pontos consecutivos, que o ruído do GPS
+    infla quando os pings são frequentes. Os pontos devem chegar em ordem cronológica por
+    veículo (os atrasados já são desviados para o histórico na ingestão) e pontos fora de
+    ordem são ignorados. O estado fica em memória; o checkpoint é gravado por `crud_stop`.
+    """
+
+    def __init__(self, *, radius_meters: float, min_dwell_seconds: float, checkpoint_interval_seconds: float):
+        self.radius_km = radius_meters / 1000
+        self.min_dwell_seconds = min_dwell_seconds
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self._vehicles: Dict[int, VehicleMotion] = {}
+        self.points = 0
+        self.stops = 0
+
+    def is_tracked(self, vehicle_id: int) -> bool:
+        return vehicle_id in self._vehicles
+
+    def restore(self, vehicle_id: int, state: VehicleMotion) -> None:
+        """Retoma o estado de um veículo a partir do checkpoint (o estado em memória tem prioridade)."""
+        state.dirty = False
+        state.checkpointed_at = time.monotonic()
+        self._vehicles.setdefault(vehicle_id, state)
+
+    def forget(self, vehicle_id: int) -> None:
+        self._vehicles.pop(vehicle_id, None)
+
+    def snapshot(self, vehicle_ids: Iterable[int]) -> Dict[int, Optional[VehicleMotion]]:
+        """Cópia do estado dos veículos, para `rollback` se a transação da ingestão falhar."""
+        return {
+            vehicle_id: replace(state) if (state := self._vehicles.get(vehicle_id)) is not None else None
+            for vehicle_id in vehicle_ids
+        }
+
+    def rollback(self, snapshot: Dict[int, Optional[VehicleMotion]]) -> None:
+        for vehicle_id, state in snapshot.items():
+            if state is None:
+                self._vehicles.pop(vehicle_id, None)
+            else:
+                self._vehicles[vehicle_id] = state
+
+    def observe(self, vehicle_id: int, organization_id: int, latitude: float, longitude: float, timestamp: datetime) -> Optional[StopEvent]:
+        """Processa um ponto e devolve o início ou o fim de uma parada, se houver."""
+        state = self._vehicles.get(vehicle_id)
+        if state is None:
+            self._vehicles[vehicle_id] = VehicleMotion(
+                organization_id, latitude, longitude, timestamp, latitude, longitude, timestamp
+            )
+            self.points += 1
+            return None
+        if timestamp <= state.last_timestamp:
+            return None
+        self.points += 1
+
+        near_anchor = haversine_km(state.anchor_latitude, state.anchor_longitude, latitude, longitude) <= self.radius_km
+        event = None
+        if near_anchor:
+            dwell = (timestamp - state.anchor_timestamp).total_seconds()
+            if not state.stopped and dwell >= self.min_dwell_seconds:
+                state.stopped = True
+                self.stops += 1
+                event = StopEvent(vehicle_id, organization_id, state.anchor_latitude, state.anchor_longitude, state.anchor_timestamp)
+        else:
+            if state.stopped:
+                state.stopped = False
+                event = StopEvent(
+                    vehicle_id, organization_id, state.anchor_latitude, state.anchor_longitude,
+                    state.anchor_timestamp, state.last_timestamp,
+                )
+            state.anchor_latitude, state.anchor_longitude, state.anchor_timestamp = latitude, longitude, timestamp
+
+        state.organization_id = organization_id
+        state.last_latitude, state.last_longitude, state.last_timestamp = latitude, longitude, timestamp
+        state.dirty = True
+        return event
+
+    def due_checkpoints(self, vehicle_ids: Iterable[int], *, force: Iterable[int] = ()) -> List[Tuple[int, VehicleMotion]]:
+        """
+        Devolve (e marca como gravados) os estados alterados cujo checkpoint venceu;
+        os veículos em `force` são incluídos mesmo antes do intervalo.
+        """
+        now = time.monotonic()
+        force = set(force)
+        due = []
+        for vehicle_id in set(vehicle_ids):
+            state = self._vehicles.get(vehicle_id)
+            if state is None or not state.dirty:
+                continue
+            if (
+                vehicle_id in force or state.checkpointed_at is None
+                or now - state.checkpointed_at >= self.checkpoint_interval_seconds
+            ):
+                state.dirty = False
+                state.checkpointed_at = now
+                due.append((vehicle_id, state))
+        return due
+
+    def stats(self) -> dict:
+        return {
+            "vehicles": len(self._vehicles),
+            "stopped": sum(1 for state in self._vehicles.values() if state.stopped),
+            "points": self.points,
+            "stops": self.stops,
+        }
+
+
+stop_detector = StopDetector(
+    radius_meters=settings.STOP_RADIUS_METERS,
+    min_dwell_seconds=settings.STOP_MIN_DWELL_SECONDS,
+    checkpoint_interval_seconds=settings.STOP_CHECKPOINT_INTERVAL_SECONDS,
+)
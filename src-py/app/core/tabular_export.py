@@ -0,0 +1,133 @@
+# backend/app/core/tabular_export.py
+
+import csv
+import enum
+import io
+import json
+import zipfile
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Select
+
+# BOM no início do CSV: o Excel só reconhece o arquivo como UTF-8 (acentos) com ele
+CSV_BOM = "\ufeff"
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def csv_chunk(rows: Iterable[Sequence[Any]]) -> str:
+    """Linhas em CSV (separador vírgula, campos entre aspas quando necessário); vazio para nulos."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(["" if value is None else _value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def ndjson_chunk(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """Um objeto JSON por linha, com as colunas como chaves."""
+    return "".join(
+        json.dumps({name: _value(value) for name, value in zip(columns, row)}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def arrow_schema(stmt: Select) -> pa.Schema:
+    """Schema Arrow da consulta, a partir dos tipos das colunas (enums como texto)."""
+    return pa.schema([pa.field(name, _arrow_type(column.type)) for name, column in stmt.selected_columns.items()])
+
+
+def _arrow_type(sql_type: Any) -> pa.DataType:
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if sql_type.timezone else None)
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _month(value: date) -> str:
+    # Datas sem fuso (SQLite) já estão em UTC
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m")
+
+
+class MonthlyParquetWriter:
+    """
+    Grava linhas em ordem cronológica em um arquivo Parquet por mês, em
+    `{directory}/month=AAAA-MM/{filename}`. As linhas são acumuladas e gravadas em row
+    groups de `row_group_size`, então a memória usada não passa de um row group.
+    """
+
+    def __init__(
+        self, directory: Path, *, schema: pa.Schema, partition_column: str, filename: str,
+        row_group_size: int, compression: str,
+    ):
+        self.directory = directory
+        self.schema = schema
+        self.filename = filename
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.files: List[Path] = []
+        self.rows = 0
+        self._partition_index = schema.get_field_index(partition_column)
+        self._month: Optional[str] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._pending: List[Sequence[Any]] = []
+
+    def write(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            month = _month(row[self._partition_index])
+            if month != self._month:
+                self._close_month()
+                self._month = month
+            self._pending.append(row)
+            if len(self._pending) >= self.row_group_size:
+                self._flush()
+
+    def close(self) -> None:
+        self._close_month()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        if self._writer is None:
+            path = self.directory / f"month={self._month}" / self.filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(path, self.schema, compression=self.compression)
+            self.files.append(path)
+        arrays = [
+            pa.array([value.value if isinstance(value, enum.Enum) else value for value in column], type=field.type)
+            for column, field in zip(zip(*self._pending), self.schema)
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema), row_group_size=self.row_group_size)
+        self.rows += len(self._pending)
+        self._pending = []
+
+    def _close_month(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def zip_directory(directory: Path, archive: Path) -> None:
+    """Empacota os arquivos do diretório (caminhos relativos ao diretório pai), sem recomprimir."""
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zf:
+        for path in sorted(directory.rglob("*.parquet")):
+            zf.write(path, path.relative_to(directory.parent).as_posix())
@@ -0,0 +1,60 @@
+# backend/app/core/telemetry_dedup.py
+
+from collections import OrderedDict
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.track_codec import as_utc
+
+
+class TelemetryDeduplicator:
+    """
+    Detecta pacotes repetidos (mesmo device_id e timestamp), comuns quando o rastreador
+    reenvia um pacote cuja confirmação se perdeu.
+
+    Para cada dispositivo são guardados os últimos `window` timestamps vistos (LRU), e no
+    máximo `max_devices` dispositivos ficam em memória; o dispositivo menos recente é
+    descartado primeiro. A verificação é feita em memória, sem consulta ao banco. O pacote só
+    é registrado (`record`) depois de gravado: se a transação falhar, o reenvio é reprocessado.
+    """
+
+    def __init__(self, *, window: int, max_devices: int):
+        self.window = window
+        self.max_devices = max_devices
+        self._devices: "OrderedDict[str, OrderedDict[datetime, None]]" = OrderedDict()
+        self.duplicates = 0
+
+    def seen(self, device_id: str, timestamp: datetime) -> bool:
+        """Indica se o pacote já foi gravado (sem registrá-lo)."""
+        seen = self._devices.get(device_id)
+        if seen is None or as_utc(timestamp) not in seen:
+            return False
+        self.duplicates += 1
+        return True
+
+    def record(self, device_id: str, timestamp: datetime) -> None:
+        """Registra um pacote gravado."""
+        timestamp = as_utc(timestamp)
+        seen = self._devices.get(device_id)
+        if seen is None:
+            seen = self._devices[device_id] = OrderedDict()
+            if len(self._devices) > self.max_devices:
+                self._devices.popitem(last=False)
+        else:
+            self._devices.move_to_end(device_id)
+        seen[timestamp] = None
+        seen.move_to_end(timestamp)
+        if len(seen) > self.window:
+            seen.popitem(last=False)
+
+    def clear(self) -> None:
+        self._devices.clear()
+
+    def stats(self) -> dict:
+        return {"devices": len(self._devices), "duplicates": self.duplicates}
+
+
+telemetry_dedup = TelemetryDeduplicator(
+    window=settings.TELEMETRY_DEDUP_WINDOW,
+    max_devices=settings.TELEMETRY_DEDUP_MAX_DEVICES,
+)
@@ -0,0 +1,135 @@
+# backend/app/core/telemetry_stream.py
+
+import asyncio
+import json
+import logging
+from typing import Any, List
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.telemetry_codec import TelemetryDecodeError, TelemetryPoint, decode_points
+from app.crud import crud_vehicle
+from app.schemas.telemetry_schema import MAX_TELEMETRY_BATCH_SIZE, TelemetryPayload
+
+logger = logging.getLogger(__name__)
+
+_CLOSED = object()
+
+
+class TelemetryStream:
+    """
+    Conexão WebSocket de um dispositivo já autenticado.
+
+    Cada mensagem recebida é um frame (um ponto ou uma lista de pontos em JSON, ou uma
+    mensagem no formato binário compacto), numerado pelo servidor a partir de 1.
+    Um leitor coloca os frames numa fila limitada: quando ela enche, o leitor para de
+    consumir o socket e o TCP aplica a contrapressão no dispositivo.
+    O processador esvazia a fila em lotes, grava cada um com o mesmo caminho do endpoint em
+    lote, numa sessão aberta só para ele (a conexão não fica presa ao socket), e confirma
+    cumulativamente ({"type": "ack", "seq": n}) a cada `ack_window` frames ou quando a fila
+    fica vazia. Frames inválidos são confirmados e listados em "rejected".
+    """
+
+    def __init__(self, websocket: WebSocket, bind: AsyncEngine, *, device_id: str, ack_window: int, max_pending: int):
+        self.websocket = websocket
+        self.bind = bind
+        self.device_id = device_id
+        self.ack_window = ack_window
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.received = 0
+        self.acked = 0
+        self.rejected: List[int] = []
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                frame = message.get("bytes")
+                if frame is None:
+                    frame = json.loads(message.get("text") or "")
+                self.received += 1
+                await self.queue.put((self.received, frame))
+        except WebSocketDisconnect:
+            pass
+        except ValueError:
+            # Mensagem que não é JSON: encerra a conexão após processar o que já foi recebido
+            await self.queue.put((self.received + 1, None))
+        finally:
+            await self.queue.put(_CLOSED)
+
+    def _parse(self, seq: int, frame: Any, payloads: List[TelemetryPayload | TelemetryPoint]) -> None:
+        if isinstance(frame, bytes):
+            try:
+                decoded = decode_points(frame, max_records=MAX_TELEMETRY_BATCH_SIZE)
+            except TelemetryDecodeError:
+                self.rejected.append(seq)
+                return
+            # O dispositivo da conexão é o do token, independentemente do que veio no frame
+            payloads.extend(point._replace(device_id=self.device_id) for point in decoded)
+            return
+
+        points = frame if isinstance(frame, list) else [frame]
+        try:
+            parsed = [TelemetryPayload(**{**point, "device_id": self.device_id}) for point in points]
+        except (TypeError, ValidationError):
+            self.rejected.append(seq)
+            return
+        payloads.extend(parsed)
+
+    async def _ack(self, seq: int) -> None:
+        message = {"type": "ack", "seq": seq}
+        if self.rejected:
+            message["rejected"] = self.rejected
+            self.rejected = []
+        await self.websocket.send_json(message)
+        self.acked = seq
+
+    async def _process(self) -> None:
+        while True:
+            item = await self.queue.get()
+            closed = item is _CLOSED
+            last_seq = self.acked
+            payloads: List[TelemetryPayload | TelemetryPoint] = []
+
+            # Agrupa o que já está na fila (até o limite do lote) numa única gravação
+            while not closed:
+                seq, frame = item
+                if frame is None:
+                    closed = True
+                    break
+                self._parse(seq, frame, payloads)
+                last_seq = seq
+                if len(payloads) >= MAX_TELEMETRY_BATCH_SIZE or self.queue.empty():
+                    break
+                item = self.queue.get_nowait()
+                closed = item is _CLOSED
+
+            if payloads:
+                async with AsyncSession(self.bind, autoflush=False) as db:
+                    await crud_vehicle.update_vehicles_from_telemetry_batch(db, payloads=payloads)
+
+            if last_seq > self.acked and (closed or self.queue.empty() or last_seq - self.acked >= self.ack_window):
+                try:
+                    await self._ack(last_seq)
+                except (WebSocketDisconnect, RuntimeError):
+                    return
+            if closed:
+                return
+
+    async def run(self) -> None:
+        reader = asyncio.create_task(self._read())
+        try:
+            await self._process()
+        except Exception:
+            logger.exception("Falha ao processar a telemetria do dispositivo %s", self.device_id)
+            try:
+                await self.websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            except RuntimeError:
+                pass
+        finally:
+            reader.cancel()
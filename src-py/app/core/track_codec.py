@@ -0,0 +1,195 @@
+# backend/app/core/track_codec.py
+
+import math
+import struct
+import zlib
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+
+FORMAT_VERSION = 1
+# Coordenadas gravadas como inteiros em 1e-7 graus (usado apenas quando o arredondamento é exato)
+COORD_SCALED = 1
+# Coordenadas gravadas pelos bits do float64 (fallback sem perda para qualquer valor)
+COORD_FLOAT_BITS = 2
+COORD_SCALE = 10_000_000
+
+_HEADER = struct.Struct("<BBI")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class TrackPoint(NamedTuple):
+    timestamp: datetime
+    latitude: float
+    longitude: float
+
+
+class TrackArrays(NamedTuple):
+    """Trajeto em vetores: microssegundos desde a época (UTC), latitude e longitude."""
+    timestamps: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+
+
+def as_utc(value: datetime) -> datetime:
+    """Datas sem fuso são tratadas como UTC (padrão do restante da aplicação)."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def to_micros(value: datetime) -> int:
+    delta = as_utc(value) - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> datetime:
+    seconds, micros = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=micros)
+
+
+def _float_bits(value: float) -> int:
+    return struct.unpack("<q", struct.pack("<d", value))[0]
+
+
+def _bits_float(value: int) -> float:
+    return struct.unpack("<d", struct.pack("<q", value))[0]
+
+
+def _wrap_int64(value: int) -> int:
+    """Aritmética de int64 com overflow (os deltas entre bits de float podem exceder 63 bits)."""
+    return ((value + (1 << 63)) % (1 << 64)) - (1 << 63)
+
+
+def _write_deltas(out: bytearray, values: Sequence[int]) -> None:
+    """Delta + zigzag + varint: séries suaves (tempo, posição) viram poucos bytes por ponto."""
+    previous = 0
+    for value in values:
+        delta = _wrap_int64(value - previous)
+        previous = value
+        zigzag = ((delta << 1) ^ (delta >> 63)) & 0xFFFFFFFFFFFFFFFF
+        while zigzag >= 0x80:
+            out.append((zigzag & 0x7F) | 0x80)
+            zigzag >>= 7
+        out.append(zigzag)
+
+
+def _read_deltas(data: bytes, offset: int, count: int) -> tuple:
+    values = []
+    previous = 0
+    for _ in range(count):
+        shift = 0
+        zigzag = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            zigzag |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        delta = (zigzag >> 1) ^ -(zigzag & 1)
+        previous = _wrap_int64(previous + delta)
+        values.append(previous)
+    return values, offset
+
+
+def _scaled(values: Sequence[float]) -> List[int] | None:
+    scaled = []
+    for value in values:
+        candidate = round(value * COORD_SCALE)
+        # -0.0 também cai no fallback, para preservar o sinal do zero
+        if candidate / COORD_SCALE != value or math.copysign(1.0, value) < 0 and value == 0:
+            return None
+        scaled.append(candidate)
+    return scaled
+
+
+def encode_points(points: Sequence[TrackPoint]) -> bytes:
+    """
+    Codifica uma sequência de pontos (ordenada por tempo) num blob binário compacto e sem perdas:
+    arrays de timestamp/lat/lon em delta + varint, comprimidos com zlib.
+    """
+    latitudes = [p.latitude for p in points]
+    longitudes = [p.longitude for p in points]
+
+    lat_ints, lon_ints = _scaled(latitudes), _scaled(longitudes)
+    if lat_ints is not None and lon_ints is not None:
+        coord_mode = COORD_SCALED
+    else:
+        coord_mode = COORD_FLOAT_BITS
+        lat_ints = [_float_bits(v) for v in latitudes]
+        lon_ints = [_float_bits(v) for v in longitudes]
+
+    body = bytearray()
+    _write_deltas(body, [to_micros(p.timestamp) for p in points])
+    _write_deltas(body, lat_ints)
+    _write_deltas(body, lon_ints)
+    return _HEADER.pack(FORMAT_VERSION, coord_mode, len(points)) + zlib.compress(bytes(body), 6)
+
+
+def decode_points(blob: bytes) -> List[TrackPoint]:
+    """Decodifica um blob gerado por `encode_points`."""
+    version, coord_mode, count = _HEADER.unpack_from(blob)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Versão de trajeto compactado não suportada: {version}")
+
+    body = zlib.decompress(blob[_HEADER.size:])
+    timestamps, offset = _read_deltas(body, 0, count)
+    lat_ints, offset = _read_deltas(body, offset, count)
+    lon_ints, offset = _read_deltas(body, offset, count)
+
+    if coord_mode == COORD_SCALED:
+        latitudes = [v / COORD_SCALE for v in lat_ints]
+        longitudes = [v / COORD_SCALE for v in lon_ints]
+    else:
+        latitudes = [_bits_float(v) for v in lat_ints]
+        longitudes = [_bits_float(v) for v in lon_ints]
+
+    return [
+        TrackPoint(_from_micros(ts), lat, lon)
+        for ts, lat, lon in zip(timestamps, latitudes, longitudes)
+    ]
+
+
+def decode_arrays(blob: bytes) -> TrackArrays:
+    """
+    Decodifica um blob gerado por `encode_points` direto em vetores numpy, sem criar um
+    objeto por ponto: os varints das três séries são lidos de uma vez.
+    """
+    version, coord_mode, count = _HEADER.unpack_from(blob)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Versão de trajeto compactado não suportada: {version}")
+    if count == 0:
+        return TrackArrays(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+
+    body = np.frombuffer(zlib.decompress(blob[_HEADER.size:]), dtype=np.uint8)
+    # Cada varint termina no primeiro byte sem o bit de continuação
+    ends = np.flatnonzero(body < 0x80)[:3 * count]
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    used = body[:ends[-1] + 1]
+    positions = np.arange(used.size) - np.repeat(starts, ends - starts + 1)
+    groups = (used & 0x7F).astype(np.uint64) << (positions * 7).astype(np.uint64)
+    zigzag = np.add.reduceat(groups, starts)
+    deltas = (zigzag >> np.uint64(1)).astype(np.int64) ^ -(zigzag & np.uint64(1)).astype(np.int64)
+    # A soma acumulada em int64 dá a volta como `_wrap_int64`
+    timestamps, lat_ints, lon_ints = np.cumsum(deltas.reshape(3, count), axis=1)
+
+    if coord_mode == COORD_SCALED:
+        return TrackArrays(timestamps, lat_ints / COORD_SCALE, lon_ints / COORD_SCALE)
+    return TrackArrays(timestamps, lat_ints.view(np.float64), lon_ints.view(np.float64))
+
+
+def arrays_from_points(points: Sequence[TrackPoint]) -> TrackArrays:
+    return TrackArrays(
+        np.fromiter((to_micros(p.timestamp) for p in points), dtype=np.int64, count=len(points)),
+        np.fromiter((p.latitude for p in points), dtype=np.float64, count=len(points)),
+        np.fromiter((p.longitude for p in points), dtype=np.float64, count=len(points)),
+    )
+
+
+def points_from_arrays(arrays: TrackArrays) -> List[TrackPoint]:
+    return [
+        TrackPoint(_from_micros(ts), lat, lon)
+        for ts, lat, lon in zip(arrays.timestamps.tolist(), arrays.latitudes.tolist(), arrays.longitudes.tolist())
+    ]
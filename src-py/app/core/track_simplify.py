@@ -0,0 +1,83 @@
+# backend/app/core/track_simplify.py
+
+import math
+from typing import List, Sequence
+
+import numpy as np
+
+from app.core.track_codec import TrackPoint
+
+
+def lttb_indices(latitudes: np.ndarray, longitudes: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Reduz um trajeto a no máximo `max_points` vértices com Largest-Triangle-Three-Buckets e
+    retorna os índices dos pontos mantidos, em ordem.
+    Os pontos são divididos em baldes consecutivos e, de cada balde, fica o ponto que forma
+    o maior triângulo com o ponto escolhido anteriormente e a média do balde seguinte,
+    preservando curvas e desvios. A área é medida no plano (longitude, latitude), com a
+    longitude corrigida pelo cosseno da latitude; o primeiro e o último ponto são mantidos.
+    As médias dos baldes e as áreas são vetorizadas: só o laço entre baldes é em Python.
+    """
+    count = latitudes.size
+    if max_points >= count or count <= 2:
+        return np.arange(count)
+    if max_points < 3:
+        return np.array([0, count - 1])
+
+    ys = np.asarray(latitudes, dtype=np.float64)
+    xs = np.asarray(longitudes, dtype=np.float64) * math.cos(math.radians(float(ys.mean())))
+
+    buckets = max_points - 2
+    bucket_size = (count - 2) / buckets
+    bounds = (np.arange(buckets + 2) * bucket_size).astype(np.int64) + 1
+    bounds[-1] = min(bounds[-1], count)
+    # Balde seguinte de cada balde (o último usa o ponto final) e sua média, via somas acumuladas
+    next_start, next_end = bounds[1:-1].copy(), bounds[2:].copy()
+    empty = next_start >= next_end
+    next_start[empty], next_end[empty] = count - 1, count
+    sum_x = np.concatenate(([0.0], np.cumsum(xs)))
+    sum_y = np.concatenate(([0.0], np.cumsum(ys)))
+    span = next_end - next_start
+    avg_x = (sum_x[next_end] - sum_x[next_start]) / span
+    avg_y = (sum_y[next_end] - sum_y[next_start]) / span
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(buckets):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        a_x, a_y = xs[previous], ys[previous]
+        areas = np.abs((a_x - avg_x[bucket]) * (ys[start:end] - a_y) - (a_x - xs[start:end]) * (avg_y[bucket] - a_y))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def lttb(points: Sequence[TrackPoint], max_points: int) -> List[TrackPoint]:
+    """Aplica `lttb_indices` a uma lista de pontos."""
+    if max_points >= len(points) or len(points) <= 2:
+        return list(points)
+    latitudes = np.fromiter((p.latitude for p in points), dtype=np.float64, count=len(points))
+    longitudes = np.fromiter((p.longitude for p in points), dtype=np.float64, count=len(points))
+    return [points[index] for index in lttb_indices(latitudes, longitudes, max_points).tolist()]
+
+
+def _encode_value(value: int, out: List[str]) -> None:
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode_polyline(points: Sequence[TrackPoint], precision: int = 5) -> str:
+    """Codifica os pontos no formato Encoded Polyline (Google), aceito pelas bibliotecas de mapa."""
+    factor = 10 ** precision
+    out: List[str] = []
+    previous_lat = previous_lon = 0
+    for point in points:
+        lat, lon = round(point.latitude * factor), round(point.longitude * factor)
+        _encode_value(lat - previous_lat, out)
+        _encode_value(lon - previous_lon, out)
+        previous_lat, previous_lon = lat, lon
+    return "".join(out)
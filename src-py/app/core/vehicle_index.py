@@ -0,0 +1,354 @@
+# backend/app/core/vehicle_index.py
+
+import heapq
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.vehicle_model import Vehicle, VehicleStatus
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@dataclass
+class IndexedVehicle:
+    vehicle_id: int
+    organization_id: int
+    status: VehicleStatus
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    cell: Optional[Tuple[int, int]] = None
+
+
+class VehicleGeoIndex:
+    """
+    Índice em grade (células de `cell_degrees` graus) das últimas posições dos veículos,
+    separado por organização, para consultas de raio, retângulo e k mais próximos.
+
+    Cada organização é carregada do banco na primeira consulta e recarregada após
+    `refresh_seconds`; entre as recargas, o índice é mantido pelo caminho da telemetria
+    (posições) e pelas operações que mudam o status dos veículos neste processo.
+    """
+
+    def __init__(self, *, cell_degrees: float, refresh_seconds: float):
+        self.cell_degrees = cell_degrees
+        self.refresh_seconds = refresh_seconds
+        self._columns = math.ceil(360 / cell_degrees)
+        self._vehicles: Dict[int, IndexedVehicle] = {}
+        self._org_vehicles: Dict[int, Set[int]] = {}
+        self._cells: Dict[Tuple[int, int, int], Set[int]] = {}
+        # Agregados por célula e status ([quantidade, soma das latitudes, soma das longitudes]),
+        # mantidos a cada alteração para que o agrupamento do mapa não percorra os veículos.
+        self._cell_stats: Dict[Tuple[int, int, int], Dict[VehicleStatus, List[float]]] = {}
+        self._org_cells: Dict[int, Set[Tuple[int, int]]] = {}
+        self._loaded_at: Dict[int, float] = {}
+
+    # --- Manutenção ---
+
+    def _cell_for(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        column = math.floor((longitude + 180) / self.cell_degrees) % self._columns
+        row = math.floor((latitude + 90) / self.cell_degrees)
+        return column, row
+
+    def _add_stats(self, vehicle: IndexedVehicle, sign: int) -> None:
+        key = (vehicle.organization_id, *vehicle.cell)
+        by_status = self._cell_stats.setdefault(key, {})
+        stats = by_status.setdefault(vehicle.status, [0, 0.0, 0.0])
+        stats[0] += sign
+        stats[1] += sign * vehicle.latitude
+        stats[2] += sign * vehicle.longitude
+        if stats[0] == 0:
+            del by_status[vehicle.status]
+            if not by_status:
+                del self._cell_stats[key]
+
+    def _unlink(self, vehicle: IndexedVehicle) -> None:
+        if vehicle.cell is None:
+            return
+        self._add_stats(vehicle, -1)
+        key = (vehicle.organization_id, *vehicle.cell)
+        members = self._cells.get(key)
+        if members is not None:
+            members.discard(vehicle.vehicle_id)
+            if not members:
+                del self._cells[key]
+                self._org_cells[vehicle.organization_id].discard(vehicle.cell)
+        vehicle.cell = None
+
+    def _link(self, vehicle: IndexedVehicle) -> None:
+        if vehicle.latitude is None or vehicle.longitude is None:
+            return
+        vehicle.cell = self._cell_for(vehicle.latitude, vehicle.longitude)
+        key = (vehicle.organization_id, *vehicle.cell)
+        if key not in self._cells:
+            self._cells[key] = set()
+            self._org_cells.setdefault(vehicle.organization_id, set()).add(vehicle.cell)
+        self._cells[key].add(vehicle.vehicle_id)
+        self._add_stats(vehicle, 1)
+
+    def upsert(
+        self, *, vehicle_id: int, organization_id: int, status: VehicleStatus,
+        latitude: Optional[float], longitude: Optional[float],
+    ) -> None:
+        self.remove(vehicle_id)
+        vehicle = IndexedVehicle(vehicle_id, organization_id, status, latitude, longitude)
+        self._vehicles[vehicle_id] = vehicle
+        self._org_vehicles.setdefault(organization_id, set()).add(vehicle_id)
+        self._link(vehicle)
+
+    def update_position(self, vehicle_id: int, latitude: float, longitude: float) -> None:
+        """Move um veículo já indexado; veículos de organizações não carregadas são ignorados."""
+        vehicle = self._vehicles.get(vehicle_id)
+        if vehicle is None:
+            return
+        self._unlink(vehicle)
+        vehicle.latitude, vehicle.longitude = latitude, longitude
+        self._link(vehicle)
+
+    def set_status(self, vehicle_id: int, status: VehicleStatus) -> None:
+        vehicle = self._vehicles.get(vehicle_id)
+        if vehicle is None or vehicle.status == status:
+            return
+        self._unlink(vehicle)
+        vehicle.status = status
+        self._link(vehicle)
+
+    def remove(self, vehicle_id: int) -> None:
+        vehicle = self._vehicles.pop(vehicle_id, None)
+        if vehicle is None:
+            return
+        self._unlink(vehicle)
+        self._org_vehicles.get(vehicle.organization_id, set()).discard(vehicle_id)
+
+    def invalidate(self, organization_id: Optional[int] = None) -> None:
+        """Força a recarga de uma organização (ou de todas) na próxima consulta."""
+        if organization_id is None:
+            self._loaded_at.clear()
+        else:
+            self._loaded_at.pop(organization_id, None)
+
+    async def ensure_loaded(self, db: AsyncSession, organization_id: int) -> None:
+        loaded_at = self._loaded_at.get(organization_id)
+        if loaded_at is not None and time.monotonic() - loaded_at < self.refresh_seconds:
+            return
+
+        stmt = select(Vehicle.id, Vehicle.status, Vehicle.last_latitude, Vehicle.last_longitude).where(
+            Vehicle.organization_id == organization_id
+        )
+        rows = (await db.execute(stmt)).all()
+
+        for vehicle_id in list(self._org_vehicles.get(organization_id, ())):
+            self.remove(vehicle_id)
+        for vehicle_id, status, latitude, longitude in rows:
+            self.upsert(
+                vehicle_id=vehicle_id, organization_id=organization_id, status=status,
+                latitude=latitude, longitude=longitude,
+            )
+        self._loaded_at[organization_id] = time.monotonic()
+
+    # --- Consultas ---
+
+    def _iter_cells(
+        self, organization_id: int, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+    ) -> Iterator[IndexedVehicle]:
+        """Percorre os veículos das células que cobrem o retângulo (que pode cruzar o antimeridiano)."""
+        first_column, first_row = self._cell_for(max(min_lat, -90), min_lon)
+        last_column, last_row = self._cell_for(min(max_lat, 90), max_lon)
+        span = (last_column - first_column) % self._columns
+        if max_lon - min_lon >= 360:
+            span = self._columns - 1
+
+        for offset in range(span + 1):
+            column = (first_column + offset) % self._columns
+            for row in range(first_row, last_row + 1):
+                for vehicle_id in self._cells.get((organization_id, column, row), ()):
+                    yield self._vehicles[vehicle_id]
+
+    @staticmethod
+    def _matches(vehicle: IndexedVehicle, statuses: Optional[Set[VehicleStatus]]) -> bool:
+        return statuses is None or vehicle.status in statuses
+
+    def within_radius(
+        self, organization_id: int, latitude: float, longitude: float, radius_km: float,
+        statuses: Optional[Iterable[VehicleStatus]] = None,
+    ) -> List[Tuple[IndexedVehicle, float]]:
+        """Veículos a até `radius_km` do ponto, ordenados pela distância."""
+        statuses = set(statuses) if statuses else None
+        # Retângulo que contém o círculo na esfera (a faixa de longitude se alarga com a latitude)
+        angular = radius_km / EARTH_RADIUS_KM
+        d_lat = math.degrees(angular)
+        cos_lat = math.cos(math.radians(latitude))
+        if abs(latitude) + d_lat >= 90 or angular >= math.pi / 2 or math.sin(angular) >= cos_lat:
+            d_lon = 180
+        else:
+            d_lon = math.degrees(math.asin(math.sin(angular) / cos_lat))
+
+        found = []
+        for vehicle in self._iter_cells(organization_id, latitude - d_lat, longitude - d_lon, latitude + d_lat, longitude + d_lon):
+            if not self._matches(vehicle, statuses):
+                continue
+            distance = haversine_km(latitude, longitude, vehicle.latitude, vehicle.longitude)
+            if distance <= radius_km:
+                found.append((vehicle, distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def within_bbox(
+        self, organization_id: int, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+        statuses: Optional[Iterable[VehicleStatus]] = None,
+    ) -> List[IndexedVehicle]:
+        """Veículos dentro do retângulo; `min_lon > max_lon` indica que ele cruza o antimeridiano."""
+        statuses = set(statuses) if statuses else None
+        crosses = min_lon > max_lon
+        found = []
+        for vehicle in self._iter_cells(organization_id, min_lat, min_lon, max_lat, max_lon):
+            if not self._matches(vehicle, statuses) or not (min_lat <= vehicle.latitude <= max_lat):
+                continue
+            inside_lon = (vehicle.longitude >= min_lon or vehicle.longitude <= max_lon) if crosses \
+                else min_lon <= vehicle.longitude <= max_lon
+            if inside_lon:
+                found.append(vehicle)
+        return found
+
+    def nearest(
+        self, organization_id: int, latitude: float, longitude: float, k: int,
+        statuses: Optional[Iterable[VehicleStatus]] = None,
+    ) -> List[Tuple[IndexedVehicle, float]]:
+        """
+        Os `k` veículos mais próximos do ponto. Percorre anéis de células a partir da célula
+        do ponto até que nenhuma célula ainda não visitada possa conter um veículo mais próximo;
+        se os anéis ficarem maiores que o número de células ocupadas, compara todos os veículos.
+        """
+        statuses = set(statuses) if statuses else None
+        if k <= 0:
+            return []
+
+        occupied = len(self._org_cells.get(organization_id, ()))
+        best: List[Tuple[float, int]] = []  # heap de (-distância, vehicle_id)
+        center_column, center_row = self._cell_for(latitude, longitude)
+        cos_lat = math.cos(math.radians(latitude))
+        visited = 0
+
+        def consider(vehicle: IndexedVehicle) -> None:
+            if not self._matches(vehicle, statuses):
+                return
+            distance = haversine_km(latitude, longitude, vehicle.latitude, vehicle.longitude)
+            if len(best) < k:
+                heapq.heappush(best, (-distance, vehicle.vehicle_id))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, vehicle.vehicle_id))
+
+        ring = 0
+        while True:
+            # Distância mínima até as células ainda não visitadas: `gap` graus de latitude
+            # ou de longitude (esta última encolhe com o cosseno da latitude do ponto)
+            gap = math.radians(min((ring - 1) * self.cell_degrees, 90)) if ring > 1 else 0.0
+            lower_bound = EARTH_RADIUS_KM * min(gap, math.asin(math.sin(gap) * cos_lat))
+            if len(best) == k and -best[0][0] <= lower_bound:
+                break
+            if visited > occupied or ring * 2 + 1 > self._columns:
+                best.clear()
+                for vehicle_id in self._org_vehicles.get(organization_id, ()):
+                    vehicle = self._vehicles[vehicle_id]
+                    if vehicle.cell is not None:
+                        consider(vehicle)
+                break
+
+            if ring == 0:
+                ring_cells = [(center_column, center_row)]
+            else:
+                ring_cells = [
+                    (center_column + dx, center_row + dy)
+                    for dx in range(-ring, ring + 1)
+                    for dy in range(-ring, ring + 1)
+                    if max(abs(dx), abs(dy)) == ring
+                ]
+            for column, row in ring_cells:
+                visited += 1
+                for vehicle_id in self._cells.get((organization_id, column % self._columns, row), ()):
+                    consider(self._vehicles[vehicle_id])
+            ring += 1
+
+        ordered = sorted((-neg_distance, vehicle_id) for neg_distance, vehicle_id in best)
+        return [(self._vehicles[vehicle_id], distance) for distance, vehicle_id in ordered]
+
+    def clusters(
+        self, organization_id: int, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+        cluster_degrees: float, statuses: Optional[Iterable[VehicleStatus]] = None,
+    ) -> List[dict]:
+        """
+        Agrupa os veículos do retângulo em blocos de aproximadamente `cluster_degrees` graus
+        (múltiplos inteiros da célula do índice), somando os agregados já mantidos por célula.
+        O custo depende do número de células ocupadas na área, não do número de veículos.
+        Cada grupo traz a quantidade, o centróide e a contagem por status.
+        """
+        statuses = set(statuses) if statuses else None
+        factor = max(1, round(cluster_degrees / self.cell_degrees))
+        first_column, first_row = self._cell_for(max(min_lat, -90), min_lon)
+        last_column, last_row = self._cell_for(min(max_lat, 90), max_lon)
+        span = self._columns - 1 if max_lon - min_lon >= 360 else (last_column - first_column) % self._columns
+
+        def in_view(column: int, row: int) -> bool:
+            return first_row <= row <= last_row and (column - first_column) % self._columns <= span
+
+        org_cells = self._org_cells.get(organization_id, set())
+        if (span + 1) * (last_row - first_row + 1) <= len(org_cells):
+            candidates = (
+                ((first_column + offset) % self._columns, row)
+                for offset in range(span + 1) for row in range(first_row, last_row + 1)
+            )
+        else:
+            candidates = (cell for cell in org_cells if in_view(*cell))
+
+        groups: Dict[Tuple[int, int], dict] = {}
+        for column, row in candidates:
+            by_status = self._cell_stats.get((organization_id, column, row))
+            if not by_status:
+                continue
+            for status, (count, sum_lat, sum_lon) in by_status.items():
+                if statuses is not None and status not in statuses:
+                    continue
+                group = groups.setdefault(
+                    (column // factor, row // factor),
+                    {"count": 0, "sum_lat": 0.0, "sum_lon": 0.0, "status_counts": {}},
+                )
+                group["count"] += count
+                group["sum_lat"] += sum_lat
+                group["sum_lon"] += sum_lon
+                group["status_counts"][status] = group["status_counts"].get(status, 0) + count
+
+        return [
+            {
+                "count": group["count"],
+                "latitude": group["sum_lat"] / group["count"],
+                "longitude": group["sum_lon"] / group["count"],
+                "status_counts": group["status_counts"],
+            }
+            for group in groups.values()
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "organizations": len(self._loaded_at),
+            "vehicles": len(self._vehicles),
+            "cells": len(self._cells),
+        }
+
+
+vehicle_index = VehicleGeoIndex(
+    cell_degrees=settings.VEHICLE_INDEX_CELL_DEGREES,
+    refresh_seconds=settings.VEHICLE_INDEX_REFRESH_SECONDS,
+)
@@ -3,6 +3,10 @@
 from . import crud_user as user
 from . import crud_organization as organization
 from . import crud_vehicle as vehicle
+from . import crud_location_history as location_history
+from . import crud_track as track
+from . import crud_geofence as geofence
+from . import crud_stop as stop
 from . import crud_part as part
 from . import crud_inventory_transaction as inventory_transaction
 from . import crud_vehicle_cost as vehicle_cost
@@ -17,6 +21,10 @@ from . import crud_freight_order as freight_order
 from . import crud_implement as implement
 from . import crud_notification as notification
 from . import crud_report as report
+from . import crud_dashboard as dashboard
+from . import crud_rollup as rollup
+from . import crud_report_job as report_job
+from . import crud_export as export
 from . import crud_tire as tire #
 from . import crud_fine as fine # <-- ADICIONE ESTA LINHA
 from . import crud_demo_usage as demo_usage
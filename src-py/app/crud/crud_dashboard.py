@@ -0,0 +1,118 @@
+# backend/app/crud/crud_dashboard.py
+
+import asyncio
+from datetime import date
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.dashboard_cache import dashboard_cache
+from app.crud import crud_report
+from app.models.alert_model import Alert
+from app.models.fuel_log_model import FuelLog
+from app.models.goal_model import Goal
+from app.models.journey_model import Journey
+from app.models.maintenance_model import MaintenanceRequest
+from app.models.organization_model import Organization
+from app.models.vehicle_cost_model import VehicleCost
+from app.models.vehicle_model import Vehicle
+from app.schemas.dashboard_schema import ManagerDashboardResponse
+
+_PENDING_KEY = "dashboard_invalidations"
+
+# Campos do veículo exibidos no dashboard (KPIs de status e próximas manutenções)
+_VEHICLE_FIELDS = (
+    "status", "current_km", "next_maintenance_date", "next_maintenance_km",
+    "brand", "model", "license_plate", "identifier",
+)
+
+
+def _changes_dashboard(obj: Any, *, is_new: bool, is_deleted: bool) -> bool:
+    """Indica se a escrita altera algum dado do dashboard do gestor."""
+    if isinstance(obj, (VehicleCost, Alert, FuelLog, MaintenanceRequest, Goal)):
+        return True
+    if isinstance(obj, Vehicle):
+        attrs = inspect(obj).attrs
+        return is_new or is_deleted or any(getattr(attrs, name).history.has_changes() for name in _VEHICLE_FIELDS)
+    if isinstance(obj, Journey):
+        return is_deleted or (obj.end_time is not None and (is_new or inspect(obj).attrs.end_time.history.has_changes()))
+    return False
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session: Session, flush_context) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for objects, is_new, is_deleted in ((session.new, True, False), (session.dirty, False, False), (session.deleted, False, True)):
+        for obj in objects:
+            if _changes_dashboard(obj, is_new=is_new, is_deleted=is_deleted) and obj.organization_id is not None:
+                pending.add(obj.organization_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for organization_id in session.info.pop(_PENDING_KEY, ()):
+        dashboard_cache.invalidate(organization_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def get_manager_dashboard(
+    bind: AsyncEngine, *, organization_id: int, start_date: date, premium: bool
+) -> ManagerDashboardResponse:
+    """
+    Monta o dashboard do gestor executando as seções independentes em paralelo, cada uma
+    numa sessão própria (e, portanto, numa conexão própria do pool), no máximo
+    `DASHBOARD_MAX_PARALLEL_SECTIONS` por requisição. O tempo total acompanha a seção mais
+    lenta em vez da soma de todas.
+
+    Resultados intermediários são compartilhados: a organização é carregada uma vez, numa
+    sessão de seção (o setor define a métrica de km/horas), e o km por dia alimenta também
+    os KPIs de eficiência. Com `premium`, inclui o km por dia e o pódio de motoristas
+    na resposta.
+
+    Recebe o engine, e não a sessão da requisição: o cálculo é compartilhado entre as
+    requisições que aguardam a mesma chave do cache e pode sobreviver à que o iniciou.
+    """
+    limit = asyncio.Semaphore(settings.DASHBOARD_MAX_PARALLEL_SECTIONS)
+
+    async def section(query: Callable[..., Awaitable[Any]], **kwargs) -> Any:
+        async with limit, AsyncSession(bind, expire_on_commit=False) as session:
+            return await query(session, organization_id=organization_id, **kwargs)
+
+    async def load_sector(session: AsyncSession, *, organization_id: int):
+        org = await session.get(Organization, organization_id)
+        return org.sector if org else None
+
+    async def by_sector(query: Callable[..., Awaitable[Any]], sector_task: asyncio.Task, **kwargs) -> Any:
+        return await section(query, sector=await sector_task, **kwargs)
+
+    async def efficiency(km_per_day_task: asyncio.Task):
+        return await section(crud_report.get_efficiency_kpis, start_date=start_date, km_per_day=await km_per_day_task)
+
+    async with asyncio.TaskGroup() as group:
+        sector = group.create_task(section(load_sector))
+        km_per_day = group.create_task(by_sector(crud_report.get_km_per_day_last_30_days, sector, start_date=start_date))
+        costs = group.create_task(section(crud_report.get_costs_by_category_last_30_days, start_date=start_date))
+        kpis = group.create_task(section(crud_report.get_dashboard_kpis))
+        recent_alerts = group.create_task(section(crud_report.get_recent_alerts))
+        upcoming_maintenances = group.create_task(section(crud_report.get_upcoming_maintenances))
+        active_goal = group.create_task(section(crud_report.get_active_goal_with_progress))
+        podium = group.create_task(by_sector(crud_report.get_podium_drivers, sector)) if premium else None
+        efficiency_kpis = group.create_task(efficiency(km_per_day))
+
+    return ManagerDashboardResponse(
+        kpis=kpis.result(),
+        efficiency_kpis=efficiency_kpis.result(),
+        costs_by_category=costs.result(),
+        km_per_day_last_30_days=km_per_day.result() if premium else None,
+        podium_drivers=podium.result() if premium else None,
+        recent_alerts=recent_alerts.result(),
+        upcoming_maintenances=upcoming_maintenances.result(),
+        active_goal=active_goal.result(),
+    )
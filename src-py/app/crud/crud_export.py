@@ -0,0 +1,222 @@
+# backend/app/crud/crud_export.py
+
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import AsyncIterator, Dict, NamedTuple, Optional, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Date, Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.core.periods import within_days
+from app.core.tabular_export import MonthlyParquetWriter, arrow_schema, zip_directory
+from app.models.fine_model import Fine
+from app.models.fuel_log_model import FuelLog
+from app.models.inventory_transaction_model import InventoryTransaction
+from app.models.journey_model import Journey
+from app.models.location_history_model import LocationHistory
+from app.models.part_model import InventoryItem, Part
+from app.models.user_model import User
+from app.models.vehicle_cost_model import VehicleCost
+from app.models.vehicle_model import Vehicle
+from app.schemas.export_schema import ExportDataset
+
+_vehicle_label = func.coalesce(Vehicle.license_plate, Vehicle.identifier).label("vehicle")
+
+
+def _costs() -> Select:
+    return (
+        select(
+            VehicleCost.id, VehicleCost.date, VehicleCost.cost_type, VehicleCost.description, VehicleCost.amount,
+            VehicleCost.vehicle_id, _vehicle_label, VehicleCost.fine_id,
+        )
+        .join(Vehicle, Vehicle.id == VehicleCost.vehicle_id)
+    )
+
+
+def _fuel_logs() -> Select:
+    return (
+        select(
+            FuelLog.id, FuelLog.timestamp, FuelLog.vehicle_id, _vehicle_label, FuelLog.user_id.label("driver_id"),
+            User.full_name.label("driver"), FuelLog.odometer, FuelLog.liters, FuelLog.total_cost, FuelLog.source,
+            FuelLog.verification_status, FuelLog.provider_name, FuelLog.gas_station_name,
+        )
+        .join(Vehicle, Vehicle.id == FuelLog.vehicle_id)
+        .outerjoin(User, User.id == FuelLog.user_id)
+    )
+
+
+def _journeys() -> Select:
+    return (
+        select(
+            Journey.id, Journey.start_time, Journey.end_time, Journey.is_active, Journey.vehicle_id, _vehicle_label,
+            Journey.driver_id, User.full_name.label("driver"), Journey.trip_type, Journey.start_mileage,
+            Journey.end_mileage, Journey.distance_km, Journey.start_engine_hours, Journey.end_engine_hours,
+            Journey.destination_city, Journey.destination_state,
+        )
+        .join(Vehicle, Vehicle.id == Journey.vehicle_id)
+        .outerjoin(User, User.id == Journey.driver_id)
+    )
+
+
+def _fines() -> Select:
+    return (
+        select(
+            Fine.id, Fine.date, Fine.vehicle_id, _vehicle_label, Fine.driver_id, User.full_name.label("driver"),
+            Fine.infraction_code, Fine.description, Fine.value, Fine.status,
+        )
+        .join(Vehicle, Vehicle.id == Fine.vehicle_id)
+        .outerjoin(User, User.id == Fine.driver_id)
+    )
+
+
+def _inventory_transactions() -> Select:
+    related_user = aliased(User)
+    return (
+        select(
+            InventoryTransaction.id, InventoryTransaction.timestamp, InventoryTransaction.transaction_type,
+            InventoryTransaction.part_id, Part.name.label("part"), InventoryTransaction.item_id,
+            InventoryItem.item_identifier, InventoryTransaction.related_vehicle_id.label("vehicle_id"), _vehicle_label,
+            InventoryTransaction.user_id, User.full_name.label("user"),
+            InventoryTransaction.related_user_id, related_user.full_name.label("related_user"),
+            InventoryTransaction.notes,
+        )
+        # As transações não têm organização própria: vale a do item
+        .join(InventoryItem, InventoryItem.id == InventoryTransaction.item_id)
+        .outerjoin(Part, Part.id == InventoryTransaction.part_id)
+        .outerjoin(Vehicle, Vehicle.id == InventoryTransaction.related_vehicle_id)
+        .outerjoin(User, User.id == InventoryTransaction.user_id)
+        .outerjoin(related_user, related_user.id == InventoryTransaction.related_user_id)
+    )
+
+
+def _location_history() -> Select:
+    return (
+        select(
+            LocationHistory.id, LocationHistory.timestamp, LocationHistory.vehicle_id, _vehicle_label,
+            LocationHistory.latitude, LocationHistory.longitude,
+        )
+        .join(Vehicle, Vehicle.id == LocationHistory.vehicle_id)
+    )
+
+
+# Por conjunto: consulta base, coluna de organização, coluna de data (ordem e período) e coluna do veículo
+_DATASETS: Dict[ExportDataset, tuple] = {
+    ExportDataset.COSTS: (_costs, VehicleCost.organization_id, VehicleCost.date, VehicleCost.vehicle_id),
+    ExportDataset.FUEL_LOGS: (_fuel_logs, FuelLog.organization_id, FuelLog.timestamp, FuelLog.vehicle_id),
+    ExportDataset.JOURNEYS: (_journeys, Journey.organization_id, Journey.start_time, Journey.vehicle_id),
+    ExportDataset.FINES: (_fines, Fine.organization_id, Fine.date, Fine.vehicle_id),
+    ExportDataset.INVENTORY_TRANSACTIONS: (
+        _inventory_transactions, InventoryItem.organization_id, InventoryTransaction.timestamp,
+        InventoryTransaction.related_vehicle_id,
+    ),
+    ExportDataset.LOCATION_HISTORY: (
+        _location_history, LocationHistory.organization_id, LocationHistory.timestamp, LocationHistory.vehicle_id,
+    ),
+}
+
+
+def build_query(
+    dataset: ExportDataset, *, organization_id: int, start_date: Optional[date] = None,
+    end_date: Optional[date] = None, vehicle_id: Optional[int] = None, after_id: Optional[int] = None,
+    until_id: Optional[int] = None,
+) -> Select:
+    """
+    Consulta da exportação: linhas da organização nos dias [start_date, end_date] (e do
+    veículo, se indicado), em ordem cronológica. Os filtros usam os índices (organização, data).
+    Com `after_id` (exportação incremental), apenas as linhas criadas depois dessa, sem período;
+    com `until_id`, apenas as linhas com id até esse.
+    """
+    base, organization_column, date_column, vehicle_column = _DATASETS[dataset]
+    stmt = base().where(organization_column == organization_id)
+    id_column = stmt.selected_columns["id"]
+    if start_date is not None and end_date is not None:
+        stmt = stmt.where(
+            date_column.between(start_date, end_date) if isinstance(date_column.type, Date)
+            else within_days(date_column, start_date, end_date)
+        )
+    if vehicle_id is not None:
+        stmt = stmt.where(vehicle_column == vehicle_id)
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+    if until_id is not None:
+        stmt = stmt.where(id_column <= until_id)
+    return stmt.order_by(date_column, id_column)
+
+
+async def max_id(db: AsyncSession, dataset: ExportDataset) -> Optional[int]:
+    """Maior id do conjunto, de todas as organizações (usa a chave primária)."""
+    id_column = _DATASETS[dataset][0]().selected_columns["id"]
+    return (await db.execute(select(func.max(id_column)))).scalar_one_or_none()
+
+
+def columns(stmt: Select) -> Sequence[str]:
+    return list(stmt.selected_columns.keys())
+
+
+async def stream_batches(db: AsyncSession, stmt: Select) -> AsyncIterator[Sequence[Row]]:
+    """
+    Percorre o resultado com um cursor no servidor (`AsyncSession.stream`), em lotes de
+    `EXPORT_BATCH_SIZE` linhas: a memória usada não depende do tamanho da exportação.
+    """
+    result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+    async for rows in result.partitions():
+        yield rows
+
+
+async def write_parquet(
+    db: AsyncSession, dataset: ExportDataset, stmt: Select, *, directory: Path, filename: str
+) -> int:
+    """
+    Grava o resultado em arquivos Parquet por mês da coluna de data do conjunto
+    (`{directory}/month=AAAA-MM/{filename}`). A gravação roda em uma thread, lote a lote.
+    Retorna o número de linhas.
+    """
+    writer = MonthlyParquetWriter(
+        directory, schema=arrow_schema(stmt), partition_column=_DATASETS[dataset][2].key, filename=filename,
+        row_group_size=settings.EXPORT_PARQUET_ROW_GROUP_SIZE, compression=settings.EXPORT_PARQUET_COMPRESSION,
+    )
+    try:
+        async for rows in stream_batches(db, stmt):
+            await run_in_threadpool(writer.write, rows)
+    finally:
+        await run_in_threadpool(writer.close)
+    return writer.rows
+
+
+class ParquetArchive(NamedTuple):
+    content: bytes
+    rows: int
+    # Posição do próximo cursor: a exportação seguinte começa depois deste id
+    last_id: int
+
+
+async def build_parquet_archive(
+    db: AsyncSession, dataset: ExportDataset, *, organization_id: int, start_date: Optional[date] = None,
+    end_date: Optional[date] = None, after_id: Optional[int] = None, until_id: Optional[int] = None,
+) -> ParquetArchive:
+    """
+    Monta o ZIP da exportação Parquet (`{dataset}/month=AAAA-MM/part-N.parquet`, N = `after_id`)
+    num diretório temporário, removido ao final. Só entram as linhas com id até `until_id`, o
+    maior id do conjunto quando a exportação foi pedida, que passa a ser a posição do cursor.
+    Sem linhas, o conteúdo é vazio.
+    """
+    stmt = build_query(
+        dataset, organization_id=organization_id, start_date=start_date, end_date=end_date,
+        after_id=after_id, until_id=until_id,
+    )
+    directory = Path(tempfile.mkdtemp(prefix="trucar-export-"))
+    try:
+        rows = await write_parquet(db, dataset, stmt, directory=directory / dataset.value, filename=f"part-{after_id or 0}.parquet")
+        content = b""
+        if rows:
+            archive = directory / f"{dataset.value}.zip"
+            await run_in_threadpool(zip_directory, directory / dataset.value, archive)
+            content = await run_in_threadpool(archive.read_bytes)
+    finally:
+        await run_in_threadpool(shutil.rmtree, directory, True)
+    return ParquetArchive(content, rows, max(until_id or 0, after_id or 0))
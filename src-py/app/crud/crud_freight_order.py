@@ -10,6 +10,8 @@ from app.models.journey_model import Journey, JourneyType
 from app.models.stop_point_model import StopPoint, StopPointStatus
 from app.models.vehicle_model import Vehicle, VehicleStatus
 from app.models.user_model import User
+from app.core.vehicle_index import vehicle_index
+from app.crud.crud_journey import compute_gps_distance
 from app.schemas.freight_order_schema import FreightOrderCreate, FreightOrderUpdate
 
 
@@ -120,6 +122,7 @@ async def claim_order(db: AsyncSession, *, order: FreightOrder, driver: User, ve
     
     vehicle.status = VehicleStatus.IN_USE
     db.add(vehicle)
+    vehicle_index.set_status(vehicle.id, vehicle.status)
     
     await db.commit()
     await db.refresh(order, attribute_names=["client", "vehicle", "driver", "stop_points"])
@@ -160,6 +163,7 @@ async def complete_stop_point(db: AsyncSession, *, order: FreightOrder, stop: St
     journey.end_time = datetime.utcnow()
     if end_mileage is not None:
         journey.end_mileage = end_mileage
+    await compute_gps_distance(db, journey=journey)
     db.add(journey)
     
     if order.vehicle and end_mileage is not None:
@@ -172,6 +176,7 @@ async def complete_stop_point(db: AsyncSession, *, order: FreightOrder, stop: St
         if order.vehicle:
             order.vehicle.status = VehicleStatus.AVAILABLE
             db.add(order.vehicle)
+            vehicle_index.set_status(order.vehicle.id, order.vehicle.status)
         db.add(order)
         
     await db.commit()
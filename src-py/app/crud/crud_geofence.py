@@ -0,0 +1,141 @@
+# backend/app/crud/crud_geofence.py
+
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.geofence_engine import GeofenceTransition, geofence_engine
+from app.models.alert_model import Alert, AlertLevel
+from app.models.geofence_model import Geofence
+from app.models.notification_model import Notification, NotificationType
+from app.models.user_model import User, UserRole
+from app.models.vehicle_model import Vehicle
+from app.schemas.geofence_schema import GeofenceCreate, GeofenceUpdate
+
+
+class GeofencePing(NamedTuple):
+    """Posição a ser avaliada contra as cercas; `organization_id` é resolvido se vier vazio."""
+    vehicle_id: int
+    organization_id: Optional[int]
+    latitude: float
+    longitude: float
+    timestamp: Optional[datetime] = None
+
+
+async def create(db: AsyncSession, *, obj_in: GeofenceCreate, organization_id: int) -> Geofence:
+    """Cria uma cerca eletrônica para a organização."""
+    db_obj = Geofence(**obj_in.model_dump(), organization_id=organization_id)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    geofence_engine.invalidate(organization_id)
+    return db_obj
+
+async def get(db: AsyncSession, *, geofence_id: int, organization_id: int) -> Geofence | None:
+    stmt = select(Geofence).where(Geofence.id == geofence_id, Geofence.organization_id == organization_id)
+    return (await db.execute(stmt)).scalars().first()
+
+async def get_multi_by_org(
+    db: AsyncSession, *, organization_id: int, skip: int = 0, limit: int = 100
+) -> List[Geofence]:
+    stmt = (
+        select(Geofence)
+        .where(Geofence.organization_id == organization_id)
+        .order_by(Geofence.name)
+        .offset(skip).limit(limit)
+    )
+    return (await db.execute(stmt)).scalars().all()
+
+async def update(db: AsyncSession, *, db_obj: Geofence, obj_in: GeofenceUpdate) -> Geofence:
+    for field, value in obj_in.model_dump(exclude_unset=True).items():
+        setattr(db_obj, field, value)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    geofence_engine.invalidate(db_obj.organization_id)
+    return db_obj
+
+async def remove(db: AsyncSession, *, db_obj: Geofence) -> Geofence:
+    organization_id = db_obj.organization_id
+    await db.delete(db_obj)
+    await db.commit()
+    geofence_engine.invalidate(organization_id)
+    return db_obj
+
+
+async def _record_transitions(
+    db: AsyncSession, *, organization_id: int, transitions: List[tuple[GeofenceTransition, datetime]]
+) -> None:
+    """Cria um alerta e uma notificação para cada gestor por transição (sem commit)."""
+    vehicle_ids = {transition.vehicle_id for transition, _ in transitions}
+    vehicles_stmt = select(Vehicle.id, Vehicle.brand, Vehicle.model, Vehicle.license_plate, Vehicle.identifier).where(
+        Vehicle.id.in_(vehicle_ids)
+    )
+    labels = {
+        vehicle_id: f"{brand} {model} ({license_plate or identifier or vehicle_id})"
+        for vehicle_id, brand, model, license_plate, identifier in (await db.execute(vehicles_stmt)).all()
+    }
+    managers_stmt = select(User.id).where(
+        User.organization_id == organization_id,
+        User.role.in_([UserRole.CLIENTE_ATIVO, UserRole.CLIENTE_DEMO]),
+        User.is_active == True,
+    )
+    manager_ids = (await db.execute(managers_stmt)).scalars().all()
+
+    for transition, timestamp in transitions:
+        fence = transition.fence
+        action = "entrou na" if transition.entered else "saiu da"
+        message = f"{labels.get(transition.vehicle_id, transition.vehicle_id)} {action} cerca '{fence.name}'."
+        db.add(Alert(
+            message=message[:255],
+            level=AlertLevel.WARNING,
+            timestamp=timestamp,
+            organization_id=organization_id,
+            vehicle_id=transition.vehicle_id,
+        ))
+        for manager_id in manager_ids:
+            db.add(Notification(
+                organization_id=organization_id,
+                user_id=manager_id,
+                message=message,
+                notification_type=NotificationType.GEOFENCE_ENTERED if transition.entered else NotificationType.GEOFENCE_EXITED,
+                related_entity_type="geofence",
+                related_entity_id=fence.fence_id,
+                related_vehicle_id=transition.vehicle_id,
+            ))
+
+
+async def evaluate_positions(db: AsyncSession, *, pings: Sequence[GeofencePing]) -> int:
+    """
+    Avalia posições (em ordem cronológica por veículo) contra as cercas da organização e
+    registra as entradas e saídas que têm alerta habilitado. Não faz commit.
+    Retorna o número de alertas criados.
+    """
+    by_org: Dict[int, List[tuple[GeofenceTransition, datetime]]] = {}
+    for ping in pings:
+        organization_id = ping.organization_id
+        if organization_id is None:
+            organization_id = await geofence_engine.organization_of(db, ping.vehicle_id)
+            if organization_id is None:
+                continue
+        await geofence_engine.ensure_loaded(db, organization_id)
+
+        transitions = geofence_engine.evaluate(organization_id, ping.vehicle_id, ping.latitude, ping.longitude)
+        if not transitions:
+            continue
+        timestamp = ping.timestamp or datetime.now(timezone.utc)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        by_org.setdefault(organization_id, []).extend(
+            (transition, timestamp) for transition in transitions
+            if (transition.fence.alert_on_enter if transition.entered else transition.fence.alert_on_exit)
+        )
+
+    created = 0
+    for organization_id, transitions in by_org.items():
+        if transitions:
+            await _record_transitions(db, organization_id=organization_id, transitions=transitions)
+            created += len(transitions)
+    return created
@@ -2,12 +2,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from typing import List, Optional, Tuple
-from sqlalchemy import func # <-- ADICIONADO func
+from sqlalchemy import func, update # <-- ADICIONADO func
 
 from datetime import datetime, date, timedelta
 
 from app.models.journey_model import Journey
 from app.models.vehicle_model import Vehicle, VehicleStatus
+from app.core.config import settings
+from app.core.journey_distance import FilteredTrack, distances_between, filter_track, track_arrays
+from app.core.vehicle_index import vehicle_index
+from app.crud import crud_rollup, crud_track
 # A LINHA QUE FALTAVA PARA O EAGER LOADING:
 from app.models.user_model import User, UserRole
 from app.schemas.journey_schema import JourneyCreate, JourneyUpdate
@@ -62,6 +66,7 @@ async def create_journey(
     
     vehicle.status = VehicleStatus.IN_USE
     db.add(vehicle)
+    vehicle_index.set_status(vehicle.id, vehicle.status)
 
     await db.commit()
     await db.refresh(db_journey, ['vehicle', 'driver', 'implement'])
@@ -103,6 +108,7 @@ async def end_journey(
         db_journey.end_engine_hours = journey_in.end_engine_hours
     if journey_in.end_mileage is not None:
         db_journey.end_mileage = journey_in.end_mileage
+    await compute_gps_distance(db, journey=db_journey)
     
     db.add(db_journey)
     print(f"Jornada ID {db_journey.id} marcada como finalizada com end_engine_hours = {db_journey.end_engine_hours}")
@@ -115,6 +121,7 @@ async def end_journey(
         if vehicle:
             print(f"Veículo ID {vehicle.id} encontrado. Horímetro ANTES: {vehicle.current_engine_hours}")
             vehicle.status = VehicleStatus.AVAILABLE
+            vehicle_index.set_status(vehicle.id, vehicle.status)
             
             # A lógica principal:
             if journey_in.end_engine_hours is not None:
@@ -145,6 +152,91 @@ async def end_journey(
     return db_journey, updated_vehicle
 
 
+async def _filtered_track(
+    db: AsyncSession, *, vehicle_id: int, start: datetime, end: datetime
+) -> Optional[FilteredTrack]:
+    track = await crud_track.get_track_arrays(db, vehicle_id=vehicle_id, start=start, end=end)
+    if track.timestamps.size < 2:
+        return None
+    return filter_track(
+        *track_arrays(track),
+        max_speed_kmh=settings.JOURNEY_DISTANCE_MAX_SPEED_KMH,
+        min_speed_kmh=settings.JOURNEY_DISTANCE_MIN_SPEED_KMH,
+        speed_window_s=settings.JOURNEY_DISTANCE_SPEED_WINDOW_SECONDS,
+    )
+
+async def compute_gps_distance(db: AsyncSession, *, journey: Journey) -> Optional[float]:
+    """
+    Calcula `distance_km` da viagem encerrada a partir dos pontos de GPS entre o início e o
+    fim, descartando picos, saltos de posição e o ruído do GPS com o veículo parado. Não faz commit.
+    Retorna a distância, ou None se não houver pontos suficientes.
+    """
+    if journey.end_time is None:
+        return None
+    track = await _filtered_track(db, vehicle_id=journey.vehicle_id, start=journey.start_time, end=journey.end_time)
+    if track is None:
+        return None
+    journey.distance_km = round(float(track.cumulative_km[-1]), 3)
+    return journey.distance_km
+
+# Viagens de um mesmo veículo separadas por menos que isto são calculadas sobre um único trajeto,
+# desde que o trajeto não passe de _BACKFILL_MAX_SPAN (limita os pontos lidos de uma vez)
+_BACKFILL_SPAN_GAP = timedelta(hours=12)
+_BACKFILL_MAX_SPAN = timedelta(days=2)
+
+async def backfill_gps_distances(db: AsyncSession, *, recompute: bool = False) -> int:
+    """
+    Calcula `distance_km` das viagens encerradas que ainda não têm o valor (ou de todas, com
+    `recompute`), em lotes de `JOURNEY_DISTANCE_BACKFILL_BATCH_SIZE` com commit por lote.
+    Viagens próximas do mesmo veículo compartilham uma única leitura e filtragem do trajeto,
+    e a distância de cada uma sai da distância acumulada nos seus limites.
+    Retorna o número de viagens atualizadas.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        stmt = (
+            select(Journey.id, Journey.vehicle_id, Journey.start_time, Journey.end_time)
+            .where(Journey.end_time.is_not(None), Journey.end_time > Journey.start_time, Journey.id > last_id)
+            .order_by(Journey.id)
+            .limit(settings.JOURNEY_DISTANCE_BACKFILL_BATCH_SIZE)
+        )
+        if not recompute:
+            stmt = stmt.where(Journey.distance_km.is_(None))
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return updated
+        last_id = rows[-1].id
+
+        spans: List[List] = []
+        for row in sorted(rows, key=lambda r: (r.vehicle_id, r.start_time)):
+            span = spans[-1] if spans else None
+            if (
+                span is None or span[0] != row.vehicle_id
+                or row.start_time - span[2] > _BACKFILL_SPAN_GAP
+                or row.end_time - span[1] > _BACKFILL_MAX_SPAN
+            ):
+                spans.append([row.vehicle_id, row.start_time, row.end_time, [row]])
+            else:
+                span[2] = max(span[2], row.end_time)
+                span[3].append(row)
+
+        values = []
+        for vehicle_id, start, end, journeys in spans:
+            track = await _filtered_track(db, vehicle_id=vehicle_id, start=start, end=end)
+            if track is None:
+                continue
+            distances = distances_between(track, [j.start_time for j in journeys], [j.end_time for j in journeys])
+            values.extend(
+                {"id": journey.id, "distance_km": round(float(distance), 3)}
+                for journey, distance in zip(journeys, distances)
+            )
+        if values:
+            async with crud_rollup.tracking_bulk_changes(db, model=Journey, ids=[value["id"] for value in values]):
+                await db.execute(update(Journey), values)
+            await db.commit()
+            updated += len(values)
+
 async def get_journey(db: AsyncSession, *, journey_id: int, organization_id: int) -> Optional[Journey]:
     """Busca uma viagem específica, garantindo que pertence à organização correta."""
     stmt = (
@@ -225,6 +317,7 @@ async def delete_journey(db: AsyncSession, *, journey_to_delete: Journey) -> Jou
     if journey_to_delete.is_active and vehicle:
         vehicle.status = VehicleStatus.AVAILABLE
         db.add(vehicle)
+        vehicle_index.set_status(vehicle.id, vehicle.status)
 
     await db.delete(journey_to_delete)
     await db.commit()
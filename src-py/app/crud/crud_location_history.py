@@ -0,0 +1,171 @@
+# backend/app/crud/crud_location_history.py
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+from app.models.location_history_model import LocationHistory
+
+TABLE_NAME = LocationHistory.__tablename__
+COPY_COLUMNS = ["vehicle_id", "organization_id", "latitude", "longitude", "timestamp"]
+
+# Meses cuja partição já foi confirmada por este processo (evita DDL a cada lote).
+# Um mês só entra aqui depois do commit da transação que criou a partição.
+_known_partitions: Set[date] = set()
+_PENDING_PARTITIONS_KEY = "location_history_pending_partitions"
+
+
+@event.listens_for(Session, "after_commit")
+def _confirm_pending_partitions(session: Session) -> None:
+    _known_partitions.update(session.info.pop(_PENDING_PARTITIONS_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_partitions(session: Session) -> None:
+    session.info.pop(_PENDING_PARTITIONS_KEY, None)
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE_NAME}_y{month.year:04d}m{month.month:02d}"
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _utc_bound(month: date) -> str:
+    return f"{month.isoformat()}T00:00:00+00"
+
+
+def retention_start(now: datetime | None = None) -> date:
+    """Primeiro mês mantido no histórico; partições anteriores são removidas pela retenção."""
+    return add_months(month_start(now or datetime.now(timezone.utc)), -settings.LOCATION_HISTORY_RETENTION_MONTHS)
+
+
+def is_from_future(value: datetime, *, now: datetime | None = None) -> bool:
+    """
+    Indica se o timestamp passa de `TELEMETRY_MAX_FUTURE_SECONDS` à frente do relógio do
+    servidor. Esses pacotes vêm de relógios errados e são descartados na ingestão.
+    """
+    now = now or datetime.now(timezone.utc)
+    return _as_utc(value) > now + timedelta(seconds=settings.TELEMETRY_MAX_FUTURE_SECONDS)
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    """Indica se a tabela de histórico já foi convertida para particionada (apenas PostgreSQL)."""
+    if conn.dialect.name != "postgresql":
+        return False
+    result = await conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :name"),
+        {"name": TABLE_NAME},
+    )
+    return result.scalar() is not None
+
+
+async def ensure_partitions(db: AsyncSession, *, months: Iterable[date]) -> None:
+    """
+    Cria (se ainda não existirem) as partições mensais informadas, na transação de `db`.
+    O índice (vehicle_id, timestamp) definido na tabela-mãe é propagado para cada partição.
+    Os limites são meia-noite UTC, independentemente do fuso da sessão.
+    """
+    pending = sorted({month_start(m) for m in months} - _known_partitions)
+    conn = await db.connection()
+    if not pending or not await is_partitioned(conn):
+        return
+
+    for month in pending:
+        await conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" PARTITION OF "{TABLE_NAME}" '
+            f"FOR VALUES FROM ('{_utc_bound(month)}') TO ('{_utc_bound(add_months(month, 1))}')"
+        ))
+    db.sync_session.info.setdefault(_PENDING_PARTITIONS_KEY, set()).update(pending)
+
+
+async def list_partitions(conn: AsyncConnection) -> List[date]:
+    """Retorna o mês de cada partição existente da tabela de histórico, em ordem."""
+    if not await is_partitioned(conn):
+        return []
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :name"
+        ),
+        {"name": TABLE_NAME},
+    )
+    months = []
+    prefix = f"{TABLE_NAME}_y"
+    for (relname,) in result.all():
+        if not relname.startswith(prefix):
+            continue
+        year, month = relname[len(prefix):].split("m")
+        months.append(date(int(year), int(month), 1))
+    return sorted(months)
+
+
+async def drop_partitions_before(conn: AsyncConnection, *, cutoff: date) -> List[str]:
+    """
+    Remove as partições inteiramente anteriores a `cutoff` (retenção sem DELETE).
+    Uma partição que ainda tem pontos não compactados em track_chunks é mantida.
+    Retorna os nomes das partições removidas.
+    """
+    dropped = []
+    for month in await list_partitions(conn):
+        if add_months(month, 1) > cutoff:
+            continue
+        name = partition_name(month)
+        if (await conn.execute(text(f'SELECT EXISTS (SELECT 1 FROM "{name}")'))).scalar():
+            continue
+        await conn.execute(text(f'ALTER TABLE "{TABLE_NAME}" DETACH PARTITION "{name}"'))
+        await conn.execute(text(f'DROP TABLE "{name}"'))
+        _known_partitions.discard(month)
+        dropped.append(name)
+    return dropped
+
+
+async def bulk_append(db: AsyncSession, *, rows: List[Dict[str, Any]]) -> int:
+    """
+    Acrescenta pontos ao histórico de localização sem fazer commit.
+    No PostgreSQL usa COPY (asyncpg) na conexão da transação atual, criando antes as
+    partições dos meses envolvidos; nos demais bancos recorre a um INSERT multi-linha.
+    Cada linha deve conter as chaves de `COPY_COLUMNS`. Retorna o número de linhas gravadas.
+    """
+    if not rows:
+        return 0
+
+    conn = await db.connection()
+    if conn.dialect.name != "postgresql" or conn.dialect.driver != "asyncpg":
+        await db.execute(insert(LocationHistory).values(rows))
+        return len(rows)
+
+    # Pontos anteriores à retenção recriariam partições já removidas; são descartados.
+    oldest = retention_start()
+    rows = [row for row in rows if month_start(_as_utc(row["timestamp"])) >= oldest]
+    if not rows:
+        return 0
+    await ensure_partitions(db, months=(_as_utc(row["timestamp"]) for row in rows))
+
+    raw_connection = await conn.get_raw_connection()
+    records = [
+        (row["vehicle_id"], row["organization_id"], row["latitude"], row["longitude"], _as_utc(row["timestamp"]))
+        for row in rows
+    ]
+    await raw_connection.driver_connection.copy_records_to_table(
+        TABLE_NAME, records=records, columns=COPY_COLUMNS
+    )
+    return len(rows)
@@ -1,11 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy import select, func, or_, and_, case, cast, Float
 from datetime import datetime, timedelta, date
 from typing import List, Optional, Dict, Any
 import logging
 from sqlalchemy.orm import selectinload
 
 from app import crud
+from app.core.config import settings
+from app.core.periods import within_days
+from app.core.vehicle_index import vehicle_index
 # --- IMPORTS DE MODELS ---
 from app.models.user_model import User, UserRole
 from app.models.alert_model import Alert, AlertLevel
@@ -13,6 +16,7 @@ from app.models.goal_model import Goal
 from app.models.vehicle_model import Vehicle, VehicleStatus
 from app.models.journey_model import Journey
 from app.models.organization_model import Organization
+from app.models.daily_rollup_model import COST_COLUMNS, DailyRollup
 from app.models.report_models import DashboardKPIs, KmPerDay, UpcomingMaintenance, CostByCategory, DashboardPodiumDriver
 from app.models.vehicle_cost_model import VehicleCost
 from app.models.fuel_log_model import FuelLog
@@ -22,7 +26,9 @@ from app.models.document_model import Document
 from app.models.tire_model import VehicleTire as Tire
 
 # --- IMPORTS DE SCHEMAS ---
-from app.schemas.dashboard_schema import KpiEfficiency, AlertSummary, GoalStatus, VehiclePosition
+from app.schemas.dashboard_schema import (
+    KpiEfficiency, AlertSummary, GoalStatus, VehiclePosition, VehicleCluster, VehicleClusterResponse
+)
 from app.schemas.report_schema import (
     DashboardSummary,
     FleetManagementReport, 
@@ -36,98 +42,120 @@ from app.schemas.report_schema import (
     VehicleReportSections  # <-- Importa o schema das seções
 )
 
-# --- NOVA FUNÇÃO HELPER (get_fleet_management_data) ---
-# (Esta função já estava no seu arquivo, vou mantê-la)
+# Tamanho de cada ranking do relatório gerencial da frota
+FLEET_RANKING_SIZE = 5
+
 async def get_fleet_management_data(
     db: AsyncSession, *, start_date: date, end_date: date, organization_id: int
 ) -> FleetManagementReport:
     """
-    Agrega dados de custo e performance de toda a frota para um período.
+    Agrega dados de custo e performance de toda a frota para um período inteiramente no banco:
+    os custos vêm da consolidação diária e a distância (faixa MIN/MAX do odômetro) e os litros
+    vêm de um agrupamento dos abastecimentos por veículo. Os rankings saem de funções de janela,
+    então só os veículos que aparecem em algum top 5 voltam do banco, qualquer que seja a frota.
     """
-    # 1. Obter todos os veículos da organização
-    vehicles_stmt = select(Vehicle).where(Vehicle.organization_id == organization_id)
-    vehicles = (await db.execute(vehicles_stmt)).scalars().all()
-    
-    vehicle_ids = [v.id for v in vehicles]
-
-    # 2. Obter todos os custos e abastecimentos do período em consultas otimizadas
-    costs_stmt = select(VehicleCost).where(
-        VehicleCost.organization_id == organization_id,
-        VehicleCost.date.between(start_date, end_date)
+    # 1. Totais do período por veículo
+    costs = (
+        select(DailyRollup.vehicle_id, func.sum(DailyRollup.total_cost).label("total_cost"))
+        .where(DailyRollup.organization_id == organization_id, DailyRollup.day.between(start_date, end_date))
+        .group_by(DailyRollup.vehicle_id)
+        .subquery()
     )
-    fuel_logs_stmt = select(FuelLog).where(
-        FuelLog.organization_id == organization_id,
-        func.date(FuelLog.timestamp).between(start_date, end_date)
+    fuel = (
+        select(
+            FuelLog.vehicle_id,
+            (func.max(FuelLog.odometer) - func.min(FuelLog.odometer)).label("distance"),
+            func.sum(FuelLog.liters).label("liters"),
+        )
+        .where(
+            FuelLog.organization_id == organization_id,
+            within_days(FuelLog.timestamp, start_date, end_date),
+        )
+        .group_by(FuelLog.vehicle_id)
+        .subquery()
     )
-    
-    all_costs = (await db.execute(costs_stmt)).scalars().all()
-    all_fuel_logs = (await db.execute(fuel_logs_stmt)).scalars().all()
 
-    # 3. Calcular Resumos e Agregações Gerais
-    total_fleet_cost = sum(c.amount for c in all_costs)
-    
-    costs_by_category: Dict[str, float] = {}
-    for cost in all_costs:
-        category_key = str(cost.cost_type.value)
-        costs_by_category[category_key] = costs_by_category.get(category_key, 0) + cost.amount
-
-    # 4. Processar dados por veículo para criar os rankings
-    vehicle_metrics: List[Dict] = []
-    total_fleet_distance = 0.0
-
-    for vehicle in vehicles:
-        costs = [c for c in all_costs if c.vehicle_id == vehicle.id]
-        fuel_logs = [f for f in all_fuel_logs if f.vehicle_id == vehicle.id]
-        
-        total_cost = sum(c.amount for c in costs)
-        
-        distance = 0.0
-        if len(fuel_logs) > 1:
-            sorted_logs = sorted(fuel_logs, key=lambda log: log.odometer or 0)
-            min_odo = sorted_logs[0].odometer or 0
-            max_odo = sorted_logs[-1].odometer or 0
-            distance = float(max_odo - min_odo)
-        
-        total_fleet_distance += distance
-        
-        total_liters = sum(log.liters for log in fuel_logs if log.liters)
-        avg_consumption = (distance / total_liters) if total_liters > 0 else 0
-        cost_per_km = (total_cost / distance) if distance > 0 else 0
-
-        vehicle_metrics.append({
-            "id": vehicle.id,
-            "identifier": vehicle.license_plate or vehicle.identifier,
-            "total_cost": total_cost,
-            "cost_per_km": cost_per_km,
-            "avg_consumption": avg_consumption
-        })
-
-    # 5. Criar os Rankings
-    top_expensive = sorted(vehicle_metrics, key=lambda v: v.get('total_cost', 0), reverse=True)[:5]
-    top_cost_per_km = sorted(vehicle_metrics, key=lambda v: v.get('cost_per_km', 0), reverse=True)[:5]
-    top_efficient = sorted(vehicle_metrics, key=lambda v: v.get('avg_consumption', 0), reverse=True)[:5]
-    least_efficient = sorted([v for v in vehicle_metrics if v.get('avg_consumption', 0) > 0], key=lambda v: v.get('avg_consumption', 0))[:5]
-
-    # 6. Montar o objeto final do relatório
+    # 2. Indicadores por veículo (veículos sem movimento entram zerados)
+    total_cost = func.coalesce(costs.c.total_cost, 0.0)
+    distance = cast(func.coalesce(fuel.c.distance, 0), Float)
+    liters = func.coalesce(fuel.c.liters, 0.0)
+    metrics = (
+        select(
+            Vehicle.id.label("vehicle_id"),
+            func.coalesce(Vehicle.license_plate, Vehicle.identifier).label("identifier"),
+            total_cost.label("total_cost"),
+            distance.label("distance"),
+            case((distance > 0, total_cost / distance), else_=0.0).label("cost_per_km"),
+            case((liters > 0, distance / liters), else_=0.0).label("avg_consumption"),
+        )
+        .outerjoin(costs, costs.c.vehicle_id == Vehicle.id)
+        .outerjoin(fuel, fuel.c.vehicle_id == Vehicle.id)
+        .where(Vehicle.organization_id == organization_id)
+        .subquery()
+    )
+
+    # 3. Posição de cada veículo nos rankings (empates pelo id) e distância total da frota
+    def rank(*order_by, **kwargs):
+        return func.row_number().over(order_by=(*order_by, metrics.c.vehicle_id), **kwargs)
+
+    ranked = select(
+        metrics,
+        rank(metrics.c.total_cost.desc()).label("expensive_rank"),
+        rank(metrics.c.cost_per_km.desc()).label("cost_per_km_rank"),
+        rank(metrics.c.avg_consumption.desc()).label("efficient_rank"),
+        rank(metrics.c.avg_consumption, partition_by=metrics.c.avg_consumption > 0).label("least_efficient_rank"),
+        func.sum(metrics.c.distance).over().label("fleet_distance"),
+    ).subquery()
+    ranked_stmt = select(ranked).where(or_(
+        ranked.c.expensive_rank <= FLEET_RANKING_SIZE,
+        ranked.c.cost_per_km_rank <= FLEET_RANKING_SIZE,
+        ranked.c.efficient_rank <= FLEET_RANKING_SIZE,
+        and_(ranked.c.avg_consumption > 0, ranked.c.least_efficient_rank <= FLEET_RANKING_SIZE),
+    ))
+    rows = (await db.execute(ranked_stmt)).all()
+
+    # 4. Total e custos por categoria da frota
+    categories_stmt = select(
+        func.sum(DailyRollup.total_cost).label("total_cost"),
+        *(func.sum(getattr(DailyRollup, column)).label(column) for column in COST_COLUMNS.values()),
+    ).where(DailyRollup.organization_id == organization_id, DailyRollup.day.between(start_date, end_date))
+    categories = (await db.execute(categories_stmt)).one()
+    costs_by_category = {
+        str(cost_type.value): float(getattr(categories, column))
+        for cost_type, column in COST_COLUMNS.items()
+        if getattr(categories, column)
+    }
+
+    def ranking(rank_column: str, value_column: str, unit: str, only_positive: bool = False) -> List[VehicleRankingEntry]:
+        selected = sorted(
+            (row for row in rows if getattr(row, rank_column) <= FLEET_RANKING_SIZE and (not only_positive or row.avg_consumption > 0)),
+            key=lambda row: getattr(row, rank_column),
+        )
+        return [
+            VehicleRankingEntry(vehicle_id=row.vehicle_id, vehicle_identifier=row.identifier, value=float(getattr(row, value_column)), unit=unit)
+            for row in selected
+        ]
+
+    # 5. Montar o objeto final do relatório
+    total_fleet_cost = float(categories.total_cost or 0)
+    total_fleet_distance = float(rows[0].fleet_distance or 0) if rows else 0.0
     summary = FleetReportSummary(
         total_cost=total_fleet_cost,
         total_distance_km=total_fleet_distance,
         overall_cost_per_km=(total_fleet_cost / total_fleet_distance) if total_fleet_distance > 0 else 0
     )
 
-    report_data = FleetManagementReport(
+    return FleetManagementReport(
         report_period_start=start_date,
         report_period_end=end_date,
         generated_at=datetime.utcnow(),
         summary=summary,
         costs_by_category=costs_by_category,
-        top_5_most_expensive_vehicles=[VehicleRankingEntry(vehicle_id=v['id'], vehicle_identifier=v['identifier'], value=v['total_cost'], unit='R$') for v in top_expensive],
-        top_5_highest_cost_per_km_vehicles=[VehicleRankingEntry(vehicle_id=v['id'], vehicle_identifier=v['identifier'], value=v['cost_per_km'], unit='R$/km') for v in top_cost_per_km],
-        top_5_most_efficient_vehicles=[VehicleRankingEntry(vehicle_id=v['id'], vehicle_identifier=v['identifier'], value=v['avg_consumption'], unit='km/l') for v in top_efficient],
-        top_5_least_efficient_vehicles=[VehicleRankingEntry(vehicle_id=v['id'], vehicle_identifier=v['identifier'], value=v['avg_consumption'], unit='km/l') for v in least_efficient]
+        top_5_most_expensive_vehicles=ranking("expensive_rank", "total_cost", "R$"),
+        top_5_highest_cost_per_km_vehicles=ranking("cost_per_km_rank", "cost_per_km", "R$/km"),
+        top_5_most_efficient_vehicles=ranking("efficient_rank", "avg_consumption", "km/l"),
+        top_5_least_efficient_vehicles=ranking("least_efficient_rank", "avg_consumption", "km/l", only_positive=True),
     )
-    
-    return report_data
 
 def _format_relative_time(dt: datetime) -> str:
     """Formata um datetime em uma string de tempo relativo (ex: 'há 5 minutos')."""
@@ -166,62 +194,65 @@ async def get_dashboard_kpis(db: AsyncSession, *, organization_id: int) -> dict:
 
 
 async def get_costs_by_category_last_30_days(db: AsyncSession, *, organization_id: int, start_date: date | None = None) -> List[CostByCategory]:
-    """Agrega os custos totais por categoria. Usa os últimos 30 dias se start_date não for fornecido."""
+    """
+    Agrega os custos totais por categoria a partir da consolidação diária.
+    Usa os últimos 30 dias se start_date não for fornecido.
+    """
     if not start_date:
         start_date = datetime.utcnow().date() - timedelta(days=30)
-    
-    stmt = (
-        select(
-            VehicleCost.cost_type,
-            func.sum(VehicleCost.amount).label("total_amount")
-        )
-        .where(
-            VehicleCost.organization_id == organization_id,
-            VehicleCost.date >= start_date
-        )
-        .group_by(VehicleCost.cost_type)
-        .order_by(func.sum(VehicleCost.amount).desc())
+
+    stmt = select(
+        *(func.sum(getattr(DailyRollup, column)).label(column) for column in COST_COLUMNS.values())
+    ).where(
+        DailyRollup.organization_id == organization_id,
+        DailyRollup.day >= start_date
     )
-    
-    result = await db.execute(stmt)
-    return [CostByCategory(cost_type=row.cost_type.value, total_amount=float(row.total_amount or 0)) for row in result.all()]
+    totals = (await db.execute(stmt)).one()
+    categories = [
+        CostByCategory(cost_type=cost_type.value, total_amount=float(getattr(totals, column)))
+        for cost_type, column in COST_COLUMNS.items()
+        if getattr(totals, column)
+    ]
+    return sorted(categories, key=lambda category: category.total_amount, reverse=True)
 
 
-async def get_podium_drivers(db: AsyncSession, *, organization_id: int) -> List[DashboardPodiumDriver]:
-    leaderboard_data = await crud.user.get_leaderboard_data(db, organization_id=organization_id)
+async def get_podium_drivers(db: AsyncSession, *, organization_id: int, sector: str | None = None) -> List[DashboardPodiumDriver]:
+    leaderboard_data = await crud.user.get_leaderboard_data(db, organization_id=organization_id, sector=sector)
     top_drivers_raw = leaderboard_data.get("leaderboard", [])[:3]
-    return [DashboardPodiumDriver.model_validate(driver_data) for driver_data in top_drivers_raw]
+    return [DashboardPodiumDriver.model_validate(driver_data, from_attributes=True) for driver_data in top_drivers_raw]
 
 
-async def get_km_per_day_last_30_days(db: AsyncSession, *, organization_id: int, start_date: date | None = None) -> List[KmPerDay]:
-    """Calcula a distância/duração total por dia. Usa os últimos 30 dias se start_date não for fornecido."""
+async def get_km_per_day_last_30_days(
+    db: AsyncSession, *, organization_id: int, start_date: date | None = None, sector: str | None = None
+) -> List[KmPerDay]:
+    """
+    Calcula a distância/duração total por dia a partir da consolidação diária. Usa os últimos
+    30 dias se start_date não for fornecido. O setor da organização é carregado se não for informado.
+    """
     if not start_date:
         start_date = datetime.utcnow().date() - timedelta(days=30)
-        
-    org = await db.get(Organization, organization_id)
-    if not org:
-        return []
 
-    if org.sector == 'agronegocio':
-        distance_col = func.sum(Journey.end_engine_hours - Journey.start_engine_hours)
-        filter_col = Journey.end_engine_hours.is_not(None)
-    else:
-        distance_col = func.sum(Journey.end_mileage - Journey.start_mileage)
-        filter_col = Journey.end_mileage.is_not(None)
+    if sector is None:
+        org = await db.get(Organization, organization_id)
+        if not org:
+            return []
+        sector = org.sector
+
+    distance_col = DailyRollup.engine_hours if sector == 'agronegocio' else DailyRollup.km
 
     stmt = (
         select(
-            func.date(Journey.start_time).label("date"),
-            distance_col.label("total_km")
+            DailyRollup.day.label("date"),
+            func.sum(distance_col).label("total_km")
         )
         .where(
-            Journey.organization_id == organization_id,
-            Journey.is_active == False,
-            func.date(Journey.start_time) >= start_date,
-            filter_col
+            DailyRollup.organization_id == organization_id,
+            DailyRollup.day >= start_date
         )
-        .group_by(func.date(Journey.start_time))
-        .order_by(func.date(Journey.start_time))
+        .group_by(DailyRollup.day)
+        # Dias só com custos ou abastecimentos não entram
+        .having(func.sum(DailyRollup.journey_count) > 0)
+        .order_by(DailyRollup.day)
     )
 
     result = await db.execute(stmt)
@@ -255,16 +286,22 @@ async def get_upcoming_maintenances(db: AsyncSession, *, organization_id: int) -
 
 # --- NOVAS FUNÇÕES PARA O DASHBOARD AVANÇADO ---
 
-async def get_efficiency_kpis(db: AsyncSession, *, organization_id: int, start_date: date) -> KpiEfficiency:
-    """Calcula KPIs de eficiência como custo por km e taxa de utilização."""
-    costs_stmt = select(func.sum(VehicleCost.amount)).where(
-        VehicleCost.organization_id == organization_id,
-        VehicleCost.date >= start_date
+async def get_efficiency_kpis(
+    db: AsyncSession, *, organization_id: int, start_date: date, km_per_day: Optional[List[KmPerDay]] = None
+) -> KpiEfficiency:
+    """
+    Calcula KPIs de eficiência como custo por km e taxa de utilização.
+    Reaproveita `km_per_day` quando já foi calculado para o mesmo período.
+    """
+    costs_stmt = select(func.sum(DailyRollup.total_cost)).where(
+        DailyRollup.organization_id == organization_id,
+        DailyRollup.day >= start_date
     )
     total_costs = (await db.execute(costs_stmt)).scalar_one_or_none() or 0
 
-    km_data = await get_km_per_day_last_30_days(db, organization_id=organization_id, start_date=start_date)
-    total_km = sum(item.total_km for item in km_data)
+    if km_per_day is None:
+        km_per_day = await get_km_per_day_last_30_days(db, organization_id=organization_id, start_date=start_date)
+    total_km = sum(item.total_km for item in km_per_day)
     
     cost_per_km = (total_costs / total_km) if total_km > 0 else 0
 
@@ -327,9 +364,9 @@ async def get_active_goal_with_progress(db: AsyncSession, *, organization_id: in
 
     current_value = 0
     if active_goal.unit == "R$":
-        costs_stmt = select(func.sum(VehicleCost.amount)).where(
-            VehicleCost.organization_id == organization_id,
-            VehicleCost.date.between(active_goal.period_start, active_goal.period_end)
+        costs_stmt = select(func.sum(DailyRollup.total_cost)).where(
+            DailyRollup.organization_id == organization_id,
+            DailyRollup.day.between(active_goal.period_start, active_goal.period_end)
         )
         current_value = (await db.execute(costs_stmt)).scalar_one_or_none() or 0
 
@@ -350,7 +387,75 @@ async def get_vehicle_positions(db: AsyncSession, *, organization_id: int) -> Li
     )
     result = await db.execute(stmt)
     vehicles = result.scalars().all()
-    return [VehiclePosition.from_orm(v) for v in vehicles]
+    return [_to_vehicle_position(v) for v in vehicles]
+
+
+def _to_vehicle_position(vehicle: Vehicle) -> VehiclePosition:
+    return VehiclePosition(
+        id=vehicle.id,
+        license_plate=vehicle.license_plate,
+        identifier=vehicle.identifier,
+        latitude=vehicle.last_latitude,
+        longitude=vehicle.last_longitude,
+        status=vehicle.status.value,
+    )
+
+
+async def get_vehicle_position_clusters(
+    db: AsyncSession,
+    *,
+    organization_id: int,
+    zoom: int,
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    statuses: Optional[List[VehicleStatus]] = None,
+) -> VehicleClusterResponse:
+    """
+    Agrupa as posições da frota na área visível a partir da grade pré-calculada do índice
+    de veículos. O tamanho do grupo acompanha o zoom (tiles de 256 px); quando ele fica
+    menor que a célula do índice e há poucos veículos na área, retorna os veículos individuais.
+    """
+    await vehicle_index.ensure_loaded(db, organization_id)
+    cluster_degrees = 360 / (256 * 2 ** zoom) * settings.MAP_CLUSTER_RADIUS_PX
+
+    if cluster_degrees < vehicle_index.cell_degrees:
+        indexed = vehicle_index.within_bbox(organization_id, min_lat, min_lon, max_lat, max_lon, statuses)
+        if len(indexed) <= settings.MAP_CLUSTER_MAX_VEHICLES:
+            if not indexed:
+                return VehicleClusterResponse(zoom=zoom)
+            stmt = select(Vehicle).where(
+                Vehicle.organization_id == organization_id,
+                Vehicle.id.in_([v.vehicle_id for v in indexed]),
+                Vehicle.last_latitude.is_not(None),
+                Vehicle.last_longitude.is_not(None),
+            )
+            vehicles = (await db.execute(stmt)).scalars().all()
+            # A posição do índice pode estar à frente do banco (buffer de escrita das posições)
+            by_id = {v.vehicle_id: v for v in indexed}
+            positions = []
+            for vehicle in vehicles:
+                position = _to_vehicle_position(vehicle)
+                position.latitude, position.longitude = by_id[vehicle.id].latitude, by_id[vehicle.id].longitude
+                positions.append(position)
+            return VehicleClusterResponse(zoom=zoom, vehicles=positions)
+
+    groups = vehicle_index.clusters(
+        organization_id, min_lat, min_lon, max_lat, max_lon, cluster_degrees, statuses
+    )
+    return VehicleClusterResponse(
+        zoom=zoom,
+        clusters=[
+            VehicleCluster(
+                latitude=group["latitude"],
+                longitude=group["longitude"],
+                count=group["count"],
+                status_counts={status.value: count for status, count in group["status_counts"].items()},
+            )
+            for group in groups
+        ],
+    )
     
 
 # --- FUNÇÃO PRINCIPAL ATUALIZADA ---
@@ -388,7 +493,7 @@ async def get_vehicle_consolidated_data(
     if sections.fuel_logs_detailed or sections.performance_summary:
         fuel_logs_stmt = select(FuelLog).where(
             FuelLog.vehicle_id == vehicle_id,
-            func.date(FuelLog.timestamp).between(start_date, end_date)
+            within_days(FuelLog.timestamp, start_date, end_date)
         )
         fuel_logs_data = (await db.execute(fuel_logs_stmt)).scalars().all()
         
@@ -396,7 +501,7 @@ async def get_vehicle_consolidated_data(
     if sections.maintenance_detailed:
         maintenance_stmt = select(MaintenanceRequest).where(
             MaintenanceRequest.vehicle_id == vehicle_id,
-            func.date(MaintenanceRequest.created_at).between(start_date, end_date)
+            within_days(MaintenanceRequest.created_at, start_date, end_date)
         ).options(selectinload(MaintenanceRequest.comments))
         maintenance_data = (await db.execute(maintenance_stmt)).scalars().unique().all()
 
@@ -412,7 +517,7 @@ async def get_vehicle_consolidated_data(
     if sections.journeys_detailed or sections.performance_summary or sections.financial_summary:
         journeys_stmt = select(Journey).where(
             Journey.vehicle_id == vehicle_id,
-            func.date(Journey.start_time).between(start_date, end_date),
+            within_days(Journey.start_time, start_date, end_date),
             Journey.is_active == False
         )
         journeys_data = (await db.execute(journeys_stmt)).scalars().all()
@@ -518,75 +623,84 @@ async def get_driver_performance_data(
 ) -> DriverPerformanceReport:
     """
     Busca e agrega dados de desempenho para todos os motoristas de uma organização
-    em um período específico.
+    em um período específico, numa única consulta: viagens e abastecimentos vêm da
+    consolidação diária agrupada por motorista e as solicitações de manutenção de um
+    agrupamento por quem as abriu. O número de consultas não cresce com os motoristas.
     """
-    # 1. Busca todos os motoristas da organização
-    drivers_stmt = select(User).where(
-        User.organization_id == organization_id, 
-        User.role == 'driver'
-    )
-    drivers = (await db.execute(drivers_stmt)).scalars().all()
-
-    drivers_performance_data: List[DriverPerformanceEntry] = []
-
-    # 2. Itera sobre cada motorista para coletar e agregar seus dados
-    for driver in drivers:
-        # Métricas de Viagens (Journeys)
-        journeys_stmt = select(func.count(Journey.id), func.sum(Journey.distance_km)).where(
-            Journey.driver_id == driver.id,
-            func.date(Journey.start_time).between(start_date, end_date)
+    # 1. Métricas de viagens (distância pelo GPS) e de combustível por motorista
+    activity = (
+        select(
+            DailyRollup.driver_id,
+            func.sum(DailyRollup.journey_count).label("journeys"),
+            func.sum(DailyRollup.gps_km).label("distance"),
+            func.sum(DailyRollup.liters).label("liters"),
+            func.sum(DailyRollup.fuel_cost).label("fuel_cost"),
         )
-        journey_metrics = (await db.execute(journeys_stmt)).first()
-        total_journeys = journey_metrics[0] or 0
-        total_distance = float(journey_metrics[1] or 0.0)
-
-        # Métricas de Combustível (FuelLog)
-        fuel_stmt = select(func.sum(FuelLog.liters), func.sum(FuelLog.total_cost)).where(
-            FuelLog.user_id == driver.id,
-            func.date(FuelLog.timestamp).between(start_date, end_date)
+        .where(
+            DailyRollup.organization_id == organization_id,
+            DailyRollup.day.between(start_date, end_date),
+            DailyRollup.driver_id.is_not(None),
         )
-        fuel_metrics = (await db.execute(fuel_stmt)).first()
-        total_liters = float(fuel_metrics[0] or 0.0)
-        total_fuel_cost = float(fuel_metrics[1] or 0.0)
-
-        # Métricas de Manutenção
-        maintenance_stmt = select(func.count(MaintenanceRequest.id)).where(
-            MaintenanceRequest.reported_by_id == driver.id,
-            func.date(MaintenanceRequest.created_at).between(start_date, end_date)
+        .group_by(DailyRollup.driver_id)
+        .subquery()
+    )
+    # 2. Solicitações de manutenção abertas por motorista
+    maintenance = (
+        select(MaintenanceRequest.reported_by_id, func.count(MaintenanceRequest.id).label("requests"))
+        .where(
+            MaintenanceRequest.organization_id == organization_id,
+            within_days(MaintenanceRequest.created_at, start_date, end_date),
         )
-        maintenance_count = (await db.execute(maintenance_stmt)).scalar_one_or_none() or 0
-        
-        # Cálculos derivados
-        avg_consumption = (total_distance / total_liters) if total_liters > 0 else 0
-        cost_per_km = (total_fuel_cost / total_distance) if total_distance > 0 else 0
+        .group_by(MaintenanceRequest.reported_by_id)
+        .subquery()
+    )
 
-        drivers_performance_data.append(
-            DriverPerformanceEntry(
-                driver_id=driver.id,
-                driver_name=driver.full_name,
-                total_journeys=total_journeys,
-                total_distance_km=total_distance,
-                total_fuel_liters=total_liters,
-                average_consumption=avg_consumption,
-                total_fuel_cost=total_fuel_cost,
-                cost_per_km=cost_per_km,
-                maintenance_requests=maintenance_count,
-            )
+    # 3. Todos os motoristas (mesmo sem atividade), com os indicadores derivados,
+    #    ordenados pelo principal indicador (ex: Custo por KM)
+    distance = func.coalesce(activity.c.distance, 0.0)
+    liters = func.coalesce(activity.c.liters, 0.0)
+    fuel_cost = func.coalesce(activity.c.fuel_cost, 0.0)
+    cost_per_km = case((distance > 0, fuel_cost / distance), else_=0.0)
+    stmt = (
+        select(
+            User.id,
+            User.full_name,
+            func.coalesce(activity.c.journeys, 0).label("journeys"),
+            distance.label("distance"),
+            liters.label("liters"),
+            fuel_cost.label("fuel_cost"),
+            case((liters > 0, distance / liters), else_=0.0).label("avg_consumption"),
+            cost_per_km.label("cost_per_km"),
+            func.coalesce(maintenance.c.requests, 0).label("maintenance_requests"),
         )
-
-    # 3. Ordena o ranking pelo principal indicador (ex: Custo por KM)
-    sorted_performance_data = sorted(drivers_performance_data, key=lambda d: d.cost_per_km, reverse=True)
+        .outerjoin(activity, activity.c.driver_id == User.id)
+        .outerjoin(maintenance, maintenance.c.reported_by_id == User.id)
+        .where(User.organization_id == organization_id, User.role == UserRole.DRIVER)
+        .order_by(cost_per_km.desc(), User.id)
+    )
+    rows = (await db.execute(stmt)).all()
 
     # 4. Monta o objeto final do relatório
-    report_data = DriverPerformanceReport(
+    return DriverPerformanceReport(
         report_period_start=start_date,
         report_period_end=end_date,
         generated_at=datetime.utcnow(),
-        drivers_performance=sorted_performance_data
+        drivers_performance=[
+            DriverPerformanceEntry(
+                driver_id=row.id,
+                driver_name=row.full_name,
+                total_journeys=int(row.journeys),
+                total_distance_km=float(row.distance),
+                total_fuel_liters=float(row.liters),
+                average_consumption=float(row.avg_consumption),
+                total_fuel_cost=float(row.fuel_cost),
+                cost_per_km=float(row.cost_per_km),
+                maintenance_requests=int(row.maintenance_requests),
+            )
+            for row in rows
+        ],
     )
 
-    return report_data
-
 # --- Adicionando a função de `get_driver_activity_data` que estava faltando ---
 async def get_driver_activity_data(db: AsyncSession, driver_id: int, organization_id: int, date_from: date, date_to: date) -> Dict[str, Any]:
     driver = await crud.user.get(db, id=driver_id)
@@ -595,7 +709,7 @@ async def get_driver_activity_data(db: AsyncSession, driver_id: int, organizatio
     
     journeys_stmt = select(Journey).where(
         Journey.driver_id == driver_id,
-        func.date(Journey.start_time).between(date_from, date_to)
+        within_days(Journey.start_time, date_from, date_to)
     ).order_by(Journey.start_time.desc())
     
     journeys = (await db.execute(journeys_stmt)).scalars().all()
@@ -0,0 +1,203 @@
+# backend/app/crud/crud_report_job.py
+
+import gzip
+import hashlib
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Tuple, Union
+
+from pydantic import BaseModel
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.track_codec import as_utc
+from app.crud import crud_export, crud_report
+from app.models.report_job_model import ReportJob, ReportJobStatus, ReportJobType
+from app.schemas.export_schema import ParquetExportJobCreate
+from app.schemas.report_job_schema import ReportJobCreate
+
+ACTIVE_STATUSES = (ReportJobStatus.PENDING, ReportJobStatus.RUNNING)
+FINISHED_STATUSES = (ReportJobStatus.DONE, ReportJobStatus.FAILED)
+
+JobCreate = Union[ReportJobCreate, ParquetExportJobCreate]
+
+
+def dedupe_key(*, organization_id: int, job_in: JobCreate) -> str:
+    payload = json.dumps(
+        {"organization_id": organization_id, **job_in.model_dump(mode="json")}, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _covers_closed_period(job: ReportJob) -> bool:
+    """Indica se o período do relatório terminou antes do dia (UTC) em que ele foi calculado."""
+    end_date = job.params.get("end_date")
+    return end_date is not None and date.fromisoformat(end_date) < as_utc(job.started_at).date()
+
+
+async def _find_reusable(db: AsyncSession, *, key: str) -> Optional[ReportJob]:
+    """
+    Job com a mesma chave ainda na fila ou em execução ou, não havendo, concluído com
+    resultado válido sobre um período já encerrado quando foi calculado. Um relatório que
+    inclui o dia do cálculo ficaria defasado com os registros lançados depois, então não é
+    reaproveitado.
+    """
+    stmt = (
+        select(ReportJob)
+        .where(
+            ReportJob.dedupe_key == key,
+            or_(
+                ReportJob.status.in_(ACTIVE_STATUSES),
+                (ReportJob.status == ReportJobStatus.DONE) & (ReportJob.expires_at > datetime.now(timezone.utc)),
+            ),
+        )
+        .order_by(ReportJob.created_at.desc())
+    )
+    for job in (await db.execute(stmt)).scalars():
+        if job.status in ACTIVE_STATUSES or _covers_closed_period(job):
+            return job
+    return None
+
+
+async def submit(
+    db: AsyncSession, *, job_in: JobCreate, organization_id: int, requested_by_id: Optional[int] = None,
+    extra_params: Optional[dict] = None, run_after: Optional[datetime] = None,
+) -> Tuple[ReportJob, bool]:
+    """
+    Enfileira o relatório e retorna (job, criado). Um pedido idêntico a outro da mesma
+    organização que ainda está na fila, em execução ou com resultado válido de um período
+    encerrado devolve esse job.
+    O índice único parcial de `dedupe_key` resolve pedidos idênticos simultâneos.
+    `extra_params` são guardados com os parâmetros sem entrar na chave; o job só é executado
+    a partir de `run_after`, se informado.
+    """
+    key = dedupe_key(organization_id=organization_id, job_in=job_in)
+    existing = await _find_reusable(db, key=key)
+    if existing is not None:
+        return existing, False
+
+    job = ReportJob(
+        report_type=job_in.report_type, params={**job_in.model_dump(mode="json"), **(extra_params or {})},
+        dedupe_key=key, status=ReportJobStatus.PENDING, run_after=run_after, organization_id=organization_id,
+        requested_by_id=requested_by_id,
+    )
+    db.add(job)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        existing = await _find_reusable(db, key=key)
+        if existing is None:
+            raise
+        return existing, False
+    await db.refresh(job)
+    return job, True
+
+
+async def get(db: AsyncSession, *, job_id: int, organization_id: int) -> Optional[ReportJob]:
+    stmt = select(ReportJob).where(ReportJob.id == job_id, ReportJob.organization_id == organization_id)
+    return (await db.execute(stmt.execution_options(populate_existing=True))).scalars().first()
+
+
+async def claim(db: AsyncSession, *, job_id: Optional[int] = None) -> Optional[ReportJob]:
+    """
+    Marca um job como em execução e o retorna: o indicado ou, sem `job_id`, o mais antigo na
+    fila cujo `run_after` já passou. Jobs em execução há mais de `REPORT_JOB_TIMEOUT_SECONDS` (o processo que os pegou
+    caiu) voltam a ser elegíveis. O UPDATE condicional garante que só um worker, de qualquer
+    processo, pegue cada job. Faz commit.
+    """
+    now = datetime.now(timezone.utc)
+    claimable = or_(
+        (ReportJob.status == ReportJobStatus.PENDING) & or_(ReportJob.run_after.is_(None), ReportJob.run_after <= now),
+        (ReportJob.status == ReportJobStatus.RUNNING)
+        & (ReportJob.started_at < now - timedelta(seconds=settings.REPORT_JOB_TIMEOUT_SECONDS)),
+    )
+    if job_id is None:
+        job_id = (await db.execute(
+            select(ReportJob.id).where(claimable).order_by(ReportJob.created_at, ReportJob.id).limit(1)
+        )).scalar_one_or_none()
+        if job_id is None:
+            return None
+
+    claimed = await db.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job_id, claimable)
+        .values(status=ReportJobStatus.RUNNING, started_at=now, attempts=ReportJob.attempts + 1)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if claimed.rowcount != 1:
+        return None
+    return await db.get(ReportJob, job_id, populate_existing=True)
+
+
+async def compute(db: AsyncSession, *, job: ReportJob) -> Union[BaseModel, crud_export.ParquetArchive]:
+    """Calcula o relatório do job com as mesmas funções dos endpoints síncronos, ou monta a exportação."""
+    if job.report_type == ReportJobType.PARQUET_EXPORT:
+        export = ParquetExportJobCreate.model_validate(job.params)
+        return await crud_export.build_parquet_archive(
+            db, export.dataset, organization_id=job.organization_id, start_date=export.start_date,
+            end_date=export.end_date, after_id=export.after_id, until_id=job.params.get("until_id"),
+        )
+    params = ReportJobCreate.model_validate(job.params)
+    if job.report_type == ReportJobType.FLEET_MANAGEMENT:
+        return await crud_report.get_fleet_management_data(
+            db, start_date=params.start_date, end_date=params.end_date, organization_id=job.organization_id
+        )
+    if job.report_type == ReportJobType.DRIVER_PERFORMANCE:
+        return await crud_report.get_driver_performance_data(
+            db, start_date=params.start_date, end_date=params.end_date, organization_id=job.organization_id
+        )
+    return await crud_report.get_vehicle_consolidated_data(
+        db, vehicle_id=params.vehicle_id, start_date=params.start_date, end_date=params.end_date,
+        sections=params.sections, organization_id=job.organization_id,
+    )
+
+
+async def _finish(db: AsyncSession, job: ReportJob, **values) -> ReportJob:
+    now = datetime.now(timezone.utc)
+    for field, value in values.items():
+        setattr(job, field, value)
+    job.finished_at = now
+    job.expires_at = now + timedelta(seconds=settings.REPORT_JOB_RESULT_TTL_SECONDS)
+    db.add(job)
+    await db.commit()
+    return job
+
+
+async def complete(db: AsyncSession, *, job: ReportJob, report: Union[BaseModel, crud_export.ParquetArchive]) -> ReportJob:
+    """
+    Guarda o JSON do relatório comprimido com gzip (ou o ZIP da exportação, já comprimido),
+    válido por `REPORT_JOB_RESULT_TTL_SECONDS`.
+    """
+    if isinstance(report, crud_export.ParquetArchive):
+        return await _finish(
+            db, job, status=ReportJobStatus.DONE, result=report.content, result_size=len(report.content),
+            result_metadata={"rows": report.rows, "last_id": report.last_id}, error=None,
+        )
+    payload = report.model_dump_json().encode()
+    return await _finish(
+        db, job, status=ReportJobStatus.DONE, result=gzip.compress(payload), result_size=len(payload), error=None
+    )
+
+
+async def fail(db: AsyncSession, *, job: ReportJob, error: str) -> ReportJob:
+    """Registra a falha; o job expira como os concluídos, e um novo pedido idêntico recomeça do zero."""
+    return await _finish(db, job, status=ReportJobStatus.FAILED, error=error[:1000])
+
+
+def is_expired(job: ReportJob) -> bool:
+    return job.expires_at is not None and as_utc(job.expires_at) <= datetime.now(timezone.utc)
+
+
+async def purge_expired(db: AsyncSession) -> int:
+    """Remove os jobs concluídos ou com falha cuja validade passou. Retorna quantos foram removidos."""
+    result = await db.execute(
+        delete(ReportJob).where(
+            ReportJob.status.in_(FINISHED_STATUSES), ReportJob.expires_at <= datetime.now(timezone.utc)
+        )
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,249 @@
+# backend/app/crud/crud_rollup.py
+
+import math
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Connection, delete, event, inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.periods import within_days
+from app.core.track_codec import as_utc
+from app.models.daily_rollup_model import COST_COLUMNS, METRICS, ROLLUP_KEY, DailyRollup
+from app.models.fuel_log_model import FuelLog
+from app.models.journey_model import Journey
+from app.models.vehicle_cost_model import VehicleCost
+from app.models.vehicle_model import Vehicle
+
+# (organização, veículo, motorista, dia)
+RollupKey = Tuple[int, int, Optional[int], date]
+Deltas = Dict[RollupKey, Dict[str, float]]
+
+_PENDING_KEY = "rollup_pending"
+
+
+def _cost_contribution(row) -> Optional[Tuple[RollupKey, Dict[str, float]]]:
+    return (row.organization_id, row.vehicle_id, None, row.date), {
+        "total_cost": row.amount, COST_COLUMNS[row.cost_type]: row.amount,
+    }
+
+
+def _fuel_contribution(row) -> Optional[Tuple[RollupKey, Dict[str, float]]]:
+    day = as_utc(row.timestamp).date()
+    return (row.organization_id, row.vehicle_id, row.user_id, day), {
+        "liters": row.liters or 0.0, "fuel_cost": row.total_cost or 0.0,
+    }
+
+
+def _journey_contribution(row) -> Optional[Tuple[RollupKey, Dict[str, float]]]:
+    # Só viagens encerradas contam, no dia em que começaram (como nos relatórios)
+    if row.is_active:
+        return None
+    values = {"journey_count": 1, "gps_km": row.distance_km or 0.0}
+    if row.end_mileage is not None:
+        values["km"] = row.end_mileage - row.start_mileage
+    if row.end_engine_hours is not None and row.start_engine_hours is not None:
+        values["engine_hours"] = row.end_engine_hours - row.start_engine_hours
+    return (row.organization_id, row.vehicle_id, row.driver_id, as_utc(row.start_time).date()), values
+
+
+# Por modelo de origem: colunas lidas, contribuição de cada linha e filtro de dias [start, end]
+_SOURCES: Dict[type, Tuple[tuple, Callable, Callable]] = {
+    VehicleCost: (
+        (VehicleCost.organization_id, VehicleCost.vehicle_id, VehicleCost.date, VehicleCost.cost_type, VehicleCost.amount),
+        _cost_contribution,
+        lambda start, end: VehicleCost.date.between(start, end),
+    ),
+    FuelLog: (
+        (FuelLog.organization_id, FuelLog.vehicle_id, FuelLog.user_id, FuelLog.timestamp, FuelLog.liters, FuelLog.total_cost),
+        _fuel_contribution,
+        lambda start, end: within_days(FuelLog.timestamp, start, end),
+    ),
+    Journey: (
+        (
+            Journey.organization_id, Journey.vehicle_id, Journey.driver_id, Journey.start_time, Journey.is_active,
+            Journey.start_mileage, Journey.end_mileage, Journey.start_engine_hours, Journey.end_engine_hours,
+            Journey.distance_km,
+        ),
+        _journey_contribution,
+        lambda start, end: within_days(Journey.start_time, start, end),
+    ),
+}
+
+
+def _fold(rows: Iterable, contribution: Callable, sign: int, into: Deltas) -> Deltas:
+    for row in rows:
+        item = contribution(row)
+        if item is None:
+            continue
+        key, values = item
+        totals = into.setdefault(key, {})
+        for metric, value in values.items():
+            totals[metric] = totals.get(metric, 0.0) + sign * value
+    return into
+
+
+def _fold_ids(conn: Connection, model: type, ids: Sequence[int], sign: int, into: Deltas, *, lock: bool = False) -> Deltas:
+    """
+    Soma (ou subtrai) a contribuição atual no banco das linhas `ids` do modelo. Com `lock`, trava
+    as linhas (`FOR UPDATE`) até o fim da transação: a contribuição lida antes de uma escrita
+    não pode mudar por uma transação concorrente antes de a diferença ser gravada.
+    """
+    if not ids:
+        return into
+    columns, contribution, _ = _SOURCES[model]
+    stmt = select(*columns).where(model.id.in_(ids))
+    if lock:
+        stmt = stmt.order_by(model.id).with_for_update()
+    return _fold(conn.execute(stmt), contribution, sign, into)
+
+
+def _is_zero(values: Dict[str, float]) -> bool:
+    return all(math.isclose(value, 0.0, abs_tol=1e-9) for value in values.values())
+
+
+def _apply(conn: Connection, deltas: Deltas) -> int:
+    """
+    Soma as diferenças às linhas da consolidação com um único upsert (`valor = valor + delta`),
+    o que mantém corretas escritas concorrentes no mesmo dia sem ler a linha antes.
+    As chaves são ordenadas para que transações concorrentes travem as linhas na mesma ordem.
+    """
+    rows = [
+        {
+            "organization_id": organization_id, "vehicle_id": vehicle_id, "driver_id": driver_id, "day": day,
+            **{metric: values.get(metric, 0) for metric in METRICS},
+        }
+        for (organization_id, vehicle_id, driver_id, day), values in sorted(
+            deltas.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] or 0, item[0][3])
+        )
+        if not _is_zero(values)
+    ]
+    if not rows:
+        return 0
+    insert = postgresql_insert if conn.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(DailyRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={metric: getattr(DailyRollup, metric) + getattr(stmt.excluded, metric) for metric in METRICS},
+    )
+    conn.execute(stmt)
+    return len(rows)
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_previous(session: Session, flush_context, instances) -> None:
+    """Subtrai a contribuição (ainda no banco) dos registros alterados ou removidos neste flush."""
+    session.info.pop(_PENDING_KEY, None)
+    new = {model: [] for model in _SOURCES}
+    previous = {model: [] for model in _SOURCES}
+    for obj in session.new:
+        if type(obj) in _SOURCES:
+            new[type(obj)].append(obj)
+    for obj in session.dirty:
+        if type(obj) in _SOURCES and session.is_modified(obj):
+            previous[type(obj)].append(inspect(obj).identity[0])
+    for obj in session.deleted:
+        if type(obj) in _SOURCES:
+            previous[type(obj)].append(inspect(obj).identity[0])
+    if not any(new.values()) and not any(previous.values()):
+        return
+
+    conn = session.connection()
+    deltas: Deltas = {}
+    for model, ids in previous.items():
+        _fold_ids(conn, model, ids, -1, deltas, lock=True)
+    # Veículos removidos levam a consolidação junto (ON DELETE CASCADE)
+    removed_vehicles = {inspect(obj).identity[0] for obj in session.deleted if isinstance(obj, Vehicle)}
+    session.info[_PENDING_KEY] = (new, previous, deltas, removed_vehicles)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_pending(session: Session, flush_context) -> None:
+    """Soma a contribuição nova dos registros inseridos ou alterados e grava as diferenças."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    new, previous, deltas, removed_vehicles = pending
+    conn = session.connection()
+    for model in _SOURCES:
+        # Os removidos também estão em `previous`, mas não voltam mais na consulta
+        ids = [obj.id for obj in new[model]] + previous[model]
+        _fold_ids(conn, model, ids, 1, deltas)
+    _apply(conn, {key: values for key, values in deltas.items() if key[1] not in removed_vehicles})
+
+
+@asynccontextmanager
+async def tracking_bulk_changes(db: AsyncSession, *, model: type, ids: Sequence[int]) -> AsyncIterator[None]:
+    """
+    Mantém a consolidação em dia em escritas em massa (`update(Model)`/`delete(Model)`), que
+    não passam pelo flush: lê a contribuição das linhas antes e depois do bloco e grava a
+    diferença. Não faz commit.
+    """
+    deltas: Deltas = await db.run_sync(lambda session: _fold_ids(session.connection(), model, ids, -1, {}, lock=True))
+    yield
+    await db.run_sync(lambda session: _apply(session.connection(), _fold_ids(session.connection(), model, ids, 1, deltas)))
+
+
+def _reconcile_range(session: Session, start: date, end: date, organization_id: Optional[int]) -> int:
+    conn = session.connection()
+    fresh: Deltas = {}
+    for model, (columns, contribution, day_filter) in _SOURCES.items():
+        stmt = select(*columns).where(day_filter(start, end))
+        if organization_id is not None:
+            stmt = stmt.where(model.organization_id == organization_id)
+        _fold(conn.execute(stmt), contribution, 1, fresh)
+
+    stmt = select(DailyRollup.id, DailyRollup.organization_id, DailyRollup.vehicle_id, DailyRollup.driver_id,
+                  DailyRollup.day, *(getattr(DailyRollup, metric) for metric in METRICS)
+                  ).where(DailyRollup.day.between(start, end))
+    if organization_id is not None:
+        stmt = stmt.where(DailyRollup.organization_id == organization_id)
+    stored: Dict[RollupKey, List] = {}
+    for row in conn.execute(stmt):
+        stored.setdefault((row.organization_id, row.vehicle_id, row.driver_id, row.day), []).append(row)
+
+    corrected = 0
+    stale_ids: List[int] = []
+    for key, rows in stored.items():
+        expected = fresh.pop(key, {})
+        matches = all(
+            math.isclose(sum(getattr(row, metric) for row in rows), expected.get(metric, 0.0), rel_tol=1e-9, abs_tol=1e-6)
+            for metric in METRICS
+        )
+        if matches and len(rows) == 1 and not _is_zero(expected):
+            continue
+        # Linhas divergentes, duplicadas ou zeradas são reescritas (ou apenas removidas)
+        stale_ids.extend(row.id for row in rows)
+        if not matches:
+            corrected += 1
+        fresh[key] = expected
+    corrected += sum(1 for key, values in fresh.items() if key not in stored and not _is_zero(values))
+
+    if stale_ids:
+        conn.execute(delete(DailyRollup).where(DailyRollup.id.in_(stale_ids)))
+    _apply(conn, fresh)
+    return corrected
+
+
+async def reconcile(
+    db: AsyncSession, *, start_date: date, end_date: date, organization_id: Optional[int] = None
+) -> int:
+    """
+    Recalcula a consolidação dos dias [start_date, end_date] a partir dos custos,
+    abastecimentos e viagens e reescreve só as chaves divergentes (ex: escritas em massa
+    feitas sem `tracking_bulk_changes`). Processa `ROLLUP_RECONCILE_BATCH_DAYS` dias por
+    transação, com commit a cada lote. Retorna o número de chaves corrigidas.
+    """
+    corrected = 0
+    start = start_date
+    while start <= end_date:
+        end = min(start + timedelta(days=settings.ROLLUP_RECONCILE_BATCH_DAYS - 1), end_date)
+        corrected += await db.run_sync(_reconcile_range, start, end, organization_id)
+        await db.commit()
+        start = end + timedelta(days=1)
+    return corrected
@@ -0,0 +1,179 @@
+# backend/app/crud/crud_stop.py
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.stop_detector import StopEvent, VehicleMotion, stop_detector
+from app.core.track_codec import as_utc
+from app.core.vehicle_index import haversine_km
+from app.crud import crud_track
+from app.crud.crud_geofence import GeofencePing
+from app.models.freight_order_model import FreightOrder, FreightStatus
+from app.models.stop_point_model import StopPoint, StopPointStatus
+from app.models.vehicle_stop_model import StopDetectorCheckpoint, VehicleStop
+
+
+async def _restore(db: AsyncSession, *, first_seen: Dict[int, datetime]) -> List[StopEvent]:
+    """
+    Carrega o checkpoint dos veículos ainda sem estado em memória e reprocessa os pontos do
+    histórico gravados depois dele (ex: enquanto o processo estava parado).
+    """
+    stmt = select(StopDetectorCheckpoint).where(StopDetectorCheckpoint.vehicle_id.in_(first_seen))
+    events = []
+    for checkpoint in (await db.execute(stmt)).scalars().all():
+        last_timestamp = as_utc(checkpoint.last_timestamp)
+        stop_detector.restore(checkpoint.vehicle_id, VehicleMotion(
+            checkpoint.organization_id,
+            checkpoint.last_latitude, checkpoint.last_longitude, last_timestamp,
+            checkpoint.anchor_latitude, checkpoint.anchor_longitude, as_utc(checkpoint.anchor_timestamp),
+            stopped=checkpoint.stopped,
+        ))
+        # O trajeto (blocos selados + buffer) cobre também paradas longas do processo
+        points = await crud_track.get_track_points(
+            db, vehicle_id=checkpoint.vehicle_id, start=last_timestamp, end=first_seen[checkpoint.vehicle_id]
+        )
+        replay = [p for p in points if last_timestamp < p.timestamp < first_seen[checkpoint.vehicle_id]]
+        for timestamp, latitude, longitude in replay[:settings.STOP_REPLAY_MAX_POINTS]:
+            event = stop_detector.observe(
+                checkpoint.vehicle_id, checkpoint.organization_id, latitude, longitude, timestamp
+            )
+            if event is not None:
+                events.append(event)
+    return events
+
+
+async def _confirm_arrival(db: AsyncSession, *, event: StopEvent) -> Optional[int]:
+    """Marca a chegada ao próximo ponto de parada pendente do frete em andamento, se a parada for nele."""
+    stmt = (
+        select(StopPoint)
+        .join(FreightOrder, StopPoint.freight_order_id == FreightOrder.id)
+        .where(
+            FreightOrder.vehicle_id == event.vehicle_id,
+            FreightOrder.status.in_([FreightStatus.CLAIMED, FreightStatus.IN_TRANSIT]),
+            StopPoint.status == StopPointStatus.PENDING,
+            StopPoint.actual_arrival_time.is_(None),
+            StopPoint.latitude.is_not(None),
+            StopPoint.longitude.is_not(None),
+        )
+        .order_by(FreightOrder.id, StopPoint.sequence_order)
+    )
+    radius_km = settings.STOP_ARRIVAL_RADIUS_METERS / 1000
+    for stop_point in (await db.execute(stmt)).scalars().all():
+        if haversine_km(event.latitude, event.longitude, stop_point.latitude, stop_point.longitude) <= radius_km:
+            stop_point.actual_arrival_time = event.started_at.astimezone(timezone.utc).replace(tzinfo=None)
+            return stop_point.id
+    return None
+
+
+async def _record_events(db: AsyncSession, *, events: Sequence[StopEvent]) -> None:
+    """Abre a parada no início e a fecha no fim, com a duração (sem commit)."""
+    for event in events:
+        stmt = select(VehicleStop).where(
+            VehicleStop.vehicle_id == event.vehicle_id, VehicleStop.started_at == event.started_at
+        )
+        stop = (await db.execute(stmt)).scalars().first()
+        if stop is None:
+            stop = VehicleStop(
+                vehicle_id=event.vehicle_id,
+                organization_id=event.organization_id,
+                latitude=event.latitude,
+                longitude=event.longitude,
+                started_at=event.started_at,
+                stop_point_id=await _confirm_arrival(db, event=event),
+            )
+            db.add(stop)
+        if event.ended_at is not None:
+            stop.ended_at = event.ended_at
+            stop.duration_seconds = int((event.ended_at - event.started_at).total_seconds())
+
+
+async def _save_checkpoints(db: AsyncSession, *, vehicle_ids: Sequence[int], force: Sequence[int]) -> int:
+    due = stop_detector.due_checkpoints(vehicle_ids, force=force)
+    if not due:
+        return 0
+    existing_stmt = select(StopDetectorCheckpoint.vehicle_id).where(
+        StopDetectorCheckpoint.vehicle_id.in_([vehicle_id for vehicle_id, _ in due])
+    )
+    existing = set((await db.execute(existing_stmt)).scalars().all())
+    for vehicle_id, state in due:
+        values = {
+            "organization_id": state.organization_id,
+            "last_latitude": state.last_latitude,
+            "last_longitude": state.last_longitude,
+            "last_timestamp": state.last_timestamp,
+            "anchor_latitude": state.anchor_latitude,
+            "anchor_longitude": state.anchor_longitude,
+            "anchor_timestamp": state.anchor_timestamp,
+            "stopped": state.stopped,
+        }
+        if vehicle_id in existing:
+            await db.execute(
+                update(StopDetectorCheckpoint).where(StopDetectorCheckpoint.vehicle_id == vehicle_id).values(**values)
+            )
+        else:
+            db.add(StopDetectorCheckpoint(vehicle_id=vehicle_id, **values))
+    return len(due)
+
+
+async def process_positions(db: AsyncSession, *, pings: Sequence[GeofencePing]) -> int:
+    """
+    Passa as posições (em ordem cronológica por veículo) pelo detector de paradas, grava as
+    paradas iniciadas e encerradas, confirma chegadas em pontos de parada de frete e grava o
+    checkpoint dos veículos cujo intervalo venceu. Não faz commit.
+    Retorna o número de linhas alteradas (zero quando não há nada a gravar).
+    """
+    pings = [ping for ping in pings if ping.organization_id is not None]
+    if not pings:
+        return 0
+
+    first_seen: Dict[int, datetime] = {}
+    for ping in pings:
+        if not stop_detector.is_tracked(ping.vehicle_id) and ping.vehicle_id not in first_seen:
+            first_seen[ping.vehicle_id] = as_utc(ping.timestamp or datetime.now(timezone.utc))
+    events = await _restore(db, first_seen=first_seen) if first_seen else []
+
+    for ping in pings:
+        event = stop_detector.observe(
+            ping.vehicle_id, ping.organization_id, ping.latitude, ping.longitude,
+            as_utc(ping.timestamp or datetime.now(timezone.utc)),
+        )
+        if event is not None:
+            events.append(event)
+
+    await _record_events(db, events=events)
+    checkpoints = await _save_checkpoints(
+        db, vehicle_ids=[ping.vehicle_id for ping in pings], force=[event.vehicle_id for event in events]
+    )
+    return len(events) + checkpoints
+
+
+async def get_multi_by_vehicle(
+    db: AsyncSession, *, vehicle_id: int, organization_id: int, start: datetime, end: datetime
+) -> List[VehicleStop]:
+    """Paradas do veículo que se sobrepõem ao período [start, end)."""
+    stmt = (
+        select(VehicleStop)
+        .where(
+            VehicleStop.vehicle_id == vehicle_id,
+            VehicleStop.organization_id == organization_id,
+            VehicleStop.started_at < end,
+            or_(VehicleStop.ended_at.is_(None), VehicleStop.ended_at > start),
+        )
+        .order_by(VehicleStop.started_at)
+    )
+    return (await db.execute(stmt)).scalars().all()
+
+
+def idle_seconds(stops: Sequence[VehicleStop], *, start: datetime, end: datetime) -> int:
+    """Tempo parado dentro do período; paradas abertas contam até `end` (ou até agora)."""
+    start, end = as_utc(start), as_utc(end)
+    now = datetime.now(timezone.utc)
+    total = 0.0
+    for stop in stops:
+        stop_end = as_utc(stop.ended_at) if stop.ended_at is not None else min(now, end)
+        total += max((min(stop_end, end) - max(as_utc(stop.started_at), start)).total_seconds(), 0)
+    return int(total)
@@ -0,0 +1,179 @@
+# backend/app/crud/crud_track.py
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import delete, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.track_codec import (
+    TrackArrays,
+    TrackPoint,
+    arrays_from_points,
+    as_utc,
+    decode_arrays,
+    decode_points,
+    encode_points,
+    points_from_arrays,
+    to_micros,
+)
+from app.models.journey_model import Journey
+from app.models.location_history_model import LocationHistory
+from app.models.track_chunk_model import TrackChunk
+
+WINDOW = timedelta(minutes=settings.TRACK_CHUNK_WINDOW_MINUTES)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def window_start_for(value: datetime) -> datetime:
+    """Início da janela de compactação que contém `value`."""
+    value = as_utc(value)
+    return value - ((value - _EPOCH) % WINDOW)
+
+
+async def compact_window(db: AsyncSession, *, window_start: datetime) -> int:
+    """
+    Move os pontos brutos de uma janela de `location_history` para `track_chunks`.
+    Os pontos são retirados do buffer com DELETE ... RETURNING e gravados na mesma
+    transação: cada ponto fica ou no buffer ou num bloco. Pontos que chegam depois que a
+    janela já foi selada (pacotes atrasados, backfills) são mesclados ao bloco existente.
+    Retorna o número de blocos gravados.
+    """
+    window_start = window_start_for(window_start)
+    window_end = window_start + WINDOW
+    claim_stmt = (
+        delete(LocationHistory)
+        .where(LocationHistory.timestamp >= window_start, LocationHistory.timestamp < window_end)
+        .returning(
+            LocationHistory.vehicle_id,
+            LocationHistory.organization_id,
+            LocationHistory.timestamp,
+            LocationHistory.id,
+            LocationHistory.latitude,
+            LocationHistory.longitude,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    claimed = sorted((await db.execute(claim_stmt)).all(), key=lambda row: (row[0], as_utc(row[2]), row[3]))
+    if not claimed:
+        await db.commit()
+        return 0
+
+    points_by_vehicle: Dict[int, Tuple[int, List[TrackPoint]]] = {}
+    for vehicle_id, organization_id, timestamp, _, latitude, longitude in claimed:
+        points_by_vehicle.setdefault(vehicle_id, (organization_id, []))[1].append(
+            TrackPoint(as_utc(timestamp), latitude, longitude)
+        )
+
+    existing_stmt = select(TrackChunk).where(
+        TrackChunk.vehicle_id.in_(points_by_vehicle),
+        TrackChunk.window_start >= window_start,
+        TrackChunk.window_start < window_end,
+    )
+    existing = {chunk.vehicle_id: chunk for chunk in (await db.execute(existing_stmt)).scalars().all()}
+
+    for vehicle_id, (organization_id, points) in points_by_vehicle.items():
+        chunk = existing.get(vehicle_id)
+        if chunk is None:
+            db.add(TrackChunk(
+                vehicle_id=vehicle_id,
+                organization_id=organization_id,
+                window_start=window_start,
+                window_end=window_end,
+                point_count=len(points),
+                data=encode_points(points),
+            ))
+            continue
+        merged = sorted(decode_points(chunk.data) + points, key=lambda point: point.timestamp)
+        chunk.data = encode_points(merged)
+        chunk.point_count = len(merged)
+        chunk.sealed_at = func.now()
+
+    await db.commit()
+    return len(points_by_vehicle)
+
+
+async def compact_pending(db: AsyncSession, *, until: datetime) -> int:
+    """
+    Sela todos os pontos ainda em `location_history` cujas janelas terminam até `until`,
+    uma janela por transação (limita a memória ao volume da frota numa janela).
+    A compactação parte do ponto mais antigo do buffer, não de um período fixo: backfills
+    de qualquer idade também são selados.
+    Retorna o número de blocos gravados.
+    """
+    until = window_start_for(until)
+    oldest_stmt = select(func.min(LocationHistory.timestamp)).where(LocationHistory.timestamp < until)
+    sealed = 0
+    while True:
+        oldest = (await db.execute(oldest_stmt)).scalar_one_or_none()
+        if oldest is None:
+            return sealed
+        written = await compact_window(db, window_start=as_utc(oldest))
+        if not written:
+            return sealed
+        sealed += written
+
+
+async def get_track_arrays(
+    db: AsyncSession, *, vehicle_id: int, start: datetime, end: datetime
+) -> TrackArrays:
+    """
+    Retorna os pontos do trajeto de um veículo entre `start` e `end` (inclusive), em ordem,
+    como vetores numpy. As janelas seladas são decodificadas direto dos blobs compactados,
+    sem criar um objeto por ponto, e os pontos ainda não selados (últimas horas, pacotes
+    atrasados) vêm do buffer `location_history`.
+    """
+    start, end = as_utc(start), as_utc(end)
+
+    chunks_stmt = (
+        select(TrackChunk.data)
+        .where(
+            TrackChunk.vehicle_id == vehicle_id,
+            TrackChunk.window_start <= end,
+            TrackChunk.window_end > start,
+        )
+        .order_by(TrackChunk.window_start)
+    )
+    parts = [decode_arrays(data) for (data,) in (await db.execute(chunks_stmt)).all()]
+
+    raw_stmt = (
+        select(LocationHistory.timestamp, LocationHistory.latitude, LocationHistory.longitude)
+        .where(
+            LocationHistory.vehicle_id == vehicle_id,
+            LocationHistory.timestamp >= start,
+            LocationHistory.timestamp <= end,
+        )
+        .order_by(LocationHistory.timestamp, LocationHistory.id)
+    )
+    parts.append(arrays_from_points([
+        TrackPoint(as_utc(timestamp), latitude, longitude)
+        for timestamp, latitude, longitude in (await db.execute(raw_stmt)).all()
+    ]))
+
+    timestamps = np.concatenate([part.timestamps for part in parts])
+    # Blocos em ordem e depois o buffer: a ordenação estável mantém a ordem de cada fonte
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order]
+    first = int(np.searchsorted(timestamps, to_micros(start), side="left"))
+    last = int(np.searchsorted(timestamps, to_micros(end), side="right"))
+    order = order[first:last]
+    return TrackArrays(
+        timestamps[first:last],
+        np.concatenate([part.latitudes for part in parts])[order],
+        np.concatenate([part.longitudes for part in parts])[order],
+    )
+
+
+async def get_track_points(
+    db: AsyncSession, *, vehicle_id: int, start: datetime, end: datetime
+) -> List[TrackPoint]:
+    """Como `get_track_arrays`, mas como lista de `TrackPoint`."""
+    return points_from_arrays(await get_track_arrays(db, vehicle_id=vehicle_id, start=start, end=end))
+
+
+async def get_journey_route(db: AsyncSession, *, journey: Journey) -> List[TrackPoint]:
+    """Retorna o trajeto percorrido durante uma jornada (até agora, se ela ainda estiver ativa)."""
+    end_time = journey.end_time or datetime.utcnow()
+    return await get_track_points(db, vehicle_id=journey.vehicle_id, start=journey.start_time, end=end_time)
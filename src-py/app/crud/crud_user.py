@@ -167,13 +167,15 @@ async def authenticate(db: AsyncSession, *, email: str, password: str) -> User |
         return None
     return user
 
-async def get_leaderboard_data(db: AsyncSession, *, organization_id: int) -> dict:
+async def get_leaderboard_data(db: AsyncSession, *, organization_id: int, sector: str | None = None) -> dict:
     from app.models.journey_model import Journey
-    org = await db.get(Organization, organization_id)
-    if not org:
-        return {"leaderboard": [], "primary_metric_unit": "N/A"}
+    if sector is None:
+        org = await db.get(Organization, organization_id)
+        if not org:
+            return {"leaderboard": [], "primary_metric_unit": "N/A"}
+        sector = org.sector
 
-    if org.sector == 'agronegocio':
+    if sector == 'agronegocio':
         metric_calculation = func.sum(Journey.end_engine_hours - Journey.start_engine_hours)
         primary_metric_unit = "Horas"
     else:
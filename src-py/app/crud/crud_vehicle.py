@@ -1,9 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_, func
-from typing import List
+from sqlalchemy import or_, func, case, update as sql_update
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from app.models.vehicle_model import Vehicle
+from app.crud import crud_geofence, crud_location_history, crud_stop
+from app.crud.crud_geofence import GeofencePing
+from app.core.position_buffer import PositionUpdate, position_buffer
+from app.core.device_registry import DeviceEntry, device_registry
+from app.core.vehicle_index import vehicle_index
+from app.core.geofence_engine import geofence_engine
+from app.core.position_hub import position_hub
+from app.core.stop_detector import stop_detector
+from app.core.telemetry_codec import TelemetryPoint
+from app.core.telemetry_dedup import telemetry_dedup
+from app.core.track_codec import as_utc
 from app.schemas.telemetry_schema import TelemetryPayload
 from app.schemas.vehicle_schema import VehicleCreate, VehicleUpdate
 
@@ -64,25 +77,229 @@ async def count(db: AsyncSession, *, organization_id: int) -> int:
     # Chama count_by_org apenas com os argumentos necessários
     return await count_by_org(db, organization_id=organization_id)
 
-async def update_vehicle_from_telemetry(db: AsyncSession, *, payload: TelemetryPayload) -> Vehicle | None:
-    """Encontra um veículo pelo seu telemetry_device_id e atualiza seus dados."""
-    stmt = select(Vehicle).where(Vehicle.telemetry_device_id == payload.device_id)
-    result = await db.execute(stmt)
-    vehicle_obj = result.scalar_one_or_none()
+async def _write_position(db: AsyncSession, *, position: PositionUpdate) -> None:
+    """
+    Grava diretamente a posição de um veículo (sem commit). O horímetro só avança e a
+    posição não é substituída por uma mais antiga que a gravada.
+    """
+    values = {"last_latitude": position.latitude, "last_longitude": position.longitude}
+    if position.engine_hours is not None:
+        values["current_engine_hours"] = case(
+            (func.coalesce(Vehicle.current_engine_hours, 0) < position.engine_hours, position.engine_hours),
+            else_=Vehicle.current_engine_hours,
+        )
+    stmt = sql_update(Vehicle).where(Vehicle.id == position.vehicle_id)
+    if position.timestamp is not None:
+        values["last_position_at"] = position.timestamp
+        stmt = stmt.where(or_(Vehicle.last_position_at.is_(None), Vehicle.last_position_at <= position.timestamp))
+    await db.execute(stmt.values(**values))
 
-    if not vehicle_obj:
-        print(f"AVISO: Recebida telemetria de um dispositivo não registrado: {payload.device_id}")
-        return None
+async def _stage_position(db: AsyncSession, *, position: PositionUpdate) -> bool:
+    """
+    Grava a posição na transação atual quando o buffer de escrita não está ativo.
+    Retorna True se gravou; caso contrário a posição é enfileirada por `_publish_position`.
+    """
+    if position_buffer.is_running:
+        return False
+    await _write_position(db, position=position)
+    return True
 
-    vehicle_obj.last_latitude = payload.latitude
-    vehicle_obj.last_longitude = payload.longitude
-    if payload.engine_hours > (vehicle_obj.current_engine_hours or 0):
-        vehicle_obj.current_engine_hours = payload.engine_hours
-    
-    db.add(vehicle_obj)
-    await db.commit()
-    await db.refresh(vehicle_obj)
-    return vehicle_obj
+async def _publish_position(
+    db: AsyncSession, *, position: PositionUpdate, staged: bool, organization_id: int, timestamp: datetime,
+) -> None:
+    """
+    Depois do commit: atualiza o índice em memória, envia a posição aos mapas conectados e,
+    se ela não foi gravada na transação, a enfileira no buffer de escrita.
+    """
+    vehicle_index.update_position(position.vehicle_id, position.latitude, position.longitude)
+    position_hub.publish(organization_id, position.vehicle_id, position.latitude, position.longitude, timestamp)
+    if not staged and not await position_buffer.submit(position):
+        # O buffer parou entre a transação e o commit
+        await _write_position(db, position=position)
+        await db.commit()
+
+@asynccontextmanager
+async def _ingest_transaction(
+    db: AsyncSession, *, vehicle_ids: Iterable[int], packets: Iterable[Tuple[str, datetime]],
+) -> AsyncIterator[None]:
+    """
+    Transação de uma ingestão de telemetria, com commit ao final do bloco. Se ela falhar, o
+    estado em memória das cercas e do detector de paradas volta ao de antes do bloco; os
+    pacotes só são marcados como vistos depois do commit, para que o reenvio do rastreador
+    seja reprocessado em vez de descartado como repetido.
+    """
+    vehicle_ids = list(vehicle_ids)
+    geofences = geofence_engine.snapshot(vehicle_ids)
+    motions = stop_detector.snapshot(vehicle_ids)
+    try:
+        yield
+        await db.commit()
+    except BaseException:
+        geofence_engine.rollback(geofences)
+        stop_detector.rollback(motions)
+        raise
+    for device_id, timestamp in packets:
+        telemetry_dedup.record(device_id, timestamp)
+
+def _history_row(entry: DeviceEntry, payload: TelemetryPayload | TelemetryPoint, timestamp: datetime) -> dict:
+    return {
+        "vehicle_id": entry.vehicle_id,
+        "organization_id": entry.organization_id,
+        "latitude": payload.latitude,
+        "longitude": payload.longitude,
+        "timestamp": timestamp,
+    }
+
+def _advance_entry(entry: DeviceEntry, *, timestamp: datetime, engine_hours: Optional[float]) -> None:
+    """
+    Avança o dispositivo no cache para a posição aplicada. Chamado só depois do commit:
+    se a gravação falhar, o cache não fica à frente do banco.
+    """
+    if entry.last_timestamp is None or timestamp > entry.last_timestamp:
+        entry.last_timestamp = timestamp
+    if engine_hours is not None and engine_hours > entry.current_engine_hours:
+        entry.current_engine_hours = engine_hours
+
+async def update_vehicle_from_telemetry(
+    db: AsyncSession, *, payload: TelemetryPayload | TelemetryPoint
+) -> DeviceEntry | None:
+    """
+    Encontra um veículo pelo seu telemetry_device_id e atualiza seus dados.
+    O veículo é resolvido pelo cache de dispositivos e, com o buffer de posições ativo,
+    a gravação da posição atual é apenas enfileirada e feita em lote. O ponto vai para o
+    histórico de localização, e a posição é avaliada contra as cercas eletrônicas da
+    organização e passa pelo detector de paradas.
+    Pacotes repetidos ou com timestamp no futuro são ignorados, e pacotes mais antigos
+    que a posição atual vão apenas para o histórico.
+    """
+    entry = await device_registry.resolve(db, payload.device_id)
+    if (
+        not entry
+        or crud_location_history.is_from_future(payload.timestamp)
+        or telemetry_dedup.seen(payload.device_id, payload.timestamp)
+    ):
+        return entry
+
+    timestamp = as_utc(payload.timestamp)
+    packets = [(payload.device_id, payload.timestamp)]
+    if entry.last_timestamp is not None and timestamp < entry.last_timestamp:
+        async with _ingest_transaction(db, vehicle_ids=(), packets=packets):
+            await crud_location_history.bulk_append(db, rows=[_history_row(entry, payload, timestamp)])
+        return entry
+
+    engine_hours = payload.engine_hours if payload.engine_hours > entry.current_engine_hours else None
+    position = PositionUpdate(
+        vehicle_id=entry.vehicle_id,
+        latitude=payload.latitude,
+        longitude=payload.longitude,
+        engine_hours=engine_hours,
+        timestamp=timestamp,
+    )
+    # As cercas são avaliadas antes da gravação: se a organização for carregada agora,
+    # o estado inicial vem da posição anterior do veículo, não da que está chegando.
+    pings = [GeofencePing(entry.vehicle_id, entry.organization_id, payload.latitude, payload.longitude, timestamp)]
+    async with _ingest_transaction(db, vehicle_ids=[entry.vehicle_id], packets=packets):
+        await crud_geofence.evaluate_positions(db, pings=pings)
+        await crud_stop.process_positions(db, pings=pings)
+        await crud_location_history.bulk_append(db, rows=[_history_row(entry, payload, timestamp)])
+        staged = await _stage_position(db, position=position)
+    _advance_entry(entry, timestamp=timestamp, engine_hours=engine_hours)
+    await _publish_position(db, position=position, staged=staged, organization_id=entry.organization_id, timestamp=timestamp)
+    return entry
+
+async def update_location(db: AsyncSession, *, vehicle_id: int, lat: float, lon: float) -> None:
+    """
+    Atualiza a última posição conhecida de um veículo a partir de um ping de GPS.
+    Com o buffer de posições ativo, a gravação é apenas enfileirada e feita em lote.
+    A posição é avaliada contra as cercas eletrônicas da organização do veículo e passa
+    pelo detector de paradas.
+    """
+    organization_id = await geofence_engine.organization_of(db, vehicle_id)
+    if organization_id is None:
+        return
+    timestamp = datetime.now(timezone.utc)
+    position = PositionUpdate(vehicle_id=vehicle_id, latitude=lat, longitude=lon, timestamp=timestamp)
+    pings = [GeofencePing(vehicle_id, organization_id, lat, lon, timestamp)]
+    async with _ingest_transaction(db, vehicle_ids=[vehicle_id], packets=()):
+        await crud_geofence.evaluate_positions(db, pings=pings)
+        await crud_stop.process_positions(db, pings=pings)
+        staged = await _stage_position(db, position=position)
+    await _publish_position(db, position=position, staged=staged, organization_id=organization_id, timestamp=timestamp)
+
+async def update_vehicles_from_telemetry_batch(
+    db: AsyncSession, *, payloads: Sequence[TelemetryPayload | TelemetryPoint]
+) -> int:
+    """
+    Processa um lote de pacotes de telemetria (de um ou mais dispositivos) numa única transação.
+    Resolve todos os device_ids de uma vez, grava apenas a posição mais recente de cada veículo
+    e acrescenta todos os pontos ao histórico de localização de uma só vez (COPY no PostgreSQL).
+    Pacotes repetidos ou no futuro são descartados; pontos mais antigos que a posição atual do veículo
+    vão apenas para o histórico. Os demais são avaliados contra as cercas e passam pelo
+    detector de paradas, em ordem cronológica por veículo.
+    Retorna o número de pontos gravados no histórico.
+    """
+    if not payloads:
+        return 0
+
+    entries_by_device = await device_registry.resolve_many(db, (p.device_id for p in payloads))
+
+    latest_by_vehicle: Dict[int, Tuple[datetime, TelemetryPayload | TelemetryPoint]] = {}
+    entries_by_vehicle: Dict[int, DeviceEntry] = {}
+    max_engine_hours: Dict[int, float] = {}
+    history_rows = []
+    pings: List[GeofencePing] = []
+    packets: Dict[Tuple[str, datetime], None] = {}
+    now = datetime.now(timezone.utc)
+    for payload in payloads:
+        entry = entries_by_device.get(payload.device_id)
+        if not entry:
+            continue
+        # Repetido de um lote anterior ou dentro deste mesmo lote
+        packet = (payload.device_id, as_utc(payload.timestamp))
+        if packet in packets or telemetry_dedup.seen(*packet):
+            continue
+        if crud_location_history.is_from_future(packet[1], now=now):
+            continue
+        packets[packet] = None
+
+        timestamp = packet[1]
+        history_rows.append(_history_row(entry, payload, timestamp))
+        if entry.last_timestamp is not None and timestamp < entry.last_timestamp:
+            continue
+        pings.append(GeofencePing(
+            entry.vehicle_id, entry.organization_id, payload.latitude, payload.longitude, timestamp
+        ))
+
+        latest = latest_by_vehicle.get(entry.vehicle_id)
+        if latest is None or timestamp >= latest[0]:
+            latest_by_vehicle[entry.vehicle_id] = (timestamp, payload)
+        entries_by_vehicle[entry.vehicle_id] = entry
+        max_engine_hours[entry.vehicle_id] = max(max_engine_hours.get(entry.vehicle_id, 0), payload.engine_hours)
+
+    pings.sort(key=lambda ping: (ping.vehicle_id, ping.timestamp))
+    positions = []
+    async with _ingest_transaction(db, vehicle_ids=entries_by_vehicle, packets=packets):
+        await crud_geofence.evaluate_positions(db, pings=pings)
+        await crud_stop.process_positions(db, pings=pings)
+        for vehicle_id, (timestamp, latest) in latest_by_vehicle.items():
+            entry = entries_by_vehicle[vehicle_id]
+            engine_hours = max_engine_hours[vehicle_id] if max_engine_hours[vehicle_id] > entry.current_engine_hours else None
+            position = PositionUpdate(
+                vehicle_id=vehicle_id,
+                latitude=latest.latitude,
+                longitude=latest.longitude,
+                engine_hours=engine_hours,
+                timestamp=timestamp,
+            )
+            positions.append((entry, position, await _stage_position(db, position=position)))
+        await crud_location_history.bulk_append(db, rows=history_rows)
+
+    for entry, position, staged in positions:
+        _advance_entry(entry, timestamp=position.timestamp, engine_hours=position.engine_hours)
+        await _publish_position(
+            db, position=position, staged=staged, organization_id=entry.organization_id, timestamp=position.timestamp
+        )
+    return len(history_rows)
 
 async def create_with_owner(db: AsyncSession, *, obj_in: VehicleCreate, organization_id: int) -> Vehicle:
     """Cria um novo veículo associado a uma organização."""
@@ -92,20 +309,31 @@ async def create_with_owner(db: AsyncSession, *, obj_in: VehicleCreate, organiza
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
+    # Remove uma eventual entrada negativa do dispositivo recém-associado
+    device_registry.invalidate(db_obj.telemetry_device_id)
+    vehicle_index.invalidate(organization_id)
     return db_obj
     
 async def update(db: AsyncSession, *, db_vehicle: Vehicle, vehicle_in: VehicleUpdate) -> Vehicle:
     """Atualiza os dados de um veículo."""
+    previous_device_id = db_vehicle.telemetry_device_id
     update_data = vehicle_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_vehicle, field, value)
     db.add(db_vehicle)
     await db.commit()
     await db.refresh(db_vehicle)
+    device_registry.invalidate(previous_device_id, db_vehicle.telemetry_device_id)
+    vehicle_index.invalidate(db_vehicle.organization_id)
     return db_vehicle
 
 async def remove(db: AsyncSession, *, db_vehicle: Vehicle) -> Vehicle:
     """Deleta um veículo do banco de dados."""
+    device_id, vehicle_id = db_vehicle.telemetry_device_id, db_vehicle.id
     await db.delete(db_vehicle)
     await db.commit()
+    device_registry.invalidate(device_id)
+    vehicle_index.remove(vehicle_id)
+    geofence_engine.forget(vehicle_id)
+    stop_detector.forget(vehicle_id)
     return db_vehicle
\ No newline at end of file
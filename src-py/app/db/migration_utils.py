@@ -0,0 +1,31 @@
+# backend/app/db/migration_utils.py
+
+"""
+Auxiliares das migrações Alembic. As revisões conferem o que já existe antes de criar, para
+rodar tanto num banco vazio quanto num criado pelo `create_all` de versões anteriores.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def has_column(table: str, column: str) -> bool:
+    return any(existing["name"] == column for existing in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def create_table(name: str, *columns, **kw) -> bool:
+    """`op.create_table` que ignora tabelas já existentes. Retorna True se criou."""
+    if has_table(name):
+        return False
+    op.create_table(name, *columns, **kw)
+    return True
+
+
+def add_column(table: str, column: sa.Column) -> None:
+    """`op.add_column` que ignora colunas já existentes."""
+    if not has_column(table, column.name):
+        op.add_column(table, column)
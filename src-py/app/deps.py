@@ -50,7 +50,8 @@ async def get_current_user(
             jwt.decode, token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         user_id: str = payload.get("sub")
-        if user_id is None:
+        # Só tokens de acesso autenticam utilizadores (não tokens de dispositivo ou cursores)
+        if user_id is None or payload.get("type") != "access":
             raise credentials_exception
     except (JWTError, ValidationError):
         raise credentials_exception
@@ -6,6 +6,11 @@ from .maintenance_model import MaintenanceRequest, MaintenanceComment, Maintenan
 from .fuel_log_model import FuelLog
 from .notification_model import Notification
 from .location_history_model import LocationHistory
+from .track_chunk_model import TrackChunk
+from .vehicle_stop_model import VehicleStop, StopDetectorCheckpoint
+from .daily_rollup_model import DailyRollup
+from .report_job_model import ReportJob, ReportJobStatus, ReportJobType
+from .geofence_model import Geofence, GeofenceType
 from .implement_model import Implement
 from .client_model import Client
 from .freight_order_model import FreightOrder
@@ -7,6 +7,7 @@ from sqlalchemy import (
     ForeignKey,
     Enum as SAEnum,
     func,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -19,6 +20,10 @@ class AlertLevel(str, enum.Enum):
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_organization_timestamp", "organization_id", "timestamp"),
+        Index("ix_alerts_driver_timestamp", "driver_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     message = Column(String(255), nullable=False)
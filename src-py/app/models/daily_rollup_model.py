@@ -0,0 +1,70 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index, func, literal_column
+from sqlalchemy.orm import relationship
+
+from app.db.base_class import Base
+from app.models.vehicle_cost_model import CostType
+
+# Coluna da consolidação que acumula cada tipo de custo
+COST_COLUMNS = {
+    CostType.MANUTENCAO: "cost_maintenance",
+    CostType.COMBUSTIVEL: "cost_fuel",
+    CostType.PEDAGIO: "cost_toll",
+    CostType.SEGURO: "cost_insurance",
+    CostType.PNEU: "cost_tire",
+    CostType.PECAS_COMPONENTES: "cost_parts",
+    CostType.MULTA: "cost_fine",
+    CostType.OUTROS: "cost_other",
+}
+
+# Colunas somáveis (tudo exceto a chave)
+METRICS = ("km", "engine_hours", "gps_km", "liters", "fuel_cost", "journey_count", "total_cost", *COST_COLUMNS.values())
+
+
+class DailyRollup(Base):
+    """
+    Totais de um dia por organização, veículo e motorista, mantidos de forma incremental por
+    `crud_rollup` a cada escrita de custos, abastecimentos e viagens encerradas. Os custos não
+    têm motorista e ficam na linha com `driver_id` vazio. Os relatórios somam estas linhas em
+    vez dos registros originais.
+    """
+    __tablename__ = "daily_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False)
+
+    # Viagens encerradas no dia (pelo início): odômetro, horímetro e distância pelo GPS
+    km = Column(Float, nullable=False, default=0, server_default="0")
+    engine_hours = Column(Float, nullable=False, default=0, server_default="0")
+    gps_km = Column(Float, nullable=False, default=0, server_default="0")
+    journey_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Abastecimentos
+    liters = Column(Float, nullable=False, default=0, server_default="0")
+    fuel_cost = Column(Float, nullable=False, default=0, server_default="0")
+    # Custos (total e por tipo)
+    total_cost = Column(Float, nullable=False, default=0, server_default="0")
+    cost_maintenance = Column(Float, nullable=False, default=0, server_default="0")
+    cost_fuel = Column(Float, nullable=False, default=0, server_default="0")
+    cost_toll = Column(Float, nullable=False, default=0, server_default="0")
+    cost_insurance = Column(Float, nullable=False, default=0, server_default="0")
+    cost_tire = Column(Float, nullable=False, default=0, server_default="0")
+    cost_parts = Column(Float, nullable=False, default=0, server_default="0")
+    cost_fine = Column(Float, nullable=False, default=0, server_default="0")
+    cost_other = Column(Float, nullable=False, default=0, server_default="0")
+
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    organization = relationship("Organization")
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False)
+    vehicle = relationship("Vehicle")
+    driver_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    driver = relationship("User")
+
+
+# Chave única (motorista vazio conta como 0, para que os custos caiam sempre na mesma linha)
+ROLLUP_KEY = (
+    DailyRollup.organization_id,
+    DailyRollup.vehicle_id,
+    func.coalesce(DailyRollup.driver_id, literal_column("0")),
+    DailyRollup.day,
+)
+Index("uq_daily_rollups_key", *ROLLUP_KEY, unique=True)
+Index("ix_daily_rollups_organization_day", DailyRollup.organization_id, DailyRollup.day)
@@ -7,6 +7,7 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     Enum as SAEnum,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -22,6 +23,9 @@ class DocumentType(str, enum.Enum):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_vehicle_id", "vehicle_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     document_type = Column(SAEnum(DocumentType), nullable=False)
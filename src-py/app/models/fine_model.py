@@ -1,7 +1,7 @@
 import enum
 from typing import TYPE_CHECKING, Optional
 from datetime import date, datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SAEnum, Float, Date, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SAEnum, Float, Date, DateTime, func, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.db.base_class import Base
@@ -20,6 +20,10 @@ class FineStatus(str, enum.Enum):
 
 class Fine(Base):
     __tablename__ = "fines"
+    __table_args__ = (
+        Index("ix_fines_vehicle_date", "vehicle_id", "date"),
+        Index("ix_fines_organization_date", "organization_id", "date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     description: Mapped[str] = mapped_column(String(255), nullable=False)
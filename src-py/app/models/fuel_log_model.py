@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, func, Enum as SAEnum
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, func, Enum as SAEnum, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -22,6 +22,11 @@ class FuelLog(Base):
     Modelo da tabela de Registros de Abastecimento, agora com campos para integração.
     """
     __tablename__ = "fuel_logs"
+    __table_args__ = (
+        Index("ix_fuel_logs_organization_timestamp", "organization_id", "timestamp"),
+        Index("ix_fuel_logs_vehicle_timestamp", "vehicle_id", "timestamp"),
+        Index("ix_fuel_logs_user_timestamp", "user_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     odometer = Column(Integer, nullable=False)
@@ -0,0 +1,35 @@
+import enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, JSON, Enum as SAEnum, func
+from sqlalchemy.orm import relationship
+
+from app.db.base_class import Base
+
+class GeofenceType(str, enum.Enum):
+    POLYGON = "polygon"
+    CIRCLE = "circle"
+
+class Geofence(Base):
+    """
+    Área definida pela organização (polígono ou círculo). A entrada e a saída dos veículos
+    são detectadas na ingestão da telemetria por `app/core/geofence_engine.py`.
+    """
+    __tablename__ = "geofences"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    type = Column(SAEnum(GeofenceType), nullable=False)
+
+    # Polígono: lista de vértices [[lat, lon], ...] (sem repetir o primeiro no final)
+    coordinates = Column(JSON, nullable=True)
+    # Círculo: centro e raio em metros
+    center_latitude = Column(Float, nullable=True)
+    center_longitude = Column(Float, nullable=True)
+    radius_meters = Column(Float, nullable=True)
+
+    alert_on_enter = Column(Boolean, nullable=False, default=True)
+    alert_on_exit = Column(Boolean, nullable=False, default=True)
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    organization = relationship("Organization")
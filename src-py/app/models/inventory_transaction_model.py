@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum as SAEnum, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum as SAEnum, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -40,6 +40,10 @@ class InventoryTransaction(Base):
     
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_inventory_transactions_item_timestamp", "item_id", "timestamp"),
+    )
+
     # --- RELACIONAMENTOS ATUALIZADOS ---
     item = relationship("InventoryItem", back_populates="transactions")
     part_template = relationship("Part", back_populates="transactions") # Relação opcional
@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Float
+    Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Float, Index, text
 )
 from sqlalchemy.orm import relationship
 from .implement_model import Implement
@@ -11,6 +11,14 @@ from app.schemas.journey_schema import JourneyType
 
 class Journey(Base):
     __tablename__ = "journeys"
+    __table_args__ = (
+        Index("ix_journeys_organization_start_time", "organization_id", "start_time"),
+        Index("ix_journeys_vehicle_start_time", "vehicle_id", "start_time"),
+        Index("ix_journeys_driver_start_time", "driver_id", "start_time"),
+        # Parciais: só as viagens em andamento, uma fração pequena da tabela
+        Index("ix_journeys_active_organization", "organization_id", postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")),
+        Index("ix_journeys_active_driver", "driver_id", postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     start_time = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -25,6 +33,8 @@ class Journey(Base):
     trip_description = Column(String, nullable=True)
     start_engine_hours = Column(Float, nullable=True)
     end_engine_hours = Column(Float, nullable=True)
+    # Distância percorrida calculada pelos pontos de GPS (independe do odômetro digitado)
+    distance_km = Column(Float, nullable=True)
 
     # --- CAMPOS DE ENDEREÇO ATUALIZADOS ---
     destination_address = Column(String, nullable=True) # Campo completo para referência
@@ -1,12 +1,19 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, func, Float
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, DateTime, func, Float, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
 
 class LocationHistory(Base):
     __tablename__ = "location_history"
+    # No PostgreSQL esta tabela é particionada por mês (RANGE em `timestamp`) e sua chave
+    # primária real é (id, timestamp) — ver a migração 0001 e `crud_location_history`.
+    # O `id` continua único (vem de uma sequence), então o ORM o usa como identidade.
+    __table_args__ = (
+        Index("ix_location_history_vehicle_id_timestamp", "vehicle_id", "timestamp"),
+        Index("ix_location_history_organization_timestamp", "organization_id", "timestamp"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -14,4 +21,4 @@ class LocationHistory(Base):
     vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False)
     vehicle = relationship("Vehicle")
     organization_id = Column(Integer, ForeignKey("organizations.id",), nullable=False)
-    organization = relationship("Organization")
\ No newline at end of file
+    organization = relationship("Organization")
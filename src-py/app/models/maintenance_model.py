@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func, Enum as SAEnum, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -26,6 +26,11 @@ class MaintenanceCategory(str, enum.Enum):
 
 class MaintenanceRequest(Base):
     __tablename__ = "maintenance_requests"
+    __table_args__ = (
+        Index("ix_maintenance_requests_organization_created_at", "organization_id", "created_at"),
+        Index("ix_maintenance_requests_vehicle_created_at", "vehicle_id", "created_at"),
+        Index("ix_maintenance_requests_reported_by_created_at", "reported_by_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     problem_description = Column(Text, nullable=False)
     # --- COLUNA ATUALIZADA ---
@@ -53,7 +58,7 @@ class MaintenanceComment(Base):
     file_url = Column(String(512), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
-    request_id = Column(Integer, ForeignKey("maintenance_requests.id", ondelete="CASCADE"), nullable=False)
+    request_id = Column(Integer, ForeignKey("maintenance_requests.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     request = relationship("MaintenanceRequest", back_populates="comments")
     user = relationship("User")
\ No newline at end of file
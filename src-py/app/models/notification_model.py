@@ -16,6 +16,8 @@ class NotificationType(str, enum.Enum):
     COST_EXCEEDED = "cost_exceeded"
     NEW_FINE_REGISTERED = "new_fine_registered"
     FINE_PAYMENT_DUE = "fine_payment_due"
+    GEOFENCE_ENTERED = "geofence_entered"
+    GEOFENCE_EXITED = "geofence_exited"
     
     # Notificações Operacionais
     FREIGHT_ASSIGNED = "freight_assigned"
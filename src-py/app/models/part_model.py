@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum as SAEnum, Float, DateTime, func, UniqueConstraint # <--- 1. IMPORTAR UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum as SAEnum, Float, DateTime, func, UniqueConstraint, Index # <--- 1. IMPORTAR UniqueConstraint
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 import enum
 from app.db.base_class import Base
@@ -80,5 +80,6 @@ class InventoryItem(Base):
     # --- 3. ADICIONAR RESTRIÇÃO ÚNICA ---
     __table_args__ = (
         UniqueConstraint('part_id', 'item_identifier', name='_part_item_identifier_uc'),
+        Index("ix_inventory_items_organization_id", "organization_id"),
     )
     # --- FIM DA ADIÇÃO --- 
@@ -0,0 +1,62 @@
+import enum
+from sqlalchemy import (
+    Column, Integer, String, Text, ForeignKey, DateTime, JSON, LargeBinary, Enum as SAEnum, Index, func, text,
+)
+from sqlalchemy.orm import relationship
+
+from app.db.base_class import Base
+
+class ReportJobType(str, enum.Enum):
+    FLEET_MANAGEMENT = "fleet_management"
+    DRIVER_PERFORMANCE = "driver_performance"
+    VEHICLE_CONSOLIDATED = "vehicle_consolidated"
+    PARQUET_EXPORT = "parquet_export"
+
+class ReportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+# Pedidos idênticos (mesma chave) se juntam ao job que ainda está na fila ou em execução
+_ACTIVE = "status IN ('PENDING', 'RUNNING')"
+
+class ReportJob(Base):
+    """
+    Relatório pedido para cálculo em segundo plano por `app/core/report_jobs.py`.
+    O resultado (o JSON do relatório, comprimido com gzip, ou o ZIP de uma exportação
+    Parquet) fica guardado até `expires_at`.
+    """
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        Index("uq_report_jobs_active_key", "dedupe_key", unique=True,
+              postgresql_where=text(_ACTIVE), sqlite_where=text(_ACTIVE)),
+        Index("ix_report_jobs_status_created_at", "status", "created_at"),
+        Index("ix_report_jobs_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    report_type = Column(SAEnum(ReportJobType), nullable=False)
+    # Parâmetros do pedido (período, veículo, seções), como recebidos em `ReportJobCreate`
+    params = Column(JSON, nullable=False)
+    # sha256 de (organização, tipo, parâmetros)
+    dedupe_key = Column(String(64), nullable=False, index=True)
+    status = Column(SAEnum(ReportJobStatus), nullable=False, default=ReportJobStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    # O job não é executado antes disto (exportações aguardam a margem de segurança do cursor)
+    run_after = Column(DateTime(timezone=True), nullable=True)
+    error = Column(Text, nullable=True)
+
+    result = Column(LargeBinary, nullable=True)
+    result_size = Column(Integer, nullable=True)
+    # Dados devolvidos nos cabeçalhos do resultado (exportação: linhas e posição do próximo cursor)
+    result_metadata = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    organization = relationship("Organization")
+    requested_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
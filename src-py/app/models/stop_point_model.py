@@ -1,7 +1,7 @@
 # ARQUIVO: backend/app/models/stop_point_model.py
 
 import enum
-from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Enum, DateTime, Float, ForeignKey
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -25,6 +25,9 @@ class StopPoint(Base):
     status = Column(Enum(StopPointStatus), nullable=False, default=StopPointStatus.PENDING)
     
     address = Column(String(500), nullable=False)
+    # Coordenadas do endereço: com elas, a chegada é confirmada pela detecção de paradas
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     cargo_description = Column(String(500), nullable=True)
     
     scheduled_time = Column(DateTime, nullable=False)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, func, Float
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, func, Float, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
 
 class VehicleTire(Base):
     __tablename__ = 'vehicle_tires'
+    __table_args__ = (
+        Index("ix_vehicle_tires_vehicle_id", "vehicle_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey('vehicles.id'), nullable=False)
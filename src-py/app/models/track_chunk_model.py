@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, LargeBinary, UniqueConstraint, func
+from sqlalchemy.orm import relationship
+
+from app.db.base_class import Base
+
+class TrackChunk(Base):
+    """
+    Trajeto compactado de um veículo numa janela fixa de tempo (ex: uma hora).
+    Os pontos de `location_history` da janela ficam num único blob binário
+    (ver `app/core/track_codec.py`), gerado pelo compactador depois que a janela fecha.
+    """
+    __tablename__ = "track_chunks"
+    __table_args__ = (
+        UniqueConstraint("vehicle_id", "window_start", name="uq_track_chunks_vehicle_window"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    window_start = Column(DateTime(timezone=True), nullable=False)
+    window_end = Column(DateTime(timezone=True), nullable=False)
+    point_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    sealed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False)
+    vehicle = relationship("Vehicle")
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    organization = relationship("Organization")
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import (Column, Integer, String, Boolean, ForeignKey, Enum as SAEnum, DateTime)
+from sqlalchemy import (Column, Integer, String, Boolean, ForeignKey, Enum as SAEnum, DateTime, Index)
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.db.base_class import Base
@@ -34,6 +34,9 @@ class UserRole(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_organization_role", "organization_id", "role"),
+    )
 
     # --- COLUNAS ATUALIZADAS PARA A SINTAXE MODERNA ---
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -1,7 +1,7 @@
 import enum
 from typing import TYPE_CHECKING, Optional
 from datetime import date
-from sqlalchemy import Column, Integer, String, Date as SADate, Float, ForeignKey, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Date as SADate, Float, ForeignKey, Enum as SAEnum, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.db.base_class import Base
@@ -23,6 +23,10 @@ class CostType(str, enum.Enum):
 
 class VehicleCost(Base):
     __tablename__ = "vehicle_costs"
+    __table_args__ = (
+        Index("ix_vehicle_costs_organization_date", "organization_id", "date"),
+        Index("ix_vehicle_costs_vehicle_date", "vehicle_id", "date"),
+    )
 
     # --- REESCRITO COM SINTAXE MODERNA (Mapped) ---
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
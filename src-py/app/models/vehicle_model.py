@@ -1,7 +1,7 @@
 import enum
 from typing import TYPE_CHECKING, List, Optional
-from datetime import date
-from sqlalchemy import Column, Integer, String, Date, Text, Float, ForeignKey, Enum as SAEnum
+from datetime import date, datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Float, ForeignKey, Enum as SAEnum, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.db.base_class import Base
@@ -27,6 +27,9 @@ class VehicleStatus(str, enum.Enum):
 
 class Vehicle(Base):
     __tablename__ = "vehicles"
+    __table_args__ = (
+        Index("ix_vehicles_organization_status", "organization_id", "status"),
+    )
     
     # --- COLUNAS ATUALIZADAS PARA A SINTAXE MODERNA ---
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -44,6 +47,8 @@ class Vehicle(Base):
     telemetry_device_id: Mapped[Optional[str]] = mapped_column(String(100), unique=True, index=True, nullable=True)
     last_latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     last_longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Horário (do pacote) da última posição; pacotes mais antigos não sobrescrevem a posição atual
+    last_position_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     next_maintenance_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     next_maintenance_km: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey, DateTime, UniqueConstraint, Index, func
+from sqlalchemy.orm import relationship
+
+from app.db.base_class import Base
+
+class VehicleStop(Base):
+    """
+    Parada de um veículo detectada no fluxo de posições por `app/core/stop_detector.py`.
+    Fica aberta (`ended_at` vazio) enquanto o veículo continua parado.
+    """
+    __tablename__ = "vehicle_stops"
+    __table_args__ = (
+        UniqueConstraint("vehicle_id", "started_at", name="uq_vehicle_stops_vehicle_started"),
+        Index("ix_vehicle_stops_organization_started", "organization_id", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    ended_at = Column(DateTime(timezone=True), nullable=True)
+    duration_seconds = Column(Integer, nullable=True)
+
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False)
+    vehicle = relationship("Vehicle")
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    organization = relationship("Organization")
+    # Ponto de parada de frete cuja chegada foi confirmada por esta parada
+    stop_point_id = Column(Integer, ForeignKey("stop_points.id", ondelete="SET NULL"), nullable=True)
+    stop_point = relationship("StopPoint")
+
+
+class StopDetectorCheckpoint(Base):
+    """
+    Estado do detector de paradas de um veículo, gravado periodicamente para que a
+    detecção seja retomada de onde parou depois de um reinício.
+    """
+    __tablename__ = "stop_detector_checkpoints"
+
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), primary_key=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    last_latitude = Column(Float, nullable=False)
+    last_longitude = Column(Float, nullable=False)
+    last_timestamp = Column(DateTime(timezone=True), nullable=False)
+    anchor_latitude = Column(Float, nullable=False)
+    anchor_longitude = Column(Float, nullable=False)
+    anchor_timestamp = Column(DateTime(timezone=True), nullable=False)
+    stopped = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 # --- Importando schemas existentes que iremos reutilizar ---
@@ -29,6 +29,22 @@ class VehiclePosition(BaseModel):
     class Config:
         from_attributes = True
 
+class VehicleCluster(BaseModel):
+    """Grupo de veículos próximos no mapa, com o centróide e a contagem por status."""
+    latitude: float
+    longitude: float
+    count: int
+    status_counts: Dict[str, int]
+
+class VehicleClusterResponse(BaseModel):
+    """
+    Posições da frota para a área visível do mapa: grupos nos níveis de zoom baixos
+    e veículos individuais apenas nos níveis de zoom altos.
+    """
+    zoom: int
+    clusters: List[VehicleCluster] = []
+    vehicles: List[VehiclePosition] = []
+
 class AlertSummary(BaseModel):
     """Estrutura de um alerta para o widget de 'Alertas Recentes'."""
     id: int
@@ -47,6 +63,17 @@ class GoalStatus(BaseModel):
 
 # --- Resposta Principal para o Dashboard do Gestor ---
 
+class DashboardCacheStats(BaseModel):
+    """Contadores do cache do dashboard do gestor."""
+    entries: int
+    hits: int
+    misses: int
+    # Requisições que aguardaram um cálculo já em andamento para a mesma chave
+    coalesced: int
+    invalidations: int
+    hit_ratio: float
+
+
 class ManagerDashboardResponse(BaseModel):
     """Schema completo para a resposta do endpoint do dashboard do gestor."""
     kpis: DashboardKPIs
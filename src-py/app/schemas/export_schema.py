@@ -0,0 +1,29 @@
+# backend/app/schemas/export_schema.py
+import enum
+from datetime import date
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+from app.models.report_job_model import ReportJobType
+
+class ExportDataset(str, enum.Enum):
+    COSTS = "costs"
+    FUEL_LOGS = "fuel_logs"
+    JOURNEYS = "journeys"
+    FINES = "fines"
+    INVENTORY_TRANSACTIONS = "inventory_transactions"
+    LOCATION_HISTORY = "location_history"
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ParquetExportJobCreate(BaseModel):
+    """Exportação Parquet em segundo plano: o período completo ou o id após o qual continuar (cursor)."""
+    report_type: Literal[ReportJobType.PARQUET_EXPORT] = ReportJobType.PARQUET_EXPORT
+    dataset: ExportDataset
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    after_id: Optional[int] = None
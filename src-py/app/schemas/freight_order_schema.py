@@ -16,6 +16,8 @@ class StopPointBase(BaseModel):
     sequence_order: int
     type: StopPointType
     address: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     cargo_description: Optional[str] = None
     scheduled_time: datetime
 
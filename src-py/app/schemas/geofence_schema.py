@@ -0,0 +1,82 @@
+# backend/app/schemas/geofence_schema.py
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from app.models.geofence_model import GeofenceType
+
+MAX_POLYGON_VERTICES = 1000
+
+Vertex = Tuple[float, float]
+_GEOMETRY_FIELDS = ("coordinates", "center_latitude", "center_longitude", "radius_meters")
+
+
+def _check_geometry(values: "GeofenceBase | GeofenceUpdate") -> None:
+    """Valida a forma da cerca conforme o tipo: polígono com vértices ou círculo com centro e raio."""
+    if values.type == GeofenceType.POLYGON:
+        if not values.coordinates or len(values.coordinates) < 3:
+            raise ValueError("Um polígono precisa de pelo menos 3 vértices.")
+        if len(values.coordinates) > MAX_POLYGON_VERTICES:
+            raise ValueError(f"Um polígono pode ter no máximo {MAX_POLYGON_VERTICES} vértices.")
+        for lat, lon in values.coordinates:
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError("Vértice com coordenadas fora do intervalo válido.")
+        values.center_latitude = values.center_longitude = values.radius_meters = None
+    else:
+        if values.center_latitude is None or values.center_longitude is None or not values.radius_meters:
+            raise ValueError("Um círculo precisa de center_latitude, center_longitude e radius_meters.")
+        values.coordinates = None
+
+
+class GeofenceBase(BaseModel):
+    name: str = Field(..., max_length=100)
+    type: GeofenceType
+    coordinates: Optional[List[Vertex]] = None
+    center_latitude: Optional[float] = Field(None, ge=-90, le=90)
+    center_longitude: Optional[float] = Field(None, ge=-180, le=180)
+    radius_meters: Optional[float] = Field(None, gt=0, le=500_000)
+    alert_on_enter: bool = True
+    alert_on_exit: bool = True
+    is_active: bool = True
+
+    @model_validator(mode="after")
+    def validate_geometry(self):
+        _check_geometry(self)
+        return self
+
+
+class GeofenceCreate(GeofenceBase):
+    pass
+
+
+class GeofenceUpdate(BaseModel):
+    """Atualização parcial; a geometria, se enviada, é substituída por inteiro (com o `type`)."""
+    name: Optional[str] = Field(None, max_length=100)
+    type: Optional[GeofenceType] = None
+    coordinates: Optional[List[Vertex]] = None
+    center_latitude: Optional[float] = Field(None, ge=-90, le=90)
+    center_longitude: Optional[float] = Field(None, ge=-180, le=180)
+    radius_meters: Optional[float] = Field(None, gt=0, le=500_000)
+    alert_on_enter: Optional[bool] = None
+    alert_on_exit: Optional[bool] = None
+    is_active: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def validate_geometry(self):
+        if self.type is None:
+            if any(getattr(self, field) is not None for field in _GEOMETRY_FIELDS):
+                raise ValueError("Envie o `type` junto com a nova geometria.")
+            return self
+        _check_geometry(self)
+        return self
+
+
+class GeofencePublic(GeofenceBase):
+    id: int
+    created_at: datetime
+
+    model_config = { "from_attributes": True }
+
+    @model_validator(mode="after")
+    def validate_geometry(self):
+        return self
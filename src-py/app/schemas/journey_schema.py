@@ -40,6 +40,7 @@ class JourneyCreate(JourneyBase):
 class JourneyUpdate(BaseModel):
     end_mileage: Optional[int] = None
     end_engine_hours: Optional[float] = None
+    distance_km: Optional[float] = None
 
 class JourneyPublic(JourneyBase):
     id: int
@@ -0,0 +1,45 @@
+# backend/app/schemas/report_job_schema.py
+from pydantic import BaseModel, model_validator
+from datetime import date, datetime
+from typing import Optional
+
+from app.models.report_job_model import ReportJobStatus, ReportJobType
+from .report_schema import VehicleReportSections
+
+class ReportJobCreate(BaseModel):
+    """Pedido de relatório em segundo plano; `vehicle_id` e `sections` só valem para o consolidado do veículo."""
+    report_type: ReportJobType
+    start_date: date
+    end_date: date
+    vehicle_id: Optional[int] = None
+    sections: Optional[VehicleReportSections] = None
+
+    @model_validator(mode="after")
+    def check_params(self) -> "ReportJobCreate":
+        if self.end_date < self.start_date:
+            raise ValueError("end_date deve ser igual ou posterior a start_date.")
+        if self.report_type == ReportJobType.PARQUET_EXPORT:
+            raise ValueError("Exportações Parquet são pedidas em POST /exports/{dataset}/parquet.")
+        if self.report_type == ReportJobType.VEHICLE_CONSOLIDATED:
+            if self.vehicle_id is None:
+                raise ValueError("vehicle_id é obrigatório para o relatório consolidado do veículo.")
+            self.sections = self.sections or VehicleReportSections()
+        else:
+            # Parâmetros que não mudam o relatório não podem separar pedidos idênticos
+            self.vehicle_id = self.sections = None
+        return self
+
+
+class ReportJobPublic(BaseModel):
+    id: int
+    report_type: ReportJobType
+    status: ReportJobStatus
+    error: Optional[str] = None
+    # Tamanho do JSON do relatório (antes da compressão) ou do ZIP da exportação
+    result_size: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    model_config = { "from_attributes": True }
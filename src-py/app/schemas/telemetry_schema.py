@@ -11,4 +11,29 @@ class TelemetryPayload(BaseModel):
     engine_hours: float
     fuel_level: Optional[float] = None
     # Códigos de erro do motor, se houver
-    error_codes: Optional[List[str]] = None
\ No newline at end of file
+    error_codes: Optional[List[str]] = None
+
+# Limite de pacotes aceitos por requisição em /telemetry/report-batch.
+# Com 5 colunas por ponto, o INSERT do histórico fica abaixo do limite de 32767 parâmetros do Postgres.
+MAX_TELEMETRY_BATCH_SIZE = 5000
+
+
+class DeviceToken(BaseModel):
+    """Token de autenticação de um dispositivo no canal WebSocket de telemetria."""
+    device_id: str
+    token: str
+
+
+class PositionBufferStats(BaseModel):
+    """Métricas do buffer de escrita das posições dos veículos."""
+    running: bool
+    queue_size: int
+    retry_pending: int
+    max_queue_size: int
+    received: int
+    written: int
+    flushes: int
+    failed_flushes: int
+    last_flush_ms: float
+    max_flush_ms: float
+    avg_flush_ms: float
@@ -0,0 +1,20 @@
+# backend/app/schemas/track_schema.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+
+class TrackPointPublic(BaseModel):
+    """Um ponto do trajeto de um veículo."""
+    timestamp: datetime
+    latitude: float
+    longitude: float
+
+    model_config = { "from_attributes": True }
+
+
+class TrackPolylinePublic(BaseModel):
+    """Trajeto reduzido codificado como Encoded Polyline, com o horário de cada vértice."""
+    polyline: str
+    timestamps: List[datetime]
+    point_count: int
+    raw_point_count: int
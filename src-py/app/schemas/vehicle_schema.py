@@ -58,4 +58,12 @@ class VehiclePublic(VehicleBase):
 # Schema para respostas paginadas
 class VehicleListResponse(BaseModel):
     vehicles: List[VehiclePublic]
-    total_items: int
\ No newline at end of file
+    total_items: int
+
+class VehicleNearby(BaseModel):
+    """Veículo retornado pelas consultas de proximidade (índice de últimas posições)."""
+    vehicle_id: int
+    latitude: float
+    longitude: float
+    status: VehicleStatus
+    distance_km: Optional[float] = None
@@ -0,0 +1,22 @@
+# backend/app/schemas/vehicle_stop_schema.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class VehicleStopPublic(BaseModel):
+    """Parada detectada; `ended_at` e `duration_seconds` ficam vazios enquanto ela está aberta."""
+    id: int
+    latitude: float
+    longitude: float
+    started_at: datetime
+    ended_at: Optional[datetime] = None
+    duration_seconds: Optional[int] = None
+    stop_point_id: Optional[int] = None
+
+    model_config = { "from_attributes": True }
+
+
+class VehicleStopListResponse(BaseModel):
+    stops: List[VehicleStopPublic]
+    # Tempo parado dentro do período consultado
+    idle_seconds: int
@@ -0,0 +1,29 @@
+import asyncio
+import sys
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import crud_journey
+
+
+async def backfill_journey_distances(db: AsyncSession, *, recompute: bool = False) -> int:
+    """
+    Tarefa de backfill da distância das viagens pelo GPS, para executar uma vez após a
+    implantação (ou com `recompute` depois de mudar os limites de filtragem). As viagens
+    novas recebem a distância ao serem encerradas.
+    """
+    updated = await crud_journey.backfill_gps_distances(db, recompute=recompute)
+    print(f"Distância pelo GPS calculada para {updated} viagens.")
+    return updated
+
+
+async def main() -> None:
+    from app.db.session import SessionLocal
+
+    async with SessionLocal() as db:
+        # `python -m app.tasks.journey_tasks --recompute` recalcula também as viagens já preenchidas
+        await backfill_journey_distances(db, recompute="--recompute" in sys.argv[1:])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
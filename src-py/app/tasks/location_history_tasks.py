@@ -0,0 +1,73 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud import crud_location_history, crud_track
+
+
+async def ensure_upcoming_partitions(db: AsyncSession) -> bool:
+    """
+    Garante as partições do mês atual e dos próximos meses do histórico de localização.
+    Retorna False se a tabela ainda não estiver particionada.
+    """
+    conn = await db.connection()
+    if not await crud_location_history.is_partitioned(conn):
+        print("AVISO: location_history não está particionada; execute as migrações (alembic upgrade head).")
+        return False
+
+    current_month = crud_location_history.month_start(datetime.utcnow())
+    upcoming = [
+        crud_location_history.add_months(current_month, offset)
+        for offset in range(settings.LOCATION_HISTORY_PARTITIONS_AHEAD + 1)
+    ]
+    await crud_location_history.ensure_partitions(db, months=upcoming)
+    await db.commit()
+    return True
+
+
+async def compact_location_history(db: AsyncSession) -> int:
+    """
+    Tarefa de compactação dos trajetos, a ser agendada a cada poucos minutos.
+    Move para `track_chunks` todos os pontos de `location_history` cujas janelas fecharam
+    há mais de `TRACK_HOT_BUFFER_HOURS`, inclusive pacotes atrasados e backfills antigos,
+    que são mesclados aos blocos já selados. O buffer fica só com as últimas horas.
+    """
+    until = datetime.now(timezone.utc) - timedelta(hours=settings.TRACK_HOT_BUFFER_HOURS)
+    return await crud_track.compact_pending(db, until=until)
+
+
+async def manage_location_history_partitions(db: AsyncSession) -> None:
+    """
+    Tarefa de manutenção do histórico de localização, a ser agendada diariamente.
+    Compacta os trajetos pendentes, garante as partições dos próximos meses e aplica
+    a retenção removendo partições inteiras (só as já esvaziadas pela compactação).
+    """
+    await compact_location_history(db)
+    if not await ensure_upcoming_partitions(db):
+        return
+
+    cutoff = crud_location_history.retention_start()
+    conn = await db.connection()
+    dropped = await crud_location_history.drop_partitions_before(conn, cutoff=cutoff)
+    await db.commit()
+
+    if dropped:
+        print(f"Retenção do histórico de localização: partições removidas {dropped}")
+
+
+async def main() -> None:
+    from app.db.session import SessionLocal
+
+    async with SessionLocal() as db:
+        # `python -m app.tasks.location_history_tasks compact` executa apenas a compactação
+        if sys.argv[1:] == ["compact"]:
+            await compact_location_history(db)
+        else:
+            await manage_location_history_partitions(db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
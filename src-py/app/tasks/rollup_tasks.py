@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud import crud_rollup
+
+
+async def reconcile_daily_rollups(db: AsyncSession, *, since: Optional[date] = None) -> int:
+    """
+    Tarefa noturna (cron) de reconciliação da consolidação diária: recalcula os últimos
+    `ROLLUP_RECONCILE_DAYS` dias a partir dos registros originais e corrige as divergências.
+    Com `since`, reconstrói desde essa data (ex: para conferir todo o histórico).
+    """
+    today = datetime.now(timezone.utc).date()
+    start = since or today - timedelta(days=settings.ROLLUP_RECONCILE_DAYS)
+    corrected = await crud_rollup.reconcile(db, start_date=start, end_date=today)
+    print(f"Consolidação diária conferida de {start} a {today}: {corrected} chaves corrigidas.")
+    return corrected
+
+
+async def main() -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Reconcilia a consolidação diária da frota.")
+    parser.add_argument("--since", type=date.fromisoformat, help="reconstrói a partir desta data (AAAA-MM-DD)")
+    args = parser.parse_args()
+    async with SessionLocal() as db:
+        await reconcile_daily_rollups(db, since=args.since)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,11 +1,17 @@
+import json
 from datetime import datetime, timedelta, date
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 
 from app import crud, deps
+from app.core.config import settings
+from app.core.dashboard_cache import dashboard_cache
+from app.core.position_hub import PositionSubscription, position_hub
 from app.models.user_model import User, UserRole
+from app.models.vehicle_model import VehicleStatus
 
 # --- CORREÇÃO: Importar a INSTÂNCIA 'demo_usage' diretamente ---
 from app.crud.crud_demo_usage import demo_usage as crud_demo_usage_instance
@@ -14,8 +20,10 @@ from app.crud.crud_demo_usage import demo_usage as crud_demo_usage_instance
 # --- NOVOS IMPORTS DOS SCHEMAS CENTRALIZADOS ---
 from app.schemas.dashboard_schema import (
     ManagerDashboardResponse,
+    DashboardCacheStats,
     DriverDashboardResponse,
     VehiclePosition,
+    VehicleClusterResponse,
 )
 
 router = APIRouter()
@@ -57,46 +65,31 @@ async def read_manager_dashboard(
             detail="Acesso não autorizado a este dashboard.",
         )
 
+    # O período entra na chave do cache pela data de início, que também muda na virada do dia.
+    # As seções são calculadas em paralelo; km por dia e pódio são dados premium (apenas CLIENTE_ATIVO)
     org_id = current_user.organization_id
     start_date = _get_start_date_from_period(period)
-
-    # --- Busca de dados de custos movida para fora do 'if' ---
-    costs = await crud.report.get_costs_by_category_last_30_days(db, organization_id=org_id, start_date=start_date)
-    
-    # --- Busca de dados comuns a todos os gestores ---
-    kpis = await crud.report.get_dashboard_kpis(db, organization_id=org_id)
-    efficiency_kpis = await crud.report.get_efficiency_kpis(db, organization_id=org_id, start_date=start_date)
-    recent_alerts = await crud.report.get_recent_alerts(db, organization_id=org_id)
-    upcoming_maintenances = await crud.report.get_upcoming_maintenances(db, organization_id=org_id)
-    active_goal = await crud.report.get_active_goal_with_progress(db, organization_id=org_id)
-
-    # --- Busca de dados premium (apenas para CLIENTE_ATIVO) ---
-    if current_user.role == UserRole.CLIENTE_ATIVO:
-        km_per_day = await crud.report.get_km_per_day_last_30_days(db, organization_id=org_id, start_date=start_date)
-        podium = await crud.report.get_podium_drivers(db, organization_id=org_id)
-
-        return ManagerDashboardResponse(
-            kpis=kpis,
-            efficiency_kpis=efficiency_kpis,
-            costs_by_category=costs,
-            km_per_day_last_30_days=km_per_day,
-            podium_drivers=podium,
-            recent_alerts=recent_alerts,
-            upcoming_maintenances=upcoming_maintenances,
-            active_goal=active_goal
-        )
-    
-    # --- Resposta para CLIENTE_DEMO (sem dados premium) ---
-    return ManagerDashboardResponse(
-        kpis=kpis,
-        efficiency_kpis=efficiency_kpis,
-        costs_by_category=costs,
-        recent_alerts=recent_alerts,
-        upcoming_maintenances=upcoming_maintenances,
-        active_goal=active_goal,
+    premium = current_user.role == UserRole.CLIENTE_ATIVO
+    # Devolve ao pool a conexão usada para carregar o usuário: as seções abrem as suas, e o
+    # cálculo (compartilhado com outras requisições) usa só o engine
+    bind = db.bind
+    await db.close()
+    return await dashboard_cache.get_or_compute(
+        (org_id, start_date, current_user.role),
+        lambda: crud.dashboard.get_manager_dashboard(
+            bind, organization_id=org_id, start_date=start_date, premium=premium,
+        ),
     )
 
 
+@router.get("/manager/cache-stats", response_model=DashboardCacheStats)
+async def read_dashboard_cache_stats(
+    current_user: User = Depends(deps.get_current_super_admin),
+):
+    """Retorna os contadores do cache do dashboard do gestor (acertos, falhas e invalidações)."""
+    return dashboard_cache.stats()
+
+
 # --- ENDPOINT PARA O DASHBOARD DO MOTORISTA ---
 @router.get(
     "/driver",
@@ -154,6 +147,104 @@ async def read_vehicle_positions(
     return positions
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _position_events(
+    request: Request, subscription: PositionSubscription, snapshot: List[VehiclePosition]
+) -> AsyncIterator[str]:
+    try:
+        yield _sse("snapshot", [position.model_dump() for position in snapshot])
+        while not await request.is_disconnected():
+            batch = await subscription.next_batch(timeout=settings.POSITION_STREAM_HEARTBEAT_SECONDS)
+            # Comentário SSE mantém a conexão aberta em proxies quando não há mudanças
+            yield _sse("positions", batch) if batch else ": keepalive\n\n"
+    finally:
+        position_hub.unsubscribe(subscription)
+
+
+@router.get(
+    "/vehicles/positions/stream",
+    summary="Transmite as mudanças de posição da frota (Server-Sent Events)",
+    response_class=StreamingResponse,
+)
+async def stream_vehicle_positions(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    interval_ms: int = Query(
+        settings.POSITION_STREAM_DEFAULT_INTERVAL_MS, ge=settings.POSITION_STREAM_MIN_INTERVAL_MS, le=60_000
+    ),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Substitui o polling de /vehicles/positions: envia um evento `snapshot` com todas as
+    posições e, depois, eventos `positions` só com os veículos que se moveram
+    ([{id, latitude, longitude, timestamp}]), no máximo um a cada `interval_ms`.
+    As posições vêm direto da telemetria, sem consultas ao banco por atualização.
+    """
+    if current_user.role not in [UserRole.CLIENTE_ATIVO, UserRole.CLIENTE_DEMO]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso não autorizado.",
+        )
+
+    # Assina antes de ler o snapshot para não perder posições recebidas entre os dois
+    subscription = position_hub.subscribe(current_user.organization_id, interval=interval_ms / 1000)
+    try:
+        snapshot = await crud.report.get_vehicle_positions(db, organization_id=current_user.organization_id)
+    except Exception:
+        position_hub.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        _position_events(request, subscription, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/vehicles/positions/clustered",
+    response_model=VehicleClusterResponse,
+    summary="Obtém as posições da frota agrupadas para a área visível do mapa",
+)
+async def read_vehicle_position_clusters(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    zoom: int = Query(..., ge=0, le=22),
+    min_lat: float = Query(-90, ge=-90, le=90),
+    min_lon: float = Query(-180, ge=-180, le=180),
+    max_lat: float = Query(90, ge=-90, le=90),
+    max_lon: float = Query(180, ge=-180, le=180),
+    status_filter: List[VehicleStatus] | None = Query(None, alias="status"),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Versão do mapa em tempo real para frotas grandes: retorna grupos (centróide e contagem)
+    de acordo com o zoom e a área visível, e os veículos individuais só nos zooms altos,
+    mantendo o tamanho da resposta limitado independentemente do tamanho da frota.
+    """
+    if current_user.role not in [UserRole.CLIENTE_ATIVO, UserRole.CLIENTE_DEMO]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso não autorizado.",
+        )
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="min_lat não pode ser maior que max_lat.")
+
+    return await crud.report.get_vehicle_position_clusters(
+        db,
+        organization_id=current_user.organization_id,
+        zoom=zoom,
+        min_lat=min_lat,
+        min_lon=min_lon,
+        max_lat=max_lat,
+        max_lon=max_lon,
+        statuses=status_filter,
+    )
+
+
 # --- Rota de estatísticas da conta demo (MANTIDA) ---
 class DemoStatsResponse(BaseModel):
     vehicles: DemoResourceLimit
@@ -0,0 +1,120 @@
+# backend/app/api/v1/endpoints/exports.py
+
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app import crud, deps
+from app.core.config import settings
+from app.core.report_jobs import report_job_runner
+from app.core.security import verify_export_cursor
+from app.core.tabular_export import CSV_BOM, csv_chunk, ndjson_chunk
+from app.models.user_model import User
+from app.schemas.export_schema import ExportDataset, ExportFormat, ParquetExportJobCreate
+from app.schemas.report_job_schema import ReportJobPublic
+
+router = APIRouter()
+
+_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+async def _export_lines(bind: AsyncEngine, stmt: Select, format: ExportFormat) -> AsyncIterator[str]:
+    # Sessão própria: a sessão da requisição é fechada antes de a resposta ser transmitida
+    columns = crud.export.columns(stmt)
+    if format == ExportFormat.CSV:
+        yield CSV_BOM + csv_chunk([columns])
+    async with AsyncSession(bind) as session:
+        async for rows in crud.export.stream_batches(session, stmt):
+            yield csv_chunk(rows) if format == ExportFormat.CSV else ndjson_chunk(columns, rows)
+
+
+@router.get("/{dataset}", response_class=StreamingResponse)
+async def export_dataset(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    dataset: ExportDataset,
+    start_date: date,
+    end_date: date,
+    format: ExportFormat = ExportFormat.CSV,
+    vehicle_id: Optional[int] = Query(None),
+    current_user: User = Depends(deps.get_current_active_manager),
+):
+    """
+    Exporta todos os registros da organização no período (custos, abastecimentos, viagens,
+    multas, transações de estoque ou histórico de localização) em CSV ou NDJSON, em ordem cronológica e sem paginação.
+    As linhas são lidas por um cursor no servidor e transmitidas em lotes, então o consumo de
+    memória não cresce com o tamanho da exportação.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A data final não pode ser anterior à data inicial.")
+
+    stmt = crud.export.build_query(
+        dataset, organization_id=current_user.organization_id, start_date=start_date, end_date=end_date,
+        vehicle_id=vehicle_id,
+    )
+    filename = f"{dataset.value}_{start_date.isoformat()}_{end_date.isoformat()}.{format.value}"
+    return StreamingResponse(
+        _export_lines(db.bind, stmt, format),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/{dataset}/parquet", response_model=ReportJobPublic, status_code=status.HTTP_202_ACCEPTED)
+async def export_dataset_parquet(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    dataset: ExportDataset,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(deps.get_current_active_manager),
+):
+    """
+    Enfileira a exportação dos registros da organização em Parquet, um arquivo por mês
+    (`{dataset}/month=AAAA-MM/part-N.parquet`), dentro de um ZIP, e retorna o job. Informe o
+    período para a exportação completa ou o `cursor` devolvido pela anterior para receber apenas
+    as linhas criadas desde então. Baixe o ZIP em GET /reports/jobs/{id}/result (cabeçalhos
+    `X-Export-Cursor` e `X-Export-Rows`; sem linhas novas, a resposta é 204).
+
+    Ids são reservados na inserção, não no commit: a
+    exportação inclui só as linhas com id até o maior existente agora e roda depois de
+    `EXPORT_CURSOR_SAFETY_LAG_SECONDS`, quando as transações com ids menores já terminaram.
+    """
+    organization_id = current_user.organization_id
+    after_id = None
+    if cursor is not None:
+        if start_date is not None or end_date is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Informe o período ou o cursor, não ambos.")
+        after_id = verify_export_cursor(cursor, organization_id=organization_id, dataset=dataset.value)
+        if after_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de exportação inválido.")
+    elif start_date is None or end_date is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Informe o período ou o cursor da última exportação.")
+    elif end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A data final não pode ser anterior à data inicial.")
+
+    # Com o conjunto vazio, o limite fica no próprio cursor: as linhas inseridas durante a
+    # espera entram só na próxima exportação, e não nesta e na seguinte
+    until_id = await crud.export.max_id(db, dataset)
+    if until_id is None:
+        until_id = after_id or 0
+
+    lag = settings.EXPORT_CURSOR_SAFETY_LAG_SECONDS
+    job, created = await crud.report_job.submit(
+        db, job_in=ParquetExportJobCreate(dataset=dataset, start_date=start_date, end_date=end_date, after_id=after_id),
+        organization_id=organization_id, requested_by_id=current_user.id,
+        extra_params={"until_id": until_id},
+        run_after=datetime.now(timezone.utc) + timedelta(seconds=lag),
+    )
+    response = ReportJobPublic.model_validate(job)
+    if created:
+        report_job_runner.enqueue(job.id, delay=lag)
+    return response
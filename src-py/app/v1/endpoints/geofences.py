@@ -0,0 +1,80 @@
+# ARQUIVO: backend/app/api/v1/endpoints/geofences.py
+
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app import crud, deps
+from app.models.user_model import User
+from app.schemas.geofence_schema import GeofenceCreate, GeofenceUpdate, GeofencePublic
+
+router = APIRouter()
+
+
+@router.post("/", response_model=GeofencePublic, status_code=status.HTTP_201_CREATED)
+async def create_geofence(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    geofence_in: GeofenceCreate,
+    current_user: User = Depends(deps.get_current_active_manager)
+):
+    """
+    Cria uma cerca eletrônica (polígono ou círculo). A entrada e a saída dos veículos
+    geram alertas e notificações para os gestores.
+    """
+    return await crud.geofence.create(db, obj_in=geofence_in, organization_id=current_user.organization_id)
+
+
+@router.get("/", response_model=List[GeofencePublic])
+async def read_geofences(
+    db: AsyncSession = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """Retorna as cercas eletrônicas da organização."""
+    return await crud.geofence.get_multi_by_org(
+        db, organization_id=current_user.organization_id, skip=skip, limit=limit
+    )
+
+
+@router.get("/{geofence_id}", response_model=GeofencePublic)
+async def read_geofence(
+    geofence_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    geofence = await crud.geofence.get(db, geofence_id=geofence_id, organization_id=current_user.organization_id)
+    if not geofence:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cerca não encontrada.")
+    return geofence
+
+
+@router.put("/{geofence_id}", response_model=GeofencePublic)
+async def update_geofence(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    geofence_id: int,
+    geofence_in: GeofenceUpdate,
+    current_user: User = Depends(deps.get_current_active_manager)
+):
+    """Atualiza uma cerca eletrônica (apenas para gestores)."""
+    geofence = await crud.geofence.get(db, geofence_id=geofence_id, organization_id=current_user.organization_id)
+    if not geofence:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cerca não encontrada.")
+    return await crud.geofence.update(db, db_obj=geofence, obj_in=geofence_in)
+
+
+@router.delete("/{geofence_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_geofence(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    geofence_id: int,
+    current_user: User = Depends(deps.get_current_active_manager)
+):
+    """Exclui uma cerca eletrônica (apenas para gestores)."""
+    geofence = await crud.geofence.get(db, geofence_id=geofence_id, organization_id=current_user.organization_id)
+    if not geofence:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cerca não encontrada.")
+    await crud.geofence.remove(db, db_obj=geofence)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -7,6 +7,7 @@ from app.models.notification_model import NotificationType
 from app import crud, deps
 from app.models.user_model import User, UserRole
 from app.schemas.journey_schema import JourneyCreate, JourneyUpdate, JourneyPublic, EndJourneyResponse
+from app.schemas.track_schema import TrackPointPublic
 from app.crud.crud_journey import VehicleNotAvailableError # Importa a exceção customizada
 
 router = APIRouter()
@@ -127,6 +128,22 @@ async def end_journey(
 
     return EndJourneyResponse(journey=finished_journey, vehicle=updated_vehicle)
 
+@router.get("/{journey_id}/route", response_model=List[TrackPointPublic])
+async def read_journey_route(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    journey_id: int,
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """Retorna o trajeto GPS percorrido durante uma viagem."""
+    journey = await crud.journey.get_journey(
+        db, journey_id=journey_id, organization_id=current_user.organization_id
+    )
+    if not journey:
+        raise HTTPException(status_code=404, detail="Viagem não encontrada.")
+
+    return await crud.track.get_journey_route(db, journey=journey)
+
 @router.delete("/{journey_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_journey(
     *,
@@ -1,14 +1,24 @@
 # backend/app/api/v1/endpoints/reports.py
-from fastapi import APIRouter, Depends, HTTPException, Response, Body, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Body, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from jinja2 import Environment, FileSystemLoader
 from xhtml2pdf import pisa
+import asyncio
+import gzip
 import io
+import json
 from datetime import datetime, date, timedelta
 import logging
+from typing import AsyncIterator
 from app import crud, deps
+from app.core.config import settings
+from app.core.report_jobs import report_job_runner
+from app.core.security import create_export_cursor
+from app.models.report_job_model import ReportJobStatus, ReportJobType
 from app.models.user_model import User, UserRole
 from app.schemas.report_generator_schema import ReportRequest
+from app.schemas.report_job_schema import ReportJobCreate, ReportJobPublic
 # --- IMPORTS ATUALIZADOS ---
 from app.schemas.report_schema import (
     DashboardSummary, 
@@ -132,6 +142,141 @@ async def generate_vehicle_consolidated_report(
         logging.error(f"Erro Inesperado no Relatório: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Ocorreu um erro ao gerar o relatório: {e}")
 
+# --- RELATÓRIOS EM SEGUNDO PLANO ---
+
+@router.post("/jobs", response_model=ReportJobPublic, status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(deps.check_demo_limit("reports"))])
+async def submit_report_job(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    job_in: ReportJobCreate,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Enfileira um relatório (gerencial da frota, desempenho de motoristas ou consolidado do
+    veículo) para cálculo em segundo plano e retorna o job. Um pedido idêntico a outro ainda
+    na fila, em execução ou com resultado válido retorna o mesmo job.
+    Acompanhe por GET /reports/jobs/{id} ou /reports/jobs/{id}/events e baixe o resultado em
+    /reports/jobs/{id}/result.
+    """
+    if job_in.report_type == ReportJobType.VEHICLE_CONSOLIDATED:
+        vehicle = await crud.vehicle.get(db, vehicle_id=job_in.vehicle_id, organization_id=current_user.organization_id)
+        if not vehicle:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Veículo não encontrado.")
+
+    job, created = await crud.report_job.submit(
+        db, job_in=job_in, organization_id=current_user.organization_id, requested_by_id=current_user.id
+    )
+    response = ReportJobPublic.model_validate(job)
+    if created:
+        report_job_runner.enqueue(job.id)
+        if current_user.role == UserRole.CLIENTE_DEMO:
+            await crud.demo_usage.increment_usage(db, organization_id=current_user.organization_id, resource_type="reports")
+    return response
+
+
+async def _get_job_or_404(db: AsyncSession, job_id: int, current_user: User):
+    job = await crud.report_job.get(db, job_id=job_id, organization_id=current_user.organization_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job de relatório não encontrado.")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobPublic)
+async def read_report_job(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    job_id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Situação do job: pending, running, done (resultado disponível até `expires_at`) ou failed."""
+    return await _get_job_or_404(db, job_id, current_user)
+
+
+@router.get("/jobs/{job_id}/result", response_class=Response)
+async def read_report_job_result(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    job_id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    JSON do relatório, no mesmo formato do endpoint síncrono correspondente. Clientes que
+    aceitam gzip recebem o resultado como foi guardado, sem descompressão no servidor.
+    Exportações Parquet devolvem o ZIP com os cabeçalhos `X-Export-Cursor` e `X-Export-Rows`
+    (204 se não havia linhas).
+    """
+    job = await _get_job_or_404(db, job_id, current_user)
+    if job.status != ReportJobStatus.DONE:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"O relatório não está pronto (status: {job.status.value}).")
+    if crud.report_job.is_expired(job):
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="O resultado do relatório expirou. Peça-o novamente.")
+    if job.report_type == ReportJobType.PARQUET_EXPORT:
+        dataset = job.params["dataset"]
+        headers = {
+            "X-Export-Cursor": create_export_cursor(job.organization_id, dataset, job.result_metadata["last_id"]),
+            "X-Export-Rows": str(job.result_metadata["rows"]),
+        }
+        if not job.result_metadata["rows"]:
+            return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+        headers["Content-Disposition"] = f'attachment; filename="{dataset}.zip"'
+        return Response(job.result, media_type="application/zip", headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(job.result, media_type="application/json", headers={"Content-Encoding": "gzip"})
+    return Response(gzip.decompress(job.result), media_type="application/json")
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _job_events(request: Request, job_id: int, organization_id: int, wakeup: asyncio.Event) -> AsyncIterator[str]:
+    try:
+        last = None
+        while not await request.is_disconnected():
+            # Limpa antes de ler: um aviso que chegue durante a leitura não se perde
+            wakeup.clear()
+            async with report_job_runner.session_factory() as db:
+                job = await crud.report_job.get(db, job_id=job_id, organization_id=organization_id)
+                current = ReportJobPublic.model_validate(job).model_dump(mode="json") if job else None
+            if current is None:
+                break
+            if current != last:
+                yield _sse("status", current)
+                last = current
+            if current["status"] in (ReportJobStatus.DONE.value, ReportJobStatus.FAILED.value):
+                break
+            # Jobs executados em outro processo são percebidos a cada heartbeat
+            try:
+                await asyncio.wait_for(wakeup.wait(), settings.REPORT_JOB_EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+    finally:
+        report_job_runner.unsubscribe(job_id, wakeup)
+
+
+@router.get("/jobs/{job_id}/events", response_class=StreamingResponse)
+async def stream_report_job_events(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    job_id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Server-Sent Events com a situação do job (`event: status`, mesmo corpo de
+    GET /reports/jobs/{id}) a cada mudança; a conexão é encerrada quando o job termina.
+    """
+    await _get_job_or_404(db, job_id, current_user)
+    wakeup = report_job_runner.subscribe(job_id)
+    return StreamingResponse(
+        _job_events(request, job_id, current_user.organization_id, wakeup),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # --- Endpoint de dashboard-summary (sem alteração) ---
 @router.get("/dashboard-summary", response_model=DashboardSummary)
 async def get_dashboard_summary_data(
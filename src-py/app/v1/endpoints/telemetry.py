@@ -1,21 +1,164 @@
 # backend/app/api/v1/endpoints/telemetry.py
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+import asyncio
+from typing import List, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 # ... (imports)
-from app.schemas.telemetry_schema import TelemetryPayload
+from app.schemas.telemetry_schema import TelemetryPayload, PositionBufferStats, DeviceToken, MAX_TELEMETRY_BATCH_SIZE
 from app import deps
+from app.core.config import settings
+from app.core.device_registry import device_registry
+from app.core.position_buffer import position_buffer
+from app.core.security import create_device_token, verify_device_token
+from app.core.telemetry_codec import BINARY_CONTENT_TYPE, TelemetryDecodeError, TelemetryFrameTooLarge, TelemetryPoint, decode_points
+from app.core.telemetry_stream import TelemetryStream
+from app.models.user_model import User
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud # <-- CAMINHO CORRETO
 
 
 router = APIRouter()
 
-@router.post("/report", status_code=status.HTTP_204_NO_CONTENT)
+_payload_list_adapter = TypeAdapter(List[TelemetryPayload])
+
+
+def _request_body_docs(json_schema: dict) -> dict:
+    """Documenta no OpenAPI os dois formatos aceitos (o corpo é lido manualmente)."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": json_schema},
+                BINARY_CONTENT_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    }
+
+
+async def _read_telemetry(request: Request, *, many: bool) -> Sequence[TelemetryPayload | TelemetryPoint]:
+    """
+    Lê os pacotes do corpo conforme o Content-Type: JSON (validado pelo Pydantic) ou o
+    formato binário compacto, decodificado direto para `TelemetryPoint`.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    body = await request.body()
+
+    if content_type == BINARY_CONTENT_TYPE:
+        try:
+            points = decode_points(body, max_records=MAX_TELEMETRY_BATCH_SIZE if many else 1)
+        except TelemetryFrameTooLarge as e:
+            code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE if many else status.HTTP_400_BAD_REQUEST
+            raise HTTPException(status_code=code, detail=str(e))
+        except TelemetryDecodeError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if not many and len(points) != 1:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie exatamente um pacote.")
+        return points
+
+    try:
+        if many:
+            return _payload_list_adapter.validate_json(body)
+        return [TelemetryPayload.model_validate_json(body)]
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+
+
+@router.post(
+    "/report", status_code=status.HTTP_204_NO_CONTENT,
+    openapi_extra=_request_body_docs(TelemetryPayload.model_json_schema()),
+)
 async def report_telemetry(
     *,
     db: AsyncSession = Depends(deps.get_db),
-    payload: TelemetryPayload
+    request: Request,
 ):
-    """Recebe e processa um pacote de dados de telemetria."""
+    """Recebe e processa um pacote de dados de telemetria (JSON ou binário)."""
+    payload, = await _read_telemetry(request, many=False)
     await crud.vehicle.update_vehicle_from_telemetry(db=db, payload=payload)
     # Retornamos 204 No Content para ser rápido, o dispositivo não precisa de uma resposta.
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.post(
+    "/report-batch", status_code=status.HTTP_204_NO_CONTENT,
+    openapi_extra=_request_body_docs(_payload_list_adapter.json_schema()),
+)
+async def report_telemetry_batch(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+):
+    """
+    Recebe um lote de pacotes de telemetria de um ou mais dispositivos (JSON ou binário).
+    Usado pelos gateways para reenviar os dados acumulados enquanto estavam sem cobertura.
+    """
+    payloads = await _read_telemetry(request, many=True)
+    if len(payloads) > MAX_TELEMETRY_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O lote excede o limite de {MAX_TELEMETRY_BATCH_SIZE} pacotes por requisição.",
+        )
+    await crud.vehicle.update_vehicles_from_telemetry_batch(db=db, payloads=payloads)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/buffer-stats", response_model=PositionBufferStats)
+async def read_position_buffer_stats(
+    current_user: User = Depends(deps.get_current_super_admin),
+):
+    """Retorna as métricas do buffer de escrita das posições (fila e latência de gravação)."""
+    return position_buffer.stats()
+
+
+@router.post("/device-token/{vehicle_id}", response_model=DeviceToken)
+async def issue_device_token(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    vehicle_id: int,
+    current_user: User = Depends(deps.get_current_active_manager),
+):
+    """Gera o token com que o rastreador do veículo se autentica no canal WebSocket (/telemetry/ws)."""
+    vehicle = await crud.vehicle.get(db, vehicle_id=vehicle_id, organization_id=current_user.organization_id)
+    if not vehicle:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Veículo não encontrado.")
+    if not vehicle.telemetry_device_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="O veículo não possui um dispositivo de telemetria.")
+    return DeviceToken(device_id=vehicle.telemetry_device_id, token=create_device_token(vehicle.telemetry_device_id))
+
+
+@router.websocket("/ws")
+async def telemetry_stream(websocket: WebSocket, db: AsyncSession = Depends(deps.get_db)):
+    """
+    Canal persistente de telemetria. O dispositivo se autentica uma única vez com
+    {"type": "auth", "token": "..."} e, em seguida, envia frames com um ponto
+    ({"timestamp", "latitude", "longitude", "engine_hours", ...}), uma lista de pontos
+    ou uma mensagem binária no formato de `app/core/telemetry_codec.py`.
+    O servidor confirma os frames em janelas com {"type": "ack", "seq": n}.
+    A sessão da requisição só autentica o dispositivo; cada lote usa uma sessão própria.
+    """
+    await websocket.accept()
+    try:
+        hello = await asyncio.wait_for(websocket.receive_json(), timeout=settings.TELEMETRY_WS_AUTH_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, ValueError, WebSocketDisconnect):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    device_id = None
+    if isinstance(hello, dict) and hello.get("type") == "auth":
+        device_id = verify_device_token(str(hello.get("token", "")))
+    registered = bool(device_id) and await device_registry.resolve(db, device_id) is not None
+    # Devolve a conexão ao pool antes de manter o socket aberto
+    bind = db.bind
+    await db.close()
+    if not registered:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.send_json({"type": "auth_ok", "device_id": device_id, "ack_window": settings.TELEMETRY_WS_ACK_WINDOW})
+    stream = TelemetryStream(
+        websocket, bind,
+        device_id=device_id,
+        ack_window=settings.TELEMETRY_WS_ACK_WINDOW,
+        max_pending=settings.TELEMETRY_WS_MAX_PENDING_FRAMES,
+    )
+    await stream.run()
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+import json
+from datetime import datetime, timedelta
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
 from pydantic import BaseModel  # Importa BaseModel
 
 from app import crud, deps
+from app.core.config import settings
+from app.core.track_codec import TrackArrays, as_utc, points_from_arrays
+from app.core.track_simplify import encode_polyline, lttb_indices
+from app.core.vehicle_index import vehicle_index
+from app.models.vehicle_model import VehicleStatus
 from app.models.user_model import User, UserRole
 from sqlalchemy.exc import IntegrityError
 
@@ -11,9 +20,12 @@ from app.schemas.vehicle_schema import (
     VehicleCreate,
     VehicleUpdate,
     VehiclePublic,
-    VehicleListResponse
+    VehicleListResponse,
+    VehicleNearby
 )
 from app.schemas.inventory_transaction_schema import TransactionPublic
+from app.schemas.track_schema import TrackPolylinePublic
+from app.schemas.vehicle_stop_schema import VehicleStopListResponse
 
 router = APIRouter()
 
@@ -50,6 +62,69 @@ async def read_vehicles(
     return {"vehicles": vehicles, "total_items": total_items}
 
 
+@router.get("/nearby", response_model=List[VehicleNearby])
+async def read_vehicles_nearby(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0, le=20000),
+    status_filter: List[VehicleStatus] | None = Query(None, alias="status"),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """Veículos da organização a até `radius_km` do ponto, do mais próximo ao mais distante."""
+    await vehicle_index.ensure_loaded(db, current_user.organization_id)
+    found = vehicle_index.within_radius(current_user.organization_id, lat, lon, radius_km, status_filter)
+    return [
+        VehicleNearby(vehicle_id=v.vehicle_id, latitude=v.latitude, longitude=v.longitude, status=v.status, distance_km=d)
+        for v, d in found
+    ]
+
+
+@router.get("/nearest", response_model=List[VehicleNearby])
+async def read_nearest_vehicles(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=100),
+    status_filter: List[VehicleStatus] | None = Query(None, alias="status"),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """Os `k` veículos da organização mais próximos do ponto."""
+    await vehicle_index.ensure_loaded(db, current_user.organization_id)
+    found = vehicle_index.nearest(current_user.organization_id, lat, lon, k, status_filter)
+    return [
+        VehicleNearby(vehicle_id=v.vehicle_id, latitude=v.latitude, longitude=v.longitude, status=v.status, distance_km=d)
+        for v, d in found
+    ]
+
+
+@router.get("/in-bbox", response_model=List[VehicleNearby])
+async def read_vehicles_in_bbox(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    status_filter: List[VehicleStatus] | None = Query(None, alias="status"),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Veículos da organização dentro do retângulo informado.
+    Um `min_lon` maior que `max_lon` indica um retângulo que cruza o antimeridiano.
+    """
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="min_lat não pode ser maior que max_lat.")
+    await vehicle_index.ensure_loaded(db, current_user.organization_id)
+    found = vehicle_index.within_bbox(current_user.organization_id, min_lat, min_lon, max_lat, max_lon, status_filter)
+    return [
+        VehicleNearby(vehicle_id=v.vehicle_id, latitude=v.latitude, longitude=v.longitude, status=v.status)
+        for v in found
+    ]
+
+
 @router.get("/{vehicle_id}", response_model=VehiclePublic)
 async def read_vehicle_by_id(
     *,
@@ -86,6 +161,95 @@ async def read_vehicle_inventory_history(
     return history
 
 
+@router.get("/{vehicle_id}/track", response_model=TrackPolylinePublic)
+async def read_vehicle_track(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    vehicle_id: int,
+    date_from: datetime = Query(..., alias="from"),
+    date_to: datetime = Query(..., alias="to"),
+    max_points: int = Query(2000, ge=2, le=20000),
+    format: Literal["ndjson", "polyline"] = "ndjson",
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Retorna o trajeto de um veículo no período, reduzido no servidor (LTTB) para no máximo
+    `max_points` vértices. Por padrão é transmitido como NDJSON (um ponto por linha);
+    com `format=polyline` retorna o trajeto como Encoded Polyline.
+    Os blocos do trajeto são decodificados e reduzidos em vetores numpy: só os vértices
+    mantidos viram objetos Python.
+    """
+    # Datas sem fuso são UTC, como no restante da API
+    date_from, date_to = as_utc(date_from), as_utc(date_to)
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="A data final não pode ser anterior à data inicial.")
+    if date_to - date_from > timedelta(days=settings.TRACK_PLAYBACK_MAX_DAYS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"O período máximo para reprodução de trajeto é de {settings.TRACK_PLAYBACK_MAX_DAYS} dias.",
+        )
+
+    vehicle = await crud.vehicle.get(db, vehicle_id=vehicle_id, organization_id=current_user.organization_id)
+    if not vehicle:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Veículo não encontrado.")
+
+    track = await crud.track.get_track_arrays(db, vehicle_id=vehicle_id, start=date_from, end=date_to)
+    raw_point_count = track.timestamps.size
+    kept = lttb_indices(track.latitudes, track.longitudes, max_points)
+    points = points_from_arrays(TrackArrays(*(values[kept] for values in track)))
+
+    if format == "polyline":
+        return TrackPolylinePublic(
+            polyline=encode_polyline(points),
+            timestamps=[p.timestamp for p in points],
+            point_count=len(points),
+            raw_point_count=raw_point_count,
+        )
+
+    def ndjson_lines():
+        for start in range(0, len(points), 500):
+            yield "".join(
+                json.dumps({"timestamp": p.timestamp.isoformat(), "latitude": p.latitude, "longitude": p.longitude}) + "\n"
+                for p in points[start:start + 500]
+            )
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Raw-Point-Count": str(raw_point_count)},
+    )
+
+
+@router.get("/{vehicle_id}/stops", response_model=VehicleStopListResponse)
+async def read_vehicle_stops(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    vehicle_id: int,
+    date_from: datetime = Query(..., alias="from"),
+    date_to: datetime = Query(..., alias="to"),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Retorna as paradas detectadas do veículo no período e o tempo parado total,
+    sem reprocessar o histórico de localização.
+    """
+    # Datas sem fuso são UTC, como no restante da API
+    date_from, date_to = as_utc(date_from), as_utc(date_to)
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="A data final não pode ser anterior à data inicial.")
+
+    vehicle = await crud.vehicle.get(db, vehicle_id=vehicle_id, organization_id=current_user.organization_id)
+    if not vehicle:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Veículo não encontrado.")
+
+    stops = await crud.stop.get_multi_by_vehicle(
+        db, vehicle_id=vehicle_id, organization_id=current_user.organization_id, start=date_from, end=date_to
+    )
+    return VehicleStopListResponse(
+        stops=stops, idle_seconds=crud.stop.idle_seconds(stops, start=date_from, end=date_to)
+    )
+
+
 @router.post("/", response_model=VehiclePublic, status_code=status.HTTP_201_CREATED,
             dependencies=[Depends(deps.check_demo_limit("vehicles"))])
 async def create_vehicle(
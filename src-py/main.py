@@ -3,6 +3,7 @@
 import os
 import shutil
 from fastapi import FastAPI, Request, status, UploadFile, File, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,11 +13,14 @@ from fastapi.staticfiles import StaticFiles
 from app.api import api_router
 from app.core.config import settings
 from app.core.logging_config import setup_logging
-from app.db.session import engine
+from app.core.position_buffer import position_buffer
+from app.core.report_jobs import report_job_runner
+from app.db.session import SessionLocal
+from app.tasks.location_history_tasks import ensure_upcoming_partitions
 
 # ======================= BLOCO DE IMPORTAÇÃO DOS MODELOS =======================
 # Este bloco garante que a Base do SQLAlchemy conheça todas as suas tabelas
-# antes que a função on_startup seja chamada para criá-las.
+# (relacionamentos entre modelos são resolvidos pelo nome da classe).
 
 from app.db.base_class import Base
 from app.models.organization_model import Organization
@@ -32,6 +36,7 @@ from app.models.maintenance_model import MaintenanceRequest, MaintenanceComment
 from app.models.fuel_log_model import FuelLog
 from app.models.notification_model import Notification
 from app.models.location_history_model import LocationHistory
+from app.models.track_chunk_model import TrackChunk
 from app.models.achievement_model import Achievement, UserAchievement
 from app.models.inventory_transaction_model import InventoryTransaction
 from app.models.document_model import Document
@@ -41,6 +46,7 @@ from app.models.vehicle_cost_model import VehicleCost
 from app.models.vehicle_component_model import VehicleComponent
 from app.models.tire_model import VehicleTire
 from app.models.fine_model import Fine
+from app.models.report_job_model import ReportJob
 
 # --- ESTA É A CORREÇÃO DEFINITIVA ---
 # Adiciona o nosso novo modelo à lista de modelos conhecidos.
@@ -79,16 +85,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 6. Adicionar o evento de startup para criar as tabelas
+# 6. Adicionar o evento de startup
 @app.on_event("startup")
 async def on_startup():
     """
-    Cria as tabelas no banco de dados na inicialização da aplicação.
+    Prepara os serviços em segundo plano na inicialização da aplicação.
+    O esquema do banco vem das migrações (`alembic upgrade head`): um `create_all` aqui
+    criaria tabelas novas sem as colunas/índices das migrações e faria o upgrade falhar.
     """
-    async with engine.begin() as conn:
-        # Agora, Base.metadata.create_all conhece a tabela 'organization'
-        # e a 'demousage', e as criará na ordem correta.
-        await conn.run_sync(Base.metadata.create_all)
+    # Garante as partições mensais do histórico de localização (apenas PostgreSQL)
+    async with SessionLocal() as db:
+        await ensure_upcoming_partitions(db)
+
+    # Inicia o buffer de escrita das posições recebidas por telemetria/GPS
+    await position_buffer.start()
+
+    # Inicia os workers dos relatórios em segundo plano
+    await report_job_runner.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """
+    Drena as posições de veículos ainda pendentes e interrompe os workers de relatórios
+    antes de encerrar a aplicação.
+    """
+    await position_buffer.stop()
+    await report_job_runner.stop()
 
 # 7. Adicionar Handlers de Exceção
 @app.exception_handler(RequestValidationError)
@@ -104,7 +126,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={"detail": custom_errors},
+        content={"detail": jsonable_encoder(custom_errors)},
     )
 
 # 8. Servir arquivos estáticos
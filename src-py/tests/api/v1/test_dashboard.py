@@ -0,0 +1,161 @@
+# backend/tests/api/v1/test_dashboard.py
+
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, deps
+from app.core.dashboard_cache import dashboard_cache
+from app.models.user_model import User, UserRole
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_vehicle_positions_are_clustered_by_zoom(client: AsyncClient, db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Cluster Org", sector="agronegocio"))
+    organization_id = org.id
+
+    # Cinco veículos num pátio em São Paulo e dois no Rio de Janeiro
+    positions = [(-23.5500 + i * 0.0005, -46.6300) for i in range(5)] + [(-22.9000, -43.2000), (-22.9010, -43.2010)]
+    for index, (lat, lon) in enumerate(positions):
+        vehicle = await crud.vehicle.create_with_owner(
+            db_session,
+            obj_in=VehicleCreate(brand="Iveco", model="Daily", year=2022, license_plate=f"CLU{index:04d}"),
+            organization_id=organization_id,
+        )
+        await crud.vehicle.update_location(db_session, vehicle_id=vehicle.id, lat=lat, lon=lon)
+
+    app.dependency_overrides[deps.get_current_active_user] = lambda: User(
+        id=1, full_name="Manager", email="cluster@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    try:
+        response = await client.get("/dashboard/vehicles/positions/clustered", params={"zoom": 6})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["vehicles"] == []
+        assert sorted(c["count"] for c in body["clusters"]) == [2, 5]
+        assert sum(c["status_counts"]["Disponível"] for c in body["clusters"]) == 7
+
+        viewport = {"zoom": 16, "min_lat": -23.56, "min_lon": -46.64, "max_lat": -23.54, "max_lon": -46.62}
+        body = (await client.get("/dashboard/vehicles/positions/clustered", params=viewport)).json()
+        assert body["clusters"] == []
+        assert len(body["vehicles"]) == 5
+        assert all(v["license_plate"].startswith("CLU") for v in body["vehicles"])
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
+
+
+@pytest.mark.asyncio
+async def test_position_stream_sends_snapshot_then_coalesced_deltas(client: AsyncClient, db_session: AsyncSession):
+    from app.core.position_hub import position_hub
+    from app.v1.endpoints.dashboard import stream_vehicle_positions
+
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Map Stream Org", sector="frete"))
+    organization_id = org.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="Scania", model="R450", year=2023, telemetry_device_id="STREAM-001"),
+        organization_id=organization_id,
+    )
+    vehicle_id = vehicle.id
+    await crud.vehicle.update_location(db_session, vehicle_id=vehicle_id, lat=-23.50, lon=-46.60)
+
+    class ConnectedRequest:
+        async def is_disconnected(self):
+            return False
+
+    manager = User(
+        id=1, full_name="Manager", email="stream@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    response = await stream_vehicle_positions(request=ConnectedRequest(), db=db_session, interval_ms=250, current_user=manager)
+    events = response.body_iterator
+    try:
+        snapshot = await events.__anext__()
+        assert snapshot.startswith("event: snapshot\n")
+        assert '"latitude":-23.5' in snapshot
+
+        # Três pacotes do mesmo veículo dentro do intervalo viram um único delta com a última posição
+        # (posteriores ao ping acima, senão seriam descartados como atrasados)
+        start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(seconds=1)
+        for i in range(3):
+            response = await client.post("/telemetry/report", json={
+                "device_id": "STREAM-001", "timestamp": (start + timedelta(seconds=i)).isoformat(),
+                "latitude": -23.51 - i * 0.01, "longitude": -46.61, "engine_hours": 1 + i,
+            })
+            assert response.status_code == 204
+
+        event = await events.__anext__()
+        assert event.startswith("event: positions\n")
+        assert json.loads(event.split("data: ", 1)[1]) == [
+            {"id": vehicle_id, "latitude": -23.53, "longitude": -46.61, "timestamp": (start + timedelta(seconds=2)).isoformat()}
+        ]
+    finally:
+        await events.aclose()
+    assert organization_id not in position_hub._subscribers
+
+
+@pytest.mark.asyncio
+async def test_manager_dashboard_sections_share_km_per_day(client: AsyncClient, db_session: AsyncSession):
+    from app.models.goal_model import Goal
+    from app.models.journey_model import Journey
+    from app.models.vehicle_cost_model import CostType, VehicleCost
+
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Manager Dashboard Org", sector="frete"))
+    organization_id = org.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Volvo", model="FH", year=2022), organization_id=organization_id
+    )
+    vehicle_id = vehicle.id
+    driver = User(full_name="Motorista Pódio", email="podium@test.com", hashed_password="x",
+                  role=UserRole.DRIVER, organization_id=organization_id, is_active=True)
+    db_session.add(driver)
+    await db_session.flush()
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    db_session.add_all([
+        Journey(start_time=yesterday, end_time=yesterday + timedelta(hours=2), start_mileage=1000, end_mileage=1250,
+                trip_type="free_roam", is_active=False, vehicle_id=vehicle_id, driver_id=driver.id, organization_id=organization_id),
+        VehicleCost(description="Diesel", amount=500.0, date=yesterday.date(), cost_type=CostType.COMBUSTIVEL,
+                    vehicle_id=vehicle_id, organization_id=organization_id),
+    ])
+    await db_session.commit()
+
+    def manager(role):
+        return lambda: User(id=1, full_name="Manager", email="manager-dash@test.com", hashed_password="x",
+                            role=role, organization_id=organization_id, is_active=True)
+
+    app.dependency_overrides[deps.get_current_active_user] = manager(UserRole.CLIENTE_ATIVO)
+    try:
+        body = (await client.get("/dashboard/manager")).json()
+        assert [day["total_km"] for day in body["km_per_day_last_30_days"]] == [250.0]
+        assert body["efficiency_kpis"]["cost_per_km"] == 2.0
+        assert body["costs_by_category"][0]["total_amount"] == 500.0
+        assert body["podium_drivers"][0]["full_name"] == "Motorista Pódio"
+
+        app.dependency_overrides[deps.get_current_active_user] = manager(UserRole.CLIENTE_DEMO)
+        body = (await client.get("/dashboard/manager")).json()
+        assert body["km_per_day_last_30_days"] is None and body["podium_drivers"] is None
+        assert body["efficiency_kpis"]["cost_per_km"] == 2.0
+
+        # Repetir a consulta usa o snapshot; um novo custo invalida o da organização
+        hits = dashboard_cache.hits
+        assert (await client.get("/dashboard/manager")).json()["efficiency_kpis"]["cost_per_km"] == 2.0
+        assert dashboard_cache.hits == hits + 1
+        db_session.add(VehicleCost(description="Pedágio", amount=250.0, date=yesterday.date(), cost_type=CostType.PEDAGIO,
+                                   vehicle_id=vehicle_id, organization_id=organization_id))
+        await db_session.commit()
+        assert (await client.get("/dashboard/manager")).json()["efficiency_kpis"]["cost_per_km"] == 3.0
+
+        # Metas também alimentam o dashboard
+        today = datetime.utcnow().date()
+        db_session.add(Goal(title="Custo do mês", target_value=1000.0, unit="R$", period_start=today - timedelta(days=1),
+                            period_end=today + timedelta(days=1), organization_id=organization_id))
+        await db_session.commit()
+        assert (await client.get("/dashboard/manager")).json()["active_goal"]["title"] == "Custo do mês"
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
@@ -0,0 +1,209 @@
+# backend/tests/api/v1/test_exports.py
+
+import io
+import json
+import zipfile
+from datetime import date, datetime, timezone
+import pyarrow.parquet as pq
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, deps
+from app.core.config import settings
+from app.core.report_jobs import report_job_runner
+from app.core.tabular_export import CSV_BOM
+from app.models.fuel_log_model import FuelLog
+from app.models.location_history_model import LocationHistory
+from app.models.report_job_model import ReportJob
+from app.models.user_model import User, UserRole
+from app.models.vehicle_cost_model import CostType, VehicleCost
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_export_streams_csv_and_ndjson_for_the_organization(client: AsyncClient, db_session: AsyncSession):
+    organization_ids = []
+    for name in ("Export Org", "Export Other Org"):
+        org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name=name, sector="frete"))
+        organization_ids.append(org.id)
+    organization_id, other_organization_id = organization_ids
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Scania", model="R450", year=2021, identifier="EXP-1"), organization_id=organization_id
+    )
+    vehicle_id = vehicle.id
+    other_vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Scania", model="R450", year=2021, identifier="EXP-2"), organization_id=other_organization_id
+    )
+    other_vehicle_id = other_vehicle.id
+    driver = User(full_name="Motorista Exportação", email="export-driver@test.com", hashed_password="x",
+                  role=UserRole.DRIVER, organization_id=organization_id, is_active=True)
+    db_session.add(driver)
+    await db_session.flush()
+    driver_id = driver.id
+    db_session.add_all([
+        VehicleCost(description="Pedágio, ida", amount=45.5, date=date(2026, 6, 12), cost_type=CostType.PEDAGIO,
+                    vehicle_id=vehicle_id, organization_id=organization_id),
+        VehicleCost(description="Lavagem", amount=80.0, date=date(2026, 6, 3), cost_type=CostType.OUTROS,
+                    vehicle_id=vehicle_id, organization_id=organization_id),
+        VehicleCost(description="Fora do período", amount=10.0, date=date(2026, 7, 1), cost_type=CostType.OUTROS,
+                    vehicle_id=vehicle_id, organization_id=organization_id),
+        VehicleCost(description="Outra organização", amount=99.0, date=date(2026, 6, 5), cost_type=CostType.OUTROS,
+                    vehicle_id=other_vehicle_id, organization_id=other_organization_id),
+        FuelLog(odometer=1000, liters=30.0, total_cost=180.0, timestamp=datetime(2026, 6, 30, 23, 30, tzinfo=timezone.utc),
+                vehicle_id=vehicle_id, user_id=driver_id, organization_id=organization_id),
+    ])
+    await db_session.commit()
+
+    current_manager = lambda: User(
+        id=1, full_name="Manager", email="manager-exports@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    previous_manager_override = app.dependency_overrides.get(deps.get_current_active_manager)
+    app.dependency_overrides[deps.get_current_active_user] = current_manager
+    app.dependency_overrides[deps.get_current_active_manager] = current_manager
+    period = {"start_date": "2026-06-01", "end_date": "2026-06-30"}
+    try:
+        response = await client.get("/exports/costs", params=period)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="costs_2026-06-01_2026-06-30.csv"' in response.headers["content-disposition"]
+        lines = response.content.decode("utf-8").split("\n")
+        assert lines[0] == CSV_BOM + "id,date,cost_type,description,amount,vehicle_id,vehicle,fine_id"
+        # Ordem cronológica, valores dos enums e campos com vírgula entre aspas
+        assert lines[1].split(",")[1:3] == ["2026-06-03", "Outros"]
+        assert lines[2].endswith(f',2026-06-12,Pedágio,"Pedágio, ida",45.5,{vehicle_id},EXP-1,')
+        assert lines[3:] == [""]
+
+        response = await client.get("/exports/fuel_logs", params={**period, "format": "ndjson"})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 1
+        assert rows[0]["driver"] == "Motorista Exportação" and rows[0]["vehicle"] == "EXP-1"
+        assert rows[0]["timestamp"].startswith("2026-06-30T23:30")
+
+        response = await client.get("/exports/costs", params={**period, "vehicle_id": other_vehicle_id})
+        assert response.text.count("\n") == 1
+        assert (await client.get("/exports/costs", params={"start_date": "2026-06-30", "end_date": "2026-06-01"})).status_code == 400
+        assert (await client.get("/exports/vehicles", params=period)).status_code == 422
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
+        if previous_manager_override is None:
+            app.dependency_overrides.pop(deps.get_current_active_manager, None)
+        else:
+            app.dependency_overrides[deps.get_current_active_manager] = previous_manager_override
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_is_partitioned_by_month_and_incremental(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Parquet Org", sector="frete"))
+    organization_id = org.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Volvo", model="FH", year=2022, identifier="PQ-1"), organization_id=organization_id
+    )
+    vehicle_id = vehicle.id
+    db_session.add_all([
+        LocationHistory(latitude=-23.5, longitude=-46.6, timestamp=datetime(2026, 4, 30, 23, 59, tzinfo=timezone.utc),
+                        vehicle_id=vehicle_id, organization_id=organization_id),
+        LocationHistory(latitude=-23.6, longitude=-46.7, timestamp=datetime(2026, 5, 1, 0, 1, tzinfo=timezone.utc),
+                        vehicle_id=vehicle_id, organization_id=organization_id),
+        LocationHistory(latitude=-23.7, longitude=-46.8, timestamp=datetime(2026, 5, 2, tzinfo=timezone.utc),
+                        vehicle_id=vehicle_id, organization_id=organization_id),
+    ])
+    await db_session.commit()
+
+    def add_point(latitude: float) -> None:
+        db_session.add(LocationHistory(latitude=latitude, longitude=-46.9, timestamp=datetime(2026, 5, 3, tzinfo=timezone.utc),
+                                       vehicle_id=vehicle_id, organization_id=organization_id))
+
+    async def export(**params):
+        job = await client.post("/exports/location_history/parquet", params=params)
+        assert job.status_code == 202
+        assert await report_job_runner.run_once(job.json()["id"])
+        return await client.get(f"/reports/jobs/{job.json()['id']}/result")
+
+    # Os workers abrem sessões próprias no banco de teste
+    monkeypatch.setattr(report_job_runner, "session_factory", lambda: AsyncSession(db_session.bind))
+    monkeypatch.setattr(settings, "EXPORT_CURSOR_SAFETY_LAG_SECONDS", 0)
+    current_manager = lambda: User(
+        id=1, full_name="Manager", email="manager-parquet@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    previous_manager_override = app.dependency_overrides.get(deps.get_current_active_manager)
+    app.dependency_overrides[deps.get_current_active_user] = current_manager
+    app.dependency_overrides[deps.get_current_active_manager] = current_manager
+    try:
+        response = await export(start_date="2026-04-01", end_date="2026-05-31")
+        assert response.status_code == 200 and response.headers["content-type"] == "application/zip"
+        assert response.headers["x-export-rows"] == "3"
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert archive.namelist() == [
+            "location_history/month=2026-04/part-0.parquet", "location_history/month=2026-05/part-0.parquet",
+        ]
+        may = pq.read_table(io.BytesIO(archive.read("location_history/month=2026-05/part-0.parquet")))
+        assert may.column_names == ["id", "timestamp", "vehicle_id", "vehicle", "latitude", "longitude"]
+        assert may.column("latitude").to_pylist() == [-23.6, -23.7] and may.column("vehicle").to_pylist() == ["PQ-1", "PQ-1"]
+
+        # Só entram as linhas que existiam no pedido; as gravadas depois ficam para a próxima
+        cursor = response.headers["x-export-cursor"]
+        add_point(-23.8)
+        await db_session.commit()
+        job = (await client.post("/exports/location_history/parquet", params={"cursor": cursor})).json()
+        add_point(-23.9)
+        await db_session.commit()
+        assert await report_job_runner.run_once(job["id"])
+        response = await client.get(f"/reports/jobs/{job['id']}/result")
+        assert response.status_code == 200 and response.headers["x-export-rows"] == "1"
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        [name] = archive.namelist()
+        assert name.startswith("location_history/month=2026-05/part-") and name != "location_history/month=2026-05/part-0.parquet"
+        assert pq.read_table(io.BytesIO(archive.read(name))).column("latitude").to_pylist() == [-23.8]
+
+        response = await export(cursor=response.headers["x-export-cursor"])
+        assert response.headers["x-export-rows"] == "1"
+        cursor = response.headers["x-export-cursor"]
+        response = await export(cursor=cursor)
+        assert response.status_code == 204
+
+        # Sem maior id no pedido (conjunto vazio), as linhas gravadas na espera ficam para a próxima
+        with monkeypatch.context() as m:
+            async def no_rows(db, dataset):
+                return None
+            m.setattr(crud.export, "max_id", no_rows)
+            job = (await client.post("/exports/location_history/parquet", params={"cursor": cursor})).json()
+        add_point(-24.0)
+        await db_session.commit()
+        assert await report_job_runner.run_once(job["id"])
+        assert (await client.get(f"/reports/jobs/{job['id']}/result")).status_code == 204
+        response = await export(cursor=cursor)
+        assert response.headers["x-export-rows"] == "1"
+        assert (await export(cursor=response.headers["x-export-cursor"])).status_code == 204
+
+        # O cursor não serve como token de acesso
+        with pytest.raises(HTTPException) as exc_info:
+            await deps.get_current_user(db_session, token=cursor)
+        assert exc_info.value.status_code == 401
+
+        # A exportação espera a margem de segurança antes de ser executada
+        monkeypatch.setattr(settings, "EXPORT_CURSOR_SAFETY_LAG_SECONDS", 3600)
+        job = (await client.post("/exports/location_history/parquet", params={"start_date": "2026-05-01", "end_date": "2026-05-02"})).json()
+        assert not await report_job_runner.run_once(job["id"])
+        async with report_job_runner.session_factory() as db:
+            await db.execute(delete(ReportJob).where(ReportJob.id == job["id"]))
+            await db.commit()
+
+        # O cursor vale apenas para o conjunto em que foi emitido
+        assert (await client.post("/exports/fuel_logs/parquet", params={"cursor": cursor})).status_code == 400
+        assert (await client.post("/exports/fuel_logs/parquet")).status_code == 400
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
+        if previous_manager_override is None:
+            app.dependency_overrides.pop(deps.get_current_active_manager, None)
+        else:
+            app.dependency_overrides[deps.get_current_active_manager] = previous_manager_override
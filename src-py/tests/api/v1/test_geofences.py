@@ -0,0 +1,94 @@
+# backend/tests/api/v1/test_geofences.py
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, deps
+from app.models.alert_model import Alert
+from app.models.notification_model import Notification, NotificationType
+from app.models.user_model import User, UserRole
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_geofence_transitions_create_alerts_and_notifications(client: AsyncClient, db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Fence Org", sector="frete"))
+    organization_id = org.id
+    manager = User(
+        full_name="Fence Manager", email="fence@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    db_session.add(manager)
+    await db_session.commit()
+    await db_session.refresh(manager)
+    manager_id = manager.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="Volvo", model="FH", year=2023, license_plate="GEO1F23", telemetry_device_id="FENCE-001"),
+        organization_id=organization_id,
+    )
+    vehicle_id = vehicle.id
+
+    current_manager = lambda: User(
+        id=manager_id, full_name="Fence Manager", email="fence@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    previous_manager_override = app.dependency_overrides.get(deps.get_current_active_manager)
+    app.dependency_overrides[deps.get_current_active_user] = current_manager
+    app.dependency_overrides[deps.get_current_active_manager] = current_manager
+    try:
+        response = await client.post("/geofences/", json={
+            "name": "Pátio", "type": "polygon",
+            "coordinates": [[-16.70, -49.30], [-16.70, -49.20], [-16.60, -49.20], [-16.60, -49.30]],
+            "alert_on_exit": False,
+        })
+        assert response.status_code == 201
+        yard_id = response.json()["id"]
+        response = await client.post("/geofences/", json={
+            "name": "Cliente", "type": "circle", "center_latitude": -16.50, "center_longitude": -49.10, "radius_meters": 1000,
+        })
+        assert response.status_code == 201
+        response = await client.post("/geofences/", json={"name": "Inválida", "type": "circle", "center_latitude": -16.5})
+        assert response.status_code == 422
+
+        # Fora -> pátio -> cliente: a primeira posição só inicializa o estado
+        route = [(-16.80, -49.40), (-16.65, -49.25), (-16.5005, -49.1005)]
+        for i, (lat, lon) in enumerate(route):
+            response = await client.post("/telemetry/report", json={
+                "device_id": "FENCE-001", "timestamp": f"2024-10-01T12:0{i}:00Z",
+                "latitude": lat, "longitude": lon, "engine_hours": 10 + i,
+            })
+            assert response.status_code == 204
+
+        alerts = (await db_session.execute(
+            select(Alert.message).where(Alert.vehicle_id == vehicle_id).order_by(Alert.timestamp, Alert.id)
+        )).scalars().all()
+        # A saída do pátio não gera alerta (alert_on_exit=False)
+        assert alerts == [
+            "Volvo FH (GEO1F23) entrou na cerca 'Pátio'.",
+            "Volvo FH (GEO1F23) entrou na cerca 'Cliente'.",
+        ]
+        notifications = (await db_session.execute(
+            select(Notification.notification_type, Notification.related_entity_id).where(Notification.user_id == manager_id)
+        )).all()
+        assert len(notifications) == 2
+        assert (NotificationType.GEOFENCE_ENTERED, yard_id) in notifications
+
+        # Desativar a cerca remove-a da avaliação: sair dela não gera alerta
+        response = await client.put(f"/geofences/{yard_id}", json={"is_active": False})
+        assert response.status_code == 200
+        await crud.vehicle.update_location(db_session, vehicle_id=vehicle_id, lat=-16.65, lon=-49.25)
+        assert len((await db_session.execute(select(Alert.id).where(Alert.vehicle_id == vehicle_id))).all()) == 3
+
+        response = await client.get("/geofences/")
+        assert [fence["name"] for fence in response.json()] == ["Cliente", "Pátio"]
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
+        if previous_manager_override is None:
+            app.dependency_overrides.pop(deps.get_current_active_manager, None)
+        else:
+            app.dependency_overrides[deps.get_current_active_manager] = previous_manager_override
@@ -0,0 +1,95 @@
+# backend/tests/api/v1/test_report_jobs.py
+
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, deps
+from app.core.report_jobs import report_job_runner
+from app.models.fuel_log_model import FuelLog
+from app.models.report_job_model import ReportJob
+from app.models.user_model import User, UserRole
+from app.models.vehicle_cost_model import CostType, VehicleCost
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_report_job_dedupes_runs_in_background_and_expires(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Report Job Org", sector="frete"))
+    organization_id = org.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Volvo", model="FH", year=2022, identifier="JOB-1"), organization_id=organization_id
+    )
+    vehicle_id = vehicle.id
+    driver = User(full_name="Motorista Job", email="report-job@test.com", hashed_password="x",
+                  role=UserRole.DRIVER, organization_id=organization_id, is_active=True)
+    db_session.add(driver)
+    await db_session.flush()
+    driver_id = driver.id
+    db_session.add_all([
+        VehicleCost(description="Pedágio", amount=250.0, date=date(2026, 5, 10), cost_type=CostType.PEDAGIO,
+                    vehicle_id=vehicle_id, organization_id=organization_id),
+        FuelLog(odometer=1000, liters=20.0, total_cost=120.0, timestamp=datetime(2026, 5, 2, tzinfo=timezone.utc),
+                vehicle_id=vehicle_id, user_id=driver_id, organization_id=organization_id),
+        FuelLog(odometer=1500, liters=20.0, total_cost=120.0, timestamp=datetime(2026, 5, 20, tzinfo=timezone.utc),
+                vehicle_id=vehicle_id, user_id=driver_id, organization_id=organization_id),
+    ])
+    await db_session.commit()
+
+    # Os workers e o stream de eventos abrem sessões próprias no banco de teste
+    monkeypatch.setattr(report_job_runner, "session_factory", lambda: AsyncSession(db_session.bind))
+    app.dependency_overrides[deps.get_current_active_user] = lambda: User(
+        id=1, full_name="Manager", email="manager-jobs@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    request = {"report_type": "fleet_management", "start_date": "2026-05-01", "end_date": "2026-05-31"}
+    try:
+        first = await client.post("/reports/jobs", json=request)
+        # Parâmetros que não se aplicam ao relatório não separam pedidos idênticos
+        second = await client.post("/reports/jobs", json={**request, "vehicle_id": vehicle_id})
+        assert first.status_code == second.status_code == 202
+        job_id = first.json()["id"]
+        assert second.json()["id"] == job_id and first.json()["status"] == "pending"
+        assert (await client.get(f"/reports/jobs/{job_id}/result")).status_code == 409
+        assert (await client.post("/reports/jobs", json={**request, "report_type": "vehicle_consolidated"})).status_code == 422
+        assert (await client.post("/reports/jobs", json={**request, "report_type": "parquet_export"})).status_code == 422
+
+        assert await report_job_runner.run_once(job_id)
+        job = (await client.get(f"/reports/jobs/{job_id}")).json()
+        assert job["status"] == "done" and job["result_size"] > 0 and job["expires_at"]
+        events = await client.get(f"/reports/jobs/{job_id}/events")
+        assert events.text.startswith("event: status\n") and '"status":"done"' in events.text
+
+        result = await client.get(f"/reports/jobs/{job_id}/result", headers={"Accept-Encoding": "gzip"})
+        assert result.headers["content-encoding"] == "gzip"
+        synchronous = await client.post("/reports/fleet-management", json={"start_date": "2026-05-01", "end_date": "2026-05-31"})
+        assert {**result.json(), "generated_at": None} == {**synchronous.json(), "generated_at": None}
+        assert result.json()["summary"] == {"total_cost": 250.0, "total_distance_km": 500.0, "overall_cost_per_km": 0.5}
+
+        # Um resultado ainda válido também atende pedidos idênticos
+        assert (await client.post("/reports/jobs", json=request)).json()["id"] == job_id
+
+        # ...mas não se o período inclui o dia do cálculo: novos registros ainda podem entrar
+        today = datetime.now(timezone.utc).date().isoformat()
+        current = {**request, "end_date": today}
+        current_id = (await client.post("/reports/jobs", json=current)).json()["id"]
+        assert await report_job_runner.run_once(current_id)
+        assert (await client.post("/reports/jobs", json=current)).json()["id"] != current_id
+
+        async with report_job_runner.session_factory() as db:
+            await db.execute(update(ReportJob).where(ReportJob.id == job_id).values(
+                expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+            await db.commit()
+        assert (await client.get(f"/reports/jobs/{job_id}/result")).status_code == 410
+        async with report_job_runner.session_factory() as db:
+            assert await crud.report_job.purge_expired(db) >= 1
+        assert (await client.get(f"/reports/jobs/{job_id}")).status_code == 404
+        assert (await client.post("/reports/jobs", json=request)).json()["status"] == "pending"
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
@@ -0,0 +1,78 @@
+# backend/tests/api/v1/test_reports.py
+
+from datetime import date, datetime, timezone
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, deps
+from app.models.fuel_log_model import FuelLog
+from app.models.user_model import User, UserRole
+from app.models.vehicle_cost_model import CostType, VehicleCost
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from main import app
+from tools import driver_report_benchmark
+
+
+@pytest.mark.asyncio
+async def test_fleet_management_report_ranks_vehicles_in_sql(client: AsyncClient, db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Fleet Report Org", sector="frete"))
+    organization_id = org.id
+    driver = User(full_name="Motorista Relatório", email="fleet-report@test.com", hashed_password="x",
+                  role=UserRole.DRIVER, organization_id=organization_id, is_active=True)
+    db_session.add(driver)
+    await db_session.flush()
+    driver_id = driver.id
+
+    # Veículo i: custo 100·i e 20 l para 200·(8-i) km (consumo 10·(8-i) km/l); o 7º não abastece
+    vehicle_ids = []
+    for i in range(1, 8):
+        vehicle = await crud.vehicle.create_with_owner(
+            db_session, obj_in=VehicleCreate(brand="Volvo", model="FH", year=2022, identifier=f"FR-{i}"),
+            organization_id=organization_id,
+        )
+        vehicle_ids.append(vehicle.id)
+        db_session.add(VehicleCost(description="Custo", amount=100.0 * i, date=date(2026, 5, 10),
+                                   cost_type=CostType.MANUTENCAO if i == 7 else CostType.PEDAGIO,
+                                   vehicle_id=vehicle.id, organization_id=organization_id))
+        if i < 7:
+            db_session.add_all([
+                FuelLog(odometer=1000, liters=10.0, total_cost=60.0, timestamp=datetime(2026, 5, 2, tzinfo=timezone.utc),
+                        vehicle_id=vehicle.id, user_id=driver_id, organization_id=organization_id),
+                FuelLog(odometer=1000 + 200 * (8 - i), liters=10.0, total_cost=60.0, timestamp=datetime(2026, 5, 20, tzinfo=timezone.utc),
+                        vehicle_id=vehicle.id, user_id=driver_id, organization_id=organization_id),
+            ])
+    # Fora do período: não amplia a faixa do odômetro
+    db_session.add(FuelLog(odometer=0, liters=50.0, total_cost=300.0, timestamp=datetime(2026, 4, 30, 23, tzinfo=timezone.utc),
+                           vehicle_id=vehicle_ids[0], user_id=driver_id, organization_id=organization_id))
+    await db_session.commit()
+
+    app.dependency_overrides[deps.get_current_active_user] = lambda: User(
+        id=1, full_name="Manager", email="manager-fleet@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    try:
+        response = await client.post("/reports/fleet-management", json={"start_date": "2026-05-01", "end_date": "2026-05-31"})
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
+    assert response.status_code == 200
+    body = response.json()
+
+    def ranking(name):
+        return [vehicle_ids.index(entry["vehicle_id"]) + 1 for entry in body[name]]
+
+    assert body["summary"]["total_cost"] == 2800.0
+    assert body["summary"]["total_distance_km"] == 5400.0
+    assert body["costs_by_category"] == {"Pedágio": 2100.0, "Manutenção": 700.0}
+    assert ranking("top_5_most_expensive_vehicles") == [7, 6, 5, 4, 3]
+    assert ranking("top_5_highest_cost_per_km_vehicles") == [6, 5, 4, 3, 2]
+    assert ranking("top_5_most_efficient_vehicles") == [1, 2, 3, 4, 5]
+    assert ranking("top_5_least_efficient_vehicles") == [6, 5, 4, 3, 2]
+    assert body["top_5_most_efficient_vehicles"][0] == {"vehicle_id": vehicle_ids[0], "vehicle_identifier": "FR-1", "value": 70.0, "unit": "km/l"}
+
+
+@pytest.mark.asyncio
+async def test_driver_performance_report_query_count_does_not_grow_with_drivers():
+    results = await driver_report_benchmark.run(driver_counts=(2, 15), days=3)
+    assert [result.queries for result in results] == [1, 1]
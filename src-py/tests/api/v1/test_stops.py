@@ -0,0 +1,84 @@
+# backend/tests/api/v1/test_stops.py
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, deps
+from app.core.stop_detector import stop_detector
+from app.models.client_model import Client
+from app.models.freight_order_model import FreightOrder, FreightStatus
+from app.models.stop_point_model import StopPoint, StopPointType
+from app.models.user_model import User, UserRole
+from app.models.vehicle_stop_model import VehicleStop
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_stop_is_detected_confirms_arrival_and_resumes_after_restart(client: AsyncClient, db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Stop Detection Org", sector="frete"))
+    organization_id = org.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="DAF", model="XF", year=2022, telemetry_device_id="STOP-001"),
+        organization_id=organization_id,
+    )
+    vehicle_id = vehicle.id
+
+    t0 = datetime(2024, 7, 1, 8, 0, tzinfo=timezone.utc)
+    customer = Client(name="Destino", organization_id=organization_id)
+    db_session.add(customer)
+    await db_session.flush()
+    order = FreightOrder(status=FreightStatus.IN_TRANSIT, client_id=customer.id, vehicle_id=vehicle_id, organization_id=organization_id)
+    db_session.add(order)
+    await db_session.flush()
+    stop_point = StopPoint(
+        freight_order_id=order.id, sequence_order=1, type=StopPointType.DELIVERY, address="Armazém",
+        scheduled_time=t0.replace(tzinfo=None), latitude=-23.5105, longitude=-46.6105,
+    )
+    db_session.add(stop_point)
+    await db_session.flush()
+    stop_point_id = stop_point.id
+    await db_session.commit()
+
+    def point(minutes, lat, lon):
+        return {"device_id": "STOP-001", "timestamp": (t0 + timedelta(minutes=minutes)).isoformat(),
+                "latitude": lat, "longitude": lon, "engine_hours": 1}
+
+    batch = [point(0, -23.50, -46.60), point(1, -23.51, -46.61), point(2, -23.51, -46.61), point(5, -23.51, -46.61)]
+    assert (await client.post("/telemetry/report-batch", json=batch)).status_code == 204
+
+    # Reinício do processo: o estado em memória se perde e é retomado do checkpoint
+    stop_detector.forget(vehicle_id)
+    assert (await client.post("/telemetry/report-batch", json=[point(10, -23.60, -46.70)])).status_code == 204
+
+    stops = (await db_session.execute(select(VehicleStop).where(VehicleStop.vehicle_id == vehicle_id))).scalars().all()
+    assert len(stops) == 1
+    assert stops[0].duration_seconds == 240 and stops[0].stop_point_id == stop_point_id
+    arrival = (await db_session.execute(
+        select(StopPoint.actual_arrival_time).where(StopPoint.id == stop_point_id)
+    )).scalar_one()
+    assert arrival == (t0 + timedelta(minutes=1)).replace(tzinfo=None)
+
+    app.dependency_overrides[deps.get_current_active_user] = lambda: User(
+        id=1, full_name="Manager", email="stops@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    try:
+        params = {"from": (t0 + timedelta(minutes=3)).isoformat(), "to": (t0 + timedelta(hours=1)).isoformat()}
+        response = await client.get(f"/vehicles/{vehicle_id}/stops", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["stops"]) == 1
+        assert body["idle_seconds"] == 120
+
+        # Um limite sem fuso é tratado como UTC, mesmo quando o outro tem fuso
+        params["from"] = (t0 + timedelta(minutes=3)).replace(tzinfo=None).isoformat()
+        response = await client.get(f"/vehicles/{vehicle_id}/stops", params=params)
+        assert response.status_code == 200 and response.json()["idle_seconds"] == 120
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
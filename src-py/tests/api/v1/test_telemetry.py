@@ -0,0 +1,332 @@
+# backend/tests/api/v1/test_telemetry.py
+
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.models.location_history_model import LocationHistory
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+
+
+@pytest.mark.asyncio
+async def test_report_batch_writes_latest_position_and_full_history(client: AsyncClient, db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Telemetry Org", sector="agronegocio"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="Valtra", model="BH 194", year=2022, telemetry_device_id="BATCH-001", current_engine_hours=10),
+        organization_id=org.id,
+    )
+
+    payloads = [
+        {"device_id": "BATCH-001", "timestamp": "2024-05-01T10:02:00Z", "latitude": -21.02, "longitude": -47.02, "engine_hours": 12.0},
+        {"device_id": "BATCH-001", "timestamp": "2024-05-01T10:00:00Z", "latitude": -21.00, "longitude": -47.00, "engine_hours": 11.0},
+        {"device_id": "BATCH-001", "timestamp": "2024-05-01T10:01:00Z", "latitude": -21.01, "longitude": -47.01, "engine_hours": 11.5},
+        {"device_id": "UNKNOWN-DEVICE", "timestamp": "2024-05-01T10:00:00Z", "latitude": 0, "longitude": 0, "engine_hours": 1.0},
+    ]
+    response = await client.post("/telemetry/report-batch", json=payloads)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    await db_session.refresh(vehicle)
+    assert vehicle.last_latitude == -21.02
+    assert vehicle.last_longitude == -47.02
+    assert vehicle.current_engine_hours == 12.0
+
+    history_count = (await db_session.execute(
+        select(func.count(LocationHistory.id)).where(LocationHistory.vehicle_id == vehicle.id)
+    )).scalar_one()
+    assert history_count == 3
+
+
+@pytest.mark.asyncio
+async def test_report_batch_rejects_oversized_batches(client: AsyncClient):
+    from app.schemas.telemetry_schema import MAX_TELEMETRY_BATCH_SIZE
+
+    payload = {"device_id": "X", "timestamp": "2024-05-01T10:00:00Z", "latitude": 0, "longitude": 0, "engine_hours": 0}
+    response = await client.post("/telemetry/report-batch", json=[payload] * (MAX_TELEMETRY_BATCH_SIZE + 1))
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+@pytest.mark.asyncio
+async def test_position_buffer_coalesces_latest_position_per_vehicle():
+    from app.core.position_buffer import PositionBuffer, PositionUpdate
+
+    written = []
+
+    async def recording_writer(updates):
+        written.append(list(updates))
+
+    buffer = PositionBuffer(flush_interval_ms=60_000, max_queue_size=100, writer=recording_writer)
+    await buffer.start()
+    try:
+        await buffer.submit(PositionUpdate(vehicle_id=1, latitude=1.0, longitude=1.0, engine_hours=5.0))
+        await buffer.submit(PositionUpdate(vehicle_id=2, latitude=2.0, longitude=2.0))
+        await buffer.submit(PositionUpdate(vehicle_id=1, latitude=1.5, longitude=1.5, engine_hours=4.0))
+    finally:
+        await buffer.stop()
+
+    assert len(written) == 1
+    by_vehicle = {u.vehicle_id: u for u in written[0]}
+    assert (by_vehicle[1].latitude, by_vehicle[1].engine_hours) == (1.5, 5.0)
+    assert by_vehicle[2].engine_hours is None
+
+    stats = buffer.stats()
+    assert stats["received"] == 3
+    assert stats["written"] == 2
+    assert stats["flushes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_position_buffer_retries_failed_batches():
+    from app.core.position_buffer import PositionBuffer, PositionUpdate
+
+    written = []
+    failures = [RuntimeError("banco indisponível")]
+
+    async def flaky_writer(updates):
+        if failures:
+            raise failures.pop()
+        written.append(list(updates))
+
+    buffer = PositionBuffer(flush_interval_ms=60_000, max_queue_size=100, writer=flaky_writer)
+    await buffer.start()
+    try:
+        await buffer.submit(PositionUpdate(vehicle_id=1, latitude=1.0, longitude=1.0, engine_hours=5.0))
+        assert await buffer.flush() == 0
+        assert buffer.stats()["retry_pending"] == 1
+        await buffer.submit(PositionUpdate(vehicle_id=2, latitude=2.0, longitude=2.0))
+    finally:
+        await buffer.stop()
+
+    # O veículo 1 não reportou de novo, mas sua posição foi gravada na tentativa seguinte
+    assert len(written) == 1
+    assert sorted((u.vehicle_id, u.latitude) for u in written[0]) == [(1, 1.0), (2, 2.0)]
+    assert buffer.stats()["failed_flushes"] == 1 and buffer.stats()["retry_pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_buffer_stats_endpoint_exposes_retry_pending(client: AsyncClient):
+    from app import deps
+    from app.models.user_model import User, UserRole
+    from main import app
+
+    app.dependency_overrides[deps.get_current_super_admin] = lambda: User(
+        id=999, full_name="Super Admin", email="superadmin@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=1, is_active=True,
+    )
+    try:
+        response = await client.get("/telemetry/buffer-stats")
+    finally:
+        app.dependency_overrides.pop(deps.get_current_super_admin, None)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["retry_pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_gps_ping_updates_vehicle_position(client: AsyncClient, db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="GPS Org", sector="frete"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Volvo", model="FH 540", year=2021), organization_id=org.id
+    )
+
+    response = await client.post("/gps/ping", json={"vehicle_id": vehicle.id, "latitude": -23.5, "longitude": -46.6})
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    await db_session.refresh(vehicle)
+    assert (vehicle.last_latitude, vehicle.last_longitude) == (-23.5, -46.6)
+
+
+@pytest.mark.asyncio
+async def test_unknown_device_is_cached_until_vehicle_is_registered(client: AsyncClient, db_session: AsyncSession):
+    from app.core.device_registry import device_registry
+
+    payload = {"device_id": "LATE-REGISTERED", "timestamp": "2024-05-01T10:00:00Z", "latitude": -22.0, "longitude": -48.0, "engine_hours": 3.0}
+    assert (await client.post("/telemetry/report", json=payload)).status_code == status.HTTP_204_NO_CONTENT
+
+    misses = device_registry.misses
+    assert (await client.post("/telemetry/report", json=payload)).status_code == status.HTTP_204_NO_CONTENT
+    assert device_registry.misses == misses  # a segunda tentativa foi respondida pela entrada negativa
+
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Registry Org", sector="agronegocio"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="John Deere", model="6125J", year=2020, telemetry_device_id="LATE-REGISTERED"),
+        organization_id=org.id,
+    )
+    assert (await client.post("/telemetry/report", json=payload)).status_code == status.HTTP_204_NO_CONTENT
+
+    await db_session.refresh(vehicle)
+    assert (vehicle.last_latitude, vehicle.current_engine_hours) == (-22.0, 3.0)
+
+
+@pytest.mark.asyncio
+async def test_websocket_stream_authenticates_once_and_acks_frames(db_session: AsyncSession):
+    from starlette.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+    from app.core.security import create_device_token
+    from main import app
+
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Stream Org", sector="agronegocio"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="Mercedes", model="Actros", year=2023, telemetry_device_id="WS-001", current_engine_hours=5),
+        organization_id=org.id,
+    )
+    vehicle_id = vehicle.id
+
+    # Sem o bloco `with`, o TestClient não dispara os eventos de startup (que exigem PostgreSQL)
+    test_client = TestClient(app)
+    with test_client.websocket_connect("/telemetry/ws") as ws:
+        ws.send_json({"type": "auth", "token": "invalid"})
+        with pytest.raises(WebSocketDisconnect):
+            ws.receive_json()
+
+    with test_client.websocket_connect("/telemetry/ws") as ws:
+        ws.send_json({"type": "auth", "token": create_device_token("WS-001")})
+        assert ws.receive_json()["type"] == "auth_ok"
+        ws.send_json({"timestamp": "2024-09-01T10:00:00Z", "latitude": -15.0, "longitude": -47.0, "engine_hours": 6})
+        ws.send_json({"latitude": "invalid"})
+        ws.send_json([
+            {"timestamp": "2024-09-01T10:00:10Z", "latitude": -15.1, "longitude": -47.1, "engine_hours": 7},
+            {"timestamp": "2024-09-01T10:00:20Z", "latitude": -15.2, "longitude": -47.2, "engine_hours": 8},
+        ])
+        acks = []
+        while not acks or acks[-1]["seq"] < 3:
+            acks.append(ws.receive_json())
+        assert all(a["type"] == "ack" for a in acks)
+        assert [r for a in acks for r in a.get("rejected", [])] == [2]
+
+    history_count = (await db_session.execute(
+        select(func.count(LocationHistory.id)).where(LocationHistory.vehicle_id == vehicle_id)
+    )).scalar_one()
+    assert history_count == 3
+
+
+@pytest.mark.asyncio
+async def test_binary_batch_is_decoded_without_json(client: AsyncClient, db_session: AsyncSession):
+    from datetime import datetime, timezone
+    from app.core.telemetry_codec import _RECORD, BINARY_CONTENT_TYPE, NO_FUEL, TelemetryPoint, decode_points, encode_points
+
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Binary Org", sector="agronegocio"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="John Deere", model="8R", year=2024, telemetry_device_id="BIN-001", current_engine_hours=1),
+        organization_id=org.id,
+    )
+
+    points = [
+        TelemetryPoint("BIN-001", datetime(2024, 10, 1, 12, 0, i, 250_000, tzinfo=timezone.utc), -16.6869 - i * 1e-4, -49.2648, 2.5 + i, 80.5)
+        for i in range(3)
+    ]
+    body = encode_points(points)
+    assert len(body) == 6 + 8 + 3 * 23
+    assert decode_points(body) == points
+
+    response = await client.post("/telemetry/report-batch", content=body, headers={"Content-Type": BINARY_CONTENT_TYPE})
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    await db_session.refresh(vehicle)
+    assert (vehicle.last_latitude, vehicle.current_engine_hours) == (-16.6871, 4.5)
+
+    response = await client.post("/telemetry/report", content=body, headers={"Content-Type": BINARY_CONTENT_TYPE})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = await client.post("/telemetry/report-batch", content=body[:-1], headers={"Content-Type": BINARY_CONTENT_TYPE})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # Timestamp i64 fora do que `datetime` representa e combustível acima de 100%: 400, não 500
+    header = encode_points(points[:1])[:-_RECORD.size]
+    for record in (_RECORD.pack(0, 2 ** 62, 0, 0, 0, NO_FUEL), _RECORD.pack(0, 1_700_000_000_000, 0, 0, 0, 1001)):
+        response = await client.post(
+            "/telemetry/report-batch", content=header + record, headers={"Content-Type": BINARY_CONTENT_TYPE}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_resent_and_late_packets_do_not_move_the_vehicle_back(client: AsyncClient, db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Late Packet Org", sector="frete"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="Scania", model="R 450", year=2022, telemetry_device_id="LATE-001", current_engine_hours=1),
+        organization_id=org.id,
+    )
+    vehicle_id = vehicle.id
+
+    newest = {"device_id": "LATE-001", "timestamp": "2024-06-01T10:05:00Z", "latitude": -20.5, "longitude": -45.5, "engine_hours": 3.0}
+    late = {"device_id": "LATE-001", "timestamp": "2024-06-01T10:00:00Z", "latitude": -20.0, "longitude": -45.0, "engine_hours": 2.0}
+    assert (await client.post("/telemetry/report-batch", json=[newest, newest])).status_code == status.HTTP_204_NO_CONTENT
+    assert (await client.post("/telemetry/report", json=newest)).status_code == status.HTTP_204_NO_CONTENT
+    assert (await client.post("/telemetry/report", json=late)).status_code == status.HTTP_204_NO_CONTENT
+    assert (await client.post("/telemetry/report-batch", json=[late])).status_code == status.HTTP_204_NO_CONTENT
+
+    await db_session.refresh(vehicle)
+    assert (vehicle.last_latitude, vehicle.current_engine_hours) == (-20.5, 3.0)
+
+    history = (await db_session.execute(
+        select(LocationHistory.latitude).where(LocationHistory.vehicle_id == vehicle_id).order_by(LocationHistory.timestamp)
+    )).scalars().all()
+    assert history == [-20.0, -20.5]
+
+
+@pytest.mark.asyncio
+async def test_packet_is_reprocessed_after_a_failed_write(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    from app.core.device_registry import device_registry
+    from app.crud import crud_location_history
+
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Failed Write Org", sector="frete"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="Volvo", model="FH", year=2022, telemetry_device_id="RETRY-001", current_engine_hours=1),
+        organization_id=org.id,
+    )
+    vehicle_id = vehicle.id
+    packet = {"device_id": "RETRY-001", "timestamp": "2024-07-01T08:00:00Z", "latitude": -19.9, "longitude": -43.9, "engine_hours": 4.0}
+
+    bulk_append = crud_location_history.bulk_append
+
+    async def failing_bulk_append(db, *, rows):
+        raise RuntimeError("falha na gravação")
+
+    monkeypatch.setattr(crud_location_history, "bulk_append", failing_bulk_append)
+    with pytest.raises(RuntimeError):
+        await client.post("/telemetry/report", json=packet)
+    entry = await device_registry.resolve(db_session, "RETRY-001")
+    assert (entry.last_timestamp, entry.current_engine_hours) == (None, 1)
+
+    # O reenvio do rastreador não é descartado como repetido
+    monkeypatch.setattr(crud_location_history, "bulk_append", bulk_append)
+    assert (await client.post("/telemetry/report", json=packet)).status_code == status.HTTP_204_NO_CONTENT
+    await db_session.refresh(vehicle)
+    assert (vehicle.last_latitude, vehicle.current_engine_hours) == (-19.9, 4.0)
+    history = (await db_session.execute(
+        select(LocationHistory.latitude).where(LocationHistory.vehicle_id == vehicle_id)
+    )).scalars().all()
+    assert history == [-19.9]
+
+
+@pytest.mark.asyncio
+async def test_device_token_is_not_accepted_as_user_token(client: AsyncClient, db_session: AsyncSession):
+    from app.core import auth
+    from app.core.security import create_device_token
+    from app.models.user_model import UserRole
+    from app.schemas.user_schema import UserCreate
+
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Device Token Org", sector="frete"))
+    user = await crud.user.create(
+        db_session,
+        user_in=UserCreate(full_name="Token Target", email="token.target@test.com", password="password"),
+        organization_id=org.id,
+        role=UserRole.CLIENTE_ATIVO,
+    )
+
+    # Um gestor pode cadastrar o id de um utilizador como telemetry_device_id do veículo
+    device_token = create_device_token(str(user.id))
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {device_token}"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    access_token = auth.create_access_token(data={"sub": str(user.id)})
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == status.HTTP_200_OK
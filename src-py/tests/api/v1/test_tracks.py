@@ -0,0 +1,157 @@
+# backend/tests/api/v1/test_tracks.py
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.track_codec import TrackPoint, decode_arrays, decode_points, encode_points, points_from_arrays
+from app.models.location_history_model import LocationHistory
+from app.models.track_chunk_model import TrackChunk
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+
+
+def test_track_codec_round_trip_is_lossless():
+    start = datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc)
+    points = [
+        TrackPoint(start + timedelta(seconds=i, microseconds=i * 7), -21.1234567 + i * 1e-5, -47.7654321 - i * 1e-5)
+        for i in range(3600)
+    ]
+    # Valores que não cabem em 1e-7 graus forçam o modo sem arredondamento
+    odd = points + [TrackPoint(start + timedelta(hours=1), 0.1 + 0.2, -0.0)]
+
+    for sample in (points, odd, []):
+        blob = encode_points(sample)
+        assert decode_points(blob) == sample
+        assert points_from_arrays(decode_arrays(blob)) == sample
+    assert len(encode_points(points)) < 3600 * 3
+
+
+@pytest.mark.asyncio
+async def test_compacted_windows_and_raw_tail_return_the_same_track(db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Track Org", sector="agronegocio"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="Volvo", model="FH 540", year=2023, telemetry_device_id="TRACK-001"),
+        organization_id=org.id,
+    )
+    vehicle_id, organization_id = vehicle.id, vehicle.organization_id
+
+    start = datetime(2024, 6, 1, 8, 0, tzinfo=timezone.utc)
+    rows = [
+        {
+            "vehicle_id": vehicle_id, "organization_id": organization_id,
+            "latitude": -23.5 + i * 1e-4, "longitude": -46.6 - i * 1e-4,
+            "timestamp": start + timedelta(minutes=i),
+        }
+        for i in range(150)  # 2h30: duas janelas fechadas e uma parcial
+    ]
+    await crud.location_history.bulk_append(db_session, rows=rows)
+    await db_session.commit()
+    expected = await crud.track.get_track_points(db_session, vehicle_id=vehicle_id, start=start, end=start + timedelta(hours=3))
+    assert len(expected) == 150
+
+    # O banco de teste é compartilhado: a compactação também sela pontos de outros testes
+    await crud.track.compact_pending(db_session, until=start + timedelta(hours=2, minutes=10))
+    chunk_count = (await db_session.execute(
+        select(func.count(TrackChunk.id)).where(TrackChunk.vehicle_id == vehicle_id)
+    )).scalar_one()
+    assert chunk_count == 2
+    # Os pontos selados saem do buffer; só a janela ainda aberta continua bruta
+    raw_count = (await db_session.execute(
+        select(func.count(LocationHistory.id)).where(LocationHistory.vehicle_id == vehicle_id)
+    )).scalar_one()
+    assert raw_count == 30
+    assert await crud.track.compact_pending(db_session, until=start + timedelta(hours=2)) == 0
+
+    track = await crud.track.get_track_points(db_session, vehicle_id=vehicle_id, start=start, end=start + timedelta(hours=3))
+    assert track == expected
+
+    middle = await crud.track.get_track_points(
+        db_session, vehicle_id=vehicle_id, start=start + timedelta(minutes=30), end=start + timedelta(minutes=130)
+    )
+    assert middle == expected[30:131]
+
+    # Um pacote atrasado numa janela já selada é mesclado ao bloco na próxima compactação
+    late = {**rows[0], "latitude": -23.6, "timestamp": start + timedelta(minutes=10, seconds=30)}
+    await crud.location_history.bulk_append(db_session, rows=[late])
+    await db_session.commit()
+    assert await crud.track.compact_pending(db_session, until=start + timedelta(hours=2)) == 1
+
+    chunks = (await db_session.execute(
+        select(TrackChunk.point_count).where(TrackChunk.vehicle_id == vehicle_id).order_by(TrackChunk.window_start)
+    )).scalars().all()
+    assert chunks == [61, 60]
+    track = await crud.track.get_track_points(db_session, vehicle_id=vehicle_id, start=start, end=start + timedelta(hours=3))
+    assert track[11] == TrackPoint(late["timestamp"], -23.6, late["longitude"])
+    assert track[:11] + track[12:] == expected
+
+
+def test_lttb_keeps_endpoints_and_sharp_turns():
+    from app.core.track_simplify import lttb
+
+    start = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    # Segue para o norte e faz uma curva de 90° no meio do trajeto
+    points = [TrackPoint(start + timedelta(seconds=i), -23.0 + min(i, 500) * 1e-4, -46.0 + max(i - 500, 0) * 1e-4) for i in range(1001)]
+
+    sampled = lttb(points, 20)
+    assert len(sampled) == 20
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert points[500] in sampled
+    assert [p.timestamp for p in sampled] == sorted(p.timestamp for p in sampled)
+
+
+@pytest.mark.asyncio
+async def test_vehicle_track_is_downsampled_and_streamed(client, db_session: AsyncSession):
+    import json
+    from app import deps
+    from app.models.user_model import User, UserRole
+    from main import app
+
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Playback Org", sector="agronegocio"))
+    organization_id = org.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session,
+        obj_in=VehicleCreate(brand="Scania", model="R 450", year=2021, telemetry_device_id="TRACK-002"),
+        organization_id=organization_id,
+    )
+    vehicle_id = vehicle.id
+
+    start = datetime(2024, 7, 1, tzinfo=timezone.utc)
+    rows = [
+        {"vehicle_id": vehicle_id, "organization_id": organization_id, "latitude": -22.0 + i * 1e-4,
+         "longitude": -47.0, "timestamp": start + timedelta(seconds=10 * i)}
+        for i in range(500)
+    ]
+    await crud.location_history.bulk_append(db_session, rows=rows)
+    await db_session.commit()
+
+    app.dependency_overrides[deps.get_current_active_user] = lambda: User(
+        id=1, full_name="Manager", email="manager@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    try:
+        params = {"from": start.isoformat(), "to": (start + timedelta(hours=2)).isoformat(), "max_points": 50}
+        response = await client.get(f"/vehicles/{vehicle_id}/track", params=params)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["x-raw-point-count"] == "500"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 50
+        assert lines[0]["latitude"] == -22.0
+
+        response = await client.get(f"/vehicles/{vehicle_id}/track", params={**params, "format": "polyline"})
+        body = response.json()
+        assert body["point_count"] == 50 and body["raw_point_count"] == 500
+        assert len(body["timestamps"]) == 50
+
+        # `from` sem fuso com `to` com fuso: ambos são tratados como UTC
+        naive = {**params, "from": start.replace(tzinfo=None).isoformat()}
+        assert (await client.get(f"/vehicles/{vehicle_id}/track", params=naive)).headers["x-raw-point-count"] == "500"
+
+        too_long = {**params, "to": (start + timedelta(days=60)).isoformat()}
+        assert (await client.get(f"/vehicles/{vehicle_id}/track", params=too_long)).status_code == 400
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
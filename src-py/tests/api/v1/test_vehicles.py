@@ -0,0 +1,53 @@
+# backend/tests/api/v1/test_vehicles.py
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, deps
+from app.core.vehicle_index import vehicle_index
+from app.models.user_model import User, UserRole
+from app.models.vehicle_model import VehicleStatus
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_proximity_queries_follow_telemetry_and_status(client: AsyncClient, db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Geo Org", sector="agronegocio"))
+    organization_id = org.id
+
+    positions = {"near": (-23.550, -46.630), "mid": (-23.600, -46.700), "far": (-22.900, -43.200)}
+    vehicle_ids = {}
+    for name, (lat, lon) in positions.items():
+        vehicle = await crud.vehicle.create_with_owner(
+            db_session, obj_in=VehicleCreate(brand="Ford", model=name, year=2020), organization_id=organization_id
+        )
+        vehicle_ids[name] = vehicle.id
+        await crud.vehicle.update_location(db_session, vehicle_id=vehicle.id, lat=lat, lon=lon)
+
+    app.dependency_overrides[deps.get_current_active_user] = lambda: User(
+        id=1, full_name="Manager", email="geo@test.com", hashed_password="x",
+        role=UserRole.CLIENTE_ATIVO, organization_id=organization_id, is_active=True,
+    )
+    try:
+        params = {"lat": -23.55, "lon": -46.63, "radius_km": 20}
+        response = await client.get("/vehicles/nearby", params=params)
+        assert response.status_code == 200
+        assert [v["vehicle_id"] for v in response.json()] == [vehicle_ids["near"], vehicle_ids["mid"]]
+
+        # Posição vinda da telemetria atualiza o índice já carregado
+        await crud.vehicle.update_location(db_session, vehicle_id=vehicle_ids["far"], lat=-23.56, lon=-46.64)
+        vehicle_index.set_status(vehicle_ids["mid"], VehicleStatus.IN_USE)
+        response = await client.get("/vehicles/nearby", params={**params, "status": VehicleStatus.AVAILABLE.value})
+        assert {v["vehicle_id"] for v in response.json()} == {vehicle_ids["near"], vehicle_ids["far"]}
+
+        response = await client.get("/vehicles/nearest", params={"lat": -23.6, "lon": -46.7, "k": 1})
+        assert [v["vehicle_id"] for v in response.json()] == [vehicle_ids["mid"]]
+
+        bbox = {"min_lat": -23.58, "min_lon": -46.66, "max_lat": -23.54, "max_lon": -46.62}
+        response = await client.get("/vehicles/in-bbox", params=bbox)
+        assert {v["vehicle_id"] for v in response.json()} == {vehicle_ids["near"], vehicle_ids["far"]}
+    finally:
+        app.dependency_overrides.pop(deps.get_current_active_user, None)
@@ -41,6 +41,8 @@ def override_get_current_super_admin():
         is_active=True
     )
 
+app.dependency_overrides[deps.get_db] = override_get_db
+
 # --- 3. FIXTURES DO PYTEST ---
 
 @pytest.fixture(scope="session", autouse=True)
@@ -0,0 +1,71 @@
+# backend/tests/test_daily_rollups.py
+
+import pytest
+from datetime import date, datetime, timezone
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.models.daily_rollup_model import DailyRollup
+from app.models.fuel_log_model import FuelLog
+from app.models.journey_model import Journey
+from app.models.user_model import User, UserRole
+from app.models.vehicle_cost_model import CostType, VehicleCost
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+
+
+async def _rollups(db: AsyncSession, organization_id: int) -> dict:
+    stmt = select(DailyRollup).where(DailyRollup.organization_id == organization_id).execution_options(populate_existing=True)
+    return {(row.driver_id, row.day): row for row in (await db.execute(stmt)).scalars().all()}
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_writes_and_reconciliation_fixes_drift(db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Rollup Org", sector="frete"))
+    organization_id = org.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Scania", model="R450", year=2021), organization_id=organization_id
+    )
+    vehicle_id = vehicle.id
+    driver = User(full_name="Motorista Consolidação", email="rollup@test.com", hashed_password="x",
+                  role=UserRole.DRIVER, organization_id=organization_id, is_active=True)
+    db_session.add(driver)
+    await db_session.flush()
+    driver_id = driver.id
+    day = date(2026, 3, 10)
+
+    journey = Journey(start_time=datetime(2026, 3, 10, 8), end_time=datetime(2026, 3, 10, 12), start_mileage=1000,
+                      end_mileage=1300, trip_type="free_roam", is_active=False,
+                      vehicle_id=vehicle_id, driver_id=driver_id, organization_id=organization_id)
+    toll = VehicleCost(description="Pedágio", amount=40.0, date=day, cost_type=CostType.PEDAGIO,
+                       vehicle_id=vehicle_id, organization_id=organization_id)
+    db_session.add_all([
+        journey, toll,
+        VehicleCost(description="Seguro", amount=60.0, date=day, cost_type=CostType.SEGURO,
+                    vehicle_id=vehicle_id, organization_id=organization_id),
+        FuelLog(odometer=1300, liters=100.0, total_cost=600.0, timestamp=datetime(2026, 3, 10, 13, tzinfo=timezone.utc),
+                vehicle_id=vehicle_id, user_id=driver_id, organization_id=organization_id),
+    ])
+    await db_session.commit()
+
+    rollups = await _rollups(db_session, organization_id)
+    assert (rollups[(None, day)].total_cost, rollups[(None, day)].cost_toll) == (100.0, 40.0)
+    assert (rollups[(driver_id, day)].km, rollups[(driver_id, day)].journey_count) == (300.0, 1)
+    assert (rollups[(driver_id, day)].liters, rollups[(driver_id, day)].fuel_cost) == (100.0, 600.0)
+
+    # Alterar e remover registros ajusta as linhas pela diferença
+    journey.end_mileage = 1450
+    await db_session.delete(toll)
+    await db_session.commit()
+    rollups = await _rollups(db_session, organization_id)
+    assert (rollups[(None, day)].total_cost, rollups[(None, day)].cost_toll) == (60.0, 0.0)
+    assert rollups[(driver_id, day)].km == 450.0
+
+    # Escrita fora do ORM: a reconciliação recalcula a partir dos registros originais
+    await db_session.execute(update(DailyRollup).where(DailyRollup.organization_id == organization_id).values(km=0))
+    await db_session.commit()
+    assert await crud.rollup.reconcile(db_session, start_date=day, end_date=day, organization_id=organization_id) == 1
+    rollups = await _rollups(db_session, organization_id)
+    assert rollups[(driver_id, day)].km == 450.0 and rollups[(None, day)].total_cost == 60.0
+    assert await crud.rollup.reconcile(db_session, start_date=day, end_date=day, organization_id=organization_id) == 0
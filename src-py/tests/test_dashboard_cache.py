@@ -0,0 +1,53 @@
+# backend/tests/test_dashboard_cache.py
+
+import asyncio
+import pytest
+
+from app.core.dashboard_cache import DashboardCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once_and_invalidation_discards_snapshot():
+    cache = DashboardCache(ttl_seconds=60, max_entries=10)
+    calls = 0
+    release = asyncio.Event()
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    waiters = [asyncio.ensure_future(cache.get_or_compute((1, "30d", "gestor"), compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == [1] * 5
+    assert await cache.get_or_compute((1, "30d", "gestor"), compute) == 1
+    assert (calls, cache.misses, cache.coalesced, cache.hits) == (1, 1, 4, 1)
+
+    # Outra organização não é afetada; a invalidada recalcula
+    assert await cache.get_or_compute((2, "30d", "gestor"), compute) == 2
+    cache.invalidate(1)
+    assert await cache.get_or_compute((1, "30d", "gestor"), compute) == 3
+    assert await cache.get_or_compute((2, "30d", "gestor"), compute) == 2
+
+    # Invalidada durante o cálculo: o resultado é entregue, mas não guardado
+    release.clear()
+    pending = asyncio.ensure_future(cache.get_or_compute((3, "30d", "gestor"), compute))
+    await asyncio.sleep(0)
+    cache.invalidate(3)
+    release.set()
+    assert await pending == 4
+    assert await cache.get_or_compute((3, "30d", "gestor"), compute) == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_computation_is_not_cached():
+    cache = DashboardCache(ttl_seconds=60, max_entries=10)
+
+    async def broken():
+        raise RuntimeError("falha")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute((1, "30d", "gestor"), broken)
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,48 @@
+# backend/tests/test_fleet_simulator.py
+
+import json
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from main import app
+from tools import fleet_simulator
+
+
+def test_percentile_uses_nearest_rank():
+    values = sorted(float(v) for v in range(1, 101))
+    assert fleet_simulator.percentile(values, 0.50) == 50.0
+    assert fleet_simulator.percentile(values, 0.99) == 99.0
+    assert fleet_simulator.percentile([], 0.95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_replay_reports_latency_and_errors_per_endpoint(db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Replay Org", sector="agronegocio"))
+    await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Case", model="Magnum", year=2021, telemetry_device_id="REPLAY-001"),
+        organization_id=org.id,
+    )
+
+    lines = [
+        json.dumps({"device_id": "REPLAY-001", "timestamp": f"2024-08-01T10:00:0{i}Z",
+                    "latitude": -20.0 + i * 1e-4, "longitude": -48.0, "engine_hours": 100 + i})
+        for i in range(6)
+    ]
+    records = fleet_simulator.read_ndjson(reversed(lines))
+    assert [r["timestamp"] for r in records] == sorted(r["timestamp"] for r in records)
+
+    args = fleet_simulator.build_parser().parse_args(["replay", "x.ndjson", "--speed", "1000", "--mode", "batch", "--batch-size", "4"])
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        report = await fleet_simulator.replay(args, client=client, records=records)
+        report.record(fleet_simulator.REPORT_PATH, 5.0, "500", False, 1)
+
+    summary = report.summary()["endpoints"]
+    batch = summary[fleet_simulator.BATCH_PATH]
+    assert batch["points"] == 6
+    assert batch["errors"] == 0
+    assert set(batch["status_counts"]) == {"204"}
+    assert summary[fleet_simulator.REPORT_PATH]["error_rate"] == 1.0
@@ -0,0 +1,45 @@
+# backend/tests/test_geofence_engine.py
+
+from app.core.geofence_engine import GeofenceEngine, IndexedFence
+from tools import geofence_benchmark
+
+
+def _engine() -> GeofenceEngine:
+    return GeofenceEngine(cell_degrees=0.05, refresh_seconds=3600, max_cells_per_fence=16)
+
+
+def test_polygon_containment_handles_concave_shapes():
+    # "U" aberto para o norte: o centro do vão está fora
+    fence = IndexedFence.polygon(1, 1, "U", [(0, 0), (0, 3), (3, 3), (3, 2), (1, 2), (1, 1), (3, 1), (3, 0)])
+    assert fence.contains(0.5, 1.5)
+    assert fence.contains(2, 0.5)
+    assert not fence.contains(2, 1.5)
+    assert not fence.contains(-0.1, 1.5)
+
+
+def test_transitions_only_on_state_changes():
+    engine = _engine()
+    circle = IndexedFence.circle(1, 7, "Base", -16.5, -49.1, 1000)
+    # Cerca grande (mais células que o limite) fica fora da grade e é testada sempre
+    region = IndexedFence.polygon(2, 7, "Região", [(-17, -50), (-17, -48), (-15, -48), (-15, -50)], alert_on_exit=False)
+    engine.load_organization(7, [circle, region], [(10, -16.5, -49.1)])
+    assert engine._orgs[7].large == [2]
+
+    assert engine.evaluate(7, 10, -16.5001, -49.1001) == []
+    exited = engine.evaluate(7, 10, -16.6, -49.2)
+    assert [(t.fence.fence_id, t.entered) for t in exited] == [(1, False)]
+    left_region = engine.evaluate(7, 10, -14.0, -49.0)
+    assert [(t.fence.fence_id, t.entered) for t in left_region] == [(2, False)]
+
+    # Veículo sem posição conhecida: a primeira posição só inicializa o estado
+    assert engine.evaluate(7, 11, -16.5, -49.1) == []
+    assert [t.entered for t in engine.evaluate(7, 11, -16.6, -49.2)] == [False]
+
+
+def test_benchmark_10k_fences_sustains_1k_pings_per_second():
+    result = geofence_benchmark.run(fences=10_000, vehicles=1000, pings=5000)
+    summary = result.summary()
+    assert result.pings_per_second >= 1000, summary
+    # A grade evita testar todas as cercas a cada posição
+    assert summary["fence_tests_per_ping"] < 50, summary
+    assert result.transitions > 0
@@ -0,0 +1,87 @@
+# backend/tests/test_journey_distance.py
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.journey_distance import distances_between, filter_track
+from app.models.journey_model import Journey
+from app.models.user_model import User, UserRole
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.vehicle_schema import VehicleCreate
+from tools import journey_distance_benchmark
+
+
+def test_spikes_are_removed_and_jumps_do_not_count():
+    # 0,01° de latitude ≈ 1,112 km a cada minuto (~67 km/h)
+    timestamps = [0, 60, 120, 180, 240, 300]
+    latitudes = [0.00, 0.01, 0.50, 0.03, 0.04, 0.05]   # pico isolado no terceiro ponto
+    longitudes = [0.0, 0.0, 0.0, 0.0, 0.0, 3.0]        # salto de ~330 km no último trecho
+    track = filter_track(timestamps, latitudes, longitudes, max_speed_kmh=250)
+
+    assert (track.dropped_points, track.dropped_segments) == (1, 1)
+    assert track.cumulative_km[-1] == pytest.approx(4 * 1.112, rel=1e-3)
+
+    start = datetime.fromtimestamp(0, timezone.utc)
+    distances = distances_between(track, [start, start + timedelta(seconds=130)], [start + timedelta(seconds=60), start + timedelta(hours=1)])
+    assert distances[0] == pytest.approx(1.112, rel=1e-3)
+    assert distances[1] == pytest.approx(1.112, rel=1e-3)
+
+
+def test_parked_jitter_does_not_count_but_slow_driving_does():
+    # 20 minutos parado com o GPS oscilando ~11 m a cada 5 s (~8 km/h entre pontos vizinhos)
+    timestamps = [i * 5 for i in range(240)]
+    latitudes = [0.0001 * (i % 2) for i in range(240)]
+    longitudes = [0.0] * 240
+    parked = filter_track(timestamps, latitudes, longitudes, max_speed_kmh=250, min_speed_kmh=3)
+    assert parked.cumulative_km[-1] < 0.05
+    assert parked.parked_segments > 200
+
+    # manobra a ~4 km/h: 0,00005° (~5,6 m) a cada 5 s
+    latitudes = [0.00005 * i for i in range(240)]
+    slow = filter_track(timestamps, latitudes, longitudes, max_speed_kmh=250, min_speed_kmh=3)
+    assert slow.parked_segments == 0
+    assert slow.cumulative_km[-1] == pytest.approx(239 * 0.00556, rel=1e-2)
+
+
+def test_benchmark_runs_on_a_small_track():
+    result = journey_distance_benchmark.run(points=20_000, journeys=10)
+    assert result.dropped_points == 20
+    assert result.total_km > 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_fills_distance_of_closed_journeys(db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Distance Org", sector="frete"))
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Iveco", model="S-Way", year=2023), organization_id=org.id
+    )
+    vehicle_id, organization_id = vehicle.id, vehicle.organization_id
+    driver = User(full_name="Motorista Distância", email="distance@test.com", hashed_password="x",
+                  role=UserRole.DRIVER, organization_id=organization_id, is_active=True)
+    db_session.add(driver)
+    await db_session.flush()
+
+    start = datetime(2024, 8, 1, 8, 0)
+    await crud.location_history.bulk_append(db_session, rows=[
+        {"vehicle_id": vehicle_id, "organization_id": organization_id, "latitude": -20.0 + i * 0.01,
+         "longitude": -45.0, "timestamp": (start + timedelta(minutes=i)).replace(tzinfo=timezone.utc)}
+        for i in range(21)
+    ])
+    journeys = [
+        Journey(start_time=start, end_time=start + timedelta(minutes=10), start_mileage=0, trip_type="FREE_ROAM",
+                is_active=False, vehicle_id=vehicle_id, driver_id=driver.id, organization_id=organization_id),
+        Journey(start_time=start + timedelta(minutes=10), end_time=start + timedelta(minutes=20), start_mileage=0,
+                trip_type="FREE_ROAM", is_active=False, vehicle_id=vehicle_id, driver_id=driver.id, organization_id=organization_id),
+    ]
+    db_session.add_all(journeys)
+    await db_session.commit()
+
+    assert await crud.journey.backfill_gps_distances(db_session) == 2
+    distances = (await db_session.execute(
+        select(Journey.distance_km).where(Journey.vehicle_id == vehicle_id).order_by(Journey.start_time)
+    )).scalars().all()
+    assert distances == [pytest.approx(11.12, rel=1e-3)] * 2
+    assert await crud.journey.backfill_gps_distances(db_session) == 0
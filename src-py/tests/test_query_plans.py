@@ -0,0 +1,115 @@
+# backend/tests/test_query_plans.py
+
+import re
+import pytest
+from datetime import date, datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.crud import crud_report
+from app.db.base_class import Base
+from app.models.alert_model import Alert, AlertLevel
+from app.models.fuel_log_model import FuelLog
+from app.models.goal_model import Goal
+from app.models.journey_model import Journey
+from app.models.maintenance_model import MaintenanceCategory, MaintenanceRequest
+from app.models.user_model import User, UserRole
+from app.models.vehicle_cost_model import CostType, VehicleCost
+from app.schemas.organization_schema import OrganizationCreate
+from app.schemas.export_schema import ExportDataset
+from app.schemas.report_schema import VehicleReportSections
+from app.schemas.vehicle_schema import VehicleCreate
+
+
+async def _sequential_scans(db: AsyncSession, statement: str, parameters) -> list[str]:
+    """Tabelas lidas por inteiro no plano da consulta (sem busca por índice)."""
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql":
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = "\n".join(row[0] for row in await conn.exec_driver_sql("EXPLAIN " + statement, parameters))
+        return re.findall(r"Seq Scan on (\w+)", plan)
+    plan = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+    # "SCAN tabela" percorre a tabela inteira, mesmo quando na ordem de um índice ("USING INDEX")
+    scans = [re.match(r"SCAN (\w+)\b", row[3]) for row in plan]
+    return [match.group(1) for match in scans if match and match.group(1) in Base.metadata.tables]
+
+
+@pytest.mark.asyncio
+async def test_reporting_queries_use_indexes(db_session: AsyncSession):
+    org = await crud.organization.create(db_session, obj_in=OrganizationCreate(name="Plan Org", sector="frete"))
+    organization_id = org.id
+    vehicle = await crud.vehicle.create_with_owner(
+        db_session, obj_in=VehicleCreate(brand="Volvo", model="FH", year=2022, identifier="PLAN-01"), organization_id=organization_id
+    )
+    vehicle_id = vehicle.id
+    driver = User(full_name="Motorista Plano", email="plan@test.com", hashed_password="x",
+                  role=UserRole.DRIVER, organization_id=organization_id, is_active=True)
+    db_session.add(driver)
+    await db_session.flush()
+    driver_id = driver.id
+    day = date(2026, 5, 10)
+    db_session.add_all([
+        Journey(start_time=datetime(2026, 5, 10, 8), end_time=datetime(2026, 5, 10, 12), start_mileage=1000,
+                end_mileage=1200, trip_type="free_roam", is_active=False,
+                vehicle_id=vehicle_id, driver_id=driver_id, organization_id=organization_id),
+        Journey(start_time=datetime(2026, 5, 11, 8), start_mileage=1200, trip_type="free_roam", is_active=True,
+                vehicle_id=vehicle_id, driver_id=driver_id, organization_id=organization_id),
+        FuelLog(odometer=1200, liters=80.0, total_cost=480.0, timestamp=datetime(2026, 5, 10, 13, tzinfo=timezone.utc),
+                vehicle_id=vehicle_id, user_id=driver_id, organization_id=organization_id),
+        VehicleCost(description="Pedágio", amount=30.0, date=day, cost_type=CostType.PEDAGIO,
+                    vehicle_id=vehicle_id, organization_id=organization_id),
+        MaintenanceRequest(problem_description="Freio", category=MaintenanceCategory.MECHANICAL,
+                           created_at=datetime(2026, 5, 10, 9, tzinfo=timezone.utc),
+                           vehicle_id=vehicle_id, reported_by_id=driver_id, organization_id=organization_id),
+        Alert(message="Excesso de velocidade", level=AlertLevel.WARNING, timestamp=datetime(2026, 5, 10, 10),
+              vehicle_id=vehicle_id, driver_id=driver_id, organization_id=organization_id),
+        Goal(title="Custo", target_value=1000.0, unit="R$", period_start=date(2026, 5, 1), period_end=date(2099, 5, 31),
+             organization_id=organization_id),
+    ])
+    await db_session.commit()
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        start, end = date(2026, 5, 1), date(2026, 5, 31)
+        await crud_report.get_km_per_day_last_30_days(db_session, organization_id=organization_id, start_date=start, sector="frete")
+        await crud_report.get_costs_by_category_last_30_days(db_session, organization_id=organization_id, start_date=start)
+        await crud_report.get_dashboard_kpis(db_session, organization_id=organization_id)
+        await crud_report.get_recent_alerts(db_session, organization_id=organization_id)
+        await crud_report.get_upcoming_maintenances(db_session, organization_id=organization_id)
+        await crud_report.get_active_goal_with_progress(db_session, organization_id=organization_id)
+        await crud_report.get_fleet_management_data(db_session, start_date=start, end_date=end, organization_id=organization_id)
+        await crud_report.get_driver_performance_data(db_session, start_date=start, end_date=end, organization_id=organization_id)
+        await crud_report.get_driver_activity_data(db_session, driver_id, organization_id, start, end)
+        await crud_report.get_vehicle_consolidated_data(
+            db_session, vehicle_id=vehicle_id, start_date=start, end_date=end, organization_id=organization_id,
+            sections=VehicleReportSections(**{name: True for name in VehicleReportSections.model_fields}),
+        )
+        await crud.journey.get_active_journeys(db_session, organization_id=organization_id)
+        await crud.journey.get_active_journey_by_driver(db_session, driver_id=driver_id, organization_id=organization_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    for dataset in ExportDataset:
+        # Exportação por período e incremental (após o cursor)
+        for stmt in (
+            crud.export.build_query(dataset, organization_id=organization_id, start_date=start, end_date=end),
+            crud.export.build_query(dataset, organization_id=organization_id, after_id=0),
+        ):
+            compiled = stmt.compile(engine, compile_kwargs={"render_postcompile": True})
+            captured.append((str(compiled), tuple(compiled.params[name] for name in compiled.positiontup)))
+
+    assert captured
+    scans = {}
+    for statement, parameters in captured:
+        tables = await _sequential_scans(db_session, statement, parameters)
+        if tables:
+            scans[statement] = tables
+    assert not scans, scans
@@ -0,0 +1,46 @@
+# backend/tests/test_stop_detector.py
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.stop_detector import StopDetector
+
+
+def test_stop_starts_after_dwell_and_ends_when_vehicle_moves():
+    detector = StopDetector(radius_meters=50, min_dwell_seconds=180, checkpoint_interval_seconds=60)
+    t0 = datetime(2024, 7, 1, 8, 0, tzinfo=timezone.utc)
+
+    # Chega ao local em movimento e fica parado (com ruído de GPS de poucos metros)
+    assert detector.observe(1, 9, -23.50, -46.60, t0) is None
+    assert detector.observe(1, 9, -23.51, -46.61, t0 + timedelta(minutes=1)) is None
+    assert detector.observe(1, 9, -23.51001, -46.61, t0 + timedelta(minutes=2)) is None
+    started = detector.observe(1, 9, -23.51, -46.61001, t0 + timedelta(minutes=4))
+    assert started is not None and started.ended_at is None
+    assert (started.latitude, started.started_at) == (-23.51, t0 + timedelta(minutes=1))
+    assert detector.observe(1, 9, -23.51, -46.61, t0 + timedelta(minutes=10)) is None
+
+    # Pontos fora de ordem são ignorados
+    assert detector.observe(1, 9, -23.60, -46.70, t0 + timedelta(minutes=5)) is None
+
+    ended = detector.observe(1, 9, -23.52, -46.62, t0 + timedelta(minutes=11))
+    assert (ended.started_at, ended.ended_at) == (t0 + timedelta(minutes=1), t0 + timedelta(minutes=10))
+    assert detector.stats()["stopped"] == 0
+
+    # Uma pausa curta não vira parada
+    assert detector.observe(1, 9, -23.52, -46.62, t0 + timedelta(minutes=12)) is None
+    assert detector.observe(1, 9, -23.55, -46.65, t0 + timedelta(minutes=14)) is None
+    assert detector.stats()["stops"] == 1
+
+
+def test_gps_jitter_with_frequent_pings_is_still_a_stop():
+    detector = StopDetector(radius_meters=50, min_dwell_seconds=180, checkpoint_interval_seconds=60)
+    t0 = datetime(2024, 7, 1, 8, 0, tzinfo=timezone.utc)
+
+    # Parado, com pings a cada segundo e ruído de ~15 m: entre pontos seguidos isso daria
+    # dezenas de km/h, mas o veículo nunca sai do raio da âncora
+    events = [
+        detector.observe(1, 9, -23.51 + (i % 2) * 1.3e-4, -46.61, t0 + timedelta(seconds=i))
+        for i in range(240)
+    ]
+    started = [event for event in events if event is not None]
+    assert len(started) == 1 and started[0].started_at == t0
+
@@ -0,0 +1,153 @@
+# backend/tools/driver_report_benchmark.py
+"""
+Benchmark do relatório de desempenho de motoristas.
+
+Cria organizações sintéticas com quantidades crescentes de motoristas (viagens,
+abastecimentos e solicitações de manutenção para cada um) num banco SQLite temporário e
+mede o tempo e o número de consultas de `crud_report.get_driver_performance_data`. Falha se
+o número de consultas variar com o número de motoristas.
+
+Exemplo:
+    python -m tools.driver_report_benchmark --drivers 10 100 400 --days 30
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.crud import crud_report
+from app.db.base_class import Base
+from app.models.fuel_log_model import FuelLog
+from app.models.journey_model import Journey
+from app.models.maintenance_model import MaintenanceCategory, MaintenanceRequest
+from app.models.organization_model import Organization
+from app.models.user_model import User, UserRole
+from app.models.vehicle_model import Vehicle
+
+PERIOD_END = date(2026, 6, 30)
+
+
+@dataclass
+class BenchmarkResult:
+    drivers: int
+    records: int
+    queries: int
+    elapsed_s: float
+
+    def summary(self) -> dict:
+        return {
+            "drivers": self.drivers,
+            "records": self.records,
+            "queries": self.queries,
+            "elapsed_ms": round(self.elapsed_s * 1000, 2),
+        }
+
+
+async def _seed(db: AsyncSession, *, drivers: int, days: int, rng: random.Random) -> int:
+    """Cria uma organização com `drivers` motoristas, um veículo cada e uma viagem e um abastecimento por dia."""
+    org = Organization(name=f"Benchmark {drivers}", sector="frete")
+    db.add(org)
+    await db.flush()
+    records = 0
+    for index in range(drivers):
+        driver = User(full_name=f"Motorista {index}", email=f"bench-{drivers}-{index}@example.com",
+                      hashed_password="x", role=UserRole.DRIVER, organization_id=org.id, is_active=True)
+        vehicle = Vehicle(brand="Volvo", model="FH", year=2022, identifier=f"B{drivers}-{index}", organization_id=org.id)
+        db.add_all([driver, vehicle])
+        await db.flush()
+        odometer = 10_000
+        for offset in range(days):
+            day = datetime.combine(PERIOD_END - timedelta(days=offset), datetime.min.time())
+            km = rng.randint(50, 400)
+            db.add_all([
+                Journey(start_time=day + timedelta(hours=8), end_time=day + timedelta(hours=12), start_mileage=odometer,
+                        end_mileage=odometer + km, distance_km=float(km), trip_type="free_roam", is_active=False,
+                        vehicle_id=vehicle.id, driver_id=driver.id, organization_id=org.id),
+                FuelLog(odometer=odometer + km, liters=km / rng.uniform(2.0, 4.0), total_cost=km * 2.0,
+                        timestamp=(day + timedelta(hours=13)).replace(tzinfo=timezone.utc),
+                        vehicle_id=vehicle.id, user_id=driver.id, organization_id=org.id),
+            ])
+            odometer += km
+            records += 2
+        db.add(MaintenanceRequest(problem_description="Revisão", category=MaintenanceCategory.MECHANICAL,
+                                  created_at=datetime.combine(PERIOD_END, datetime.min.time(), timezone.utc),
+                                  vehicle_id=vehicle.id, reported_by_id=driver.id, organization_id=org.id))
+        records += 1
+    await db.commit()
+    return org.id
+
+
+async def run(*, driver_counts: Sequence[int], days: int = 30, seed: int = 42) -> List[BenchmarkResult]:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'benchmark.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        queries = 0
+
+        def count(*args) -> None:
+            nonlocal queries
+            queries += 1
+
+        results = []
+        try:
+            for drivers in driver_counts:
+                async with AsyncSession(engine, expire_on_commit=False) as db:
+                    organization_id = await _seed(db, drivers=drivers, days=days, rng=rng)
+                async with AsyncSession(engine) as db:
+                    queries = 0
+                    event.listen(engine.sync_engine, "before_cursor_execute", count)
+                    started = time.perf_counter()
+                    report = await crud_report.get_driver_performance_data(
+                        db, start_date=PERIOD_END - timedelta(days=days - 1), end_date=PERIOD_END,
+                        organization_id=organization_id,
+                    )
+                    elapsed = time.perf_counter() - started
+                    event.remove(engine.sync_engine, "before_cursor_execute", count)
+                assert len(report.drivers_performance) == drivers and all(
+                    entry.total_journeys == days and entry.maintenance_requests == 1 for entry in report.drivers_performance
+                )
+                results.append(BenchmarkResult(drivers, drivers * (days * 2 + 1), queries, elapsed))
+        finally:
+            await engine.dispose()
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark do relatório de desempenho de motoristas.")
+    parser.add_argument("--drivers", type=int, nargs="+", default=[10, 100, 400])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = asyncio.run(run(driver_counts=args.drivers, days=args.days, seed=args.seed))
+    summaries = [result.summary() for result in results]
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    else:
+        for summary in summaries:
+            print("  ".join(f"{key}={value}" for key, value in summary.items()))
+    if len({result.queries for result in results}) > 1:
+        print("O número de consultas varia com o número de motoristas.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
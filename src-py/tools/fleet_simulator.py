@@ -0,0 +1,477 @@
+# backend/tools/fleet_simulator.py
+"""
+Simulador de frota e ferramenta de replay de telemetria para testes de carga.
+
+Exemplos:
+    # 5000 dispositivos (TRATOR-001 ... TRATOR-5000) enviando a cada 10 s por 2 minutos
+    python -m tools.fleet_simulator simulate --devices 5000 --interval 10 --duration 120
+
+    # Mesmos dispositivos agrupando 50 pacotes por requisição no endpoint em lote,
+    # gravando o que foi enviado para replay posterior
+    python -m tools.fleet_simulator simulate --devices 5000 --mode batch --batch-size 50 --record carga.ndjson
+
+    # Reproduz um arquivo NDJSON de telemetria 20x mais rápido que o original
+    python -m tools.fleet_simulator replay carga.ndjson --speed 20
+
+Ao final (e a cada `--report-every` segundos) imprime, por endpoint, o número de
+requisições, a taxa de erro e as latências p50/p95/p99.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+import httpx
+
+REPORT_PATH = "/telemetry/report"
+BATCH_PATH = "/telemetry/report-batch"
+PING_PATH = "/gps/ping"
+
+
+# --- Métricas ---
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Percentil pelo método do posto mais próximo (valores já ordenados)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    status_counts: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    points: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms)
+
+    def record(self, latency_ms: float, status: str, ok: bool, points: int) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+        self.points += points
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies_ms)
+        return {
+            "requests": self.requests,
+            "points": self.points,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "p50_ms": percentile(ordered, 0.50),
+            "p95_ms": percentile(ordered, 0.95),
+            "p99_ms": percentile(ordered, 0.99),
+            "max_ms": ordered[-1] if ordered else 0.0,
+            "status_counts": dict(self.status_counts),
+        }
+
+
+class LoadReport:
+    """Agrega as métricas por endpoint durante uma execução."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    def record(self, path: str, latency_ms: float, status: str, ok: bool, points: int) -> None:
+        self.endpoints.setdefault(path, EndpointStats()).record(latency_ms, status, ok, points)
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "elapsed_s": elapsed,
+            "endpoints": {
+                path: {**stats.summary(), "requests_per_s": stats.requests / elapsed if elapsed else 0.0}
+                for path, stats in self.endpoints.items()
+            },
+        }
+
+    def format(self) -> str:
+        summary = self.summary()
+        lines = [f"--- {summary['elapsed_s']:.1f} s ---"]
+        for path, stats in summary["endpoints"].items():
+            lines.append(
+                f"{path:<24} req={stats['requests']:<8} pts={stats['points']:<9} "
+                f"rps={stats['requests_per_s']:<8.1f} erros={stats['error_rate'] * 100:5.2f}% "
+                f"p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms "
+                f"status={stats['status_counts']}"
+            )
+        return "\n".join(lines)
+
+
+async def send(
+    client: httpx.AsyncClient, report: LoadReport, path: str, body, points: int,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> None:
+    """Envia uma requisição e registra latência/status; erros de conexão contam como falha."""
+    async def _post():
+        started = time.perf_counter()
+        try:
+            response = await client.post(path, json=body)
+            status, ok = str(response.status_code), response.status_code < 400
+        except httpx.HTTPError as exc:
+            status, ok = type(exc).__name__, False
+        report.record(path, (time.perf_counter() - started) * 1000, status, ok, points)
+
+    if semaphore is None:
+        await _post()
+    else:
+        async with semaphore:
+            await _post()
+
+
+# --- Rotas ---
+
+def load_routes(path: Optional[str]) -> List[List[Tuple[float, float]]]:
+    """
+    Carrega rotas de um arquivo JSON: uma lista de rotas, cada uma uma lista de [lat, lon],
+    ou um GeoJSON (FeatureCollection/Feature/LineString, com coordenadas [lon, lat]).
+    """
+    if not path:
+        return []
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, list):
+        return [[(float(lat), float(lon)) for lat, lon in route] for route in data]
+
+    features = data.get("features") or [data]
+    routes = []
+    for feature in features:
+        geometry = feature.get("geometry", feature)
+        if geometry.get("type") == "LineString":
+            routes.append([(float(lat), float(lon)) for lon, lat, *_ in geometry["coordinates"]])
+    return routes
+
+
+class VirtualDevice:
+    """Dispositivo simulado: percorre uma rota (ida e volta) ou faz um passeio aleatório."""
+
+    def __init__(
+        self, device_id: str, vehicle_id: int, *, route: Optional[List[Tuple[float, float]]],
+        center: Tuple[float, float], speed_kmh: float, engine_hours: float,
+    ):
+        self.device_id = device_id
+        self.vehicle_id = vehicle_id
+        # Pontos repetidos em sequência formariam segmentos de comprimento zero
+        route = [point for i, point in enumerate(route or []) if i == 0 or point != route[i - 1]]
+        self.route = route if len(route) > 1 else None
+        self.speed_kmh = speed_kmh
+        self.engine_hours = engine_hours
+        self.segment = 0
+        self.direction = 1
+        self.progress = random.random() if self.route else 0.0
+        if self.route:
+            self.segment = random.randrange(len(self.route) - 1)
+            self.latitude, self.longitude = self.route[self.segment]
+        else:
+            self.latitude = center[0] + random.uniform(-0.5, 0.5)
+            self.longitude = center[1] + random.uniform(-0.5, 0.5)
+
+    def advance(self, seconds: float) -> None:
+        self.engine_hours += seconds / 3600
+        distance_deg = self.speed_kmh * seconds / 3600 / 111.32
+        if not self.route:
+            heading = random.uniform(0, 2 * math.pi)
+            self.latitude += distance_deg * math.cos(heading)
+            self.longitude += distance_deg * math.sin(heading)
+            return
+
+        while distance_deg > 0:
+            start = self.route[self.segment]
+            end = self.route[self.segment + 1]
+            length = math.hypot(end[0] - start[0], end[1] - start[1]) or 1e-9
+            remaining = (1 - self.progress) * length if self.direction > 0 else self.progress * length
+            step = min(distance_deg, remaining)
+            self.progress += self.direction * step / length
+            distance_deg -= step
+            if distance_deg > 0:
+                # Fim do segmento: segue para o próximo ou inverte o sentido no fim da rota
+                next_segment = self.segment + self.direction
+                if 0 <= next_segment < len(self.route) - 1:
+                    self.segment = next_segment
+                    self.progress = 0.0 if self.direction > 0 else 1.0
+                else:
+                    self.direction = -self.direction
+        start, end = self.route[self.segment], self.route[self.segment + 1]
+        self.latitude = start[0] + (end[0] - start[0]) * self.progress
+        self.longitude = start[1] + (end[1] - start[1]) * self.progress
+
+    def telemetry(self, timestamp: datetime) -> dict:
+        return {
+            "device_id": self.device_id,
+            "timestamp": timestamp.isoformat(),
+            "latitude": round(self.latitude, 7),
+            "longitude": round(self.longitude, 7),
+            "engine_hours": round(self.engine_hours, 3),
+        }
+
+    def ping(self) -> dict:
+        return {"vehicle_id": self.vehicle_id, "latitude": round(self.latitude, 7), "longitude": round(self.longitude, 7)}
+
+
+# --- Simulação ---
+
+async def _device_loop(
+    device: VirtualDevice, *, client: httpx.AsyncClient, report: LoadReport, args,
+    semaphore: asyncio.Semaphore, deadline: float, batch_queue: Optional[asyncio.Queue],
+    recorder: Optional[TextIO],
+) -> None:
+    # Distribui o início dos dispositivos ao longo do intervalo para não enviar tudo no mesmo instante
+    await asyncio.sleep(random.uniform(0, args.interval))
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        device.advance(args.interval)
+        payload = device.telemetry(datetime.now(timezone.utc))
+        if recorder is not None:
+            recorder.write(json.dumps(payload) + "\n")
+
+        if args.mode == "ping":
+            await send(client, report, PING_PATH, device.ping(), 1, semaphore)
+        elif args.mode == "batch":
+            await batch_queue.put(payload)
+        else:
+            await send(client, report, REPORT_PATH, payload, 1, semaphore)
+
+        await asyncio.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+
+_STOP = object()
+
+
+async def _batch_sender(
+    queue: asyncio.Queue, *, client: httpx.AsyncClient, report: LoadReport, batch_size: int,
+    max_wait: float, semaphore: asyncio.Semaphore,
+) -> None:
+    """
+    Agrupa pacotes da fila e os envia ao endpoint em lote (por tamanho ou tempo de espera).
+    Ao receber `_STOP`, envia o lote parcial e aguarda as requisições em andamento.
+    """
+    pending = []
+    in_flight = set()
+    stopping = False
+    while not stopping:
+        try:
+            item = await asyncio.wait_for(queue.get(), timeout=max_wait if pending else None)
+        except asyncio.TimeoutError:
+            item = None
+        stopping = item is _STOP
+        if item is not None and not stopping:
+            pending.append(item)
+        if pending and (item is None or stopping or len(pending) >= batch_size):
+            task = asyncio.create_task(send(client, report, BATCH_PATH, pending, len(pending), semaphore))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            pending = []
+    if in_flight:
+        await asyncio.gather(*list(in_flight))
+
+
+async def _periodic_report(report: LoadReport, every: float) -> None:
+    while True:
+        await asyncio.sleep(every)
+        print(report.format(), flush=True)
+
+
+async def simulate(args, client: Optional[httpx.AsyncClient] = None) -> LoadReport:
+    """Simula `args.devices` dispositivos concorrentes até `args.duration` segundos."""
+    routes = load_routes(args.routes)
+    devices = [
+        VirtualDevice(
+            f"{args.device_prefix}{index:0{args.id_width}d}",
+            args.first_vehicle_id + index - 1,
+            route=routes[(index - 1) % len(routes)] if routes else None,
+            center=(args.center_lat, args.center_lon),
+            speed_kmh=args.speed_kmh,
+            engine_hours=random.uniform(100, 5000),
+        )
+        for index in range(1, args.devices + 1)
+    ]
+
+    report = LoadReport()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    deadline = time.monotonic() + args.duration
+    recorder = open(args.record, "w", encoding="utf-8") if args.record else None
+    owns_client = client is None
+    if owns_client:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits)
+
+    batch_queue = asyncio.Queue() if args.mode == "batch" else None
+    batch_task = None
+    if batch_queue is not None:
+        batch_task = asyncio.create_task(_batch_sender(
+            batch_queue, client=client, report=report, batch_size=args.batch_size,
+            max_wait=args.batch_wait, semaphore=semaphore,
+        ))
+    reporter = asyncio.create_task(_periodic_report(report, args.report_every)) if args.report_every else None
+
+    try:
+        await asyncio.gather(*(
+            _device_loop(
+                device, client=client, report=report, args=args, semaphore=semaphore,
+                deadline=deadline, batch_queue=batch_queue, recorder=recorder,
+            )
+            for device in devices
+        ))
+        if batch_task is not None:
+            await batch_queue.put(_STOP)
+            await batch_task
+    finally:
+        if batch_task is not None and not batch_task.done():
+            batch_task.cancel()
+        if reporter is not None:
+            reporter.cancel()
+        if recorder is not None:
+            recorder.close()
+        if owns_client:
+            await client.aclose()
+    return report
+
+
+# --- Replay ---
+
+def read_ndjson(lines: Iterable[str]) -> List[dict]:
+    """Lê pacotes de telemetria (um JSON por linha) e os ordena pelo timestamp."""
+    records = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            records.append(json.loads(line))
+    records.sort(key=lambda r: r["timestamp"])
+    return records
+
+
+def _parse_timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def replay(args, client: Optional[httpx.AsyncClient] = None, records: Optional[List[dict]] = None) -> LoadReport:
+    """
+    Reenvia pacotes gravados respeitando o espaçamento original dividido por `args.speed`.
+    Com `--rewrite-timestamps`, os horários são deslocados para o momento do replay.
+    """
+    if records is None:
+        with open(args.file, encoding="utf-8") as f:
+            records = read_ndjson(f)
+
+    report = LoadReport()
+    if not records:
+        return report
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    owns_client = client is None
+    if owns_client:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits)
+
+    first_timestamp = _parse_timestamp(records[0]["timestamp"])
+    shift = datetime.now(timezone.utc) - first_timestamp if args.rewrite_timestamps else timedelta(0)
+    started = time.monotonic()
+    tasks = set()
+
+    def dispatch(path: str, body, points: int) -> None:
+        task = asyncio.create_task(send(client, report, path, body, points, semaphore))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    try:
+        pending_batch = []
+        for record in records:
+            timestamp = _parse_timestamp(record["timestamp"])
+            due = (timestamp - first_timestamp).total_seconds() / args.speed
+            delay = due - (time.monotonic() - started)
+            if delay > 0:
+                if pending_batch:
+                    dispatch(BATCH_PATH, pending_batch, len(pending_batch))
+                    pending_batch = []
+                await asyncio.sleep(delay)
+
+            payload = {**record, "timestamp": (timestamp + shift).isoformat()}
+            if args.mode == "batch":
+                pending_batch.append(payload)
+                if len(pending_batch) >= args.batch_size:
+                    dispatch(BATCH_PATH, pending_batch, len(pending_batch))
+                    pending_batch = []
+            else:
+                dispatch(REPORT_PATH, payload, 1)
+
+        if pending_batch:
+            dispatch(BATCH_PATH, pending_batch, len(pending_batch))
+        if tasks:
+            await asyncio.gather(*list(tasks))
+    finally:
+        if owns_client:
+            await client.aclose()
+    return report
+
+
+# --- CLI ---
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--base-url", default="http://127.0.0.1:8000", help="URL base da API.")
+    common.add_argument("--concurrency", type=int, default=200, help="Máximo de requisições simultâneas.")
+    common.add_argument("--timeout", type=float, default=30.0, help="Timeout de cada requisição (s).")
+    common.add_argument("--batch-size", type=int, default=100, help="Pacotes por requisição no modo batch.")
+    common.add_argument("--json", action="store_true", help="Imprime o relatório final em JSON.")
+
+    parser = argparse.ArgumentParser(description="Simulador de frota e replay de telemetria do TruCar.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sim = subparsers.add_parser("simulate", parents=[common], help="Simula dispositivos concorrentes.")
+    sim.add_argument("--mode", choices=["report", "batch", "ping"], default="report",
+                     help="Endpoint usado: /telemetry/report, /telemetry/report-batch ou /gps/ping.")
+    sim.add_argument("--devices", type=int, default=1)
+    sim.add_argument("--device-prefix", default="TRATOR-", help="Prefixo do telemetry_device_id.")
+    sim.add_argument("--id-width", type=int, default=3, help="Dígitos do número do dispositivo (TRATOR-001).")
+    sim.add_argument("--first-vehicle-id", type=int, default=1, help="vehicle_id do primeiro dispositivo (modo ping).")
+    sim.add_argument("--interval", type=float, default=10.0, help="Segundos entre envios de cada dispositivo.")
+    sim.add_argument("--duration", type=float, default=60.0, help="Duração da simulação (s).")
+    sim.add_argument("--routes", help="Arquivo JSON/GeoJSON com as rotas percorridas pelos dispositivos.")
+    sim.add_argument("--center-lat", type=float, default=-23.5505)
+    sim.add_argument("--center-lon", type=float, default=-46.6333)
+    sim.add_argument("--speed-kmh", type=float, default=60.0)
+    sim.add_argument("--batch-wait", type=float, default=0.5, help="Espera máxima para completar um lote (s).")
+    sim.add_argument("--record", help="Grava os pacotes enviados em NDJSON (para replay).")
+    sim.add_argument("--report-every", type=float, default=10.0, help="Intervalo dos relatórios parciais (0 desativa).")
+
+    rep = subparsers.add_parser("replay", parents=[common], help="Reproduz telemetria gravada em NDJSON.")
+    rep.add_argument("file")
+    rep.add_argument("--mode", choices=["report", "batch"], default="report",
+                     help="Endpoint usado: /telemetry/report ou /telemetry/report-batch.")
+    rep.add_argument("--speed", type=float, default=1.0, help="Fator de aceleração (20 = 20x mais rápido).")
+    rep.add_argument("--rewrite-timestamps", action="store_true",
+                     help="Desloca os timestamps para o instante do replay.")
+    return parser
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.command == "simulate":
+        print(f"--- Simulando {args.devices} dispositivo(s) em {args.base_url} (modo {args.mode}) ---", flush=True)
+        report = await simulate(args)
+    else:
+        print(f"--- Replay de {args.file} a {args.speed}x em {args.base_url} (modo {args.mode}) ---", flush=True)
+        report = await replay(args)
+
+    print(json.dumps(report.summary(), indent=2) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n--- Simulador encerrado. ---")
@@ -0,0 +1,142 @@
+# backend/tools/geofence_benchmark.py
+"""
+Benchmark do motor de cercas eletrônicas (sem banco de dados).
+
+Gera cercas sintéticas (polígonos e círculos) espalhadas por uma região e veículos em
+passeio aleatório, e mede a avaliação de cada posição pelo `GeofenceEngine`.
+
+Exemplo:
+    # 10 mil cercas, 1000 veículos, 20 mil posições; falha se não sustentar 1000 posições/s
+    python -m tools.geofence_benchmark --fences 10000 --vehicles 1000 --pings 20000 --target-rate 1000
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.core.geofence_engine import GeofenceEngine, IndexedFence
+from tools.fleet_simulator import percentile
+
+ORGANIZATION_ID = 1
+
+
+@dataclass
+class BenchmarkResult:
+    fences: int
+    pings: int
+    elapsed_s: float
+    latencies_ms: List[float]
+    transitions: int
+    fence_tests: int
+
+    @property
+    def pings_per_second(self) -> float:
+        return self.pings / self.elapsed_s if self.elapsed_s else float("inf")
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "fences": self.fences,
+            "pings": self.pings,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "pings_per_second": round(self.pings_per_second, 1),
+            "p50_ms": round(percentile(latencies, 0.50), 4),
+            "p99_ms": round(percentile(latencies, 0.99), 4),
+            "fence_tests_per_ping": round(self.fence_tests / self.pings, 2) if self.pings else 0,
+            "transitions": self.transitions,
+        }
+
+
+def build_fences(count: int, *, center_lat: float, center_lon: float, spread_deg: float, rng: random.Random) -> List[IndexedFence]:
+    """Cercas de 200 m a 5 km: 70% polígonos irregulares (6 a 24 vértices) e 30% círculos."""
+    fences = []
+    for fence_id in range(1, count + 1):
+        lat = center_lat + rng.uniform(-spread_deg, spread_deg)
+        lon = center_lon + rng.uniform(-spread_deg, spread_deg)
+        radius_m = rng.uniform(200, 5000)
+        if rng.random() < 0.3:
+            fences.append(IndexedFence.circle(fence_id, ORGANIZATION_ID, f"Círculo {fence_id}", lat, lon, radius_m))
+            continue
+        d_lat = radius_m / 111_320
+        d_lon = d_lat / math.cos(math.radians(lat))
+        sides = rng.randint(6, 24)
+        vertices = []
+        for i in range(sides):
+            angle = 2 * math.pi * i / sides
+            scale = rng.uniform(0.5, 1.0)
+            vertices.append((lat + d_lat * scale * math.sin(angle), lon + d_lon * scale * math.cos(angle)))
+        fences.append(IndexedFence.polygon(fence_id, ORGANIZATION_ID, f"Polígono {fence_id}", vertices))
+    return fences
+
+
+def run(
+    *, fences: int, vehicles: int, pings: int, center_lat: float = -16.68, center_lon: float = -49.26,
+    spread_deg: float = 2.0, seed: int = 42, engine: Optional[GeofenceEngine] = None,
+) -> BenchmarkResult:
+    rng = random.Random(seed)
+    engine = engine or GeofenceEngine(cell_degrees=0.05, refresh_seconds=3600, max_cells_per_fence=1024)
+
+    positions = [
+        (vehicle_id, center_lat + rng.uniform(-spread_deg, spread_deg), center_lon + rng.uniform(-spread_deg, spread_deg))
+        for vehicle_id in range(1, vehicles + 1)
+    ]
+    engine.load_organization(
+        ORGANIZATION_ID, build_fences(fences, center_lat=center_lat, center_lon=center_lon, spread_deg=spread_deg, rng=rng),
+        positions,
+    )
+
+    # Cada veículo anda ~100 m por posição, o que provoca entradas e saídas frequentes
+    step = 0.001
+    walk = [[lat, lon] for _, lat, lon in positions]
+    schedule = [rng.randrange(vehicles) for _ in range(pings)]
+    tests_before = engine.fence_tests
+
+    latencies_ms = []
+    transitions = 0
+    started = time.perf_counter()
+    for index in schedule:
+        position = walk[index]
+        position[0] += rng.uniform(-step, step)
+        position[1] += rng.uniform(-step, step)
+        t0 = time.perf_counter()
+        transitions += len(engine.evaluate(ORGANIZATION_ID, index + 1, position[0], position[1]))
+        latencies_ms.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+
+    return BenchmarkResult(fences, pings, elapsed, latencies_ms, transitions, engine.fence_tests - tests_before)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark do motor de cercas eletrônicas.")
+    parser.add_argument("--fences", type=int, default=10_000)
+    parser.add_argument("--vehicles", type=int, default=1000)
+    parser.add_argument("--pings", type=int, default=20_000)
+    parser.add_argument("--spread-deg", type=float, default=2.0, help="Meia largura da região das cercas (graus).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--target-rate", type=float, default=1000.0, help="Posições/s exigidas (0 desativa).")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    result = run(fences=args.fences, vehicles=args.vehicles, pings=args.pings, spread_deg=args.spread_deg, seed=args.seed)
+    summary = result.summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for key, value in summary.items():
+            print(f"{key:>22}: {value}")
+    if args.target_rate and result.pings_per_second < args.target_rate:
+        print(f"Abaixo da meta de {args.target_rate:.0f} posições/s.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())